@@ -0,0 +1,46 @@
+"""Add llm_usage table for per-call token and latency accounting
+
+Revision ID: 006_add_llm_usage
+Revises: 005_add_score_category
+Create Date: 2025-10-20
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_add_llm_usage'
+down_revision = '005_add_score_category'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create llm_usage table (rows outlive deleted sessions/jobs so cost history is kept)
+    op.create_table('llm_usage',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=True),
+    sa.Column('job_id', sa.Integer(), nullable=True),
+    sa.Column('operation', sa.String(length=50), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+    sa.Column('completion_tokens', sa.Integer(), nullable=True),
+    sa.Column('audio_seconds', sa.Float(), nullable=True),
+    sa.Column('duration_ms', sa.Float(), nullable=False),
+    sa.Column('cached', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_llm_usage_id'), 'llm_usage', ['id'], unique=False)
+    op.create_index(op.f('ix_llm_usage_session_id'), 'llm_usage', ['session_id'], unique=False)
+    op.create_index(op.f('ix_llm_usage_job_id'), 'llm_usage', ['job_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_llm_usage_job_id'), table_name='llm_usage')
+    op.drop_index(op.f('ix_llm_usage_session_id'), table_name='llm_usage')
+    op.drop_index(op.f('ix_llm_usage_id'), table_name='llm_usage')
+    op.drop_table('llm_usage')
@@ -0,0 +1,26 @@
+"""Add timings_json to turns for per-stage answer latency
+
+Revision ID: 007_add_turn_timings
+Revises: 006_add_llm_usage
+Create Date: 2025-10-22
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_add_turn_timings'
+down_revision = '006_add_llm_usage'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Add timings_json column to turns table
+    op.add_column('turns', sa.Column('timings_json', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    # Remove timings_json column from turns table
+    op.drop_column('turns', 'timings_json')
@@ -0,0 +1,43 @@
+"""Add document_cache table for content-addressed resume/JD extraction results
+
+Revision ID: 008_add_document_cache
+Revises: 007_add_turn_timings
+Create Date: 2025-10-26
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_document_cache'
+down_revision = '007_add_turn_timings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create document_cache table (one row per distinct uploaded file, keyed by sha256)
+    op.create_table('document_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('extractor_version', sa.String(length=50), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('pages', sa.Integer(), nullable=True),
+    sa.Column('truncated', sa.Boolean(), nullable=True),
+    sa.Column('extracted_text', sa.Text(), nullable=False),
+    sa.Column('parsed_json', sa.JSON(), nullable=True),
+    sa.Column('hit_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_document_cache_id'), 'document_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_document_cache_content_hash'), 'document_cache', ['content_hash'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_document_cache_content_hash'), table_name='document_cache')
+    op.drop_index(op.f('ix_document_cache_id'), table_name='document_cache')
+    op.drop_table('document_cache')
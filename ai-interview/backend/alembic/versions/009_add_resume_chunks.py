@@ -0,0 +1,41 @@
+"""Add resume_chunks table for per-candidate retrieval passages
+
+Revision ID: 009_add_resume_chunks
+Revises: 008_add_document_cache
+Create Date: 2025-10-28
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_add_resume_chunks'
+down_revision = '008_add_document_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create resume_chunks table (resume passages and their embeddings, per candidate)
+    op.create_table('resume_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('candidate_id', sa.Integer(), nullable=False),
+    sa.Column('resume_hash', sa.String(length=64), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('section', sa.String(length=50), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('token_count', sa.Integer(), nullable=False),
+    sa.Column('embedding', sa.LargeBinary(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resume_chunks_id'), 'resume_chunks', ['id'], unique=False)
+    op.create_index(op.f('ix_resume_chunks_candidate_id'), 'resume_chunks', ['candidate_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_resume_chunks_candidate_id'), table_name='resume_chunks')
+    op.drop_index(op.f('ix_resume_chunks_id'), table_name='resume_chunks')
+    op.drop_table('resume_chunks')
@@ -0,0 +1,26 @@
+"""Add resume_content_hash to candidates, the document_cache key of their uploaded resume
+
+Revision ID: 010_add_candidate_resume_hash
+Revises: 009_add_resume_chunks
+Create Date: 2025-10-30
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_add_candidate_resume_hash'
+down_revision = '009_add_resume_chunks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Add resume_content_hash column to candidates table
+    op.add_column('candidates', sa.Column('resume_content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    # Remove resume_content_hash column from candidates table
+    op.drop_column('candidates', 'resume_content_hash')
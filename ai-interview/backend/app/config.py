@@ -9,6 +9,36 @@ class Settings(BaseSettings):
     
     # GROQ API
     groq_api_key: str
+    groq_base_url: str = "https://api.groq.com/openai/v1"  # Point at loadtest/fake_groq.py for load tests
+    groq_chat_model: str = "llama-3.3-70b-versatile"  # Evaluation and question generation
+    groq_fast_model: str = "llama-3.1-8b-instant"  # Light tasks such as rephrasing bank questions
+    
+    # LLM Response Cache
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 1000  # In-memory fallback and semantic index size
+    llm_cache_semantic: bool = False  # Also reuse responses for near-identical prompts
+    llm_cache_semantic_threshold: float = 0.97  # Cosine similarity needed for a semantic hit
+    llm_usage_tracking: bool = True  # Record tokens, audio seconds and latency of every Groq call
+    llm_usage_flush_seconds: float = 2.0  # Buffered usage rows are inserted at least this often
+    llm_usage_batch_size: int = 100  # ...or as soon as this many are waiting
+    
+    # Monitoring
+    sql_trace_headers: bool = False  # Send X-DB-* SQL trace headers on every response
+    metrics_enabled: bool = True  # Prometheus metrics at /metrics
+    sql_trace_enabled: bool = True  # Count statements per request and warn about slow patterns
+    sql_warn_query_count: int = 50  # Warn when a request runs this many statements
+    sql_warn_time_ms: float = 500.0  # Warn when a request spends this long in SQL
+    sql_n_plus_one_threshold: int = 5  # Same statement this many times in one request looks like N+1
+    health_cache_seconds: float = 5.0  # Reuse dependency check results for this long
+    health_ready_checks: str = "database"  # Checks that must pass for /health/ready; the rest only report "degraded"
+    health_min_free_disk_mb: int = 500  # Free space required under audio_storage_path
+    profiling_enabled: bool = False  # Allow per-request profiles (header or sampling)
+    profile_header: str = "X-Profile"  # Requests sending this header are profiled
+    profile_sample_rate: float = 0.0  # Fraction of requests profiled without the header
+    profile_interval_ms: float = 5.0  # Stack sampling interval
+    profile_storage_path: str = "./profiles"
+    profile_max_files: int = 50  # Oldest profiles are deleted beyond this
     
     # URLs
     public_base_url: str = "http://localhost:5173"
@@ -22,8 +52,17 @@ class Settings(BaseSettings):
     smtp_username: Optional[str] = None
     smtp_pass: str = ""
     smtp_password: Optional[str] = None
+    smtp_starttls: bool = True  # Disable for local relays and the load-test SMTP sink
     mail_from: str = "noreply@example.com"
     from_email: Optional[str] = None
+    smtp_timeout_seconds: float = 30.0
+    smtp_idle_timeout_seconds: float = 60.0  # Pooled connections idle longer than this are reopened
+    mail_queue_enabled: bool = True  # Send in background threads; false sends inside the request
+    mail_queue_workers: int = 2  # Sender threads, each with its own SMTP connection
+    mail_batch_size: int = 20  # Queued messages one sender takes and sends over its connection at once
+    mail_max_retries: int = 3  # Retries for temporary failures (connection errors, 4xx replies)
+    mail_retry_backoff_seconds: float = 2.0  # First retry delay, doubled on every further retry
+    bulk_invite_max_candidates: int = 1000  # Candidates per bulk invite request
     
     @property
     def effective_smtp_host(self) -> str:
@@ -44,6 +83,14 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
     
+    # OTP Verification
+    otp_ttl_seconds: int = 600
+    otp_max_attempts: int = 5  # Wrong codes before the code is discarded
+    otp_send_limit: int = 5  # Codes sent per email and invite within the window
+    otp_send_window_seconds: int = 900
+    otp_memory_max_entries: int = 10000  # Codes kept by the in-memory fallback (without Redis)
+    otp_sweep_interval_seconds: int = 60  # How often the in-memory fallback drops expired codes
+    
     # JWT
     jwt_secret: str = "changeme"
     jwt_algorithm: str = "HS256"
@@ -61,11 +108,66 @@ class Settings(BaseSettings):
     # Interview Configuration
     max_questions: int = 15  # Structured 15-question interview
     max_retries: int = 5  # 5 buffer questions for failed audio
+    question_source: str = "llm"  # llm (generate every question) or bank (retrieve from the curated question bank)
+    question_bank_path: str = ""  # Custom question bank JSON; empty uses app/data/question_bank.json
+    question_bank_rephrase: bool = True  # Let the LLM adapt bank questions to the candidate's answer
+    question_bank_dedupe_threshold: float = 0.8  # Skip bank questions this similar to one already asked
+    history_recent_turns: int = 3  # Turns sent verbatim to the LLM; older ones are summarized
+    history_summary_mode: str = "extractive"  # extractive (no LLM call) or llm (fast model)
     
     # File Storage
     audio_storage_path: str = "audio_files"
     max_file_size_mb: int = 50
     
+    # Document Processing (resume/JD uploads)
+    document_pool_workers: int = 2  # Extraction processes; 0 extracts in a thread instead
+    document_max_mb: int = 10  # Larger uploads are rejected with 413
+    document_max_pages: int = 50  # Pages extracted per document; the rest is ignored
+    document_max_chars: int = 200000
+    document_timeout_seconds: float = 30.0
+    document_cache_enabled: bool = True  # Reuse extraction/parse results for files with the same sha256
+    document_cache_retention_days: int = 60  # Cached documents unused this long are deleted
+    document_cache_sweep_interval_seconds: int = 3600  # Minimum time between retention sweeps per worker
+    skill_taxonomy_path: str = ""  # Custom skill taxonomy JSON; empty uses app/data/skill_taxonomy.json
+    bulk_ingest_max_files: int = 500  # Resumes per bulk upload (zip entries included)
+    bulk_ingest_max_mb: int = 200  # Total size of one bulk upload, counting zip entries uncompressed
+    bulk_ingest_concurrency: int = 4  # Files extracted at once; the document pool bounds CPU use
+    job_progress_ttl_seconds: int = 86400  # How long bulk ingest/invite job progress stays queryable
+    
+    # ML Models
+    embedding_model_name: str = "all-MiniLM-L6-v2"
+    embedding_backend: str = "sentence-transformers"  # sentence-transformers, onnx, onnx-int8
+    onnx_model_dir: str = "models/all-MiniLM-L6-v2-onnx"
+    onnx_intra_op_threads: int = 0  # 0 lets ONNX Runtime pick
+    preload_models: bool = False  # Load models at import time, before workers fork (gunicorn --preload)
+    warm_up_models: bool = True  # Warm models in a background thread once the app starts
+    
+    # Embedding Server (shared, batching encoder for multi-worker deployments)
+    embedding_server_url: Optional[str] = None  # e.g. http://127.0.0.1:8001 or unix:///tmp/embeddings.sock
+    embedding_server_host: str = "127.0.0.1"
+    embedding_server_port: int = 8001
+    embedding_server_uds: Optional[str] = None  # Serve on a Unix socket instead of TCP
+    embedding_batch_max_size: int = 64  # Max texts encoded in one batch
+    embedding_batch_max_wait_ms: int = 10  # How long to wait for more requests before encoding
+    embedding_client_timeout_seconds: int = 30
+    
+    # Vector Index
+    vector_index_type: str = "auto"  # flat, ivf, hnsw or auto (chosen by corpus size)
+    vector_ann_min_vectors: int = 10000  # auto: exact flat search below this size
+    vector_ivf_min_vectors: int = 200000  # auto: IVF instead of HNSW from this size
+    vector_ivf_nlist: int = 0  # IVF clusters; 0 = 4 * sqrt(n)
+    vector_ivf_nprobe: int = 16  # IVF clusters scanned per query
+    vector_ivf_retrain_growth: float = 2.0  # Retrain IVF once the corpus grows by this factor
+    vector_hnsw_m: int = 32
+    vector_hnsw_ef_construction: int = 80
+    vector_hnsw_ef_search: int = 128
+
+    # Resume Retrieval (per-candidate chunks for RAG)
+    resume_chunk_tokens: int = 128  # Max tokens per resume passage
+    resume_chunk_overlap_tokens: int = 24  # Tokens of the previous passage repeated at the start of the next
+    resume_index_on_upload: bool = True  # Chunk and embed resumes when uploaded; otherwise at the first interview
+    rag_context_chunks: int = 3  # Resume passages added to the follow-up prompt
+
     class Config:
         env_file = ".env"
         case_sensitive = False
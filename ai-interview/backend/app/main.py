@@ -1,16 +1,26 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
-# Import SSL configuration early to fix sentence transformers
-from .services import startup_config
-
 from .config import settings
-from .database import create_tables
+from .database import create_tables, engine, SessionLocal
+from .models import Session as SessionModel
+from .services.model_registry import model_registry
+from .services.health import health_checker
+from .services.document_pool import document_pool
+from .services.mail_queue import mail_queue
+from .services.profiler import request_profiler
+from .services.usage import usage_recorder
+from .services.metrics import instrument_engine, metrics_middleware, metrics_response, register_active_sessions
 from .routers import admin, invites, identity, sessions, proctor, reports, candidates, jobs
 from .routers import invites_management, sessions_management, reports_management
 
+# Load models in the master process so forked workers share the weights copy-on-write
+if settings.preload_models:
+    model_registry.load_all()
+
 # Create FastAPI app
 app = FastAPI(
     title="Exatech Round 1 Interview Platform",
@@ -28,6 +38,30 @@ app.add_middleware(
     expose_headers=["*"]      # Expose all response headers
 )
 
+# Request latency, per-request SQL counts and service metrics, served at /metrics.
+# The same middleware traces each request's SQL: statement count, time and N+1 warnings
+# (X-DB-* headers when SQL_TRACE_HEADERS=true)
+if settings.metrics_enabled or settings.sql_trace_enabled:
+    instrument_engine(engine)
+    app.middleware("http")(metrics_middleware)
+
+
+def count_active_sessions() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(SessionModel).filter(SessionModel.status == "started").count()
+    finally:
+        db.close()
+
+
+register_active_sessions(count_active_sessions)
+
+
+# Opt-in request profiles (X-Profile header or sampling), listed under /api/admin/profiles
+if settings.profiling_enabled:
+    request_profiler.instrument_engine(engine)
+    app.middleware("http")(request_profiler.middleware)
+
 # Global OPTIONS handler for CORS preflight requests
 @app.options("/{path:path}")
 async def handle_options(path: str):
@@ -54,8 +88,17 @@ if os.path.exists(settings.audio_storage_path):
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on startup"""
+    """Initialize database tables and warm models on startup"""
     create_tables()
+    if settings.warm_up_models:
+        model_registry.warm_up_in_background()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    document_pool.shutdown()
+    mail_queue.shutdown()
+    usage_recorder.flush()
 
 
 @app.get("/")
@@ -67,9 +110,32 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return metrics_response()
+
+
+@app.get("/health/live")
+def liveness():
+    """Liveness probe: the process is serving requests"""
+    return health_checker.liveness()
+
+
+@app.get("/health/ready")
+def readiness():
+    """Readiness probe: 503 until the database, Redis and models are usable"""
+    report = health_checker.readiness()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
 @app.get("/health")
-async def health_check():
-    return {"status": "healthy", "timestamp": "2025-01-08T12:00:00Z"}
+def health_check():
+    """Dependency status for dashboards; always 200, use /health/ready for routing"""
+    report = health_checker.readiness()
+    report["uptime_seconds"] = health_checker.liveness()["uptime_seconds"]
+    return report
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, Index, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, Index, JSON, LargeBinary
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from .database import Base
 import enum
@@ -36,7 +36,8 @@ class Candidate(Base):
     experience_years = Column(Integer, nullable=True)
     skills = Column(JSON, nullable=True)  # Array of skills
     resume_url = Column(String(500), nullable=True)
-    resume_text = Column(Text, nullable=True)  # Full resume content for RAG processing
+    resume_text = deferred(Column(Text, nullable=True), group="resume")  # Full resume content for RAG processing
+    resume_content_hash = Column(String(64), nullable=True)  # sha256 of the uploaded resume file (its document_cache key)
     status = Column(String(20), default="active")  # active, inactive, hired, rejected
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -50,7 +51,7 @@ class Job(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=False)  # Map to jd_text for compatibility
+    description = deferred(Column(Text, nullable=False), group="job_text")  # Map to jd_text for compatibility
     requirements = Column(JSON, nullable=True)
     duration_minutes = Column(Integer, nullable=True)
     questions_count = Column(Integer, nullable=True)
@@ -125,7 +126,7 @@ class Turn(Base):
     question_number = Column(Integer, nullable=False)
     question_text = Column(Text, nullable=False)
     audio_transcript = Column(Text, nullable=True)
-    ai_evaluation = Column(JSON, nullable=True)
+    ai_evaluation = deferred(Column(JSON, nullable=True), group="turn_content")
     turn_score = Column(Float, nullable=True)
     started_at = Column(DateTime(timezone=True), nullable=True)
     ended_at = Column(DateTime(timezone=True), nullable=True)
@@ -139,10 +140,11 @@ class Turn(Base):
     start_time = Column(DateTime(timezone=True), nullable=True)
     submitted_at = Column(DateTime(timezone=True), nullable=True)
     status = Column(String(20), nullable=True)
-    answer_text = Column(Text, nullable=True)
+    answer_text = deferred(Column(Text, nullable=True), group="turn_content")
     audio_url = Column(String(255), nullable=True)
-    scores_json = Column(JSON, nullable=True)
+    scores_json = deferred(Column(JSON, nullable=True), group="turn_content")
     followup_reason = Column(Text, nullable=True)
+    timings_json = Column(JSON, nullable=True)  # Milliseconds per stage of the answer submission
     
     # Relationships
     session = relationship("Session", back_populates="turns")
@@ -154,10 +156,56 @@ class ProctorEvent(Base):
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("sessions.id"), nullable=False)
     event_type = Column(String(50), nullable=False)
-    event_data = Column(JSON, nullable=True)
+    event_data = deferred(Column(JSON, nullable=True), group="event_data")
     severity = Column(String(20), nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    session = relationship("Session", back_populates="proctor_events")
\ No newline at end of file
+    session = relationship("Session", back_populates="proctor_events")
+
+class LLMUsage(Base):
+    __tablename__ = "llm_usage"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("sessions.id", ondelete="SET NULL"), nullable=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True, index=True)
+    operation = Column(String(50), nullable=False)  # followup, evaluate, rephrase, summarize, transcribe
+    model = Column(String(100), nullable=False)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    audio_seconds = Column(Float, default=0.0)
+    duration_ms = Column(Float, nullable=False)
+    cached = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class CachedDocument(Base):
+    __tablename__ = "document_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False, unique=True, index=True)  # sha256 of the uploaded bytes
+    extractor_version = Column(String(50), nullable=False)  # Extraction version and limits the entry was made with
+    filename = Column(String(255), nullable=True)
+    size_bytes = Column(Integer, nullable=False)
+    pages = Column(Integer, nullable=True)
+    truncated = Column(Boolean, default=False)
+    extracted_text = Column(Text, nullable=False)
+    parsed_json = Column(JSON, nullable=True)  # Contact details and resume sections, filled on first resume parse
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ResumeChunk(Base):
+    __tablename__ = "resume_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
+    resume_hash = Column(String(64), nullable=False)  # sha256 of the resume text the chunks were cut from
+    chunk_index = Column(Integer, nullable=False)
+    section = Column(String(50), nullable=False)  # summary, experience, education, skills, ...
+    text = Column(Text, nullable=False)
+    token_count = Column(Integer, nullable=False)
+    embedding = Column(LargeBinary, nullable=True)  # Normalized float32 vector; NULL when no encoder was available
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Form, File, UploadFile
-from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse, PlainTextResponse
+from sqlalchemy.orm import Session, undefer
 from typing import List, Optional
+import asyncio
 import secrets
+import json
 import bcrypt
 from datetime import datetime, timezone
 import os
@@ -13,10 +16,15 @@ from ..schemas import (
     Invite as InviteSchema, CreateJobRequest, CreateInviteRequest, CreateInviteResponse,
     AdminStatsResponse
 )
-from ..services.resume_parser import extract_text_from_pdf, parse_resume_text
-from ..services.jd_parser import extract_jd_from_pdf
+from ..services.document_cache import document_cache
+from ..services.document_pool import DocumentError, document_pool
 from ..services.emailer import email_service
 from ..services.calendar import generate_ics_file
+from ..services.llm_cache import llm_cache
+from ..services.mail_queue import mail_queue
+from ..services.usage import usage_summary, usage_by_job
+from ..services.profiler import request_profiler
+from ..services.timings import timing_percentiles
 from ..config import settings
 
 router = APIRouter()
@@ -46,6 +54,70 @@ def get_admin_stats(db: Session = Depends(get_db)):
     )
 
 
+@router.get("/llm-cache/stats")
+def get_llm_cache_stats():
+    """Get LLM response cache hit/miss statistics for this worker"""
+    return llm_cache.stats()
+
+
+@router.get("/mail-queue/stats")
+def get_mail_queue_stats():
+    """Get queued, sent, retried and failed email counts and SMTP connections opened by this worker"""
+    return mail_queue.stats()
+
+
+@router.get("/mail-queue/messages/{message_id}")
+def get_mail_status(message_id: str):
+    """Get the delivery status (queued, retrying, sent, failed) of an email queued by this worker"""
+    status = mail_queue.status(message_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown message id")
+    return status
+
+
+@router.get("/llm-usage")
+def get_llm_usage(session_id: Optional[int] = None, job_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Get Groq token, audio and latency totals per operation, optionally for one session or job"""
+    return usage_summary(db, session_id=session_id, job_id=job_id)
+
+
+@router.get("/llm-usage/jobs")
+def get_llm_usage_by_job(limit: int = 20, db: Session = Depends(get_db)):
+    """Get jobs ranked by Groq token usage"""
+    return usage_by_job(db, limit=limit)
+
+
+@router.get("/turn-timings")
+def get_turn_timings(
+    job_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """Get answer submission latency percentiles per stage, overall and per job, for a time window"""
+    return timing_percentiles(db, job_id=job_id, since=since, until=until)
+
+
+@router.get("/profiles")
+def list_request_profiles():
+    """List stored request profiles, newest first"""
+    return request_profiler.list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+def download_request_profile(profile_id: str, format: str = "json"):
+    """Download a request profile as JSON, or its collapsed stacks for flamegraph tools"""
+    path = request_profiler.get_path(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "collapsed":
+        with open(path, encoding="utf-8") as f:
+            collapsed = json.load(f)["collapsed"]
+        return PlainTextResponse(collapsed, headers={"Content-Disposition": f"attachment; filename={profile_id}.collapsed.txt"})
+    return FileResponse(path, media_type="application/json", filename=f"{profile_id}.json")
+
+
 @router.get("/candidates", response_model=List[CandidateSchema])
 def get_candidates(db: Session = Depends(get_db)):
     """Get list of all candidates"""
@@ -93,10 +165,23 @@ def get_jobs(db: Session = Depends(get_db)):
             db.commit()
     
     # Return ordered jobs
-    jobs = db.query(Job).order_by(Job.created_at.desc()).all()
+    jobs = db.query(Job).options(undefer(Job.description)).order_by(Job.created_at.desc()).all()
     return jobs
 
 
+def _save_job(db: Session, job: Job) -> Job:
+    """Insert a job; blocking, so async handlers run it in a thread"""
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _find_candidate(db: Session, candidate_id: int) -> Optional[Candidate]:
+    """Blocking candidate lookup for async handlers to run in a thread"""
+    return db.query(Candidate).filter(Candidate.id == candidate_id).first()
+
+
 @router.options("/create-job")
 async def create_job_options():
     """Handle CORS preflight for create-job endpoint"""
@@ -104,7 +189,7 @@ async def create_job_options():
 
 
 @router.post("/create-job")
-def create_job(
+async def create_job(
     title: str = Form(...),
     level: str = Form(...),
     department: str = Form(...),
@@ -119,8 +204,11 @@ def create_job(
         if jd_pdf.content_type != "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF files allowed")
         
-        pdf_content = jd_pdf.file.read()
-        jd_text = extract_jd_from_pdf(pdf_content)
+        try:
+            pdf_content = await document_pool.read_upload(jd_pdf)
+            jd_text = (await document_cache.extract_text(pdf_content, "job_description.pdf"))["text"].strip()
+        except DocumentError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
     
     if not jd_text or not jd_text.strip():
         raise HTTPException(status_code=400, detail="Job description text is required")
@@ -132,9 +220,7 @@ def create_job(
         jd_text=jd_text
     )
     
-    db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    db_job = await asyncio.to_thread(_save_job, db, db_job)
     
     return {"job_id": db_job.id, "message": "Job created successfully"}
 
@@ -146,7 +232,7 @@ async def upload_resume_options():
 
 
 @router.post("/upload-resume")
-def upload_resume(
+async def upload_resume(
     candidate_id: int = Form(...),
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
@@ -154,7 +240,7 @@ def upload_resume(
     """Upload and parse resume for candidate"""
     
     # Validate candidate exists
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = await asyncio.to_thread(_find_candidate, db, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
@@ -163,14 +249,17 @@ def upload_resume(
         raise HTTPException(status_code=400, detail="Only PDF files allowed")
     
     # Extract text from PDF
-    pdf_content = file.file.read()
-    resume_text = extract_text_from_pdf(pdf_content)
+    try:
+        pdf_content = await document_pool.read_upload(file)
+        parsed = await document_cache.parse_resume(pdf_content, "resume.pdf")
+    except DocumentError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     
+    resume_text = parsed["text"]
     if not resume_text.strip():
         raise HTTPException(status_code=400, detail="Could not extract text from PDF")
     
-    # Parse resume
-    parsed_resume = parse_resume_text(resume_text)
+    parsed_resume = {**parsed["sections"], "raw_text": resume_text}
     
     return {
         "candidate_id": candidate_id,
@@ -1,50 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session as DBSession
 from typing import List, Optional
 import json
 import logging
 from datetime import datetime
 
+from ..config import settings
 from ..database import get_db
-from ..models import Candidate, Session as InterviewSession, Turn, ProctorEvent, Invite
+from ..models import Candidate, Session as InterviewSession, Turn, ProctorEvent, Invite, ResumeChunk
 from ..schemas import CandidateCreate, CandidateResponse, CandidateUpdate
-from ..services.resume_parser import ResumeParser, parse_resume_text
+from ..services.document_cache import content_hash, document_cache
+from ..services.document_pool import DocumentError, document_pool
+from ..services.bulk_ingest import BulkIngestError, bulk_ingestor, expand_uploads
+from ..services.resume_index import resume_index
 
-# Create resume parser instance
-resume_parser = ResumeParser()
+async def read_resume(upload: UploadFile) -> bytes:
+    """Read an uploaded resume, rejecting it as soon as it passes the size limit"""
+    try:
+        return await document_pool.read_upload(upload)
+    except DocumentError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
 
 async def parse_resume(content: bytes, filename: str) -> dict:
     """Parse resume file and extract candidate information"""
     try:
-        # Extract text based on file type
-        if filename.lower().endswith('.pdf'):
-            text = resume_parser.extract_text_from_pdf(content)
-        elif filename.lower().endswith(('.doc', '.docx')):
-            text = resume_parser.extract_text_from_docx(content)
-        else:
-            # Try to decode as text
-            text = content.decode('utf-8', errors='ignore')
-        
-        # Parse the extracted text
-        return parse_resume_text(text)
+        # Extract and parse (PDF/DOCX in the document pool), reusing results for files seen before
+        parsed = await document_cache.parse_resume(content, filename)
+        return {**parsed["sections"], "raw_text": parsed["text"]}
         
+    except DocumentError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         logger.error(f"Error parsing resume {filename}: {str(e)}")
         return {}
+
+
+def index_resume_after_response(background_tasks: BackgroundTasks, candidate_id: int, resume_text: Optional[str]):
+    """Chunk and embed a newly stored resume once the response has been sent"""
+    if settings.resume_index_on_upload and resume_text and resume_text.strip():
+        background_tasks.add_task(resume_index.index_candidate, candidate_id, resume_text)
 from sqlalchemy import func, and_, desc
+from sqlalchemy.orm import defer, load_only, undefer
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/admin/candidates", tags=["Admin - Candidates"])
 
+# Fields returned by the candidate listing; resume_text is only sent when requested via fields=
+LIST_FIELDS = [
+    "id", "name", "email", "phone", "location", "experience_years", "skills", "resume_url",
+    "resume_text_length", "has_resume", "status", "created_at", "updated_at",
+    "interview_count", "average_score", "last_interview_date"
+]
+OPTIONAL_LIST_FIELDS = ["resume_text"]
+
+
 @router.get("/", response_model=dict)
 async def get_all_candidates(
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     search: Optional[str] = None,
+    fields: Optional[str] = None,
     db: DBSession = Depends(get_db)
 ):
-    """Get all candidates with pagination and filtering"""
+    """
+    Get all candidates with pagination and filtering
+    fields: comma-separated subset of LIST_FIELDS (plus resume_text) to return; resume text is
+    omitted by default, fetch it with GET /{candidate_id}/resume
+    """
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected if field not in LIST_FIELDS + OPTIONAL_LIST_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        if "id" not in selected:
+            selected.insert(0, "id")
+    else:
+        selected = LIST_FIELDS
+    include_resume = "resume_text" in selected
+
     try:
         query = db.query(Candidate)
         
@@ -59,27 +93,33 @@ async def get_all_candidates(
                 (Candidate.email.ilike(search_term))
             )
         
-        # Get candidates with interview statistics
-        candidates_data = []
-        candidates = query.offset(skip).limit(limit).all()
+        total = query.count()
         
-        for candidate in candidates:
-            # Get interview statistics - need to join with invites first
-            interview_stats = db.query(
-                func.count(InterviewSession.id).label('interview_count'),
-                func.avg(InterviewSession.score).label('average_score'),
-                func.max(InterviewSession.started_at).label('last_interview_date')
-            ).join(
-                Invite, InterviewSession.invite_id == Invite.id
-            ).filter(
-                Invite.candidate_id == candidate.id
-            ).first()
-            
-            # Debug logging for resume content
-            logger.info(f"Candidate {candidate.id} ({candidate.name}) - Resume text length: {len(candidate.resume_text or '')}")
-            if candidate.resume_text:
-                logger.info(f"Resume text preview: {candidate.resume_text[:100]}...")
-            
+        # Interview statistics for all candidates in one grouped subquery instead of one query per row
+        interview_stats = db.query(
+            Invite.candidate_id.label('candidate_id'),
+            func.count(InterviewSession.id).label('interview_count'),
+            func.avg(InterviewSession.score).label('average_score'),
+            func.max(InterviewSession.started_at).label('last_interview_date')
+        ).join(
+            Invite, InterviewSession.invite_id == Invite.id
+        ).group_by(Invite.candidate_id).subquery()
+        
+        resume_length = func.coalesce(func.length(Candidate.resume_text), 0).label('resume_text_length')
+        rows = query.add_columns(
+            interview_stats.c.interview_count,
+            interview_stats.c.average_score,
+            interview_stats.c.last_interview_date,
+            resume_length
+        ).outerjoin(
+            interview_stats, interview_stats.c.candidate_id == Candidate.id
+        ).options(
+            # Resumes can be tens of kilobytes each; only load them when asked for
+            undefer(Candidate.resume_text) if include_resume else defer(Candidate.resume_text)
+        ).offset(skip).limit(limit).all()
+        
+        candidates_data = []
+        for candidate, interview_count, average_score, last_interview_date, resume_text_length in rows:
             candidate_dict = {
                 "id": candidate.id,
                 "name": candidate.name,
@@ -89,19 +129,20 @@ async def get_all_candidates(
                 "experience_years": candidate.experience_years,
                 "skills": candidate.skills or [],
                 "resume_url": candidate.resume_url,
-                "resume_text": candidate.resume_text,  # Include resume text in response
-                "resume_text_length": len(candidate.resume_text or ''),  # Debug field
-                "has_resume": bool(candidate.resume_text),  # Debug field
+                "resume_text_length": resume_text_length,
+                "has_resume": resume_text_length > 0,
                 "status": candidate.status or "active",
                 "created_at": candidate.created_at.isoformat() if candidate.created_at else None,
                 "updated_at": candidate.updated_at.isoformat() if candidate.updated_at else None,
-                "interview_count": interview_stats.interview_count or 0,
-                "average_score": float(interview_stats.average_score) if interview_stats.average_score else None,
-                "last_interview_date": interview_stats.last_interview_date.isoformat() if interview_stats.last_interview_date else None
+                "interview_count": interview_count or 0,
+                "average_score": float(average_score) if average_score else None,
+                "last_interview_date": last_interview_date.isoformat() if last_interview_date else None
             }
-            candidates_data.append(candidate_dict)
+            if include_resume:
+                candidate_dict["resume_text"] = candidate.resume_text
+            candidates_data.append({field: candidate_dict[field] for field in selected})
         
-        total = query.count()
+        logger.debug(f"Listed {len(candidates_data)} of {total} candidates (resume text included: {include_resume})")
         
         return {
             "candidates": candidates_data,
@@ -114,8 +155,26 @@ async def get_all_candidates(
         logger.error(f"Error fetching candidates: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch candidates")
 
+
+@router.get("/{candidate_id}/resume", response_model=dict)
+async def get_candidate_resume(candidate_id: int, db: DBSession = Depends(get_db)):
+    """Get a candidate's full resume text (left out of the listing)"""
+    candidate = db.query(Candidate).options(
+        load_only(Candidate.id, Candidate.resume_text, Candidate.resume_url)
+    ).filter(Candidate.id == candidate_id).first()
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    return {
+        "candidate_id": candidate.id,
+        "resume_url": candidate.resume_url,
+        "resume_text": candidate.resume_text,
+        "resume_text_length": len(candidate.resume_text or '')
+    }
+
 @router.post("/", response_model=dict)
 async def create_candidate(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     email: str = Form(...),
     phone: Optional[str] = Form(None),
@@ -157,7 +216,7 @@ async def create_candidate(
         if resume:
             try:
                 # Save resume file
-                resume_content = await resume.read()
+                resume_content = await read_resume(resume)
                 resume_filename = f"resume_{email.replace('@', '_')}_{resume.filename}"
                 
                 # Parse resume for additional candidate information
@@ -175,9 +234,15 @@ async def create_candidate(
                         candidate_data['experience_years'] = parsed_data['experience_years']
                     if parsed_data.get('skills') and not candidate_data['skills']:
                         candidate_data['skills'] = parsed_data['skills']
+                    if parsed_data.get('raw_text'):
+                        candidate_data['resume_text'] = parsed_data['raw_text']
+                        candidate_data['resume_content_hash'] = content_hash(resume_content)
                 
                 candidate_data['resume_url'] = f"/uploads/resumes/{resume_filename}"
                 
+            except HTTPException:
+                # Oversized or unreadable uploads are reported rather than silently dropped
+                raise
             except Exception as e:
                 logger.warning(f"Resume parsing failed: {str(e)}")
                 # Continue without parsed data
@@ -187,6 +252,7 @@ async def create_candidate(
         db.add(db_candidate)
         db.commit()
         db.refresh(db_candidate)
+        index_resume_after_response(background_tasks, db_candidate.id, candidate_data.get('resume_text'))
         
         return {
             "message": "Candidate created successfully",
@@ -209,6 +275,7 @@ async def create_candidate(
 @router.post("/json", response_model=dict)
 async def create_candidate_json(
     candidate_data: CandidateCreate,
+    background_tasks: BackgroundTasks,
     db: DBSession = Depends(get_db)
 ):
     """Create a new candidate with JSON data including resume text"""
@@ -235,6 +302,7 @@ async def create_candidate_json(
         db.add(db_candidate)
         db.commit()
         db.refresh(db_candidate)
+        index_resume_after_response(background_tasks, db_candidate.id, candidate_data.resume_text)
         
         return {
             "message": "Candidate created successfully",
@@ -255,6 +323,44 @@ async def create_candidate_json(
         raise HTTPException(status_code=500, detail="Failed to create candidate")
 
 
+@router.post("/bulk", response_model=dict, status_code=202)
+async def bulk_create_candidates(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...)
+):
+    """Create candidates from many resumes (files or zip archives); poll GET /bulk/{job_id} for progress"""
+    # Uploads are spooled to disk by now; refuse oversized batches before reading them into memory
+    limit = settings.bulk_ingest_max_mb * 1024 * 1024
+    if sum(upload.size or 0 for upload in files) > limit:
+        raise HTTPException(status_code=413, detail=f"Upload is larger than {settings.bulk_ingest_max_mb} MB")
+    uploads = [(upload.filename or "resume", await upload.read()) for upload in files]
+    try:
+        entries = expand_uploads(uploads)
+    except BulkIngestError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if not entries:
+        raise HTTPException(status_code=400, detail="No resumes found in the upload")
+    
+    job = bulk_ingestor.create_job(entries)
+    background_tasks.add_task(bulk_ingestor.run, job, entries)
+    
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "total": job["total"],
+        "status_url": f"/api/admin/candidates/bulk/{job['job_id']}"
+    }
+
+
+@router.get("/bulk/{job_id}", response_model=dict)
+async def get_bulk_job(job_id: str):
+    """Progress of a bulk resume upload, with the result or error of every file"""
+    job = bulk_ingestor.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk upload job not found")
+    return job
+
+
 @router.get("/{candidate_id}/details", response_model=dict)
 async def get_candidate_details(candidate_id: int, db: DBSession = Depends(get_db)):
     """Get detailed candidate information including interview history"""
@@ -327,6 +433,7 @@ async def get_candidate_details(candidate_id: int, db: DBSession = Depends(get_d
 @router.post("/{candidate_id}/parse-resume", response_model=dict)
 async def parse_candidate_resume(
     candidate_id: int,
+    background_tasks: BackgroundTasks,
     resume: UploadFile = File(...),
     db: DBSession = Depends(get_db)
 ):
@@ -337,7 +444,7 @@ async def parse_candidate_resume(
             raise HTTPException(status_code=404, detail="Candidate not found")
         
         # Parse resume
-        resume_content = await resume.read()
+        resume_content = await read_resume(resume)
         parsed_data = await parse_resume(resume_content, resume.filename)
         
         if not parsed_data:
@@ -370,15 +477,21 @@ async def parse_candidate_resume(
                 candidate.skills = combined_skills
                 updated_fields.append('skills')
         
-        # Save resume URL
+        # Save resume URL and text
         resume_filename = f"resume_{candidate.email.replace('@', '_')}_{resume.filename}"
         candidate.resume_url = f"/uploads/resumes/{resume_filename}"
         updated_fields.append('resume_url')
         
+        if parsed_data.get('raw_text'):
+            candidate.resume_text = parsed_data['raw_text']
+            candidate.resume_content_hash = content_hash(resume_content)
+            updated_fields.append('resume_text')
+        
         candidate.updated_at = datetime.utcnow()
         
         db.commit()
         db.refresh(candidate)
+        index_resume_after_response(background_tasks, candidate.id, parsed_data.get('raw_text'))
         
         return {
             "message": "Resume parsed and candidate updated successfully",
@@ -396,6 +509,7 @@ async def parse_candidate_resume(
 async def update_candidate(
     candidate_id: int,
     candidate_update: CandidateUpdate,
+    background_tasks: BackgroundTasks,
     db: DBSession = Depends(get_db)
 ):
     """Update candidate information"""
@@ -423,6 +537,14 @@ async def update_candidate(
         
         db.commit()
         db.refresh(candidate)
+        if 'resume_text' in update_data:
+            if (update_data['resume_text'] or '').strip():
+                index_resume_after_response(background_tasks, candidate.id, update_data['resume_text'])
+            else:
+                # Resume cleared: its passages must not keep feeding interview prompts
+                db.query(ResumeChunk).filter(ResumeChunk.candidate_id == candidate.id).delete()
+                db.commit()
+                resume_index.forget(candidate.id)
         
         return {
             "message": "Candidate updated successfully",
@@ -476,11 +598,14 @@ async def delete_candidate(candidate_id: int, db: DBSession = Depends(get_db)):
             db.delete(invite)
             deleted_items.append(f"invite {invite.id}")
         
-        # Finally, delete the candidate
+        # Finally, delete the candidate (resume chunks and cached resume go with it)
+        db.query(ResumeChunk).filter(ResumeChunk.candidate_id == candidate_id).delete()
+        document_cache.forget(db, [candidate.resume_content_hash])
         db.delete(candidate)
         deleted_items.append(f"candidate {candidate.name}")
         
         db.commit()
+        resume_index.forget(candidate_id)
         
         return {
             "message": f"Candidate '{candidate.name}' and all related data deleted successfully",
@@ -512,6 +637,9 @@ async def delete_all_candidates(db: DBSession = Depends(get_db)):
         total_deleted = 0
         all_deleted_items = []
         
+        # Cached resumes of the deleted candidates
+        document_cache.forget(db, [digest for (digest,) in db.query(Candidate.resume_content_hash)])
+        
         for candidate in candidates:
             # Get all invites for this candidate
             invites = db.query(Invite).filter(Invite.candidate_id == candidate.id).all()
@@ -540,10 +668,12 @@ async def delete_all_candidates(db: DBSession = Depends(get_db)):
                 db.delete(invite)
                 all_deleted_items.append(f"invite {invite.id}")
             
-            # Delete the candidate
+            # Delete the candidate and its resume chunks
+            db.query(ResumeChunk).filter(ResumeChunk.candidate_id == candidate.id).delete()
             db.delete(candidate)
             all_deleted_items.append(f"candidate {candidate.name}")
             total_deleted += 1
+            resume_index.forget(candidate.id)
         
         db.commit()
         
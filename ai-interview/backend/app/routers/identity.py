@@ -4,7 +4,9 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Invite, Candidate
 from ..schemas import OTPSendRequest, OTPVerifyRequest, LivenessRequest
+from ..config import settings
 from ..services.emailer import email_service
+from ..services.otp_store import OTPRateLimited
 
 router = APIRouter()
 
@@ -26,8 +28,10 @@ def send_otp(request: OTPSendRequest, db: Session = Depends(get_db)):
     try:
         # Send OTP
         otp_code = email_service.send_otp(request.email, request.invite_id)
-        return {"message": "OTP sent successfully", "expires_in": 600}
+        return {"message": "OTP sent successfully", "expires_in": settings.otp_ttl_seconds}
     
+    except OTPRateLimited as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         print(f"DEBUG: OTP sending failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to send OTP: {str(e)}")
@@ -48,7 +52,10 @@ def verify_otp(request: OTPVerifyRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Email does not match candidate")
     
     # Verify OTP
-    is_valid = email_service.verify_otp(request.email, request.invite_id, request.code)
+    try:
+        is_valid = email_service.verify_otp(request.email, request.invite_id, request.code)
+    except OTPRateLimited as e:
+        raise HTTPException(status_code=429, detail=str(e))
     
     if not is_valid:
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, status
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import func, and_, or_, desc
 from typing import List, Optional
 from datetime import datetime, timedelta
@@ -11,8 +11,9 @@ from ..database import get_db
 from ..models import Invite, Candidate, Job
 from ..schemas import (
     InviteCreate, InviteUpdate, InviteResponse, InvitesStatsResponse,
-    InviteDetailsResponse
+    InviteDetailsResponse, BulkInviteCreate
 )
+from ..services.bulk_invites import bulk_inviter
 from ..services.emailer import email_service
 from ..config import settings
 
@@ -152,7 +153,7 @@ async def create_invite(invite_data: InviteCreate, db: Session = Depends(get_db)
         )
     
     # Check if job exists
-    job = db.query(Job).filter(Job.id == invite_data.job_id).first()
+    job = db.query(Job).options(undefer(Job.description)).filter(Job.id == invite_data.job_id).first()
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -197,9 +198,10 @@ async def create_invite(invite_data: InviteCreate, db: Session = Depends(get_db)
         db.commit()
         db.refresh(db_invite)
         
-        # Send email invitation
+        # Send email invitation (queued; its delivery status is at /api/admin/mail-queue/messages/{id})
+        email_message_id = None
         if invite_data.send_email:
-            await send_invitation_email(db_invite, candidate, job)
+            email_message_id = await send_invitation_email(db_invite, candidate, job)
         
         return InviteResponse(
             id=db_invite.id,
@@ -213,7 +215,8 @@ async def create_invite(invite_data: InviteCreate, db: Session = Depends(get_db)
             status=db_invite.status,
             expires_at=db_invite.expires_at,
             created_at=db_invite.created_at,
-            updated_at=db_invite.updated_at
+            updated_at=db_invite.updated_at,
+            email_message_id=email_message_id
         )
         
     except Exception as e:
@@ -224,6 +227,59 @@ async def create_invite(invite_data: InviteCreate, db: Session = Depends(get_db)
         )
 
 
+@router.post("/bulk", response_model=dict, status_code=202)
+async def create_bulk_invites(
+    invite_data: BulkInviteCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Invite many candidates to one job; poll GET /bulk/{job_id} for progress"""
+    
+    if not invite_data.candidate_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No candidates given"
+        )
+    
+    if len(invite_data.candidate_ids) > settings.bulk_invite_max_candidates:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"{len(invite_data.candidate_ids)} candidates in one request; "
+                   f"the limit is {settings.bulk_invite_max_candidates}"
+        )
+    
+    if not db.query(Job.id).filter(Job.id == invite_data.job_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    job = bulk_inviter.create_job(
+        invite_data.job_id, invite_data.candidate_ids, invite_data.expires_at, invite_data.send_email
+    )
+    background_tasks.add_task(bulk_inviter.run, job)
+    
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "total": job["total"],
+        "status_url": f"/api/admin/invites/bulk/{job['job_id']}"
+    }
+
+
+@router.get("/bulk/{job_id}", response_model=dict)
+async def get_bulk_invite_job(job_id: str):
+    """Progress of a bulk invite, with the invite or error of every candidate"""
+    
+    job = bulk_inviter.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bulk invite job not found"
+        )
+    return job
+
+
 @router.get("/{invite_id}", response_model=InviteDetailsResponse)
 async def get_invite_details(invite_id: int, db: Session = Depends(get_db)):
     """Get detailed invite information"""
@@ -371,7 +427,8 @@ async def resend_invitation_email(invite_id: int, db: Session = Depends(get_db))
         )
     
     try:
-        await send_invitation_email(invite, candidate, job)
+        # Sent before responding, so success means the SMTP server accepted it
+        await send_invitation_email(invite, candidate, job, wait=True)
         return {"message": "Invitation email sent successfully"}
         
     except Exception as e:
@@ -381,8 +438,8 @@ async def resend_invitation_email(invite_id: int, db: Session = Depends(get_db))
         )
 
 
-async def send_invitation_email(invite: Invite, candidate: Candidate, job: Job):
-    """Send invitation email to candidate"""
+async def send_invitation_email(invite: Invite, candidate: Candidate, job: Job, wait: bool = False) -> Optional[str]:
+    """Send invitation email to candidate; returns the mail queue id unless sent with wait=True"""
     
     interview_url = f"{settings.public_base_url}/i/{invite.invite_code}"
     
@@ -421,13 +478,14 @@ async def send_invitation_email(invite: Invite, candidate: Candidate, job: Job):
         window_start = "Available now"
         window_end = invite.expires_at.strftime('%B %d, %Y at %I:%M %p')
         
-        email_service.send_interview_invite(
+        return email_service.send_interview_invite(
             email=candidate.email,
             candidate_name=candidate.name,
             job_title=job.title,
             interview_url=interview_url,
             window_start=window_start,
-            window_end=window_end
+            window_end=window_end,
+            wait=wait
         )
     except Exception as e:
         raise Exception(f"Failed to send email: {str(e)}")
\ No newline at end of file
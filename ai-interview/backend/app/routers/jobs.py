@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import func, and_, or_
 from typing import List, Optional
 from datetime import datetime
@@ -27,15 +27,15 @@ async def get_all_jobs(
 ):
     """Get all jobs with filtering, pagination, and search"""
     
-    # Base query
-    query = db.query(Job)
+    # Base query; the job cards show and search the description
+    query = db.query(Job).options(undefer(Job.description))
     
     # Apply filters
     if search:
         search_filter = or_(
             Job.title.ilike(f"%{search}%"),
             Job.department.ilike(f"%{search}%"),
-            Job.jd_text.ilike(f"%{search}%")
+            Job.description.ilike(f"%{search}%")
         )
         query = query.filter(search_filter)
     
@@ -203,7 +203,7 @@ async def get_job_details(job_id: int, db: Session = Depends(get_db)):
     """Get detailed job information including related invites"""
     
     try:
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = db.query(Job).options(undefer(Job.description)).filter(Job.id == job_id).first()
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from fastapi.responses import StreamingResponse, FileResponse
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, undefer_group
 from sqlalchemy import func, desc, asc, and_, or_, case, extract
 from typing import List, Optional, Dict, Any
 import io
@@ -19,6 +19,7 @@ from ..schemas import (
 )
 from ..services.report import report_service
 from ..services.proctor_signals import proctor_signals
+from ..services.usage import usage_summary
 
 router = APIRouter()
 
@@ -366,7 +367,9 @@ def _generate_json_report(session_id: int, db: Session) -> dict:
         joinedload(SessionModel.invite).joinedload(Invite.job)
     ).filter(SessionModel.id == session_id).first()
     
-    turns = db.query(Turn).filter(Turn.session_id == session_id).order_by(Turn.idx).all()
+    turns = db.query(Turn).options(undefer_group("turn_content")).filter(
+        Turn.session_id == session_id
+    ).order_by(Turn.idx).all()
     risk_assessment = proctor_signals.get_risk_assessment(session_id, db)
     
     return {
@@ -397,6 +400,7 @@ def _generate_json_report(session_id: int, db: Session) -> dict:
             } for turn in turns
         ],
         "proctoring": risk_assessment,
+        "llm_usage": usage_summary(db, session_id=session_id),
         "generated_at": datetime.utcnow().isoformat()
     }
 
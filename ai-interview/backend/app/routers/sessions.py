@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, UploadFile, Form
+from sqlalchemy.orm import Session, joinedload, undefer
 from datetime import datetime, timezone, timedelta
 import os
 import uuid
@@ -18,10 +18,13 @@ from ..config import settings
 from ..services.scoring import get_final_assessment
 from ..services.proctor_signals import proctor_signals
 from ..services.interview_structure import interview_structure
+from ..services.conversation_summary import conversation_summarizer
+from ..services.usage import bind_usage
+from ..services.timings import TurnTimings, save_turn_timings, start_turn_timings
 
 def get_conversation_history(session_id: int, current_turn: int, db: Session) -> list:
     """Get previous questions and answers for context"""
-    previous_turns = db.query(Turn).filter(
+    previous_turns = db.query(Turn).options(undefer(Turn.answer_text)).filter(
         Turn.session_id == session_id,
         Turn.question_number < current_turn,
         Turn.answer_text.isnot(None)
@@ -35,19 +38,9 @@ def get_conversation_history(session_id: int, current_turn: int, db: Session) ->
         })
     return history
 
-# Import the RAG service with improved error handling
+# Import the shared RAG service; models load lazily on first use
 try:
-    # Set SSL environment for model loading
-    import os
-    
-    # Clear problematic SSL environment variables (from startup_config)
-    ssl_vars_to_clear = ['REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE', 'SSL_CERT_FILE']
-    for var in ssl_vars_to_clear:
-        if var in os.environ:
-            del os.environ[var]
-    
-    from ..services.rag import RAGService
-    rag_service = RAGService()
+    from ..services.rag import rag_service
     logger.info("✅ RAG service loaded successfully (may use fallback vectorstore)")
     
 except Exception as e:
@@ -55,7 +48,7 @@ except Exception as e:
     
     # Enhanced mock service that uses resume content (fallback)
     class EnhancedMockRagService:
-        def generate_initial_question(self, jd_text, resume_text=""):
+        def generate_initial_question(self, jd_text, resume_text="", candidate_id=None):
             if resume_text and len(resume_text) > 100:
                 # Extract some context from resume for a more personalized question
                 if "python" in resume_text.lower():
@@ -68,7 +61,7 @@ except Exception as e:
                     return f"I can see from your resume that you have {len(resume_text)} characters of experience to discuss. Tell me about your most significant professional accomplishment."
             return "Tell me about yourself and your professional background."
         
-        def generate_followup_question(self, current_question, answer, context=""):
+        def generate_followup_question(self, current_question, answer, context="", *args, **kwargs):
             return {
                 "question": "That's interesting. Can you provide more technical details about your approach?",
                 "score": 7.5,
@@ -85,12 +78,12 @@ async def debug_rag_integration(candidate_id: int, db: Session = Depends(get_db)
     """Debug endpoint to test RAG integration with resume data"""
     try:
         # Get candidate
-        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        candidate = db.query(Candidate).options(undefer(Candidate.resume_text)).filter(Candidate.id == candidate_id).first()
         if not candidate:
             return {"error": "Candidate not found"}
         
         # Get a job for testing
-        job = db.query(Job).first()
+        job = db.query(Job).options(undefer(Job.description)).first()
         if not job:
             return {"error": "No jobs available for testing"}
         
@@ -172,8 +165,8 @@ async def start_session(request: SessionStartRequest, db: Session = Depends(get_
         raise HTTPException(status_code=400, detail="Session already exists for this invite")
     
     # Get job and candidate from invite
-    job = db.query(Job).filter(Job.id == invite.job_id).first()
-    candidate = db.query(Candidate).filter(Candidate.id == invite.candidate_id).first()
+    job = db.query(Job).options(undefer(Job.description)).filter(Job.id == invite.job_id).first()
+    candidate = db.query(Candidate).options(undefer(Candidate.resume_text)).filter(Candidate.id == invite.candidate_id).first()
     
     if not job or not candidate:
         raise HTTPException(status_code=404, detail="Job or candidate not found")
@@ -197,7 +190,7 @@ async def start_session(request: SessionStartRequest, db: Session = Depends(get_
         # Get resume text from candidate
         resume_text = candidate.resume_text or ""
         if resume_text:
-            first_question = rag_service.generate_initial_question(job.description, resume_text)
+            first_question = rag_service.generate_initial_question(job.description, resume_text, candidate.id)
         else:
             # If no resume text, generate a generic question
             first_question = f"Tell me about your experience that makes you suitable for this {job.title} role."
@@ -241,15 +234,19 @@ async def speech_options(session_id: int):
 @router.post("/{session_id}/speech", response_model=SpeechSubmissionResponse)
 async def submit_speech_answer(
     session_id: int,
+    background_tasks: BackgroundTasks,
     audio: UploadFile = File(...),
     question: str = Form(...),
     turn_idx: int = Form(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    timings: TurnTimings = Depends(start_turn_timings)
 ):
     """Process speech answer and generate follow-up"""
     
-    # Validate session
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+    # Validate session; the job description is needed to generate the next question
+    session = db.query(SessionModel).options(
+        joinedload(SessionModel.invite).joinedload(Invite.job).undefer(Job.description)
+    ).filter(SessionModel.id == session_id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -261,12 +258,17 @@ async def submit_speech_answer(
     if not turn:
         raise HTTPException(status_code=404, detail="Turn not found")
     
+    # Attribute Groq usage in this request to the session and its job
+    bind_usage(session_id=session.id, job_id=session.invite.job_id if session.invite else None)
+    
     # Check timing
     now_utc = datetime.now(timezone.utc)
     
     # Handle case where deadline might be None
     if turn.deadline:
-        grace_deadline = turn.deadline + timedelta(seconds=settings.grace_seconds)
+        # SQLite returns naive datetimes; deadlines are stored in UTC
+        deadline = turn.deadline if turn.deadline.tzinfo else turn.deadline.replace(tzinfo=timezone.utc)
+        grace_deadline = deadline + timedelta(seconds=settings.grace_seconds)
         if now_utc > grace_deadline:
             turn.status = TurnStatus.LATE.value
         else:
@@ -282,13 +284,17 @@ async def submit_speech_answer(
         audio_filename = f"session_{session_id}_turn_{turn_idx}_{uuid.uuid4().hex}.webm"
         audio_path = os.path.join(settings.audio_storage_path, audio_filename)
         
-        with open(audio_path, "wb") as audio_file:
-            audio_file.write(await audio.read())
+        with timings.span("upload"):
+            audio_bytes = await audio.read()
+        with timings.span("disk_write"):
+            with open(audio_path, "wb") as audio_file:
+                audio_file.write(audio_bytes)
         
         turn.audio_url = f"/audio/{audio_filename}"
         
         # Transcribe audio
-        transcript = groq_client.transcribe_audio(audio_path)
+        with timings.span("whisper"):
+            transcript = groq_client.transcribe_audio(audio_path)
         turn.answer_text = transcript
         
         # Check if transcription failed (contains error messages)
@@ -313,21 +319,22 @@ async def submit_speech_answer(
         elif should_skip_scoring:
             # Skip evaluation for this question - generate next question without scoring
             try:
-                # Get job description and resume for context
+                # Get job description for context (resume passages are retrieved by candidate id)
                 job_description = ""
-                resume_text = ""
                 if session.invite and session.invite.job:
                     job_description = session.invite.job.description or ""
-                if session.invite and session.invite.candidate:
-                    resume_text = session.invite.candidate.resume_text or ""
                 
                 # Get conversation history to avoid repetition
-                conversation_history = get_conversation_history(session_id, turn.question_number, db)
-                
-                # Generate next question based on current section
-                evaluation = rag_service.generate_followup_question(
-                    question, transcript, job_description, turn.question_number, conversation_history
-                )
+                with timings.span("evaluation"):
+                    conversation_history = get_conversation_history(session_id, turn.question_number, db)
+                    
+                    # Generate next question based on current section; older turns are summarized only if needed
+                    evaluation = rag_service.generate_followup_question(
+                        question, transcript, job_description, turn.question_number, conversation_history,
+                        score_answer=False,
+                        candidate_id=session.invite.candidate_id if session.invite else None,
+                        summarize_history=lambda: conversation_summarizer.compact(session, conversation_history)
+                    )
                 # Override to not show score for non-scored questions
                 evaluation["score"] = None  
                 section_info = interview_structure.get_section_info(turn.question_number)
@@ -360,11 +367,15 @@ async def submit_speech_answer(
                     job_description = session.invite.job.description or ""
                 
                 # Get conversation history to avoid repetition
-                conversation_history = get_conversation_history(session_id, turn.question_number, db)
-                
-                evaluation = rag_service.generate_followup_question(
-                    question, transcript, job_description, turn.question_number, conversation_history
-                )
+                with timings.span("evaluation"):
+                    conversation_history = get_conversation_history(session_id, turn.question_number, db)
+                    
+                    # Older turns are summarized only if the LLM generates the next question
+                    evaluation = rag_service.generate_followup_question(
+                        question, transcript, job_description, turn.question_number, conversation_history,
+                        candidate_id=session.invite.candidate_id if session.invite else None,
+                        summarize_history=lambda: conversation_summarizer.compact(session, conversation_history)
+                    )
                 turn.followup_reason = "Generated based on candidate response"
             except Exception as eval_error:
                 print(f"❌ Error evaluating answer: {str(eval_error)}")
@@ -385,7 +396,8 @@ async def submit_speech_answer(
             "missing": evaluation.get("missing", [])
         }
         
-        db.commit()
+        with timings.span("db_commit"):
+            db.commit()
         
         # Count successful questions (non-failed transcriptions) and total turns
         all_turns = db.query(Turn).filter(Turn.session_id == session_id).all()
@@ -428,7 +440,6 @@ async def submit_speech_answer(
                 status=TurnStatus.PENDING.value
             )
             db.add(next_turn)
-            db.commit()
             
             response_data.update({
                 "next_question": evaluation.get("followup"),
@@ -441,7 +452,7 @@ async def submit_speech_answer(
             session.ended_at = now_utc
             
             # Calculate overall score and category (excluding None scores from introduction)
-            all_turns = db.query(Turn).filter(Turn.session_id == session_id).all()
+            all_turns = db.query(Turn).options(undefer(Turn.scores_json)).filter(Turn.session_id == session_id).all()
             scores = [
                 t.scores_json.get("score") 
                 for t in all_turns 
@@ -467,12 +478,13 @@ async def submit_speech_answer(
                 # Save score category
                 session.score_category = final_assessment['score_category']
                 
-                # Store detailed assessment in metadata
-                if not session.session_metadata:
-                    session.session_metadata = {}
-                session.session_metadata['final_assessment'] = final_assessment
-                
+                # Store detailed assessment in metadata (reassign so the JSON column is marked changed)
+                session.session_metadata = {**(session.session_metadata or {}), 'final_assessment': final_assessment}
+        
+        # This commit also saves the next turn or the session result; timings are stored after the response
+        with timings.span("db_commit"):
             db.commit()
+        background_tasks.add_task(save_turn_timings, turn.id, timings.as_dict())
         
         return SpeechSubmissionResponse(**response_data)
     
@@ -514,7 +526,7 @@ def handle_timeout(
     turn.answer_text = "[No response - timeout]"
     
     # Count successful questions and total attempts to determine if we should continue
-    all_turns = db.query(Turn).filter(Turn.session_id == session_id).all()
+    all_turns = db.query(Turn).options(undefer(Turn.answer_text)).filter(Turn.session_id == session_id).all()
     successful_questions = len([t for t in all_turns if t.followup_reason != "Audio transcription failed" and t.answer_text != "[No response - timeout]"])
     
     # Create next turn with generic follow-up if within limits
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, status
-from sqlalchemy.orm import Session as DBSession
+from sqlalchemy.orm import Session as DBSession, undefer
 from sqlalchemy import func, and_, or_, desc, asc
 from typing import List, Optional
 from datetime import datetime, timedelta
@@ -315,7 +315,9 @@ async def get_session_details(session_id: int, db: DBSession = Depends(get_db)):
         
         # Get all turns for this session
         # Get all turns for this session
-        turns = db.query(Turn).filter(Turn.session_id == session_id).order_by(Turn.question_number).all()
+        turns = db.query(Turn).options(undefer(Turn.ai_evaluation)).filter(
+            Turn.session_id == session_id
+        ).order_by(Turn.question_number).all()
         
         turns_data = []
         for turn in turns:
@@ -333,7 +335,7 @@ async def get_session_details(session_id: int, db: DBSession = Depends(get_db)):
             turns_data.append(turn_dict)
         
         # Get proctor events
-        proctor_events = db.query(ProctorEvent).filter(
+        proctor_events = db.query(ProctorEvent).options(undefer(ProctorEvent.event_data)).filter(
             ProctorEvent.session_id == session_id
         ).order_by(ProctorEvent.timestamp).all()
         
@@ -255,6 +255,7 @@ class CandidateUpdate(BaseModel):
     experience_years: Optional[int] = None
     skills: Optional[Union[str, List[str]]] = None  # Accept both string and list
     status: Optional[str] = None
+    resume_text: Optional[str] = None  # Only sent when the resume was edited
 
 
 class CandidateResponse(BaseModel):
@@ -360,6 +361,13 @@ class InviteCreate(BaseModel):
     send_email: Optional[bool] = True
 
 
+class BulkInviteCreate(BaseModel):
+    job_id: int
+    candidate_ids: List[int]
+    expires_at: Optional[datetime] = None
+    send_email: Optional[bool] = True
+
+
 class InviteUpdate(BaseModel):
     status: Optional[str] = None
     expires_at: Optional[datetime] = None
@@ -378,6 +386,7 @@ class InviteResponse(BaseModel):
     expires_at: datetime
     created_at: datetime
     updated_at: Optional[datetime] = None
+    email_message_id: Optional[str] = None  # Mail queue id of the invitation email, when one was queued
     
     model_config = ConfigDict(from_attributes=True)
 
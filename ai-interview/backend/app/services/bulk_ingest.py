@@ -0,0 +1,241 @@
+"""
+Bulk Ingest Service - Create candidates from a batch of uploaded resumes
+
+A batch (several files or a zip of resumes) becomes a job: every file is
+extracted in the document pool, a few at a time, and parsed for contact
+details (files seen before come straight from the document cache). Emails are
+then checked against the database with a single IN query (and against each
+other), the new candidates are inserted with one executemany, and their
+resumes are chunked and embedded for retrieval in one batch. Per-file progress
+and errors are kept in Redis (in memory without Redis) so any worker can answer
+status polls.
+"""
+import asyncio
+import functools
+import io
+import logging
+import os
+import time
+import uuid
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Candidate
+from .document_cache import document_cache
+from .document_pool import DocumentError
+from .job_progress import JobProgressStore
+from .resume_index import resume_index
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bulk_ingest:"
+RESUME_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+
+# File bytes, or a function reading a zip member when the file is parsed
+Content = Union[bytes, Callable[[], bytes]]
+
+
+class BulkIngestError(Exception):
+    """The batch as a whole was rejected"""
+
+
+def expand_uploads(uploads: List[Tuple[str, bytes]]) -> List[Tuple[str, Optional[Content], Optional[str]]]:
+    """Flatten uploads into (filename, content, error) entries, unpacking zip archives.
+
+    Only the zip headers are read here: the file count and the total
+    uncompressed size are checked against the batch limits before anything is
+    decompressed, and each member is read when it is parsed.
+    """
+    entries = []
+    limit = settings.document_max_mb * 1024 * 1024
+    total_bytes = 0
+    for filename, content in uploads:
+        if not filename.lower().endswith(".zip"):
+            entries.append((filename, content, None))
+            total_bytes += len(content)
+            continue
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(content))
+        except zipfile.BadZipFile:
+            entries.append((filename, None, "Not a valid zip archive"))
+            continue
+        for info in archive.infolist():
+            name = info.filename
+            base = os.path.basename(name)
+            if info.is_dir() or name.startswith("__MACOSX/") or base.startswith("."):
+                continue
+            if not base.lower().endswith(RESUME_EXTENSIONS):
+                entries.append((name, None, "Unsupported file type"))
+            elif info.file_size > limit:
+                # Checked against the header before decompressing anything
+                entries.append((name, None, f"File is larger than {settings.document_max_mb} MB"))
+            else:
+                entries.append((name, functools.partial(archive.read, info), None))
+                total_bytes += info.file_size
+            if len(entries) > settings.bulk_ingest_max_files:
+                # Stop before walking the rest of a huge archive
+                raise BulkIngestError(f"More than {settings.bulk_ingest_max_files} files in one batch")
+
+    if len(entries) > settings.bulk_ingest_max_files:
+        raise BulkIngestError(f"{len(entries)} files in one batch; the limit is {settings.bulk_ingest_max_files}")
+    if total_bytes > settings.bulk_ingest_max_mb * 1024 * 1024:
+        raise BulkIngestError(f"The batch holds {total_bytes / 1024 / 1024:.0f} MB of files (uncompressed); "
+                              f"the limit is {settings.bulk_ingest_max_mb} MB")
+    return entries
+
+
+class BulkIngestor:
+    """Runs ingestion jobs and stores their progress"""
+
+    def __init__(self):
+        self.progress = JobProgressStore(KEY_PREFIX, "bulk ingest")
+
+    def _save(self, job: Dict[str, Any]):
+        job["counts"] = {
+            status: sum(1 for entry in job["files"] if entry["status"] == status)
+            for status in ("queued", "parsing", "parsed", "created", "duplicate", "failed")
+        }
+        job["processed"] = job["counts"]["created"] + job["counts"]["duplicate"] + job["counts"]["failed"]
+        self.progress.save(job)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.progress.get(job_id)
+
+    def create_job(self, entries: List[Tuple[str, Optional[Content], Optional[str]]]) -> Dict[str, Any]:
+        now = time.time()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+            "total": len(entries),
+            "files": [
+                {"index": index, "filename": filename, "status": "failed" if error else "queued",
+                 "email": None, "name": None, "candidate_id": None, "error": error}
+                for index, (filename, _, error) in enumerate(entries)
+            ]
+        }
+        self._save(job)
+        return job
+
+    def _update(self, job: Dict[str, Any], entry: Dict[str, Any], **fields):
+        entry.update(fields)
+        self._save(job)
+
+    async def _parse(self, job: Dict[str, Any], entry: Dict[str, Any], content: Content,
+                     semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            self._update(job, entry, status="parsing")
+            try:
+                if callable(content):
+                    # Zip members are decompressed only now, a few at a time
+                    content = await asyncio.to_thread(content)
+                parsed = await document_cache.parse_resume(content, entry["filename"])
+            except DocumentError as e:
+                self._update(job, entry, status="failed", error=str(e))
+                return None
+            except Exception as e:
+                logger.error(f"❌ Bulk ingest could not read {entry['filename']}: {e}")
+                self._update(job, entry, status="failed", error="Could not read file")
+                return None
+
+        text = parsed["text"]
+        if not text.strip():
+            self._update(job, entry, status="failed", error="No text found in file")
+            return None
+        info = parsed["contact"]
+        if not info["email"]:
+            self._update(job, entry, status="failed", error="No email address found")
+            return None
+        name = info["name"] or os.path.splitext(os.path.basename(entry["filename"]))[0].replace("_", " ")
+        self._update(job, entry, status="parsed", email=info["email"], name=name)
+        return {
+            "name": name, "email": info["email"], "phone": info["phone"],
+            "experience_years": info["experience_years"], "skills": info["skills"],
+            "resume_text": text, "resume_content_hash": parsed["content_hash"], "status": "active"
+        }
+
+    def _insert(self, job: Dict[str, Any], parsed: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+        """Skip emails that already exist (one IN query) or repeat within the batch, insert the rest together"""
+        db = SessionLocal()
+        try:
+            for attempt in range(2):
+                emails = sorted({row["email"] for _, row in parsed})
+                existing = {
+                    email for (email,) in db.query(func.lower(Candidate.email)).filter(
+                        func.lower(Candidate.email).in_(emails)
+                    ).all()
+                } if emails else set()
+
+                new_rows, seen = [], {}
+                for entry, row in parsed:
+                    if row["email"] in existing:
+                        entry.update(status="duplicate", error="Candidate with this email already exists")
+                    elif row["email"] in seen:
+                        entry.update(status="duplicate", error=f"Same email as {seen[row['email']]}")
+                    else:
+                        seen[row["email"]] = entry["filename"]
+                        new_rows.append((entry, row))
+
+                if not new_rows:
+                    return
+                # One executemany (no per-row RETURNING, which SQLite cannot batch), then read the ids back
+                now = datetime.utcnow()
+                try:
+                    db.execute(insert(Candidate), [dict(row, created_at=now, updated_at=now) for _, row in new_rows])
+                    db.commit()
+                except IntegrityError:
+                    # Another request created one of these emails since the check; look again
+                    db.rollback()
+                    if attempt == 0:
+                        continue
+                    raise
+                ids = dict(db.query(Candidate.email, Candidate.id).filter(
+                    Candidate.email.in_([row["email"] for _, row in new_rows])
+                ).all())
+                for entry, row in new_rows:
+                    entry.update(status="created", candidate_id=ids.get(row["email"]), error=None)
+                return
+        finally:
+            db.close()
+
+    async def run(self, job: Dict[str, Any], entries: List[Tuple[str, Optional[Content], Optional[str]]]):
+        """Parse every file, then dedupe and insert; the job ends completed or failed"""
+        start = time.perf_counter()
+        job["status"] = "running"
+        semaphore = asyncio.Semaphore(max(1, settings.bulk_ingest_concurrency))
+        pending = [(entry, content) for entry, (_, content, error) in zip(job["files"], entries) if not error]
+        try:
+            rows = await asyncio.gather(*[self._parse(job, entry, content, semaphore) for entry, content in pending])
+            parsed = [(entry, row) for (entry, _), row in zip(pending, rows) if row is not None]
+            if parsed:
+                await asyncio.to_thread(self._insert, job, parsed)
+                created = [(entry["candidate_id"], row["resume_text"]) for entry, row in parsed
+                           if entry["status"] == "created" and entry.get("candidate_id")]
+                if created and settings.resume_index_on_upload:
+                    # Chunks of the whole batch are embedded together
+                    await asyncio.to_thread(resume_index.index_candidates, created)
+            job["status"] = "completed"
+        except Exception as e:
+            logger.error(f"❌ Bulk ingest job {job['job_id']} failed: {e}")
+            job["status"] = "failed"
+            job["error"] = "Could not save candidates"
+            for entry in job["files"]:
+                if entry["status"] not in ("failed", "duplicate", "created"):
+                    entry.update(status="failed", error=entry["error"] or "Not saved")
+        job["finished_at"] = time.time()
+        self._save(job)
+        counts = job["counts"]
+        logger.info(f"✅ Bulk ingest {job['job_id']}: {counts['created']} created, {counts['duplicate']} duplicates, "
+                    f"{counts['failed']} failed in {time.perf_counter() - start:.1f}s")
+
+
+# Global instance
+bulk_ingestor = BulkIngestor()
@@ -0,0 +1,220 @@
+"""
+Bulk Invite Service - Invite many candidates to one job in a single request
+
+A hiring drive becomes a job: the candidates are loaded with one IN query,
+candidates that already have a pending invite for the job are found with
+another, and the new invites are inserted with one executemany. The calendar
+attachment is rendered once for the job and filled in per candidate, and the
+invitation emails are handed to the mail queue, which delivers them over
+pooled SMTP connections and reports each delivery back to the job. Per-candidate
+progress, email status and errors are kept in Redis (in memory without Redis)
+so any worker can answer status polls.
+"""
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Candidate, Invite, Job
+from .calendar import ics_template, render_ics
+from .emailer import email_service
+from .job_progress import JobProgressStore
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bulk_invite:"
+# Progress is written after this many emails rather than after every one
+SAVE_EVERY = 25
+
+
+class BulkInviter:
+    """Runs bulk invite jobs and stores their progress"""
+
+    def __init__(self):
+        self.progress = JobProgressStore(KEY_PREFIX, "bulk invite")
+        # Mail senders report deliveries while the job thread is still saving progress
+        self._lock = threading.Lock()
+
+    def _save(self, job: Dict[str, Any]):
+        with self._lock:
+            job["counts"] = {
+                status: sum(1 for entry in job["candidates"] if entry["status"] == status)
+                for status in ("queued", "invited", "duplicate", "failed")
+            }
+            job["counts"]["emails_queued"] = sum(1 for entry in job["candidates"] if entry["email_queued"])
+            for status in ("sent", "failed"):
+                job["counts"][f"emails_{status}"] = sum(
+                    1 for entry in job["candidates"] if entry["email_status"] == status
+                )
+            job["processed"] = job["total"] - job["counts"]["queued"]
+            self.progress.save(job)
+
+    def _delivery_callback(self, job: Dict[str, Any], entry: Dict[str, Any]):
+        def on_result(status: str, error: Optional[str]):
+            with self._lock:
+                entry["email_status"] = status
+                if error:
+                    entry["error"] = f"Invite created but email failed: {error}"
+            self._save(job)
+        return on_result
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.progress.get(job_id)
+
+    def create_job(self, interview_job_id: int, candidate_ids: List[int], expires_at: Optional[datetime] = None,
+                   send_email: bool = True) -> Dict[str, Any]:
+        now = time.time()
+        expires_at = expires_at or (datetime.now() + timedelta(days=7))
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+            "interview_job_id": interview_job_id,
+            "expires_at": expires_at.isoformat(),
+            "send_email": send_email,
+            "total": len(candidate_ids),
+            "candidates": [],
+        }
+        seen = set()
+        for candidate_id in candidate_ids:
+            entry = {"candidate_id": candidate_id, "status": "queued", "invite_id": None, "invite_code": None,
+                     "email": None, "email_queued": False, "email_status": None, "error": None}
+            if candidate_id in seen:
+                entry.update(status="duplicate", error="Listed more than once")
+            seen.add(candidate_id)
+            job["candidates"].append(entry)
+        self._save(job)
+        return job
+
+    def _insert(self, db, job: Dict[str, Any], expires_at: datetime) -> Dict[int, Any]:
+        """Validate every candidate with set-based queries and insert the new invites together"""
+        pending = [entry for entry in job["candidates"] if entry["status"] == "queued"]
+        ids = [entry["candidate_id"] for entry in pending]
+        # Plain rows, so nothing is reloaded per candidate after the commit
+        candidates = {
+            candidate.id: candidate
+            for candidate in db.query(Candidate.id, Candidate.name, Candidate.email).filter(Candidate.id.in_(ids))
+        }
+        already_invited = {
+            candidate_id for (candidate_id,) in db.query(Invite.candidate_id).filter(
+                Invite.job_id == job["interview_job_id"],
+                Invite.status == 'pending',
+                Invite.candidate_id.in_(ids)
+            )
+        }
+
+        rows, codes = [], set()
+        current_time = datetime.now()
+        for entry in pending:
+            candidate = candidates.get(entry["candidate_id"])
+            if candidate is None:
+                entry.update(status="failed", error="Candidate not found")
+                continue
+            entry["email"] = candidate.email
+            if candidate.id in already_invited:
+                entry.update(status="duplicate", error="Candidate already has a pending invite for this job")
+                continue
+            invite_code = str(uuid.uuid4())[:8].upper()
+            while invite_code in codes:
+                invite_code = str(uuid.uuid4())[:8].upper()
+            codes.add(invite_code)
+            entry["invite_code"] = invite_code
+            rows.append({
+                "candidate_id": candidate.id,
+                "job_id": job["interview_job_id"],
+                "invite_code": invite_code,
+                "status": 'pending',
+                "expires_at": expires_at,
+                "created_at": current_time,
+                "updated_at": current_time
+            })
+
+        if rows:
+            # One executemany (no per-row RETURNING, which SQLite cannot batch), then read the ids back
+            db.execute(insert(Invite), rows)
+            db.commit()
+            invite_ids = dict(db.query(Invite.invite_code, Invite.id).filter(
+                Invite.job_id == job["interview_job_id"], Invite.invite_code.in_(list(codes))
+            ).all())
+            for entry in pending:
+                if entry["invite_code"] in invite_ids:
+                    entry.update(status="invited", invite_id=invite_ids[entry["invite_code"]])
+        self._save(job)
+        return candidates
+
+    def _send_emails(self, job: Dict[str, Any], job_title: str, candidates: Dict[int, Any], expires_at: datetime):
+        # The calendar attachment differs only in candidate name, URL and UID
+        window_start = datetime.now()
+        template = ics_template(job_title, window_start, expires_at)
+        window_end = expires_at.strftime('%B %d, %Y at %I:%M %p')
+        invited = [entry for entry in job["candidates"] if entry["status"] == "invited"]
+        for number, entry in enumerate(invited, start=1):
+            candidate = candidates[entry["candidate_id"]]
+            interview_url = f"{settings.public_base_url}/i/{entry['invite_code']}"
+            try:
+                message_id = email_service.send_interview_invite(
+                    email=candidate.email,
+                    candidate_name=candidate.name,
+                    job_title=job_title,
+                    interview_url=interview_url,
+                    window_start="Available now",
+                    window_end=window_end,
+                    calendar_attachment=render_ics(template, candidate.name, interview_url,
+                                                   uid=f"invite-{entry['invite_id']}"),
+                    on_result=self._delivery_callback(job, entry)
+                )
+                with self._lock:
+                    entry["email_queued"] = message_id is not None
+                    if entry["email_status"] is None:
+                        # Inline sends have already reported; neither queued nor sent means no SMTP
+                        entry["email_status"] = "queued" if message_id else "skipped"
+            except Exception as e:
+                logger.error(f"❌ Bulk invite email to {candidate.email} failed: {e}")
+                entry.update(email_status="failed", error=f"Invite created but email failed: {e}")
+            if number % SAVE_EVERY == 0:
+                self._save(job)
+
+    def run(self, job: Dict[str, Any]):
+        """Validate and insert every invite, then queue the emails; the job ends completed or failed"""
+        start = time.perf_counter()
+        job["status"] = "running"
+        self._save(job)
+        expires_at = datetime.fromisoformat(job["expires_at"])
+        db = SessionLocal()
+        try:
+            job_title = db.query(Job.title).filter(Job.id == job["interview_job_id"]).scalar()
+            if job_title is None:
+                raise ValueError("Job not found")
+            candidates = self._insert(db, job, expires_at)
+            if job["send_email"]:
+                self._send_emails(job, job_title, candidates, expires_at)
+            job["status"] = "completed"
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Bulk invite job {job['job_id']} failed: {e}")
+            job["status"] = "failed"
+            job["error"] = "Could not create invites"
+            for entry in job["candidates"]:
+                if entry["status"] == "queued":
+                    entry.update(status="failed", error="Not saved")
+        finally:
+            db.close()
+        job["finished_at"] = time.time()
+        self._save(job)
+        counts = job["counts"]
+        logger.info(f"✅ Bulk invite {job['job_id']}: {counts['invited']} invited, {counts['duplicate']} duplicates, "
+                    f"{counts['failed']} failed, {counts['emails_queued']} emails queued "
+                    f"({counts['emails_sent']} sent, {counts['emails_failed']} failed so far) "
+                    f"in {time.perf_counter() - start:.1f}s")
+
+
+# Global instance
+bulk_inviter = BulkInviter()
@@ -1,24 +1,29 @@
 from datetime import datetime, timedelta
+from typing import Optional
 
+# Placeholders filled in per candidate by render_ics
+CANDIDATE_NAME = "{{candidate_name}}"
+INTERVIEW_URL = "{{interview_url}}"
+EVENT_UID = "{{uid}}"
+
+
+def ics_template(job_title: str, window_start: datetime, window_end: datetime) -> str:
+    """ICS calendar text for one job and interview window, with the candidate left as placeholders"""
 
-def generate_ics_file(candidate_name: str, job_title: str, interview_url: str, 
-                     window_start: datetime, window_end: datetime) -> bytes:
-    """Generate ICS calendar file for interview invitation"""
-    
     # ICS file format
-    ics_content = f"""BEGIN:VCALENDAR
+    return f"""BEGIN:VCALENDAR
 VERSION:2.0
 PRODID:-//Exatech Round 1 Interview//Interview Scheduler//EN
 CALSCALE:GREGORIAN
 METHOD:REQUEST
 BEGIN:VEVENT
-UID:{datetime.utcnow().strftime('%Y%m%d%H%M%S')}@exatech.com
+UID:{EVENT_UID}@exatech.com
 DTSTAMP:{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}
 DTSTART:{window_start.strftime('%Y%m%dT%H%M%SZ')}
 DTEND:{window_end.strftime('%Y%m%dT%H%M%SZ')}
 SUMMARY:Exatech Round 1 Interview - {job_title}
-DESCRIPTION:Exatech Round 1 Interview for {job_title} position\\n\\nCandidate: {candidate_name}\\n\\nInterview URL: {interview_url}\\n\\nPlease ensure you have a stable internet connection and test your microphone before the interview.
-LOCATION:Online - {interview_url}
+DESCRIPTION:Exatech Round 1 Interview for {job_title} position\\n\\nCandidate: {CANDIDATE_NAME}\\n\\nInterview URL: {INTERVIEW_URL}\\n\\nPlease ensure you have a stable internet connection and test your microphone before the interview.
+LOCATION:Online - {INTERVIEW_URL}
 STATUS:CONFIRMED
 TRANSP:OPAQUE
 BEGIN:VALARM
@@ -33,5 +38,16 @@ DESCRIPTION:Interview reminder - 1 hour
 END:VALARM
 END:VEVENT
 END:VCALENDAR"""
-    
-    return ics_content.encode('utf-8')
\ No newline at end of file
+
+
+def render_ics(template: str, candidate_name: str, interview_url: str, uid: Optional[str] = None) -> bytes:
+    """Fill a template from ics_template for one candidate"""
+    uid = uid or datetime.utcnow().strftime('%Y%m%d%H%M%S')
+    ics_content = template.replace(CANDIDATE_NAME, candidate_name).replace(INTERVIEW_URL, interview_url)
+    return ics_content.replace(EVENT_UID, uid).encode('utf-8')
+
+
+def generate_ics_file(candidate_name: str, job_title: str, interview_url: str,
+                     window_start: datetime, window_end: datetime, uid: Optional[str] = None) -> bytes:
+    """Generate ICS calendar file for interview invitation"""
+    return render_ics(ics_template(job_title, window_start, window_end), candidate_name, interview_url, uid)
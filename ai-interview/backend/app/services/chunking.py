@@ -0,0 +1,112 @@
+"""
+Chunking Service - Splits resumes into small, section-labelled passages for retrieval
+
+Section headings ("Work Experience", "Education", "Technical Skills", ...) are
+recognized by one compiled regex and start a new section. Inside a section the
+text is cut into sentences and bullet points, which are packed into chunks of
+at most `max_tokens`; each chunk repeats the last sentences of the previous one
+(up to `overlap_tokens`) so a statement split across chunks is still found.
+Chunks never span two sections, and a sentence longer than the budget is split
+on word boundaries.
+"""
+import re
+from typing import Dict, List
+
+from .conversation_summary import estimate_tokens
+
+# Heading line -> section; up to two leading words ("Professional Experience", "Key Skills")
+SECTION_PATTERNS = {
+    "summary": r"summary|profile|objective|about me",
+    "experience": r"experience|employment(?: history)?|work history|career history",
+    "projects": r"projects?",
+    "education": r"education|qualifications?|academic background",
+    "skills": r"skills?|competenc(?:y|ies)|technologies|tech stack|technical proficiency",
+    "certifications": r"certifications?|licenses?|courses|training",
+    "achievements": r"achievements?|awards?|honou?rs|publications?",
+}
+HEADING_REGEX = re.compile(
+    r"^(?:[a-z&/]+\s+){0,2}(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_PATTERNS.items()) + r")\s*:?$",
+    re.IGNORECASE
+)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9(\"'])")
+BULLET = re.compile(r"^[\-•*·▪●◦>]+\s*")
+
+
+def section_of(line: str):
+    """Section name when the line is a heading, else None"""
+    if len(line) > 60:
+        return None
+    match = HEADING_REGEX.match(line)
+    return match.lastgroup if match else None
+
+
+def split_sections(text: str) -> List[Dict[str, str]]:
+    """[{"section", "text"}] in document order; lines before the first heading are the summary"""
+    sections, current, lines = [], "summary", []
+    for raw_line in (text or "").splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        heading = section_of(line)
+        if heading:
+            if lines:
+                sections.append({"section": current, "text": "\n".join(lines)})
+            current, lines = heading, []
+        else:
+            lines.append(line)
+    if lines:
+        sections.append({"section": current, "text": "\n".join(lines)})
+    return sections
+
+
+def _units(text: str, max_tokens: int) -> List[str]:
+    """Sentences and bullet points, with any longer than the budget cut on word boundaries"""
+    units = []
+    for line in text.splitlines():
+        for sentence in SENTENCE_SPLIT.split(BULLET.sub("", line)):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if estimate_tokens(sentence) <= max_tokens:
+                units.append(sentence)
+                continue
+            piece: List[str] = []
+            for word in sentence.split():
+                if piece and estimate_tokens(" ".join(piece + [word])) > max_tokens:
+                    units.append(" ".join(piece))
+                    piece = []
+                piece.append(word)
+            if piece:
+                units.append(" ".join(piece))
+    return units
+
+
+def chunk_text(text: str, max_tokens: int = 128, overlap_tokens: int = 24) -> List[str]:
+    """Pack sentences into chunks of at most max_tokens, overlapping by up to overlap_tokens"""
+    chunks, current = [], []
+    for unit in _units(text, max_tokens):
+        if current and estimate_tokens("\n".join(current + [unit])) > max_tokens:
+            chunks.append("\n".join(current))
+            # Carry the trailing sentences that fit in the overlap, as long as the new one still fits
+            carried: List[str] = []
+            for previous in reversed(current):
+                candidate = [previous] + carried
+                if estimate_tokens("\n".join(candidate)) > overlap_tokens:
+                    break
+                carried = candidate
+            while carried and estimate_tokens("\n".join(carried + [unit])) > max_tokens:
+                carried.pop(0)
+            current = carried
+        current.append(unit)
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def chunk_resume(text: str, max_tokens: int = 128, overlap_tokens: int = 24) -> List[Dict]:
+    """[{"section", "text", "tokens"}] for every chunk of every section"""
+    return [
+        {"section": section["section"], "text": chunk, "tokens": estimate_tokens(chunk)}
+        for section in split_sections(text)
+        for chunk in chunk_text(section["text"], max_tokens, overlap_tokens)
+    ]
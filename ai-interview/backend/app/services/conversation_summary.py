@@ -0,0 +1,99 @@
+"""
+Conversation Summary Service - Keeps follow-up prompts small as the interview grows
+
+The last few turns are sent to the LLM verbatim; earlier turns are folded into a
+compact summary stored on the session (session_metadata['conversation_summary'])
+and extended incrementally, so each turn only summarizes what is new.
+"""
+import logging
+import math
+from typing import Dict, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+QUESTION_CHARS = 100
+ANSWER_CHARS = 120
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return math.ceil(len(text or "") / 4)
+
+
+def history_tokens(history: List[Dict]) -> int:
+    return sum(estimate_tokens(turn.get('question', '')) + estimate_tokens(turn.get('answer', '')) for turn in history)
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def _first_sentence(text: str) -> str:
+    text = " ".join((text or "").split())
+    for end in (". ", "? ", "! "):
+        idx = text.find(end)
+        if idx != -1:
+            return text[:idx + 1]
+    return text
+
+
+class ConversationSummarizer:
+    """Rolling summary of earlier turns plus the most recent turns verbatim"""
+
+    def summarize_turns(self, previous_summary: str, turns: List[Dict]) -> str:
+        """Extend the summary with new turns"""
+        if settings.history_summary_mode == "llm":
+            from .groq_client import groq_client
+            try:
+                return groq_client.summarize_conversation(previous_summary, turns)
+            except Exception as e:
+                logger.warning(f"⚠️ LLM conversation summary failed, using extractive summary: {str(e)}")
+
+        lines = [previous_summary] if previous_summary else []
+        for turn in turns:
+            lines.append(
+                f"- Asked: {_shorten(turn.get('question', ''), QUESTION_CHARS)} "
+                f"| Answered: {_shorten(_first_sentence(turn.get('answer', '')), ANSWER_CHARS)}"
+            )
+        return "\n".join(lines)
+
+    def compact(self, session, history: List[Dict]) -> Optional[str]:
+        """
+        Summarize all but the most recent turns and store the summary on the session
+        Returns None while the whole history still fits in the recent window
+        """
+        recent_count = settings.history_recent_turns
+        if len(history) <= recent_count:
+            return None
+
+        older = history[:-recent_count] if recent_count else history
+        recent = history[len(older):]
+
+        metadata = session.session_metadata or {}
+        state = metadata.get('conversation_summary') or {"text": "", "turns": 0}
+        if state.get("turns", 0) > len(older):
+            state = {"text": "", "turns": 0}  # History shrank (e.g. failed turns removed), start over
+
+        new_turns = older[state["turns"]:]
+        if new_turns:
+            state = {
+                "text": self.summarize_turns(state["text"], new_turns),
+                "turns": len(older)
+            }
+            # Reassign so SQLAlchemy notices the JSON column changed
+            session.session_metadata = {**metadata, 'conversation_summary': state}
+
+        full_tokens = history_tokens(history)
+        compact_tokens = estimate_tokens(state["text"]) + history_tokens(recent)
+        logger.info(
+            f"Conversation history for session {session.id}: {len(older)} turns summarized, "
+            f"~{full_tokens} -> ~{compact_tokens} tokens"
+        )
+        return state["text"]
+
+
+# Global instance
+conversation_summarizer = ConversationSummarizer()
@@ -0,0 +1,203 @@
+"""
+Document Cache Service - Extraction and parse results keyed by file content
+
+Recruiters upload the same resume again and again (re-uploads, bulk batches
+that overlap earlier ones, backfill scripts re-run over a folder). Results are
+stored in the document_cache table under the sha256 of the file bytes, so an
+identical file is never extracted or parsed twice. An entry only counts when it
+was made with the same extractor version and page/character limits; parsed
+fields additionally carry the skill taxonomy they were made with. Database
+errors are logged and the document is simply processed uncached.
+
+Entries hold resume text, so they do not outlive their use: entries unused for
+DOCUMENT_CACHE_RETENTION_DAYS are deleted by a sweep that runs at most every
+DOCUMENT_CACHE_SWEEP_INTERVAL_SECONDS when new entries are stored, and a
+candidate's resume entry (found by candidates.resume_content_hash) is deleted
+with the candidate.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import CachedDocument
+from .document_pool import document_pool
+from .resume_parser import parse_resume_text, resume_parser
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction changes in a way that should invalidate stored text
+EXTRACTOR_VERSION = "1"
+# Bump when resume parsing changes; the taxonomy fingerprint is added automatically
+PARSER_VERSION = "1"
+# Hashes per DELETE when removing the entries of deleted candidates
+DELETE_BATCH = 100
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _extractor_key(filename: str) -> str:
+    extension = os.path.splitext((filename or "").lower())[1] or ".txt"
+    return f"{EXTRACTOR_VERSION}:{extension}:{settings.document_max_pages}:{settings.document_max_chars}"
+
+
+def _parser_key() -> str:
+    rules = resume_parser.skill_matcher.rules_signature()
+    return f"{PARSER_VERSION}:{hashlib.sha256(rules.encode()).hexdigest()[:12]}"
+
+
+# Parsed fields are reused only while the resume parser and skill taxonomy are unchanged
+PARSER_KEY = _parser_key()
+
+
+def _parse_resume_fields(text: str) -> Dict[str, Any]:
+    """Contact details and sections of a resume; regex-heavy, so callers run it in a thread"""
+    sections = parse_resume_text(text)
+    sections.pop("raw_text", None)
+    return {"version": PARSER_KEY, "contact": resume_parser.extract_contact_info(text), "sections": sections}
+
+
+class DocumentCache:
+    """Content-addressed cache in front of the document pool and resume parser"""
+
+    def __init__(self):
+        self._next_sweep = 0.0
+
+    def lookup(self, digest: str, extractor_key: str) -> Optional[Dict[str, Any]]:
+        """Stored result for these bytes, or None; a hit bumps hit_count and last_used_at"""
+        db = SessionLocal()
+        try:
+            row = db.query(CachedDocument).filter(CachedDocument.content_hash == digest).first()
+            if row is None or row.extractor_version != extractor_key:
+                return None
+            db.query(CachedDocument).filter(CachedDocument.id == row.id).update(
+                {"hit_count": CachedDocument.hit_count + 1, "last_used_at": func.now()},
+                synchronize_session=False
+            )
+            db.commit()
+            return {
+                "text": row.extracted_text, "pages": row.pages, "truncated": row.truncated,
+                "parsed": row.parsed_json
+            }
+        except Exception as e:
+            logger.warning(f"⚠️ Document cache lookup failed: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    def forget(self, db, digests: Iterable[Optional[str]]) -> int:
+        """Delete the entries of these content hashes (deleted candidates' resumes), in db's transaction"""
+        digests = list({digest for digest in digests if digest})
+        deleted = 0
+        for start in range(0, len(digests), DELETE_BATCH):
+            deleted += db.query(CachedDocument).filter(
+                CachedDocument.content_hash.in_(digests[start:start + DELETE_BATCH])
+            ).delete(synchronize_session=False)
+        return deleted
+
+    def sweep(self) -> int:
+        """Delete entries not used within DOCUMENT_CACHE_RETENTION_DAYS"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.document_cache_retention_days)
+        db = SessionLocal()
+        try:
+            deleted = db.query(CachedDocument).filter(CachedDocument.last_used_at < cutoff).delete(
+                synchronize_session=False
+            )
+            db.commit()
+            if deleted:
+                logger.info(f"🧹 Document cache removed {deleted} entries unused for "
+                            f"{settings.document_cache_retention_days} days")
+            return deleted
+        except Exception as e:
+            logger.warning(f"⚠️ Document cache sweep failed: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def _maybe_sweep(self):
+        now = time.time()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + settings.document_cache_sweep_interval_seconds
+        self.sweep()
+
+    def store(self, digest: str, extractor_key: str, filename: str, size: int,
+              extracted: Dict[str, Any], parsed: Optional[Dict[str, Any]] = None):
+        """Insert or replace the entry for these bytes; a concurrent insert of the same file wins"""
+        db = SessionLocal()
+        try:
+            row = db.query(CachedDocument).filter(CachedDocument.content_hash == digest).first()
+            if row is None:
+                row = CachedDocument(content_hash=digest, hit_count=0)
+                db.add(row)
+            elif row.extractor_version == extractor_key and parsed is not None:
+                # Same extraction, only the parsed fields are new
+                row.parsed_json = parsed
+                db.commit()
+                return
+            row.extractor_version = extractor_key
+            row.filename = (filename or "")[:255]
+            row.size_bytes = size
+            row.pages = extracted.get("pages")
+            row.truncated = bool(extracted.get("truncated"))
+            row.extracted_text = extracted["text"]
+            row.parsed_json = parsed
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        except Exception as e:
+            logger.warning(f"⚠️ Document cache store failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+        self._maybe_sweep()
+
+    async def extract_text(self, content: bytes, filename: str) -> Dict[str, Any]:
+        """Like document_pool.extract_text, plus "cached" and "content_hash"; raises DocumentError subclasses"""
+        document_pool.check_size(content)
+        digest = content_hash(content)
+        if not settings.document_cache_enabled:
+            return {**await document_pool.extract_text(content, filename), "cached": False, "content_hash": digest}
+
+        key = _extractor_key(filename)
+        entry = await asyncio.to_thread(self.lookup, digest, key)
+        if entry is not None:
+            logger.info(f"📄 Document cache hit for {filename} ({digest[:12]})")
+            return {**entry, "cached": True, "content_hash": digest}
+
+        extracted = await document_pool.extract_text(content, filename)
+        if extracted["text"].strip():
+            # Empty results are not stored so a fixed extractor gets another try
+            await asyncio.to_thread(self.store, digest, key, filename, len(content), extracted)
+        return {**extracted, "parsed": None, "cached": False, "content_hash": digest}
+
+    async def parse_resume(self, content: bytes, filename: str) -> Dict[str, Any]:
+        """Extracted text with contact details and resume sections, parsed once per distinct file"""
+        result = await self.extract_text(content, filename)
+        parsed = result.get("parsed")
+        if parsed and parsed.get("version") == PARSER_KEY:
+            return {**result, "contact": parsed["contact"], "sections": parsed["sections"]}
+
+        text = result["text"]
+        parsed = await asyncio.to_thread(_parse_resume_fields, text)
+        if settings.document_cache_enabled and text.strip():
+            await asyncio.to_thread(
+                self.store, result["content_hash"], _extractor_key(filename), filename, len(content), result, parsed
+            )
+        return {**result, "parsed": parsed, "contact": parsed["contact"], "sections": parsed["sections"]}
+
+
+# Global instance
+document_cache = DocumentCache()
@@ -0,0 +1,306 @@
+"""
+Document Pool Service - Resume/JD text extraction off the event loop
+
+PDF and DOCX extraction (PyPDF2 with a pdfminer fallback, python-docx) is CPU
+bound and can take seconds on large files, so uploads are handed to a small
+pool of worker processes instead of running inside the request handler.
+Uploads are read in chunks and rejected once they pass the size limit, pages
+are extracted one at a time up to the page and character limits, and each job
+has a deadline: the worker gives up between pages once it has passed, and a
+worker stuck inside a single page is killed and replaced without touching the
+jobs running in the other workers. Cancelling the awaiting task drops a job
+that has not started yet.
+"""
+import asyncio
+import io
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Extra time a job gets beyond its deadline to stop on its own before its worker is killed
+KILL_GRACE_SECONDS = 5.0
+# Uploads are read in pieces of this size so oversized ones are rejected early
+READ_CHUNK_BYTES = 1024 * 1024
+POOLED_EXTENSIONS = (".pdf", ".doc", ".docx")
+
+
+class DocumentError(Exception):
+    """The document could not be turned into text"""
+    status_code = 422
+
+
+class DocumentTooLarge(DocumentError):
+    status_code = 413
+
+
+class DocumentTimeout(DocumentError):
+    status_code = 422
+
+
+def _check_deadline(deadline: Optional[float]):
+    if deadline is not None and time.time() > deadline:
+        raise DocumentTimeout("Document took too long to process")
+
+
+def _pdf_pages_pypdf2(content: bytes, max_pages: int):
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(content))
+    total = len(reader.pages)
+    for index in range(min(total, max_pages)):
+        yield reader.pages[index].extract_text() or "", total
+
+
+def _pdf_pages_pdfminer(content: bytes, max_pages: int):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    for layout in extract_pages(io.BytesIO(content), maxpages=max_pages):
+        yield "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer)), None
+
+
+def _collect(pages, max_chars: int, deadline: Optional[float]) -> Dict[str, Any]:
+    """Join page texts until the character limit, checking the deadline after every page"""
+    parts, chars, count, total = [], 0, 0, None
+    for text, total in pages:
+        parts.append(text)
+        chars += len(text) + 1
+        count += 1
+        _check_deadline(deadline)
+        if chars >= max_chars:
+            break
+    text = "\n".join(parts)
+    truncated = chars >= max_chars or (total is not None and total > count)
+    return {"text": text[:max_chars], "pages": count, "truncated": truncated}
+
+
+def _extract_pdf(content: bytes, max_pages: int, max_chars: int, deadline: Optional[float]) -> Dict[str, Any]:
+    result = {"text": "", "pages": 0, "truncated": False}
+    for method, pages in (("pypdf2", _pdf_pages_pypdf2), ("pdfminer", _pdf_pages_pdfminer)):
+        try:
+            result = _collect(pages(content, max_pages), max_chars, deadline)
+        except DocumentTimeout:
+            raise
+        except ImportError:
+            continue
+        except Exception as e:
+            logger.warning(f"{method} extraction failed: {e}")
+            continue
+        if result["text"].strip():
+            result["method"] = method
+            return result
+    return result
+
+
+def _extract_docx(content: bytes, max_chars: int, deadline: Optional[float]) -> Dict[str, Any]:
+    from docx import Document
+
+    paragraphs = ((paragraph.text, None) for paragraph in Document(io.BytesIO(content)).paragraphs)
+    result = _collect(paragraphs, max_chars, deadline)
+    result["method"] = "docx"
+    return result
+
+
+def extract_document(content: bytes, filename: str, max_pages: Optional[int] = None,
+                     max_chars: Optional[int] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Extract text from a PDF, DOCX or plain-text document within the page/character limits"""
+    max_pages = max_pages or settings.document_max_pages
+    max_chars = max_chars or settings.document_max_chars
+    name = (filename or "").lower()
+
+    if name.endswith(".pdf"):
+        return _extract_pdf(content, max_pages, max_chars, deadline)
+    if name.endswith((".doc", ".docx")):
+        try:
+            return _extract_docx(content, max_chars, deadline)
+        except ImportError:
+            raise DocumentError("DOCX support is not installed (pip install python-docx)")
+        except DocumentTimeout:
+            raise
+        except Exception as e:
+            raise DocumentError(f"Could not read document: {e}")
+
+    text = content.decode("utf-8", errors="ignore")
+    return {"text": text[:max_chars], "pages": 1, "truncated": len(text) > max_chars, "method": "text"}
+
+
+def _worker_main(conn):
+    """Worker process: run (function, args) jobs from the pipe until it is closed"""
+    while True:
+        try:
+            function, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send((True, function(*args)))
+        except DocumentError as e:
+            conn.send((False, e))
+        except Exception as e:
+            conn.send((False, DocumentError(f"Could not read document: {e}")))
+
+
+class _Worker:
+    """One extraction process, fed one job at a time over a pipe"""
+
+    def __init__(self, generation: int):
+        # spawn: never fork a worker that holds models, sockets or threads
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.generation = generation
+
+    def run(self, function, args, timeout: float):
+        """Result of function(*args); TimeoutError if the worker does not answer in time"""
+        self.conn.send((function, args))
+        if not self.conn.poll(timeout):
+            raise TimeoutError()
+        ok, value = self.conn.recv()
+        if not ok:
+            raise value
+        return value
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class DocumentPool:
+    """Up to DOCUMENT_POOL_WORKERS extraction processes, started on first use"""
+
+    def __init__(self):
+        self._idle: List[_Worker] = []
+        self._size = 0  # Workers started and not yet discarded, idle or busy
+        self._generation = 0  # Bumped by shutdown so busy workers are discarded when they finish
+        self._available = threading.Condition()
+
+    def _acquire(self, cancelled: threading.Event) -> Optional[_Worker]:
+        """An idle worker, a new one if the pool is not full, or None once cancelled"""
+        with self._available:
+            while True:
+                if cancelled.is_set():
+                    return None
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < settings.document_pool_workers:
+                    self._size += 1
+                    generation = self._generation
+                    break
+                self._available.wait()
+        try:
+            worker = _Worker(generation)
+        except Exception:
+            self._discard(generation)
+            raise
+        logger.info(f"✅ Document worker {worker.process.pid} started")
+        return worker
+
+    def _discard(self, generation: int):
+        with self._available:
+            if generation == self._generation:
+                self._size -= 1
+            self._available.notify()
+
+    def _release(self, worker: _Worker, healthy: bool):
+        """Return a worker to the pool, or kill it if it failed or the pool was shut down meanwhile"""
+        with self._available:
+            if healthy and worker.generation == self._generation:
+                self._idle.append(worker)
+                self._available.notify()
+                return
+        worker.kill()
+        self._discard(worker.generation)
+
+    def _run(self, function, args, filename: str, cancelled: threading.Event):
+        worker = self._acquire(cancelled)
+        if worker is None:
+            return None
+        healthy = False
+        try:
+            # The job's deadline plus a grace period for it to stop on its own
+            result = worker.run(function, args, max(args[-1] - time.time(), 0) + KILL_GRACE_SECONDS)
+            healthy = True
+            return result
+        except TimeoutError:
+            # Only this job's worker is killed; the other workers keep their jobs
+            logger.error(f"❌ Extraction of {filename} stuck past its deadline, killing worker {worker.process.pid}")
+            raise DocumentTimeout("Document took too long to process")
+        except DocumentError:
+            healthy = True
+            raise
+        except (EOFError, OSError):
+            logger.error(f"❌ Document worker {worker.process.pid} died while extracting {filename}")
+            raise DocumentError("Document processing failed, please try again")
+        finally:
+            self._release(worker, healthy)
+
+    def check_size(self, content: bytes):
+        limit = settings.document_max_mb * 1024 * 1024
+        if len(content) > limit:
+            raise DocumentTooLarge(
+                f"Document is {len(content) / 1024 / 1024:.1f} MB; the limit is {settings.document_max_mb} MB"
+            )
+
+    async def read_upload(self, upload) -> bytes:
+        """Read an UploadFile in chunks, raising DocumentTooLarge as soon as it passes the size limit"""
+        limit = settings.document_max_mb * 1024 * 1024
+        too_large = DocumentTooLarge(f"Document is larger than the {settings.document_max_mb} MB limit")
+        if upload.size is not None and upload.size > limit:
+            raise too_large
+        chunks, size = [], 0
+        while True:
+            chunk = await upload.read(READ_CHUNK_BYTES)
+            if not chunk:
+                return b"".join(chunks)
+            size += len(chunk)
+            if size > limit:
+                raise too_large
+            chunks.append(chunk)
+
+    async def extract_text(self, content: bytes, filename: str) -> Dict[str, Any]:
+        """Extract text without blocking the event loop; raises DocumentError subclasses"""
+        self.check_size(content)
+        timeout = settings.document_timeout_seconds
+        args = (content, filename, settings.document_max_pages, settings.document_max_chars, time.time() + timeout)
+
+        if not (filename or "").lower().endswith(POOLED_EXTENSIONS):
+            return extract_document(*args)
+        if settings.document_pool_workers <= 0:
+            # No pool: a thread keeps the loop free but shares the GIL, and only the deadline stops it
+            return await asyncio.to_thread(extract_document, *args)
+
+        start = time.perf_counter()
+        cancelled = threading.Event()
+        try:
+            result = await asyncio.to_thread(self._run, extract_document, args, filename, cancelled)
+        except asyncio.CancelledError:
+            # A job still waiting for a worker is dropped
+            cancelled.set()
+            with self._available:
+                self._available.notify_all()
+            raise
+
+        logger.info(f"📄 Extracted {result['pages']} pages from {filename} in {time.perf_counter() - start:.2f}s"
+                    f"{' (truncated)' if result['truncated'] else ''}")
+        return result
+
+    def shutdown(self):
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._size = 0
+            self._generation += 1
+            self._available.notify_all()
+        for worker in idle:
+            worker.kill()
+
+
+# Global instance
+document_pool = DocumentPool()
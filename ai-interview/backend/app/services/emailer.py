@@ -1,15 +1,13 @@
-import smtplib
-import ssl
-import time
 from email.mime.text import MIMEText as MimeText
 from email.mime.multipart import MIMEMultipart as MimeMultipart
 from email.mime.base import MIMEBase as MimeBase
 from email import encoders
 import random
 import string
-from typing import Optional
+from typing import Callable, Optional
 from ..config import settings
-from ..database import get_redis
+from .mail_queue import SMTPConfig, SMTPConnection, mail_queue
+from .otp_store import otp_store
 
 
 class EmailService:
@@ -20,18 +18,19 @@ class EmailService:
         self.smtp_pass = settings.effective_smtp_pass
         self.mail_from = settings.effective_mail_from
         self.smtp_configured = bool(self.smtp_user and self.smtp_pass)
-        try:
-            self.redis_client = get_redis()
-        except Exception as e:
-            print(f"Redis connection failed, using in-memory storage: {e}")
-            self.redis_client = None
-        self.memory_store = {}  # Fallback in-memory storage
     
-    def _send_email(self, to_email: str, subject: str, body_html: str, attachment_data: Optional[bytes] = None, attachment_name: Optional[str] = None):
-        """Send email with optional attachment"""
+    def _send_email(self, to_email: str, subject: str, body_html: str, attachment_data: Optional[bytes] = None,
+                    attachment_name: Optional[str] = None, wait: bool = False,
+                    on_result: Optional[Callable[[str, Optional[str]], None]] = None) -> Optional[str]:
+        """Send email with optional attachment.
+
+        Queued messages return their mail queue id (delivery is reported to on_result);
+        with wait=True or the queue disabled the email is sent before returning, and
+        failures raise.
+        """
         if not self.smtp_configured:
             print(f"SMTP not configured - Email skipped: {subject} to {to_email}")
-            return
+            return None
             
         message = MimeMultipart("alternative")
         message["Subject"] = subject
@@ -53,28 +52,26 @@ class EmailService:
             )
             message.attach(part)
         
-        # Send email
-        context = ssl.create_default_context()
-        with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-            server.starttls(context=context)
-            server.login(self.smtp_user, self.smtp_pass)
-            server.sendmail(self.mail_from, to_email, message.as_string())
+        # Send email - queued for the background senders, or inline when the queue is disabled
+        config = SMTPConfig(self.smtp_host, self.smtp_port, self.smtp_user, self.smtp_pass, settings.smtp_starttls)
+        if settings.mail_queue_enabled and not wait:
+            return mail_queue.enqueue(config, self.mail_from, [to_email], message.as_string(), on_result)
+        connection = SMTPConnection()
+        try:
+            connection.get(config).sendmail(self.mail_from, to_email, message.as_string())
+        finally:
+            connection.close()
+        if on_result is not None:
+            on_result("sent", None)
+        return None
     
     def send_otp(self, email: str, invite_id: int) -> str:
-        """Send OTP code to email and store in Redis"""
+        """Send OTP code to email and store it (raises OTPRateLimited past the send limit)"""
         # Generate 6-digit OTP
         otp_code = ''.join(random.choices(string.digits, k=6))
         
-        # Store in Redis with 10-minute expiration or fallback to memory
-        redis_key = f"otp:{email}:{invite_id}"
-        if self.redis_client:
-            try:
-                self.redis_client.setex(redis_key, 600, otp_code)
-            except Exception as e:
-                print(f"Redis store failed, using memory: {e}")
-                self.memory_store[redis_key] = {"code": otp_code, "expires": time.time() + 600}
-        else:
-            self.memory_store[redis_key] = {"code": otp_code, "expires": time.time() + 600}
+        # Store with expiration, replacing any earlier code
+        otp_store.issue(email, invite_id, otp_code)
         
         # Send email
         subject = "Exatech Round 1 Interview - Verification Code"
@@ -83,7 +80,7 @@ class EmailService:
         <body>
             <h2>Exatech Round 1 Interview</h2>
             <p>Your verification code is: <strong style="font-size: 24px; color: #007bff;">{otp_code}</strong></p>
-            <p>This code will expire in 10 minutes.</p>
+            <p>This code will expire in {settings.otp_ttl_seconds // 60} minutes.</p>
             <p>If you didn't request this code, please ignore this email.</p>
         </body>
         </html>
@@ -93,37 +90,14 @@ class EmailService:
         return otp_code
     
     def verify_otp(self, email: str, invite_id: int, provided_code: str) -> bool:
-        """Verify OTP code"""
-        redis_key = f"otp:{email}:{invite_id}"
-        
-        if self.redis_client:
-            try:
-                stored_code = self.redis_client.get(redis_key)
-                if stored_code and stored_code.decode() == provided_code:
-                    # Clear the OTP after successful verification
-                    self.redis_client.delete(redis_key)
-                    return True
-            except Exception as e:
-                print(f"Redis verify failed, checking memory: {e}")
-                # Fall through to memory check
-        
-        # Check memory store
-        if redis_key in self.memory_store:
-            stored_data = self.memory_store[redis_key]
-            if time.time() < stored_data["expires"] and stored_data["code"] == provided_code:
-                # Clear the OTP after successful verification
-                del self.memory_store[redis_key]
-                return True
-            elif time.time() >= stored_data["expires"]:
-                # Clean up expired OTP
-                del self.memory_store[redis_key]
-        
-        return False
+        """Verify OTP code (raises OTPRateLimited after too many wrong codes)"""
+        return otp_store.verify(email, invite_id, provided_code)
     
     def send_interview_invite(self, email: str, candidate_name: str, job_title: str, 
                             interview_url: str, window_start: str, window_end: str,
-                            calendar_attachment: Optional[bytes] = None):
-        """Send interview invitation with calendar attachment"""
+                            calendar_attachment: Optional[bytes] = None, wait: bool = False,
+                            on_result: Optional[Callable[[str, Optional[str]], None]] = None) -> Optional[str]:
+        """Send interview invitation with calendar attachment; returns the mail queue id when queued"""
         subject = f"Exatech Round 1 Interview Invitation - {job_title}"
         
         body_html = f"""
@@ -172,7 +146,8 @@ class EmailService:
         """
         
         attachment_name = "interview.ics" if calendar_attachment else None
-        self._send_email(email, subject, body_html, calendar_attachment, attachment_name)
+        return self._send_email(email, subject, body_html, calendar_attachment, attachment_name,
+                                wait=wait, on_result=on_result)
 
 
 # Global instance
@@ -0,0 +1,211 @@
+"""
+Local embedding server shared by all uvicorn workers on a host
+
+Run it next to the API workers and point EMBEDDING_SERVER_URL at it:
+
+    python -m app.services.embedding_server                  # TCP on 127.0.0.1:8001
+    python -m app.services.embedding_server --uds /tmp/embeddings.sock
+
+Encode requests from every worker are collected for up to
+EMBEDDING_BATCH_MAX_WAIT_MS and encoded together, so a single copy of the
+model serves the whole host with batched CPU inference.
+"""
+import argparse
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from ..config import settings
+from .metrics import metrics_response, set_queue_depth
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Dynamically batches concurrent encode calls into one model invocation"""
+
+    def __init__(self, encoder, max_batch_size: int = 64, max_wait_ms: int = 10):
+        self.encoder = encoder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # One inference at a time; the model parallelizes internally
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-batch")
+        self.batches_encoded = 0
+        self.texts_encoded = 0
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize() if self.queue else 0
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Queue texts for the next batch and wait for their embeddings"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+
+    async def _collect_batch(self) -> list:
+        """Wait for one request, then gather more until the batch is full or the window closes"""
+        loop = asyncio.get_running_loop()
+        items = [await self.queue.get()]
+        count = len(items[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while count < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            count += len(item[0])
+
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect_batch()
+            texts = [text for batch, _ in items for text in batch]
+
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._encode, texts)
+            except Exception as e:
+                logger.error(f"Batch encode of {len(texts)} texts failed: {str(e)}")
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_encoded += 1
+            self.texts_encoded += len(texts)
+
+            offset = 0
+            for batch, future in items:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(batch)])
+                offset += len(batch)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.encoder.encode(texts, batch_size=self.max_batch_size), dtype='float32')
+
+
+class EmbeddingClient:
+    """Drop-in replacement for SentenceTransformer.encode backed by the embedding server"""
+
+    def __init__(self, url: str, timeout: Optional[int] = None):
+        import httpx
+
+        timeout = timeout or settings.embedding_client_timeout_seconds
+        if url.startswith("unix://"):
+            transport = httpx.HTTPTransport(uds=url[len("unix://"):])
+            self._client = httpx.Client(transport=transport, base_url="http://embedding-server", timeout=timeout)
+        else:
+            self._client = httpx.Client(base_url=url.rstrip("/"), timeout=timeout)
+        self.url = url
+
+    def encode(self, sentences, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        response = self._client.post("/encode", json={"texts": texts})
+        response.raise_for_status()
+        embeddings = np.asarray(response.json()["embeddings"], dtype='float32')
+        return embeddings[0] if single else embeddings
+
+
+class EncodeRequest(BaseModel):
+    texts: List[str]
+
+
+app = FastAPI(title="Embedding Server")
+batcher: Optional[EmbeddingBatcher] = None
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Load the local model and start the batching loop"""
+    global batcher
+    from .model_registry import load_local_sentence_encoder
+
+    encoder = load_local_sentence_encoder()
+    encoder.encode(["warm up"])
+    batcher = EmbeddingBatcher(
+        encoder,
+        max_batch_size=settings.embedding_batch_max_size,
+        max_wait_ms=settings.embedding_batch_max_wait_ms
+    )
+    batcher.start()
+    logger.info("✅ Embedding server ready")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if batcher:
+        await batcher.stop()
+
+
+@app.post("/encode")
+async def encode(request: EncodeRequest):
+    if not request.texts:
+        return {"embeddings": [], "dimension": 0}
+    if batcher is None:
+        raise HTTPException(status_code=503, detail="Embedding model not loaded")
+
+    embeddings = await batcher.encode(request.texts)
+    return {"embeddings": embeddings.tolist(), "dimension": int(embeddings.shape[1])}
+
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "healthy" if batcher else "starting",
+        "queue_depth": batcher.queue_depth if batcher else 0,
+        "batches_encoded": batcher.batches_encoded if batcher else 0,
+        "texts_encoded": batcher.texts_encoded if batcher else 0
+    }
+
+
+@app.get("/metrics")
+def metrics():
+    set_queue_depth("embedding_batch", batcher.queue_depth if batcher else 0)
+    return metrics_response()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the shared embedding server")
+    parser.add_argument("--host", default=settings.embedding_server_host)
+    parser.add_argument("--port", type=int, default=settings.embedding_server_port)
+    parser.add_argument("--uds", default=settings.embedding_server_uds, help="Serve on a Unix domain socket")
+    args = parser.parse_args()
+
+    import uvicorn
+    if args.uds:
+        uvicorn.run(app, uds=args.uds)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,83 @@
 import requests
 import json
-from typing import Dict, Any, List
+import logging
+import time
+from typing import Dict, Any, List, Callable, Optional
 from ..config import settings
+from .llm_cache import llm_cache
+from .conversation_summary import estimate_tokens
+from .usage import record_llm_usage
+from .metrics import observe_groq_call, observe_groq_error
+from .timings import record_span
+
+logger = logging.getLogger(__name__)
+
+
+def _clean_json(content: str) -> str:
+    """Strip markdown code fences the model sometimes wraps JSON in"""
+    return content.replace("```json", "").replace("```", "").strip()
+
+
+def _is_json(content: str) -> bool:
+    try:
+        json.loads(_clean_json(content))
+        return True
+    except json.JSONDecodeError:
+        return False
 
 
 class GroqClient:
     def __init__(self):
         self.api_key = settings.groq_api_key
-        self.base_url = "https://api.groq.com/openai/v1"
+        self.base_url = settings.groq_base_url.rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
     
+    def _chat_completion(self, payload: Dict[str, Any], timeout: Optional[int] = None,
+                         is_valid: Callable[[str], bool] = None, operation: str = "chat") -> str:
+        """
+        Run a chat completion and return the message content, reusing cached responses
+        Only responses that pass is_valid (if given) are cached; every call is recorded for usage accounting
+        """
+        start = time.perf_counter()
+        prompt_estimate = sum(estimate_tokens(m["content"]) for m in payload["messages"])
+        cached = llm_cache.get(payload, operation)
+        if cached is not None:
+            logger.info(f"LLM call {operation} ({payload['model']}): cache hit, ~{prompt_estimate} prompt tokens saved")
+            duration_ms = (time.perf_counter() - start) * 1000
+            record_llm_usage(operation, payload["model"], duration_ms, cached=True)
+            record_span("llm", duration_ms)
+            return cached
+        
+        url = f"{self.base_url}/chat/completions"
+        try:
+            response = requests.post(url, headers=self.headers, json=payload, timeout=timeout)
+            response.raise_for_status()
+        except Exception:
+            observe_groq_error(operation)
+            record_span("llm", (time.perf_counter() - start) * 1000)
+            raise
+        duration_ms = (time.perf_counter() - start) * 1000
+        record_span("llm", duration_ms)
+        
+        result = response.json()
+        usage = result.get("usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", prompt_estimate)
+        completion_tokens = usage.get("completion_tokens", 0)
+        logger.info(
+            f"LLM call {operation} ({payload['model']}): prompt_tokens={prompt_tokens} "
+            f"completion_tokens={completion_tokens} in {duration_ms:.0f}ms"
+        )
+        record_llm_usage(operation, payload["model"], duration_ms, prompt_tokens, completion_tokens)
+        observe_groq_call(operation, payload["model"], duration_ms / 1000, prompt_tokens, completion_tokens)
+        
+        content = result["choices"][0]["message"]["content"].strip()
+        if is_valid is None or is_valid(content):
+            llm_cache.set(payload, content, operation)
+        return content
+    
     def transcribe_audio(self, audio_file_path: str) -> str:
         """
         Transcribe audio using Groq Whisper API with enhanced error handling
@@ -48,14 +113,19 @@ class GroqClient:
                 }
                 data = {
                     "model": "whisper-large-v3",
-                    "response_format": "json"
+                    "response_format": "verbose_json"  # Includes the audio duration for usage accounting
                 }
                 headers = {"Authorization": f"Bearer {self.api_key}"}
                 
+                start = time.perf_counter()
                 response = requests.post(url, headers=headers, files=files, data=data, timeout=60)
+                duration_ms = (time.perf_counter() - start) * 1000
                 
                 if response.status_code == 200:
                     result = response.json()
+                    record_llm_usage("transcribe", data["model"], duration_ms,
+                                     audio_seconds=float(result.get("duration") or 0.0))
+                    observe_groq_call("transcribe", data["model"], duration_ms / 1000)
                     transcript = result.get("text", "").strip()
                     print(f"✅ Transcription successful: '{transcript}'")
                     
@@ -65,6 +135,9 @@ class GroqClient:
                     return transcript
                 
                 else:
+                    record_llm_usage("transcribe", data["model"], duration_ms)
+                    observe_groq_error("transcribe")
+                    
                     # Enhanced error handling with specific messages
                     error_msg = f"Groq API Error {response.status_code}: {response.text}"
                     print(f"❌ {error_msg}")
@@ -85,6 +158,7 @@ class GroqClient:
         
         except Exception as e:
             print(f"❌ Transcription exception: {str(e)}")
+            observe_groq_error("transcribe")
             return "Unable to process audio. Please try again."
         
         finally:
@@ -92,7 +166,7 @@ class GroqClient:
             for var, value in original_values.items():
                 os.environ[var] = value
     
-    def chat_followup_json(self, criteria: str, question: str, answer: str, job_description: str = "", question_context: Dict = None, conversation_history: List = None) -> Dict[str, Any]:
+    def chat_followup_json(self, criteria: str, question: str, answer: str, job_description: str = "", question_context: Dict = None, conversation_history: List = None, conversation_summary: str = None, resume_context: str = None) -> Dict[str, Any]:
         """
         Generate follow-up evaluation using Groq Chat API
         Returns structured JSON with score, missing points, followup question, and completion status
@@ -104,9 +178,9 @@ class GroqClient:
             job_description: Job description to evaluate alignment with role requirements
             question_context: Context for the next question type
             conversation_history: Previous questions and answers to avoid repetition
+            conversation_summary: Compact summary of turns older than conversation_history
+            resume_context: Resume passages relevant to the answer
         """
-        url = f"{self.base_url}/chat/completions"
-        
         system_prompt = """You are an expert technical interview evaluator. Return ONLY valid JSON in this exact format:
 {
   "score": <number between 1-10>,
@@ -147,14 +221,18 @@ Ask for clarification or deeper details about their mentioned skills, projects,
         
         # Build conversation history context
         history_context = ""
+        if conversation_summary:
+            history_context = f"\n\nEARLIER IN THE INTERVIEW (summary, avoid repeating these topics):\n{conversation_summary}\n"
         if conversation_history:
-            history_context = "\n\nPREVIOUS CONVERSATION HISTORY (avoid repeating similar questions):\n"
+            history_context += "\n\nPREVIOUS CONVERSATION HISTORY (avoid repeating similar questions):\n"
             for i, turn in enumerate(conversation_history, 1):
                 history_context += f"Q{i}: {turn.get('question', 'N/A')}\n"
                 history_context += f"A{i}: {turn.get('answer', 'N/A')[:200]}...\n\n"
         
+        resume_section = f"\n\nRelevant Resume Excerpts:\n{resume_context}" if resume_context else ""
+        
         user_prompt = f"""
-Job Requirements: {job_description if job_description else "General technical role"}
+Job Requirements: {job_description if job_description else "General technical role"}{resume_section}
 
 Evaluation Criteria: {criteria}
 Current Question: {question}
@@ -177,7 +255,7 @@ Provide the next follow-up question if more depth is needed, or acknowledge comp
 """
         
         payload = {
-            "model": "llama-3.3-70b-versatile",
+            "model": settings.groq_chat_model,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -186,14 +264,10 @@ Provide the next follow-up question if more depth is needed, or acknowledge comp
             "max_tokens": 500
         }
         
-        response = requests.post(url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        
-        result = response.json()
-        content = result["choices"][0]["message"]["content"].strip()
+        content = self._chat_completion(payload, is_valid=_is_json, operation="followup")
         
         # Clean up the response to extract JSON
-        content = content.replace("```json", "").replace("```", "").strip()
+        content = _clean_json(content)
         
         try:
             return json.loads(content)
@@ -206,6 +280,105 @@ Provide the next follow-up question if more depth is needed, or acknowledge comp
                 "complete": False
             }
     
+    def evaluate_answer_json(self, criteria: str, question: str, answer: str, job_description: str = "", next_question: str = None) -> Dict[str, Any]:
+        """
+        Evaluate an answer when the next question comes from the question bank
+        Returns the same JSON shape as chat_followup_json with a much smaller prompt:
+        no conversation history, and the follow-up is only rephrased, not invented
+        
+        Args:
+            criteria: Evaluation criteria
+            question: The question asked
+            answer: Candidate's answer
+            job_description: Job description to evaluate alignment with role requirements
+            next_question: Bank question to adapt to the answer (omit to evaluate only)
+        """
+        system_prompt = """You are an expert technical interview evaluator. Return ONLY valid JSON in this exact format:
+{
+  "score": <number between 1-10>,
+  "missing": ["list of missing key points or gaps"],
+  "followup": "<the next question, lightly rephrased to connect to the answer>",
+  "complete": <true if the candidate has clearly covered the role's requirements, false otherwise>
+}
+Score technical accuracy, depth, relevance to the job, problem solving and clarity. Be thorough but fair.
+When rephrasing the next question keep its topic and difficulty; do not add new topics."""
+        
+        user_prompt = f"""Job Requirements: {job_description[:2000] if job_description else "General technical role"}
+Evaluation Criteria: {criteria}
+Current Question: {question}
+Current Answer: {answer}
+Next Question: {next_question or "(none - return an empty followup)"}"""
+        
+        payload = {
+            "model": settings.groq_chat_model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 300
+        }
+        
+        content = _clean_json(self._chat_completion(payload, is_valid=_is_json, operation="evaluate"))
+        
+        try:
+            evaluation = json.loads(content)
+        except json.JSONDecodeError:
+            evaluation = {
+                "score": 5,
+                "missing": ["Could not parse evaluation"],
+                "complete": False
+            }
+        
+        if not evaluation.get("followup"):
+            evaluation["followup"] = next_question
+        return evaluation
+    
+    def rephrase_question(self, question: str, answer: str) -> str:
+        """
+        Adapt a question bank question to the candidate's previous answer using the fast model
+        Falls back to the original question on any error
+        """
+        payload = {
+            "model": settings.groq_fast_model,
+            "messages": [
+                {"role": "system", "content": "You are an interviewer. Rephrase the next interview question so it "
+                                              "follows naturally from the candidate's previous answer. Keep the topic "
+                                              "and difficulty. Return only the question."},
+                {"role": "user", "content": f"Previous answer: {answer[:1000]}\n\nNext question: {question}"}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 120
+        }
+        
+        try:
+            rephrased = self._chat_completion(payload, timeout=15, operation="rephrase").strip('"')
+            return rephrased or question
+        except Exception as e:
+            print(f"⚠️  Question rephrasing failed, using bank question: {str(e)}")
+            return question
+    
+    def summarize_conversation(self, previous_summary: str, turns: List[Dict]) -> str:
+        """
+        Fold new interview turns into the running conversation summary using the fast model
+        """
+        transcript = "\n".join(
+            f"Q: {turn.get('question', 'N/A')}\nA: {turn.get('answer', 'N/A')[:600]}" for turn in turns
+        )
+        payload = {
+            "model": settings.groq_fast_model,
+            "messages": [
+                {"role": "system", "content": "You maintain a compact summary of a job interview. Merge the new turns "
+                                              "into the existing summary as short bullet points: topics asked, key "
+                                              "claims, skills and gaps shown. Keep it under 150 words. "
+                                              "Return only the summary."},
+                {"role": "user", "content": f"Existing summary:\n{previous_summary or '(none)'}\n\nNew turns:\n{transcript}"}
+            ],
+            "temperature": 0.2,
+            "max_tokens": 250
+        }
+        return self._chat_completion(payload, timeout=15, operation="summarize")
+    
     def generate_initial_question(self, job_description: str, resume_text: str = "") -> str:
         """
         Generate the introduction question (always the same, not scored)
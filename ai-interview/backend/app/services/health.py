@@ -0,0 +1,122 @@
+"""
+Health Service - Dependency checks behind the liveness and readiness probes
+
+Each check is cached for HEALTH_CACHE_SECONDS so frequent load balancer probes
+do not hammer Postgres or Redis. Readiness fails when any check listed in
+HEALTH_READY_CHECKS fails (only the database by default); the others are
+reported but only mark the worker as degraded. The app runs without Redis
+(in-memory fallbacks) and without the sentence encoder (lite image), so
+neither keeps a worker out of rotation unless listed explicitly.
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from sqlalchemy import text
+
+from ..config import settings
+from ..database import engine, get_redis
+from .model_registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+STARTED_AT = time.time()
+
+
+def check_database() -> Dict[str, Any]:
+    pool = engine.pool
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    details = {"ok": True}
+    # QueuePool exposes its usage; SQLite's pools do not
+    if hasattr(pool, "checkedout") and hasattr(pool, "size"):
+        details.update({"pool_size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()})
+    return details
+
+
+def check_redis() -> Dict[str, Any]:
+    return {"ok": bool(get_redis().ping())}
+
+
+def check_models() -> Dict[str, Any]:
+    status = model_registry.status()
+    failed = {name: info["error"] for name, info in status.items() if info["error"]}
+    cold = [name for name, info in status.items() if not info["loaded"] and not info["error"]]
+    # Without warm-up, models load on first use and a cold worker is still ready
+    ok = not failed and (not cold or not settings.warm_up_models)
+    return {"ok": ok, "models": status, "cold": cold}
+
+
+def check_disk() -> Dict[str, Any]:
+    path = settings.audio_storage_path if os.path.exists(settings.audio_storage_path) else "."
+    usage = shutil.disk_usage(path)
+    free_mb = usage.free / (1024 * 1024)
+    return {
+        "ok": free_mb >= settings.health_min_free_disk_mb,
+        "path": os.path.abspath(path),
+        "free_mb": round(free_mb, 1),
+        "min_free_mb": settings.health_min_free_disk_mb
+    }
+
+
+class HealthChecker:
+    """Runs dependency checks with a short result cache"""
+
+    def __init__(self):
+        self.checks: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "database": check_database,
+            "redis": check_redis,
+            "models": check_models,
+            "disk": check_disk
+        }
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _run(self, name: str) -> Dict[str, Any]:
+        cached = self._cache.get(name)
+        if cached and time.time() - cached["checked_at"] < settings.health_cache_seconds:
+            return cached
+
+        # One probe at a time refreshes a check; concurrent probes reuse its result
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached and time.time() - cached["checked_at"] < settings.health_cache_seconds:
+                return cached
+
+            start = time.perf_counter()
+            try:
+                result = self.checks[name]()
+            except Exception as e:
+                result = {"ok": False, "error": str(e)}
+                logger.warning(f"⚠️ Health check '{name}' failed: {str(e)}")
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            result["checked_at"] = time.time()
+            self._cache[name] = result
+            return result
+
+    def liveness(self) -> Dict[str, Any]:
+        """The process is up and serving requests; no dependencies are touched"""
+        return {"status": "alive", "uptime_seconds": round(time.time() - STARTED_AT, 1), "pid": os.getpid()}
+
+    def readiness(self) -> Dict[str, Any]:
+        """Whether this worker should receive traffic"""
+        required = {name.strip() for name in settings.health_ready_checks.split(",") if name.strip()}
+        results = {name: self._run(name) for name in self.checks}
+
+        ready = all(results[name]["ok"] for name in required if name in results)
+        degraded = not all(result["ok"] for result in results.values())
+        return {
+            "status": "ready" if ready and not degraded else ("degraded" if ready else "not_ready"),
+            "ready": ready,
+            "checks": {
+                name: {**result, "required": name in required}
+                for name, result in results.items()
+            }
+        }
+
+
+# Global instance
+health_checker = HealthChecker()
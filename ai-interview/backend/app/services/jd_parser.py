@@ -1,17 +1,18 @@
-import PyPDF2
-import io
+import re
+
+from .document_pool import extract_document
+from .skill_matcher import skill_matcher
+
+# Each compiled once; lines and text are scanned in a single pass instead of once per keyword
+REQUIREMENT_LINE = re.compile(r"^.*(?:require|must have|essential|mandatory).*$", re.MULTILINE)
+SENIOR_TERMS = re.compile(r"senior|lead|principal|5\+ years|6\+ years")
+JUNIOR_TERMS = re.compile(r"junior|entry|graduate|0-2 years|1-3 years")
 
 
 def extract_jd_from_pdf(pdf_bytes: bytes) -> str:
-    """Extract job description text from PDF"""
+    """Extract job description text from PDF (blocking; request handlers use document_pool)"""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
-        text = ""
-        
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        
-        return text.strip()
+        return extract_document(pdf_bytes, "job_description.pdf")["text"].strip()
     
     except Exception as e:
         return f"Error extracting JD text: {str(e)}"
@@ -39,44 +40,26 @@ def parse_job_description(jd_text: str) -> dict:
 def extract_requirements(text: str) -> list:
     """Extract requirements from job description"""
     requirements = []
-    lines = text.lower().split('\n')
+    for match in REQUIREMENT_LINE.finditer(text.lower()):
+        requirements.append(match.group(0).strip())
+        if len(requirements) == 10:  # Limit to top 10
+            break
     
-    for line in lines:
-        if any(keyword in line for keyword in ['require', 'must have', 'essential', 'mandatory']):
-            requirements.append(line.strip())
-    
-    return requirements[:10]  # Limit to top 10
+    return requirements
 
 
 def extract_skills(text: str) -> list:
-    """Extract technical skills from job description"""
-    # Common technical skills - this would be more comprehensive in production
-    skill_keywords = [
-        'python', 'java', 'javascript', 'react', 'angular', 'vue',
-        'node.js', 'express', 'django', 'flask', 'spring', 'bootstrap',
-        'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
-        'git', 'ci/cd', 'agile', 'scrum', 'microservices', 'rest',
-        'graphql', 'api', 'sql', 'nosql', 'machine learning', 'ai'
-    ]
-    
-    found_skills = []
-    text_lower = text.lower()
-    
-    for skill in skill_keywords:
-        if skill in text_lower:
-            found_skills.append(skill.title())
-    
-    return list(set(found_skills))
+    """Extract technical skills from job description (canonical names from the skill taxonomy)"""
+    return skill_matcher.find(text)
 
 
 def extract_level(text: str) -> str:
     """Extract experience level from job description"""
     text_lower = text.lower()
     
-    if any(term in text_lower for term in ['senior', 'lead', 'principal', '5+ years', '6+ years']):
+    if SENIOR_TERMS.search(text_lower):
         return 'Senior'
-    elif any(term in text_lower for term in ['junior', 'entry', 'graduate', '0-2 years', '1-3 years']):
+    elif JUNIOR_TERMS.search(text_lower):
         return 'Junior'
     else:
-        return 'Mid-level'
\ No newline at end of file
+        return 'Mid-level'
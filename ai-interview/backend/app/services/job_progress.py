@@ -0,0 +1,60 @@
+"""
+Job Progress Store - Progress of background jobs, readable from any worker
+
+Bulk ingest and bulk invite jobs are dicts saved under a per-service key
+prefix in Redis for JOB_PROGRESS_TTL_SECONDS, so whichever worker answers a
+status poll sees the latest progress. Without Redis they are kept in memory
+(per process), and jobs not updated within the TTL are dropped on every save.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..config import settings
+from ..database import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgressStore:
+    """Saves and loads job dicts by job_id"""
+
+    def __init__(self, prefix: str, name: str):
+        self.prefix = prefix
+        self.name = name
+        try:
+            self.redis_client = get_redis()
+        except Exception as e:
+            print(f"Redis connection failed, keeping {name} progress in memory: {e}")
+            self.redis_client = None
+        self.memory_store: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Dict[str, Any]):
+        job["updated_at"] = time.time()
+        if self.redis_client:
+            try:
+                self.redis_client.setex(self.prefix + job["job_id"], settings.job_progress_ttl_seconds, json.dumps(job))
+                return
+            except Exception as e:
+                logger.debug(f"Redis {self.name} write failed, using memory: {e}")
+        with self._lock:
+            self.memory_store[job["job_id"]] = json.loads(json.dumps(job))
+            # Drop expired jobs so the fallback store stays bounded
+            cutoff = time.time() - settings.job_progress_ttl_seconds
+            for job_id in [key for key, value in self.memory_store.items() if value["updated_at"] < cutoff]:
+                del self.memory_store[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if self.redis_client:
+            try:
+                value = self.redis_client.get(self.prefix + job_id)
+                if value:
+                    return json.loads(value)
+            except Exception as e:
+                logger.debug(f"Redis {self.name} read failed, using memory: {e}")
+        with self._lock:
+            job = self.memory_store.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
@@ -0,0 +1,206 @@
+"""
+LLM Response Cache - Reuses Groq chat completions for repeated prompts
+
+Entries are keyed by a SHA-256 of the normalized request (model, parameters and
+whitespace-collapsed messages) and stored in Redis with a TTL, falling back to a
+bounded in-memory LRU when Redis is unavailable. Optional semantic matching
+reuses a response whose prompt embedding is nearly identical to the new one,
+but only for operations in SEMANTIC_OPERATIONS: scoring prompts (follow-up and
+evaluation) open with the job description, so two different answers to the
+same question embed almost identically and must never share a response.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..database import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm_cache:"
+# Operations whose responses may be reused for a near-identical prompt; never scoring ones
+SEMANTIC_OPERATIONS = frozenset({"rephrase"})
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting-only prompt differences share a cache entry"""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class LLMCache:
+    """Prompt-hash cache for chat completion responses with hit-rate stats"""
+
+    def __init__(self):
+        try:
+            self.redis_client = get_redis()
+        except Exception as e:
+            print(f"Redis connection failed, using in-memory LLM cache: {e}")
+            self.redis_client = None
+        self.memory_store: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # key -> (expires, content)
+        self.semantic_index: "OrderedDict[str, Tuple[str, np.ndarray]]" = OrderedDict()  # key -> (scope, vector)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _scope(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Request fields that must match exactly, everything but the final user message"""
+        messages = payload.get("messages", [])
+        return {
+            "model": payload.get("model"),
+            "temperature": payload.get("temperature"),
+            "max_tokens": payload.get("max_tokens"),
+            "context": [(m["role"], normalize_text(m["content"])) for m in messages[:-1]]
+        }
+
+    def make_key(self, payload: Dict[str, Any]) -> str:
+        messages = payload.get("messages", [])
+        prompt = normalize_text(messages[-1]["content"]) if messages else ""
+        raw = json.dumps({**self._scope(payload), "prompt": prompt}, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _scope_key(self, payload: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(self._scope(payload), sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _read(self, key: str) -> Optional[str]:
+        if self.redis_client:
+            try:
+                value = self.redis_client.get(KEY_PREFIX + key)
+                return value.decode("utf-8") if isinstance(value, bytes) else value
+            except Exception as e:
+                logger.debug(f"Redis LLM cache read failed, using memory: {e}")
+
+        with self._lock:
+            entry = self.memory_store.get(key)
+            if entry is None:
+                return None
+            expires, content = entry
+            if expires < time.time():
+                del self.memory_store[key]
+                return None
+            self.memory_store.move_to_end(key)
+            return content
+
+    def _write(self, key: str, content: str):
+        if self.redis_client:
+            try:
+                self.redis_client.setex(KEY_PREFIX + key, settings.llm_cache_ttl_seconds, content)
+                return
+            except Exception as e:
+                logger.debug(f"Redis LLM cache write failed, using memory: {e}")
+
+        with self._lock:
+            self.memory_store[key] = (time.time() + settings.llm_cache_ttl_seconds, content)
+            self.memory_store.move_to_end(key)
+            while len(self.memory_store) > settings.llm_cache_max_entries:
+                self.memory_store.popitem(last=False)
+
+    def _prompt_vector(self, payload: Dict[str, Any]) -> Optional[np.ndarray]:
+        from .model_registry import model_registry
+
+        model = model_registry.get_sentence_encoder()
+        messages = payload.get("messages", [])
+        if model is None or not messages:
+            return None
+        vector = np.asarray(model.encode([normalize_text(messages[-1]["content"])]), dtype='float32')[0]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _semantic_lookup(self, payload: Dict[str, Any]) -> Optional[str]:
+        vector = self._prompt_vector(payload)
+        if vector is None:
+            return None
+        scope = self._scope_key(payload)
+        with self._lock:
+            candidates = [(key, v) for key, (s, v) in self.semantic_index.items() if s == scope]
+        if not candidates:
+            return None
+
+        keys: List[str] = [key for key, _ in candidates]
+        similarities = np.stack([v for _, v in candidates]) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < settings.llm_cache_semantic_threshold:
+            return None
+        return self._read(keys[best])
+
+    @staticmethod
+    def _semantic(operation: Optional[str]) -> bool:
+        return settings.llm_cache_semantic and operation in SEMANTIC_OPERATIONS
+
+    def get(self, payload: Dict[str, Any], operation: Optional[str] = None) -> Optional[str]:
+        """Cached response content for a chat completion payload, if any"""
+        if not settings.llm_cache_enabled:
+            return None
+
+        content = self._read(self.make_key(payload))
+        semantic_hit = False
+        if content is None and self._semantic(operation):
+            try:
+                content = self._semantic_lookup(payload)
+            except Exception as e:
+                logger.warning(f"⚠️ Semantic LLM cache lookup failed: {e}")
+            semantic_hit = content is not None
+
+        with self._lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.semantic_hits += semantic_hit
+        return content
+
+    def set(self, payload: Dict[str, Any], content: str, operation: Optional[str] = None):
+        """Store the response content for a chat completion payload"""
+        if not settings.llm_cache_enabled or not content:
+            return
+
+        key = self.make_key(payload)
+        self._write(key, content)
+
+        if self._semantic(operation):
+            try:
+                vector = self._prompt_vector(payload)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not embed prompt for semantic LLM cache: {e}")
+                vector = None
+            if vector is not None:
+                with self._lock:
+                    self.semantic_index[key] = (self._scope_key(payload), vector)
+                    while len(self.semantic_index) > settings.llm_cache_max_entries:
+                        self.semantic_index.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, semantic_hits, misses = self.hits, self.semantic_hits, self.misses
+            memory_entries, semantic_entries = len(self.memory_store), len(self.semantic_index)
+        lookups = hits + misses
+        return {
+            "enabled": settings.llm_cache_enabled,
+            "backend": "redis" if self.redis_client else "memory",
+            "hits": hits,
+            "semantic_hits": semantic_hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "semantic_entries": semantic_entries
+        }
+
+    def clear(self):
+        """Drop in-process entries and reset stats (Redis entries expire by TTL)"""
+        with self._lock:
+            self.memory_store.clear()
+            self.semantic_index.clear()
+            self.hits = self.semantic_hits = self.misses = 0
+
+
+# Global instance
+llm_cache = LLMCache()
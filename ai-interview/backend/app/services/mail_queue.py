@@ -0,0 +1,295 @@
+"""
+Mail Queue Service - Sends email in the background over persistent SMTP connections
+
+OTP and invite emails used to open a new SMTP connection (TCP, STARTTLS and
+login) inside the request that triggered them. Messages are now queued and the
+request returns at once; a few sender threads each keep one SMTP connection
+open, take whatever is queued (up to MAIL_BATCH_SIZE messages) and send it over
+that connection. A connection idle for SMTP_IDLE_TIMEOUT_SECONDS is closed, and
+one the server dropped is reopened. Temporary failures are retried with
+exponential backoff; permanent ones (a 5xx reply, refused recipients) are not.
+
+Queueing is not delivery: enqueue() returns a message id whose status
+(queued, retrying, sent or failed) can be read with status() in the process
+that queued it, and an optional callback is told the final outcome. The last
+STATUS_LIMIT statuses are kept.
+"""
+import logging
+import queue
+import random
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Delivery statuses kept for status(); the oldest are dropped beyond this
+STATUS_LIMIT = 10000
+
+
+class SMTPConfig(NamedTuple):
+    host: str
+    port: int
+    user: str
+    password: str
+    starttls: bool
+
+
+class MailMessage(NamedTuple):
+    id: str
+    config: SMTPConfig
+    sender: str
+    recipients: List[str]
+    data: str
+    attempts: int = 0
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Errors that will fail the same way on every retry"""
+    if isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPAuthenticationError)):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600
+
+
+class SMTPConnection:
+    """One SMTP connection, opened on first use and reused until idle or broken"""
+
+    def __init__(self):
+        self.server: Optional[smtplib.SMTP] = None
+        self.config: Optional[SMTPConfig] = None
+        self.last_used = 0.0
+
+    def get(self, config: SMTPConfig) -> smtplib.SMTP:
+        idle = time.time() - self.last_used
+        if self.server is not None and (config != self.config or idle > settings.smtp_idle_timeout_seconds):
+            self.close()
+        if self.server is None:
+            server = smtplib.SMTP(config.host, config.port, timeout=settings.smtp_timeout_seconds)
+            try:
+                if config.starttls:
+                    server.starttls(context=ssl.create_default_context())
+                if config.user:
+                    server.login(config.user, config.password)
+            except Exception:
+                server.close()
+                raise
+            self.server, self.config = server, config
+        self.last_used = time.time()
+        return self.server
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                self.server.close()
+        self.server = None
+
+
+class MailQueue:
+    """Background senders with pooled connections; start on first enqueue"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[MailMessage]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._retry_timers: Dict[str, Tuple[threading.Timer, MailMessage]] = {}
+        self._statuses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._callbacks: Dict[str, Callable[[str, Optional[str]], None]] = {}
+        self._stats = {"queued": 0, "sent": 0, "retried": 0, "failed": 0, "connections": 0, "batches": 0}
+
+    def _start(self):
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            for number in range(len(self._threads), max(1, settings.mail_queue_workers)):
+                thread = threading.Thread(target=self._run, name=f"mail-sender-{number}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def enqueue(self, config: SMTPConfig, sender: str, recipients: List[str], data: str,
+                on_result: Optional[Callable[[str, Optional[str]], None]] = None) -> str:
+        """Queue a message for delivery and return its id.
+
+        on_result(status, error) is called from a sender thread once the message
+        is "sent" or "failed".
+        """
+        message = MailMessage(uuid.uuid4().hex, config, sender, list(recipients), data)
+        self._start()
+        with self._lock:
+            self._stats["queued"] += 1
+            if on_result is not None:
+                self._callbacks[message.id] = on_result
+            self._set_status(message.id, "queued")
+        self._queue.put(message)
+        return message.id
+
+    def _set_status(self, message_id: str, status: str, attempts: int = 0, error: Optional[str] = None):
+        # Called with self._lock held
+        self._statuses[message_id] = {"status": status, "attempts": attempts, "error": error, "updated_at": time.time()}
+        self._statuses.move_to_end(message_id)
+        while len(self._statuses) > STATUS_LIMIT:
+            self._statuses.popitem(last=False)
+
+    def _finish(self, message: MailMessage, status: str, attempts: int, error: Optional[str] = None):
+        with self._lock:
+            self._stats[status] += 1
+            self._set_status(message.id, status, attempts, error)
+            callback = self._callbacks.pop(message.id, None)
+        if callback is not None:
+            try:
+                callback(status, error)
+            except Exception as e:
+                logger.error(f"❌ Delivery callback for email {message.id} failed: {e}")
+
+    def status(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """Delivery status of a message queued by this process, or None if unknown"""
+        with self._lock:
+            status = self._statuses.get(message_id)
+            return dict(status, id=message_id) if status else None
+
+    def _next_batch(self) -> Optional[List[MailMessage]]:
+        """Block for one message, then take whatever else is already queued (same SMTP server)"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        while len(batch) < settings.mail_batch_size:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if message is None or message.config != first.config:
+                # Stop signal or another server: put it back for the next batch
+                self._queue.task_done()
+                self._queue.put(message)
+                break
+            batch.append(message)
+        return batch
+
+    def _run(self):
+        connection = SMTPConnection()
+        while True:
+            try:
+                batch = self._next_batch()
+            except Exception as e:
+                logger.error(f"❌ Mail sender crashed while reading the queue: {e}")
+                continue
+            if batch is None:
+                connection.close()
+                self._queue.task_done()
+                return
+            self._count("batches")
+            for message in batch:
+                try:
+                    self._send(connection, message)
+                finally:
+                    self._queue.task_done()
+
+    def _send(self, connection: SMTPConnection, message: MailMessage):
+        try:
+            # One reconnect for a connection the server closed while it sat idle
+            for attempt in range(2):
+                previous, opened = connection.server, True
+                try:
+                    server = connection.get(message.config)
+                    opened = server is not previous
+                    if opened:
+                        self._count("connections")
+                    server.sendmail(message.sender, message.recipients, message.data)
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    connection.close()
+                    if attempt or opened:
+                        raise
+            self._finish(message, "sent", message.attempts + 1)
+        except Exception as e:
+            # A rejected message leaves the session usable; anything else may have broken it
+            if not isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+                connection.close()
+            self._retry_or_fail(message, e)
+
+    def _retry_or_fail(self, message: MailMessage, error: Exception):
+        attempts = message.attempts + 1
+        if _is_permanent(error) or attempts > settings.mail_max_retries:
+            logger.error(f"❌ Email {message.id} to {', '.join(message.recipients)} failed after "
+                         f"{attempts} attempt(s): {error}")
+            self._finish(message, "failed", attempts, str(error))
+            return
+
+        delay = settings.mail_retry_backoff_seconds * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+        logger.warning(f"⚠️ Email {message.id} to {', '.join(message.recipients)} failed ({error}), "
+                       f"retrying in {delay:.1f}s")
+        retry = message._replace(attempts=attempts)
+        with self._lock:
+            self._stats["retried"] += 1
+            self._set_status(message.id, "retrying", attempts, str(error))
+
+        # The message stays pending for flush() until its retry is back in the queue
+        with self._queue.mutex:
+            self._queue.unfinished_tasks += 1
+        timer = threading.Timer(delay, self._requeue, args=(retry,))
+        timer.daemon = True
+        with self._lock:
+            self._retry_timers[retry.id] = (timer, retry)
+        timer.start()
+
+    def _requeue(self, message: MailMessage):
+        with self._lock:
+            if self._retry_timers.pop(message.id, None) is None:
+                return  # Cancelled by shutdown()
+        self._queue.put(message)
+        # put() added a task; drop the placeholder added when the retry was scheduled
+        self._queue.task_done()
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until every queued message (and scheduled retry) is sent or failed"""
+        deadline = time.time() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "pending": self._queue.qsize(),
+                "retry_scheduled": len(self._retry_timers),
+                "workers": sum(1 for thread in self._threads if thread.is_alive())
+            }
+
+    def shutdown(self, timeout: float = 10.0):
+        """Deliver what is queued (up to timeout), then stop the senders and close their connections"""
+        if not self._threads:
+            return
+        if not self.flush(timeout):
+            logger.warning(f"⚠️ Mail queue shut down with {self._queue.qsize()} unsent messages")
+        with self._lock:
+            threads, self._threads = self._threads, []
+            timers, self._retry_timers = list(self._retry_timers.values()), {}
+        # Retries not yet due will never run: stop their timers and report them as failed
+        for timer, message in timers:
+            timer.cancel()
+            self._finish(message, "failed", message.attempts, "Shut down before the retry was sent")
+            self._queue.task_done()
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout=2)
+
+
+# Global instance
+mail_queue = MailQueue()
@@ -0,0 +1,205 @@
+"""
+Metrics Service - Prometheus metrics for requests, DB queries, Groq calls and vector search
+
+Request latency and per-request DB query counts come from an HTTP middleware and
+SQLAlchemy cursor events; services record their own timings with the helpers
+below. With several worker processes set PROMETHEUS_MULTIPROC_DIR so /metrics
+aggregates all of them.
+
+The same middleware keeps each request's statements in an SQLTrace, which the
+SQL tracer uses for N+1 warnings and the X-DB-* headers.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event
+
+from ..config import settings
+from . import sql_tracer
+from .sql_tracer import SQLTrace
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    logger.warning("⚠️ prometheus_client not installed, /metrics is disabled")
+
+
+class _NoopMetric:
+    """Stands in for a metric when prometheus_client is missing"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, *args, **kwargs):
+        pass
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def set(self, *args, **kwargs):
+        pass
+
+
+def _metric(kind: str, *args, **kwargs):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return {"counter": Counter, "gauge": Gauge, "histogram": Histogram}[kind](*args, **kwargs)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+HTTP_REQUESTS = _metric("counter", "http_requests_total", "HTTP requests", ["method", "route", "status"])
+HTTP_LATENCY = _metric("histogram", "http_request_duration_seconds", "HTTP request latency",
+                       ["method", "route"], buckets=LATENCY_BUCKETS)
+DB_QUERIES_PER_REQUEST = _metric("histogram", "db_queries_per_request", "SQL statements executed per request",
+                                 ["route"], buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250))
+DB_TIME_PER_REQUEST = _metric("histogram", "db_time_per_request_seconds", "Time spent in SQL per request",
+                              ["route"], buckets=LATENCY_BUCKETS)
+DB_QUERY_LATENCY = _metric("histogram", "db_query_duration_seconds", "SQL statement latency",
+                           buckets=LATENCY_BUCKETS)
+GROQ_LATENCY = _metric("histogram", "groq_request_duration_seconds", "Groq API call latency",
+                       ["operation", "model"], buckets=LLM_BUCKETS)
+GROQ_ERRORS = _metric("counter", "groq_errors_total", "Failed Groq API calls", ["operation"])
+GROQ_TOKENS = _metric("counter", "groq_tokens_total", "Groq tokens used", ["operation", "kind"])
+VECTOR_SEARCH_LATENCY = _metric("histogram", "vector_search_duration_seconds", "Vector store search latency",
+                                ["index_type"], buckets=LATENCY_BUCKETS)
+QUEUE_DEPTH = _metric("gauge", "queue_depth", "Items waiting in background queues", ["queue"],
+                      multiprocess_mode="livesum")
+ACTIVE_SESSIONS = _metric("gauge", "active_interview_sessions", "Interview sessions in progress",
+                          multiprocess_mode="livemax")
+
+_active_sessions_fn: Optional[Callable[[], int]] = None
+
+# SQL statements, time and signatures for the request being handled
+_request_db_stats: ContextVar[Optional[SQLTrace]] = ContextVar("request_db_stats", default=None)
+
+
+def current_sql_trace() -> Optional[SQLTrace]:
+    return _request_db_stats.get()
+
+
+@contextmanager
+def sql_trace_scope(trace: SQLTrace):
+    """Count statements executed inside the block against trace"""
+    token = _request_db_stats.set(trace)
+    try:
+        yield trace
+    finally:
+        _request_db_stats.reset(token)
+
+
+def observe_groq_call(operation: str, model: str, seconds: float, prompt_tokens: int = 0, completion_tokens: int = 0):
+    GROQ_LATENCY.labels(operation, model).observe(seconds)
+    if prompt_tokens:
+        GROQ_TOKENS.labels(operation, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        GROQ_TOKENS.labels(operation, "completion").inc(completion_tokens)
+
+
+def observe_groq_error(operation: str):
+    GROQ_ERRORS.labels(operation).inc()
+
+
+def observe_vector_search(index_type: str, seconds: float):
+    VECTOR_SEARCH_LATENCY.labels(index_type or "flat").observe(seconds)
+
+
+def set_queue_depth(queue: str, depth: int):
+    QUEUE_DEPTH.labels(queue).set(depth)
+
+
+def register_active_sessions(count_fn: Callable[[], int]):
+    """Report the active session count by calling count_fn at scrape time"""
+    global _active_sessions_fn
+    _active_sessions_fn = count_fn
+
+
+def instrument_engine(engine):
+    """Time every SQL statement and count it against the current request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERY_LATENCY.observe(elapsed)
+        trace = _request_db_stats.get()
+        if trace is not None:
+            trace.record(statement, elapsed)
+
+
+def _route_template(request: Request) -> str:
+    """Route path with parameters (/session/{session_id}/speech) to keep label cardinality low"""
+    route = request.scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if not path_format:
+        return "unmatched"
+
+    # Newer FastAPI versions report the route relative to its router; add back the static prefix
+    path = request.scope.get("path", "")
+    for i, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[i:]):
+            return path[:i] + path_format
+    return path_format
+
+
+async def metrics_middleware(request: Request, call_next):
+    # Signatures are only needed for N+1 detection
+    trace = SQLTrace(signatures=settings.sql_trace_enabled)
+    token = _request_db_stats.set(trace)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        _request_db_stats.reset(token)
+        if settings.metrics_enabled:
+            route = _route_template(request)
+            HTTP_REQUESTS.labels(request.method, route, str(status)).inc()
+            HTTP_LATENCY.labels(request.method, route).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(trace.count)
+            DB_TIME_PER_REQUEST.labels(route).observe(trace.seconds)
+        if settings.sql_trace_enabled:
+            sql_tracer.report(trace, f"{request.method} {request.url.path}")
+
+    if settings.sql_trace_headers:
+        response.headers["X-DB-Query-Count"] = str(trace.count)
+        response.headers["X-DB-Time-Ms"] = f"{trace.total_ms:.1f}"
+        response.headers["X-DB-Max-Repeats"] = str(trace.max_repeats())
+    return response
+
+
+def metrics_response() -> Response:
+    """Render all metrics in the Prometheus text format"""
+    if not PROMETHEUS_AVAILABLE:
+        return Response("prometheus_client is not installed\n", status_code=503, media_type="text/plain")
+
+    if _active_sessions_fn is not None:
+        try:
+            ACTIVE_SESSIONS.set(_active_sessions_fn())
+        except Exception as e:
+            logger.warning(f"⚠️ Could not count active sessions: {str(e)}")
+
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=multiproc_dir)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
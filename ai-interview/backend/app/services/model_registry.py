@@ -0,0 +1,163 @@
+"""
+Process-wide registry for heavyweight ML models.
+
+Models are loaded lazily on first use and shared by every service in the
+process, so importing a module never pays the load cost and a worker never
+holds two copies of the same model.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_ENCODER = "sentence_encoder"
+
+
+EMBEDDING_DIMENSION = 384  # all-MiniLM-L6-v2; every backend must match it
+
+EMBEDDING_BACKENDS = ("sentence-transformers", "onnx", "onnx-int8")
+
+
+def load_local_sentence_encoder():
+    """Load the sentence encoder into this process using the configured backend"""
+    backend = settings.embedding_backend
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected one of {EMBEDDING_BACKENDS}")
+
+    if backend == "sentence-transformers":
+        from .startup_config import configure_ssl_for_sentence_transformers
+        configure_ssl_for_sentence_transformers()
+
+        from sentence_transformers import SentenceTransformer
+        encoder = SentenceTransformer(settings.embedding_model_name)
+    else:
+        from .onnx_encoder import OnnxSentenceEncoder
+        encoder = OnnxSentenceEncoder(
+            settings.onnx_model_dir,
+            quantized=backend == "onnx-int8",
+            intra_op_threads=settings.onnx_intra_op_threads
+        )
+
+    # Read from the model config / graph: no inference here, this may run in a pre-fork master
+    dimension = encoder.get_sentence_embedding_dimension()
+    if dimension is not None and dimension != EMBEDDING_DIMENSION:
+        raise ValueError(f"{backend} encoder produces {dimension}-d vectors, expected {EMBEDDING_DIMENSION}")
+    return encoder
+
+
+def _load_sentence_encoder():
+    """Use the shared embedding server when configured, otherwise a local model"""
+    if settings.embedding_server_url:
+        from .embedding_server import EmbeddingClient
+        return EmbeddingClient(settings.embedding_server_url)
+    return load_local_sentence_encoder()
+
+
+def _warm_up_sentence_encoder(model):
+    """Run one tiny encode so lazy kernels and thread pools are initialized"""
+    model.encode(["warm up"])
+
+
+class ModelRegistry:
+    """Lazily loads named models once per process and hands out the shared instance"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._warmers: Dict[str, Callable[[Any], None]] = {}
+        self._models: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any],
+                 warmer: Optional[Callable[[Any], None]] = None):
+        """Register a loader (and optional warm-up function) for a model name"""
+        self._loaders[name] = loader
+        if warmer:
+            self._warmers[name] = warmer
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return the shared model instance, loading it on first use.
+
+        Returns None if the model could not be loaded; the failure is logged
+        once and not retried, so callers can degrade gracefully.
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors:
+                return None
+
+            start = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._errors[name] = str(e)
+                logger.warning(f"⚠️ Could not load model '{name}': {str(e)}")
+                return None
+
+            self._load_seconds[name] = time.perf_counter() - start
+            self._models[name] = model
+            logger.info(f"✅ Loaded model '{name}' in {self._load_seconds[name]:.2f}s")
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def load_all(self, names: Optional[List[str]] = None):
+        """Load models without running inference.
+
+        Safe to call in a pre-fork master process: weights are shared with
+        forked workers copy-on-write, while inference thread pools are only
+        created after the fork.
+        """
+        for name in names or list(self._loaders):
+            self.get(name)
+
+    def warm_up(self, names: Optional[List[str]] = None) -> Dict[str, float]:
+        """Load models and run a dummy inference, returning seconds spent per model"""
+        timings = {}
+        for name in names or list(self._loaders):
+            start = time.perf_counter()
+            model = self.get(name)
+            if model is not None and name in self._warmers:
+                try:
+                    self._warmers[name](model)
+                except Exception as e:
+                    logger.warning(f"⚠️ Warm-up failed for model '{name}': {str(e)}")
+            timings[name] = time.perf_counter() - start
+        return timings
+
+    def warm_up_in_background(self, names: Optional[List[str]] = None) -> threading.Thread:
+        """Warm models in a daemon thread so startup is not blocked"""
+        thread = threading.Thread(target=self.warm_up, args=(names,), name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def get_sentence_encoder(self):
+        return self.get(SENTENCE_ENCODER)
+
+    def status(self) -> Dict[str, Any]:
+        """Loaded state, load time and last error for every registered model"""
+        return {
+            name: {
+                "loaded": name in self._models,
+                "load_seconds": round(self._load_seconds[name], 3) if name in self._load_seconds else None,
+                "error": self._errors.get(name)
+            }
+            for name in self._loaders
+        }
+
+
+# Global registry instance
+model_registry = ModelRegistry()
+model_registry.register(SENTENCE_ENCODER, _load_sentence_encoder, _warm_up_sentence_encoder)
@@ -0,0 +1,186 @@
+"""
+OTP Store - Verification codes with expiry, attempt counters and send rate limits
+
+Codes are kept in Redis so every worker sees the same code, attempt count and
+send count; each operation is a single Lua script, so concurrent requests
+cannot both pass a limit. When Redis is unavailable a bounded in-memory store
+with the same rules is used instead (per process, so multi-worker deployments
+need Redis). Expired entries are swept from it every OTP_SWEEP_INTERVAL_SECONDS
+and the oldest are dropped beyond OTP_MEMORY_MAX_ENTRIES.
+
+Per email and invite: at most OTP_SEND_LIMIT codes per OTP_SEND_WINDOW_SECONDS,
+and a code is discarded after OTP_MAX_ATTEMPTS wrong guesses.
+"""
+import hmac
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from ..config import settings
+from ..database import get_redis
+
+logger = logging.getLogger(__name__)
+
+CODE_PREFIX = "otp:"
+ATTEMPTS_PREFIX = "otp_attempts:"
+SENDS_PREFIX = "otp_sends:"
+
+# Verification outcomes
+VALID, INVALID, MISSING, LOCKED = "valid", "invalid", "missing", "locked"
+
+# KEYS: code, attempts, sends. ARGV: code, ttl, window, send limit. Returns seconds to wait (0 = stored)
+ISSUE_SCRIPT = """
+local sends = redis.call('INCR', KEYS[3])
+if sends == 1 then redis.call('EXPIRE', KEYS[3], ARGV[3]) end
+if sends > tonumber(ARGV[4]) then
+    return math.max(redis.call('TTL', KEYS[3]), 1)
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('DEL', KEYS[2])
+return 0
+"""
+
+# KEYS: code, attempts. ARGV: provided code, max attempts. Returns 1 valid, 0 invalid, -1 missing, -2 locked
+VERIFY_SCRIPT = """
+local code = redis.call('GET', KEYS[1])
+if not code then return -1 end
+if code == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 1
+end
+local attempts = redis.call('INCR', KEYS[2])
+if attempts == 1 then redis.call('PEXPIRE', KEYS[2], math.max(redis.call('PTTL', KEYS[1]), 1)) end
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return -2
+end
+return 0
+"""
+
+VERIFY_RESULTS = {1: VALID, 0: INVALID, -1: MISSING, -2: LOCKED}
+
+
+class OTPRateLimited(Exception):
+    """Too many codes requested, or too many wrong codes entered"""
+
+    def __init__(self, message: str, retry_after: int = 0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class MemoryOTPStore:
+    """Bounded in-process store with the same rules as the Redis scripts"""
+
+    def __init__(self):
+        self.codes: "OrderedDict[str, List]" = OrderedDict()  # key -> [expires, code, wrong attempts]
+        self.sends: "OrderedDict[str, List]" = OrderedDict()  # key -> [window end, codes sent]
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def _sweep(self, now: float):
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + settings.otp_sweep_interval_seconds
+        for store in (self.codes, self.sends):
+            for key in [key for key, value in store.items() if value[0] <= now]:
+                del store[key]
+
+    @staticmethod
+    def _bound(store: OrderedDict):
+        while len(store) > settings.otp_memory_max_entries:
+            store.popitem(last=False)
+
+    def issue(self, key: str, code: str) -> int:
+        """Store a code unless the send limit is reached; returns seconds to wait (0 = stored)"""
+        now = time.time()
+        with self._lock:
+            self._sweep(now)
+            window = self.sends.get(key)
+            if window is None or window[0] <= now:
+                window = self.sends[key] = [now + settings.otp_send_window_seconds, 0]
+            if window[1] >= settings.otp_send_limit:
+                return max(math.ceil(window[0] - now), 1)
+            window[1] += 1
+            self.sends.move_to_end(key)
+            self.codes[key] = [now + settings.otp_ttl_seconds, code, 0]
+            self.codes.move_to_end(key)
+            self._bound(self.sends)
+            self._bound(self.codes)
+            return 0
+
+    def verify(self, key: str, code: str) -> str:
+        now = time.time()
+        with self._lock:
+            self._sweep(now)
+            entry = self.codes.get(key)
+            if entry is None or entry[0] <= now:
+                self.codes.pop(key, None)
+                return MISSING
+            if hmac.compare_digest(entry[1].encode(), code.encode()):
+                del self.codes[key]
+                return VALID
+            entry[2] += 1
+            if entry[2] >= settings.otp_max_attempts:
+                del self.codes[key]
+                return LOCKED
+            return INVALID
+
+
+class OTPStore:
+    """Redis-backed OTP store, falling back to memory when Redis is unavailable"""
+
+    def __init__(self):
+        try:
+            self.redis_client = get_redis()
+        except Exception as e:
+            print(f"Redis connection failed, keeping OTP codes in memory: {e}")
+            self.redis_client = None
+        self.memory = MemoryOTPStore()
+        self._issue_script = self.redis_client.register_script(ISSUE_SCRIPT) if self.redis_client else None
+        self._verify_script = self.redis_client.register_script(VERIFY_SCRIPT) if self.redis_client else None
+
+    @staticmethod
+    def _key(email: str, invite_id: int) -> str:
+        return f"{email}:{invite_id}"
+
+    def issue(self, email: str, invite_id: int, code: str):
+        """Store a new code, replacing the previous one; raises OTPRateLimited past the send limit"""
+        key = self._key(email, invite_id)
+        retry_after: Optional[int] = None
+        if self.redis_client:
+            try:
+                retry_after = int(self._issue_script(
+                    keys=[CODE_PREFIX + key, ATTEMPTS_PREFIX + key, SENDS_PREFIX + key],
+                    args=[code, settings.otp_ttl_seconds, settings.otp_send_window_seconds, settings.otp_send_limit]
+                ))
+            except Exception as e:
+                logger.debug(f"Redis OTP write failed, using memory: {e}")
+        if retry_after is None:
+            retry_after = self.memory.issue(key, code)
+        if retry_after:
+            raise OTPRateLimited(f"Too many codes requested; try again in {retry_after} seconds", retry_after)
+
+    def verify(self, email: str, invite_id: int, code: str) -> bool:
+        """Check a code (used once); raises OTPRateLimited when this guess used up the attempts"""
+        key = self._key(email, invite_id)
+        result = None
+        if self.redis_client:
+            try:
+                result = VERIFY_RESULTS[int(self._verify_script(
+                    keys=[CODE_PREFIX + key, ATTEMPTS_PREFIX + key], args=[code, settings.otp_max_attempts]
+                ))]
+            except Exception as e:
+                logger.debug(f"Redis OTP verify failed, checking memory: {e}")
+        if result in (None, MISSING):
+            # Codes stored in memory while Redis was down
+            result = self.memory.verify(key, code)
+        if result == LOCKED:
+            raise OTPRateLimited("Too many incorrect codes; request a new one")
+        return result == VALID
+
+
+# Global instance
+otp_store = OTPStore()
@@ -0,0 +1,247 @@
+"""
+Profiler Service - Opt-in per-request profiles for slow endpoints
+
+A request is profiled when it carries the PROFILE_HEADER header or is picked by
+PROFILE_SAMPLE_RATE. A background thread samples the Python stacks that run app
+code (sync endpoints execute in a worker thread, so cProfile on the event loop
+would miss them) and every SQL statement is timed. Profiles are stored as JSON
+under PROFILE_STORAGE_PATH and served from the admin API.
+
+Only one request is profiled at a time; other requests running concurrently can
+show up in the samples when they execute app code.
+"""
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}_[0-9a-f]{8}$")
+TOP_FUNCTIONS = 30
+TOP_STATEMENTS = 20
+
+# SQL statements executed by the request being profiled
+_profiled_sql: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("profiled_sql", default=None)
+
+
+class StackSampler:
+    """Samples the stacks of threads running app code at a fixed interval"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                in_app = False
+                while frame is not None:
+                    code = frame.f_code
+                    in_app = in_app or code.co_filename.startswith(APP_DIR)
+                    stack.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                # Threads that are not executing app code are idle or serving something else
+                if in_app:
+                    self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(APP_DIR):
+        return "app" + filename[len(APP_DIR):]
+    parts = filename.replace("\\", "/").split("/")
+    if "site-packages" in parts:
+        return "/".join(parts[parts.index("site-packages") + 1:])
+    return "/".join(parts[-2:])
+
+
+def _summarize_stacks(stacks: Counter, interval_ms: float) -> Dict[str, Any]:
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for stack, count in stacks.items():
+        self_counts[stack[-1]] += count
+        for function in set(stack):
+            total_counts[function] += count
+
+    def rows(counts: Counter):
+        return [
+            {"function": function, "samples": count, "ms": round(count * interval_ms, 1)}
+            for function, count in counts.most_common(TOP_FUNCTIONS)
+        ]
+
+    return {
+        "top_self": rows(self_counts),
+        "top_cumulative": rows(total_counts),
+        # Collapsed stacks, the input format of flamegraph.pl and speedscope
+        "collapsed": "\n".join(f"{';'.join(stack)} {count}" for stack, count in stacks.most_common())
+    }
+
+
+def _summarize_sql(statements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for statement in statements:
+        entry = grouped.setdefault(statement["sql"], {"sql": statement["sql"], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += statement["ms"]
+        entry["max_ms"] = max(entry["max_ms"], statement["ms"])
+
+    top = sorted(grouped.values(), key=lambda entry: entry["total_ms"], reverse=True)[:TOP_STATEMENTS]
+    for entry in top:
+        entry["total_ms"] = round(entry["total_ms"], 2)
+        entry["max_ms"] = round(entry["max_ms"], 2)
+    return {
+        "count": len(statements),
+        "total_ms": round(sum(statement["ms"] for statement in statements), 2),
+        "statements": top
+    }
+
+
+class RequestProfiler:
+    """Decides which requests to profile and stores the results"""
+
+    def __init__(self):
+        self._active = threading.Lock()
+
+    def should_profile(self, request: Request) -> bool:
+        if not settings.profiling_enabled:
+            return False
+        if request.headers.get(settings.profile_header):
+            return True
+        return settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+
+    def instrument_engine(self, engine):
+        """Time SQL statements for the request being profiled"""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if _profiled_sql.get() is not None:
+                conn.info.setdefault("profile_start_time", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements = _profiled_sql.get()
+            if statements is not None and conn.info.get("profile_start_time"):
+                elapsed = time.perf_counter() - conn.info["profile_start_time"].pop()
+                statements.append({"sql": " ".join(statement.split()), "ms": elapsed * 1000})
+
+    async def middleware(self, request: Request, call_next):
+        if not self.should_profile(request) or not self._active.acquire(blocking=False):
+            return await call_next(request)
+
+        statements: List[Dict[str, Any]] = []
+        token = _profiled_sql.set(statements)
+        sampler = StackSampler(settings.profile_interval_ms / 1000)
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        status = 500
+        sampler.start()
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            sampler.stop()
+            duration_ms = (time.perf_counter() - start) * 1000
+            _profiled_sql.reset(token)
+            self._active.release()
+            try:
+                profile_id = self.save(request, status, started_at, duration_ms, sampler, statements)
+            except Exception as e:
+                profile_id = None
+                logger.warning(f"⚠️ Could not store request profile: {str(e)}")
+
+        if profile_id:
+            response.headers["X-Profile-Id"] = profile_id
+        return response
+
+    def save(self, request: Request, status: int, started_at: datetime, duration_ms: float,
+             sampler: StackSampler, statements: List[Dict[str, Any]]) -> str:
+        profile_id = f"{started_at.strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        profile = {
+            "id": profile_id,
+            "method": request.method,
+            "path": request.url.path,
+            "status": status,
+            "started_at": started_at.isoformat(),
+            "duration_ms": round(duration_ms, 1),
+            "interval_ms": settings.profile_interval_ms,
+            "samples": sampler.samples,
+            "sql": _summarize_sql(statements),
+            **_summarize_stacks(sampler.stacks, settings.profile_interval_ms)
+        }
+
+        os.makedirs(settings.profile_storage_path, exist_ok=True)
+        with open(self._path(profile_id), "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        self._prune()
+        logger.info(f"Profiled {request.method} {request.url.path}: {duration_ms:.0f} ms, "
+                    f"{len(statements)} SQL statements -> {profile_id}")
+        return profile_id
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(settings.profile_storage_path, f"{profile_id}.json")
+
+    def _prune(self):
+        """Keep only the newest PROFILE_MAX_FILES profiles"""
+        files = sorted(f for f in os.listdir(settings.profile_storage_path) if f.endswith(".json"))
+        for name in files[:-settings.profile_max_files] if settings.profile_max_files > 0 else []:
+            os.remove(os.path.join(settings.profile_storage_path, name))
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Stored profiles, newest first, without the stack and SQL details"""
+        if not os.path.isdir(settings.profile_storage_path):
+            return []
+        profiles = []
+        for name in sorted(os.listdir(settings.profile_storage_path), reverse=True):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(settings.profile_storage_path, name), encoding="utf-8") as f:
+                    profile = json.load(f)
+            except (OSError, ValueError):
+                continue
+            summary = {key: profile[key] for key in ("id", "method", "path", "status", "started_at", "duration_ms", "samples")}
+            summary["sql_count"] = profile["sql"]["count"]
+            summary["sql_ms"] = profile["sql"]["total_ms"]
+            profiles.append(summary)
+        return profiles
+
+    def get_path(self, profile_id: str) -> Optional[str]:
+        """File of a stored profile, or None for unknown or malformed ids"""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self._path(profile_id)
+        return path if os.path.exists(path) else None
+
+
+# Global instance
+request_profiler = RequestProfiler()
@@ -0,0 +1,106 @@
+"""
+Question Bank Service - Retrieves curated interview questions by similarity
+
+Questions live in a JSON file keyed by the question context type from
+InterviewStructure ("introduction_followup", "technology", "mixed"). Each
+section is embedded once into its own VectorStore; the next question is the
+one most similar to the job description and the candidate's last answer that
+has not already been asked.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from ..config import settings
+from .model_registry import model_registry
+from .vectorstore import VectorStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "question_bank.json")
+QUERY_CHARS = 1000  # Per input (JD, answer); the encoder truncates long inputs anyway
+
+
+class QuestionBank:
+    """Curated questions per interview section, retrieved by embedding similarity"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.question_bank_path or DEFAULT_BANK_PATH
+        self.stores: Dict[str, VectorStore] = {}
+        self.question_vectors: Dict[str, np.ndarray] = {}  # Question text alone, for duplicate checks
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self) -> bool:
+        """Read and embed the bank once; returns False if no encoder is available"""
+        if self._loaded:
+            return True
+        with self._lock:
+            if self._loaded:
+                return True
+            model = model_registry.get_sentence_encoder()
+            if model is None:
+                return False
+
+            with open(self.path, encoding="utf-8") as f:
+                bank = json.load(f)
+
+            for section, entries in bank.items():
+                store = VectorStore()
+                # Embed the question together with its topics so JD keywords match
+                store.add_documents(
+                    [f"{e['question']} Topics: {', '.join(e.get('topics', []))}" for e in entries],
+                    [{"section": section, "question": e["question"], "topics": e.get("topics", [])} for e in entries]
+                )
+                self.stores[section] = store
+                question_vectors = np.ascontiguousarray(model.encode([e["question"] for e in entries]), dtype='float32')
+                faiss.normalize_L2(question_vectors)
+                self.question_vectors[section] = question_vectors
+
+            self._loaded = True
+            logger.info(f"✅ Question bank loaded: {sum(s.ntotal for s in self.stores.values())} questions")
+            return True
+
+    def select_question(self, section: str, job_description: str = "", last_answer: str = "",
+                        asked_questions: List[str] = None) -> Optional[Dict]:
+        """Most relevant unasked question for the section, or None if there is none to offer"""
+        if not self._load():
+            return None
+        store = self.stores.get(section)
+        if store is None or store.ntotal == 0:
+            return None
+
+        asked_questions = [q for q in (asked_questions or []) if q]
+        asked = {q.strip().lower() for q in asked_questions}
+        query = "\n".join(part[:QUERY_CHARS] for part in (job_description, last_answer) if part) or section
+
+        # One encoder call for the query and every question already asked
+        vectors = np.ascontiguousarray(store.model.encode([query] + asked_questions), dtype='float32')
+        faiss.normalize_L2(vectors)
+        query_vector, asked_vectors = vectors[:1], vectors[1:]
+
+        store._ensure_index()
+        scores, indices = store.index.search(query_vector, store.ntotal)
+        for score, idx in zip(scores[0], indices[0]):
+            if idx < 0:
+                continue
+            _, metadata = store.get_record(int(idx))
+            if metadata["question"].strip().lower() in asked:
+                continue
+            # Rephrased questions won't match verbatim, so also skip near-duplicates
+            if len(asked_vectors):
+                similarity = float((asked_vectors @ self.question_vectors[section][idx]).max())
+                if similarity >= settings.question_bank_dedupe_threshold:
+                    continue
+            return {**metadata, "score": float(score)}
+
+        return None
+
+
+# Global instance
+question_bank = QuestionBank()
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 import logging
 
 # Try to import the complex vectorstore first, fallback to simple one
@@ -11,85 +11,39 @@ except ImportError as e:
     logger = logging.getLogger(__name__)
     logger.warning(f"⚠️ Using simple vectorstore due to import error: {str(e)}")
 
+from ..config import settings
 from .groq_client import groq_client
 from .interview_structure import interview_structure
+from .resume_index import resume_index
+
+try:
+    from .question_bank import question_bank
+except ImportError as e:
+    question_bank = None
+    logger.warning(f"⚠️ Question bank unavailable, questions will be generated by the LLM: {str(e)}")
 
 
 class RAGService:
     def __init__(self):
         self.vector_store = vector_store
         self.groq_client = groq_client
+        self.question_bank = question_bank
         logger.info("RAG Service initialized successfully")
         
-    def prepare_context(self, job_description: str, resume_text: str = ""):
-        """Prepare and index context documents for RAG"""
-        documents = []
-        metadata = []
-        
-        # Add job description
-        if job_description.strip():
-            documents.append(job_description)
-            metadata.append({'type': 'job_description'})
-        
-        # Add resume if provided
-        if resume_text.strip():
-            # Split resume into sections for better retrieval
-            resume_sections = self._split_resume(resume_text)
-            for section_name, section_text in resume_sections.items():
-                if section_text.strip():
-                    documents.append(section_text)
-                    metadata.append({'type': 'resume', 'section': section_name})
-        
-        # Add to vector store
-        if documents:
-            self.vector_store.add_documents(documents, metadata)
-    
-    def _split_resume(self, resume_text: str) -> Dict[str, str]:
-        """Split resume into logical sections"""
-        # TODO: Implement more sophisticated resume section detection
-        sections = {
-            'full_resume': resume_text
-        }
-        
-        lines = resume_text.split('\n')
-        current_section = 'summary'
-        section_content = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Detect section headers
-            lower_line = line.lower()
-            if any(keyword in lower_line for keyword in ['experience', 'employment', 'work history']):
-                if section_content:
-                    sections[current_section] = '\n'.join(section_content)
-                current_section = 'experience'
-                section_content = []
-            elif any(keyword in lower_line for keyword in ['education', 'qualification', 'degree']):
-                if section_content:
-                    sections[current_section] = '\n'.join(section_content)
-                current_section = 'education'
-                section_content = []
-            elif any(keyword in lower_line for keyword in ['skill', 'technical', 'competenc']):
-                if section_content:
-                    sections[current_section] = '\n'.join(section_content)
-                current_section = 'skills'
-                section_content = []
-            else:
-                section_content.append(line)
-        
-        # Add the last section
-        if section_content:
-            sections[current_section] = '\n'.join(section_content)
-        
-        return sections
+    def prepare_context(self, job_description: str, resume_text: str = "", candidate_id: Optional[int] = None):
+        """Index the candidate's resume passages that follow-up questions retrieve from
+
+        Follow-ups search only resume_index, so the job description (passed whole in every
+        prompt) and resumes without a candidate are not embedded.
+        """
+        if candidate_id and resume_text.strip():
+            resume_index.index_candidate(candidate_id, resume_text)
     
-    def generate_initial_question(self, job_description: str, resume_text: str = "") -> str:
+    def generate_initial_question(self, job_description: str, resume_text: str = "",
+                                  candidate_id: Optional[int] = None) -> str:
         """Generate first interview question using RAG"""
         # Prepare context
-        self.prepare_context(job_description, resume_text)
+        self.prepare_context(job_description, resume_text, candidate_id)
         
         # Use GROQ to generate initial question
         return self.groq_client.generate_initial_question(job_description, resume_text)
@@ -99,14 +53,15 @@ class RAGService:
         return self.vector_store.search(query, k=k)
     
     def generate_followup_question(self, current_question: str, candidate_answer: str, 
-                                 job_context: str, question_number: int = 2, conversation_history: List[Dict] = None) -> Dict[str, Any]:
-        """Generate follow-up question with context based on interview structure"""
-        # Get relevant context
-        context_docs = self.get_relevant_context(candidate_answer)
-        
-        # Build context string
-        context_text = "\n".join([doc['document'] for doc in context_docs[:2]])
-        
+                                 job_context: str, question_number: int = 2, conversation_history: List[Dict] = None,
+                                 score_answer: bool = True, conversation_summary: str = None,
+                                 candidate_id: Optional[int] = None,
+                                 summarize_history: Optional[Callable[[], Optional[str]]] = None) -> Dict[str, Any]:
+        """Generate follow-up question with context based on interview structure
+
+        summarize_history, if given, produces conversation_summary; it is only called when the
+        question is generated by the LLM, since the question bank path does not use a summary.
+        """
         # Get question context based on interview structure
         next_question_number = question_number + 1
         question_context = interview_structure.get_question_context(
@@ -116,6 +71,28 @@ class RAGService:
         # Define evaluation criteria
         criteria = "System Design, Technical Evidence, Clarity, Problem-solving approach, Job requirement alignment"
         
+        if settings.question_source == "bank":
+            evaluation = self._followup_from_bank(
+                criteria, current_question, candidate_answer, job_context,
+                question_context, conversation_history, score_answer
+            )
+            if evaluation is not None:
+                return evaluation
+        
+        if conversation_summary is None and summarize_history is not None:
+            conversation_summary = summarize_history()
+        
+        # Resume passages related to the answer; only this candidate's resume is searched
+        resume_context = None
+        if candidate_id:
+            passages = resume_index.search(candidate_id, candidate_answer, k=settings.rag_context_chunks)
+            resume_context = "\n---\n".join(passage['document'] for passage in passages) or None
+        
+        # Turns covered by the summary are not repeated verbatim
+        if conversation_summary and conversation_history:
+            recent_count = settings.history_recent_turns
+            conversation_history = conversation_history[-recent_count:] if recent_count else []
+        
         # Use GROQ to evaluate and generate follow-up with structured context
         return self.groq_client.chat_followup_json(
             criteria, 
@@ -123,8 +100,43 @@ class RAGService:
             candidate_answer,
             job_context,  # Pass job description for better evaluation
             question_context,  # Pass structured question context
-            conversation_history  # Pass conversation history to avoid repetition
+            conversation_history,  # Pass conversation history to avoid repetition
+            conversation_summary,  # Compact summary of earlier turns
+            resume_context  # Small resume passages instead of the whole resume
         )
+    
+    def _followup_from_bank(self, criteria: str, current_question: str, candidate_answer: str, job_context: str,
+                            question_context: Dict, conversation_history: List[Dict] = None,
+                            score_answer: bool = True) -> Dict[str, Any]:
+        """Pick the next question from the question bank; None falls back to LLM generation"""
+        if self.question_bank is None:
+            return None
+        asked = [turn.get('question') for turn in (conversation_history or [])] + [current_question]
+        try:
+            selected = self.question_bank.select_question(
+                question_context.get("type"), job_context, candidate_answer, asked
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Question bank lookup failed, generating with LLM: {str(e)}")
+            return None
+        if selected is None:
+            return None
+        
+        next_question = selected["question"]
+        if score_answer:
+            evaluation = self.groq_client.evaluate_answer_json(
+                criteria, current_question, candidate_answer, job_context,
+                next_question if settings.question_bank_rephrase else None
+            )
+            if not settings.question_bank_rephrase:
+                evaluation["followup"] = next_question
+        else:
+            if settings.question_bank_rephrase:
+                next_question = self.groq_client.rephrase_question(next_question, candidate_answer)
+            evaluation = {"score": None, "missing": [], "followup": next_question, "complete": False}
+        
+        evaluation["question_source"] = "bank"
+        return evaluation
 
 
 # Global RAG service instance
@@ -6,9 +6,10 @@ from reportlab.lib import colors
 from typing import Dict, Any, List
 import io
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from ..models import Session as SessionModel, Turn, Candidate, Job, ProctorEvent
 from .proctor_signals import proctor_signals
+from .usage import usage_summary
 
 
 class ReportService:
@@ -49,7 +50,9 @@ class ReportService:
         # Get related data
         candidate = db.query(Candidate).filter(Candidate.id == session.invite.candidate_id).first()
         job = db.query(Job).filter(Job.id == session.invite.job_id).first()
-        turns = db.query(Turn).filter(Turn.session_id == session_id).order_by(Turn.idx).all()
+        turns = db.query(Turn).options(undefer_group("turn_content")).filter(
+            Turn.session_id == session_id
+        ).order_by(Turn.idx).all()
         
         # Get risk assessment
         risk_assessment = proctor_signals.get_risk_assessment(session_id, db)
@@ -168,6 +171,33 @@ class ReportService:
         
         story.append(Spacer(1, 20))
         
+        # Processing Cost
+        usage = usage_summary(db, session_id=session_id)
+        if usage['operations']:
+            story.append(Paragraph("Processing Cost", self.heading_style))
+            usage_data = [['Operation', 'Calls', 'Prompt Tokens', 'Completion Tokens', 'Audio (s)', 'Time (s)']]
+            for operation, stats in sorted(usage['operations'].items()):
+                usage_data.append([
+                    operation.title(), str(stats['calls']), str(stats['prompt_tokens']),
+                    str(stats['completion_tokens']), f"{stats['audio_seconds']:.1f}", f"{stats['total_seconds']:.1f}"
+                ])
+            totals = usage['totals']
+            usage_data.append([
+                'Total', str(totals['calls']), str(totals['prompt_tokens']), str(totals['completion_tokens']),
+                f"{totals['audio_seconds']:.1f}", f"{totals['total_seconds']:.1f}"
+            ])
+            
+            usage_table = Table(usage_data)
+            usage_table.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ]))
+            story.append(usage_table)
+            story.append(Spacer(1, 20))
+        
         # Final Assessment Section
         if final_assessment:
             from ..services.scoring import get_score_breakdown_text
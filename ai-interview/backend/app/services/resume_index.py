@@ -0,0 +1,192 @@
+"""
+Resume Index Service - Per-candidate resume passages and embeddings for retrieval
+
+Resumes are chunked (see chunking.py) and embedded once, when they are
+uploaded, and the chunks are stored in the resume_chunks table with their
+normalized vectors. Retrieval for a candidate only scores that candidate's own
+passages (a few dozen vectors), so it is a single matrix product and returns
+small passages instead of whole resume sections. A resume that has not been
+indexed yet (uploaded before this existed, or with indexing on upload turned
+off) is indexed when the candidate's interview starts. Passages are cached in
+memory per candidate; each search first checks the stored resume hash and
+chunk counts, so chunks replaced or deleted by another worker are not served.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, insert
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import ResumeChunk
+from .chunking import chunk_resume
+from .model_registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+# Candidates whose chunks are kept in memory for repeated searches during an interview
+CACHE_SIZE = 256
+
+
+def resume_hash(resume_text: str) -> str:
+    return hashlib.sha256((resume_text or "").encode("utf-8")).hexdigest()
+
+
+class ResumeIndex:
+    """Chunk, embed and search resumes per candidate"""
+
+    def __init__(self):
+        # candidate_id -> (stored version, chunks, vectors)
+        self._cache: "OrderedDict[int, Tuple[Tuple, List[Dict[str, Any]], Optional[np.ndarray]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _encode(self, texts: List[str]) -> Optional[np.ndarray]:
+        """Unit-length float32 embeddings, or None without an encoder"""
+        model = model_registry.get_sentence_encoder()
+        if model is None or not texts:
+            return None
+        vectors = np.asarray(model.encode(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def forget(self, candidate_id: int):
+        with self._lock:
+            self._cache.pop(candidate_id, None)
+
+    def index_candidates(self, resumes: Iterable[Tuple[int, str]], force: bool = False) -> int:
+        """Chunk and embed resumes given as (candidate_id, text), replacing older chunks.
+
+        Resumes whose chunks are already stored for the same text are skipped
+        unless force is set. Chunks of all resumes are encoded in one batch.
+        Returns the number of chunks written.
+        """
+        resumes = [(candidate_id, text) for candidate_id, text in resumes if text and text.strip()]
+        if not resumes:
+            return 0
+
+        db = SessionLocal()
+        try:
+            ids = [candidate_id for candidate_id, _ in resumes]
+            stored: Dict[int, Tuple[str, bool]] = {}
+            for candidate_id, digest, embedding in db.query(
+                ResumeChunk.candidate_id, ResumeChunk.resume_hash, ResumeChunk.embedding
+            ).filter(ResumeChunk.candidate_id.in_(ids)):
+                previous = stored.get(candidate_id, (digest, True))
+                stored[candidate_id] = (digest, previous[1] and embedding is not None)
+
+            pending = []
+            for candidate_id, text in resumes:
+                digest = resume_hash(text)
+                if not force and candidate_id in stored and stored[candidate_id][0] == digest:
+                    # Re-embed chunks stored while no encoder was available, once there is one
+                    if stored[candidate_id][1] or model_registry.get_sentence_encoder() is None:
+                        continue
+                chunks = chunk_resume(text, settings.resume_chunk_tokens, settings.resume_chunk_overlap_tokens)
+                pending.append((candidate_id, digest, chunks))
+            if not pending:
+                return 0
+
+            vectors = self._encode([chunk["text"] for _, _, chunks in pending for chunk in chunks])
+            rows, position = [], 0
+            for candidate_id, digest, chunks in pending:
+                for chunk_index, chunk in enumerate(chunks):
+                    rows.append({
+                        "candidate_id": candidate_id,
+                        "resume_hash": digest,
+                        "chunk_index": chunk_index,
+                        "section": chunk["section"],
+                        "text": chunk["text"],
+                        "token_count": chunk["tokens"],
+                        "embedding": vectors[position].tobytes() if vectors is not None else None
+                    })
+                    position += 1
+
+            db.query(ResumeChunk).filter(
+                ResumeChunk.candidate_id.in_([candidate_id for candidate_id, _, _ in pending])
+            ).delete(synchronize_session=False)
+            if rows:
+                db.execute(insert(ResumeChunk), rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Resume indexing failed for candidates {[c for c, _ in resumes][:10]}: {e}")
+            return 0
+        finally:
+            db.close()
+
+        for candidate_id, _, _ in pending:
+            self.forget(candidate_id)
+        logger.info(f"📄 Indexed {len(rows)} resume chunks for {len(pending)} candidates"
+                    f"{'' if vectors is not None else ' (no encoder, stored without embeddings)'}")
+        return len(rows)
+
+    def index_candidate(self, candidate_id: int, resume_text: str, force: bool = False) -> int:
+        return self.index_candidates([(candidate_id, resume_text)], force=force)
+
+    def _load(self, candidate_id: int) -> Tuple[List[Dict[str, Any]], Optional[np.ndarray]]:
+        db = SessionLocal()
+        try:
+            # Another worker may have replaced or deleted the chunks since they were cached
+            version = tuple(db.query(
+                func.max(ResumeChunk.resume_hash), func.count(ResumeChunk.id), func.count(ResumeChunk.embedding)
+            ).filter(ResumeChunk.candidate_id == candidate_id).one())
+            with self._lock:
+                entry = self._cache.get(candidate_id)
+                if entry is not None and entry[0] == version:
+                    self._cache.move_to_end(candidate_id)
+                    return entry[1], entry[2]
+            if not version[1]:
+                self.forget(candidate_id)
+                return [], None
+
+            rows = db.query(ResumeChunk).filter(
+                ResumeChunk.candidate_id == candidate_id
+            ).order_by(ResumeChunk.chunk_index).all()
+            chunks = [
+                {"chunk_index": row.chunk_index, "section": row.section, "text": row.text} for row in rows
+            ]
+            vectors = None
+            if rows and all(row.embedding is not None for row in rows):
+                vectors = np.vstack([np.frombuffer(row.embedding, dtype=np.float32) for row in rows])
+        finally:
+            db.close()
+
+        if chunks:
+            with self._lock:
+                self._cache[candidate_id] = (version, chunks, vectors)
+                while len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return chunks, vectors
+
+    def search(self, candidate_id: int, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        """The candidate's k passages most similar to query, shaped like vector store results"""
+        chunks, vectors = self._load(candidate_id)
+        if not chunks or vectors is None or not (query or "").strip():
+            return []
+
+        query_vector = self._encode([query])
+        if query_vector is None:
+            return []
+        scores = vectors @ query_vector[0]
+        # Passages with nothing in common with the query are left out
+        top = [i for i in np.argsort(-scores)[:k] if scores[i] > 0]
+        return [
+            {
+                "document": chunks[i]["text"],
+                "metadata": {
+                    "type": "resume", "section": chunks[i]["section"],
+                    "candidate_id": candidate_id, "chunk_index": chunks[i]["chunk_index"]
+                },
+                "score": float(scores[i])
+            }
+            for i in top
+        ]
+
+
+# Global instance
+resume_index = ResumeIndex()
@@ -1,27 +1,11 @@
-import io
 import re
 import logging
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
-try:
-    import PyPDF2
-    from PyPDF2 import PdfReader
-except ImportError:
-    PyPDF2 = None
-    PdfReader = None
-
-try:
-    import docx
-    from docx import Document
-except ImportError:
-    docx = None
-    Document = None
-
-try:
-    from pdfminer.six import extract_text as pdfminer_extract_text # type: ignore
-except ImportError:
-    pdfminer_extract_text = None
+# PDF/DOCX libraries are optional and imported by document_pool where they are used
+from .document_pool import extract_document
+from .skill_matcher import skill_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -38,35 +22,6 @@ class ResumeParser:
         
         self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         
-        self.skill_keywords = [
-            # Programming Languages
-            'python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php', 'go', 'rust', 'swift',
-            'kotlin', 'scala', 'r', 'matlab', 'typescript', 'dart', 'perl', 'shell', 'bash',
-            
-            # Web Technologies
-            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-            'spring', 'laravel', 'rails', 'asp.net', 'jquery', 'bootstrap', 'sass', 'less',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server',
-            'cassandra', 'elasticsearch', 'dynamodb', 'firebase',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
-            'gitlab', 'bitbucket', 'terraform', 'ansible', 'chef', 'puppet', 'vagrant',
-            
-            # Data Science & AI
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'pandas', 'numpy',
-            'scikit-learn', 'keras', 'opencv', 'nlp', 'computer vision', 'data analysis',
-            
-            # Mobile Development
-            'ios', 'android', 'react native', 'flutter', 'xamarin', 'ionic', 'cordova',
-            
-            # Tools & Frameworks
-            'jira', 'confluence', 'slack', 'trello', 'asana', 'figma', 'sketch', 'photoshop',
-            'illustrator', 'postman', 'swagger', 'nginx', 'apache', 'linux', 'windows', 'macos'
-        ]
-        
         self.experience_patterns = [
             r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
             r'(\d+)\+?\s*yrs?\s*(?:of\s*)?experience',
@@ -75,34 +30,47 @@ class ResumeParser:
             r'over\s*(\d+)\s*years?',
             r'more\s*than\s*(\d+)\s*years?'
         ]
+        # One pass over the text for all experience phrasings
+        self.experience_regex = re.compile('|'.join(f'(?:{pattern})' for pattern in self.experience_patterns), re.IGNORECASE)
+        self.skill_matcher = skill_matcher
         
     def extract_text_from_pdf(self, file_content: bytes) -> str:
-        """Extract text from PDF using multiple methods"""
-        text = ""
-        
-        # Try PyPDF2 first
-        if PdfReader:
-            try:
-                pdf_file = io.BytesIO(file_content)
-                reader = PdfReader(pdf_file)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                if text.strip():
-                    return text
-            except Exception as e:
-                logger.warning(f"PyPDF2 extraction failed: {e}")
-        
-        # Try pdfminer as fallback
-        if pdfminer_extract_text:
-            try:
-                pdf_file = io.BytesIO(file_content)
-                text = pdfminer_extract_text(pdf_file)
-                if text.strip():
-                    return text
-            except Exception as e:
-                logger.warning(f"PDFMiner extraction failed: {e}")
-        
-        return text
+        """Extract text from PDF page by page (PyPDF2, then pdfminer); blocking, request handlers use document_pool"""
+        return extract_document(file_content, "resume.pdf")["text"]
+    
+    def extract_text_from_docx(self, file_content: bytes) -> str:
+        """Extract text from a Word document (blocking)"""
+        return extract_document(file_content, "resume.docx")["text"]
+
+    def extract_contact_info(self, text: str) -> Dict[str, Any]:
+        """Pull name, email, phone, years of experience and known skills out of resume text"""
+        info: Dict[str, Any] = {'name': None, 'email': None, 'phone': None, 'experience_years': None, 'skills': []}
+
+        email_match = re.search(self.email_pattern, text)
+        if email_match:
+            info['email'] = email_match.group(0).lower()
+
+        for pattern in self.phone_patterns:
+            phone_match = re.search(pattern, text)
+            if phone_match:
+                info['phone'] = phone_match.group(0).strip()
+                break
+
+        # The name is usually the first short line of plain words at the top
+        for line in [line.strip() for line in text.split('\n') if line.strip()][:5]:
+            words = line.split()
+            if 2 <= len(words) <= 4 and all(re.fullmatch(r"[A-Za-z][A-Za-z.'-]*", word) for word in words):
+                if line.lower() not in ('resume', 'curriculum vitae'):
+                    info['name'] = line.title() if line.isupper() else line
+                    break
+
+        years = [int(next(group for group in match.groups() if group))
+                 for match in self.experience_regex.finditer(text)]
+        if years:
+            info['experience_years'] = min(max(years), 50)
+
+        info['skills'] = self.skill_matcher.find(text)
+        return info
 
 
 def parse_resume_text(resume_text: str) -> dict:
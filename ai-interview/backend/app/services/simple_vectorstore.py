@@ -1,12 +1,13 @@
 """
 Simple vectorstore implementation that avoids complex huggingface_hub dependencies
 """
-import os
 import pickle
 import numpy as np
 from typing import List, Dict, Any
 import logging
 
+from .model_registry import model_registry
+
 logger = logging.getLogger(__name__)
 
 class SimpleVectorStore:
@@ -16,35 +17,22 @@ class SimpleVectorStore:
         self.embeddings = []
         self.documents = []
         self.metadata = []
-        self.model = None
-        self._initialize_model()
     
-    def _initialize_model(self):
-        """Initialize sentence transformer model with error handling"""
-        try:
-            # Clear SSL environment variables
-            ssl_vars = ['REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE', 'SSL_CERT_FILE']
-            for var in ssl_vars:
-                if var in os.environ:
-                    del os.environ[var]
-            
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("✅ SentenceTransformer model loaded successfully")
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Could not load SentenceTransformer model: {str(e)}")
-            self.model = None
+    @property
+    def model(self):
+        """Shared sentence encoder, loaded on first use (None if unavailable)"""
+        return model_registry.get_sentence_encoder()
     
     def add_documents(self, documents: List[str], metadata: List[Dict[str, Any]]):
         """Add documents to the vector store"""
-        if not self.model:
+        model = self.model
+        if not model:
             logger.warning("No model available, skipping document indexing")
             return
         
         try:
             # Generate embeddings
-            new_embeddings = self.model.encode(documents)
+            new_embeddings = model.encode(documents)
             
             # Store documents and embeddings
             self.documents.extend(documents)
@@ -58,12 +46,16 @@ class SimpleVectorStore:
     
     def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         """Search for similar documents"""
-        if not self.model or not self.embeddings:
+        if not self.embeddings:
+            return []
+        
+        model = self.model
+        if not model:
             return []
         
         try:
             # Generate query embedding
-            query_embedding = self.model.encode([query])[0]
+            query_embedding = model.encode([query])[0]
             
             # Calculate similarities
             similarities = []
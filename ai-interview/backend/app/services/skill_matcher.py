@@ -0,0 +1,148 @@
+"""
+Skill Matcher Service - Finds known skills in resumes and job descriptions in one pass
+
+Skills and their aliases come from a taxonomy JSON file ({category: {skill:
+[aliases]}}). All aliases are compiled into a single regex whose alternation is
+factored into a prefix trie, so the text is scanned once instead of once per
+keyword, and matches only count at word boundaries ("go" is not found in
+"google", "ai" not in "maintain"). Every match is normalized to the skill's
+canonical name, e.g. "k8s" and "kubernetes" both give "Kubernetes".
+
+Skill names that are also English words are written as {skill: {"aliases":
+[...], "case_sensitive": true, "context": true}}. A case-sensitive name
+written otherwise ("react to incidents") only counts in a technical context:
+another skill or a word like "languages" or "stack" nearby on the same line
+("react, node.js"). A context skill always needs that context ("Go, Kafka" or
+"Languages: Go", not "Go to market"), and if it is also case-sensitive it must
+be written as in the taxonomy or in capitals. Aliases ("golang", "spring boot")
+are unambiguous and match in any case.
+"""
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Set, Union
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skill_taxonomy.json")
+
+# A skill must not be glued to letters, digits or the symbols that occur inside skill names ("R&D" is not R)
+BOUNDARY_BEFORE = r"(?<![\w+#.@&])"
+BOUNDARY_AFTER = r"(?![\w+#&])"
+
+# How far (in characters, on the same line) a context skill looks for another skill or a context word
+CONTEXT_CHARS = 40
+CONTEXT_WORDS = re.compile(
+    r"\b(?:skills?|languages?|frameworks?|librar(?:y|ies)|stack|tools?|technolog(?:y|ies)|programming|"
+    r"developers?|engineers?|coding|tech)\b", re.IGNORECASE
+)
+
+
+def _normalize(alias: str) -> str:
+    return " ".join(alias.lower().split())
+
+
+def _escape(char: str) -> str:
+    # Any run of whitespace matches a space, so "machine\nlearning" is still found
+    return r"\s+" if char == " " else re.escape(char)
+
+
+def _trie_pattern(words) -> str:
+    """Regex matching any of words, with shared prefixes factored out"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [_escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            # Greedy: the longest alias wins, shorter ones are tried on backtracking
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Compiled matcher for a skill taxonomy"""
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, Union[List[str], Dict]]]):
+        self.canonical: Dict[str, str] = {}  # normalized alias -> skill
+        self.categories: Dict[str, str] = {}  # skill -> category
+        self.exact: Dict[str, str] = {}  # normalized name -> required spelling, for case-sensitive skills
+        self.needs_context: Set[str] = set()
+        for category, skills in taxonomy.items():
+            for skill, entry in skills.items():
+                rules = entry if isinstance(entry, dict) else {"aliases": entry}
+                self.categories[skill] = category
+                for alias in [skill, *rules.get("aliases", [])]:
+                    self.canonical[_normalize(alias)] = skill
+                if rules.get("case_sensitive"):
+                    self.exact[_normalize(skill)] = " ".join(skill.split())
+                if rules.get("context"):
+                    self.needs_context.add(skill)
+        self.pattern = re.compile(
+            BOUNDARY_BEFORE + "(?:" + _trie_pattern(self.canonical) + ")" + BOUNDARY_AFTER, re.IGNORECASE
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        with open(path, "r", encoding="utf-8") as f:
+            matcher = cls(json.load(f))
+        logger.info(f"✅ Skill matcher compiled {len(matcher.canonical)} aliases for {len(matcher.categories)} skills")
+        return matcher
+
+    def _in_context(self, text: str, start: int, end: int, anchors: List[int]) -> bool:
+        line_start = text.rfind("\n", 0, start) + 1
+        line_end = text.find("\n", end)
+        line_end = len(text) if line_end == -1 else line_end
+        low, high = max(line_start, start - CONTEXT_CHARS), min(line_end, end + CONTEXT_CHARS)
+        if any(low <= position < high for position in anchors):
+            return True
+        return CONTEXT_WORDS.search(text, low, high) is not None
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Mentions per skill, in order of first appearance"""
+        text = text or ""
+        matches = []
+        for match in self.pattern.finditer(text):
+            found = _normalize(match.group(0))
+            skill = self.canonical[found]
+            # Only the bare name is ambiguous; aliases like "golang" need no context
+            ambiguous = skill in self.needs_context and found == _normalize(skill)
+            required = self.exact.get(found)
+            written = " ".join(match.group(0).split())
+            if required is not None and written not in (required, required.upper()):
+                if ambiguous:
+                    continue
+                ambiguous = True
+            matches.append((skill, match.start(), match.end(), ambiguous))
+
+        anchors = [start for _, start, _, ambiguous in matches if not ambiguous]
+        counts: Dict[str, int] = {}
+        for skill, start, end, ambiguous in matches:
+            if ambiguous and not self._in_context(text, start, end, anchors):
+                continue
+            counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+    def rules_signature(self) -> str:
+        """Aliases and matching rules, for caches of parse results"""
+        aliases = "\n".join(f"{alias}={skill}" for alias, skill in sorted(self.canonical.items()))
+        return f"{aliases}\n{sorted(self.exact.values())}\n{sorted(self.needs_context)}"
+
+    def find(self, text: str) -> List[str]:
+        """Distinct skills mentioned in text, in order of first appearance"""
+        return list(self.count(text))
+
+
+# Global instance
+skill_matcher = SkillMatcher.from_file(settings.skill_taxonomy_path or DEFAULT_TAXONOMY_PATH)
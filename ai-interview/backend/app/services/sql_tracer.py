@@ -0,0 +1,92 @@
+"""
+SQL Tracer Service - Statement count, DB time and N+1 detection per request
+
+The metrics middleware and cursor events count every statement executed while
+handling a request in an SQLTrace. Statements are reduced to a signature
+(whitespace collapsed, literals and IN lists replaced by placeholders), so the
+same query issued once per row of a loop shows up as one signature with a high
+count. Requests above the configured thresholds are logged by report(); with
+SQL_TRACE_HEADERS=true the metrics middleware also sends the numbers as X-DB-*
+response headers.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))*\s*\)")
+
+
+def statement_signature(statement: str) -> str:
+    """Normalize a statement so repeats with different parameters compare equal"""
+    signature = " ".join(statement.split())
+    signature = _STRING_LITERAL.sub("?", signature)
+    signature = _NUMBER_LITERAL.sub("?", signature)
+    return _PLACEHOLDER_LIST.sub("(...)", signature)
+
+
+class SQLTrace:
+    """Statements executed by one request or traced block"""
+
+    def __init__(self, signatures: bool = True, parent: Optional["SQLTrace"] = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.signatures: Counter = Counter()
+        self.track_signatures = signatures
+        # A block traced inside a request still counts towards the request
+        self.parent = parent
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        if self.track_signatures:
+            self.signatures[statement_signature(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, seconds)
+
+    @property
+    def total_ms(self) -> float:
+        return self.seconds * 1000
+
+    def repeated_statements(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Signatures executed at least threshold times (likely N+1 queries), most frequent first"""
+        threshold = threshold or settings.sql_n_plus_one_threshold
+        return [(signature, count) for signature, count in self.signatures.most_common() if count >= threshold]
+
+    def max_repeats(self) -> int:
+        return max(self.signatures.values(), default=0)
+
+
+@contextmanager
+def trace_sql():
+    """Trace statements executed inside the block (for scripts, background jobs and tests)"""
+    # metrics imports this module for SQLTrace
+    from .metrics import current_sql_trace, sql_trace_scope
+
+    trace = SQLTrace(parent=current_sql_trace())
+    with sql_trace_scope(trace):
+        yield trace
+
+
+def report(trace: SQLTrace, label: str):
+    """Log a warning when a request ran too many statements, spent too long in SQL, or repeated a statement"""
+    problems = []
+    if trace.count >= settings.sql_warn_query_count:
+        problems.append(f"{trace.count} statements")
+    if trace.total_ms >= settings.sql_warn_time_ms:
+        problems.append(f"{trace.total_ms:.0f} ms in SQL")
+    repeated = trace.repeated_statements()
+    if repeated:
+        problems.append(f"{len(repeated)} repeated statement(s), possible N+1")
+    if not problems:
+        return
+
+    details = "".join(f"\n    {count}x {signature[:200]}" for signature, count in repeated[:3])
+    logger.warning(f"⚠️ Slow SQL pattern in {label}: {', '.join(problems)}{details}")
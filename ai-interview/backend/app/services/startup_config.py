@@ -1,6 +1,6 @@
 """
 Startup configuration to ensure sentence transformers works properly
-This should be imported early in the application startup
+Applied once by the model registry right before the first model is loaded
 """
 import os
 import ssl
@@ -8,8 +8,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_configured = False
+
 def configure_ssl_for_sentence_transformers():
     """Configure SSL settings to fix sentence transformers download issues"""
+    global _configured
+    if _configured:
+        return
+    _configured = True
     
     # Clear problematic SSL environment variables that interfere with model downloading
     ssl_vars_to_clear = [
@@ -28,19 +34,16 @@ def configure_ssl_for_sentence_transformers():
     if cleared_vars:
         logger.info(f"🔧 Cleared SSL environment variables: {', '.join(cleared_vars)}")
     
-    # Set cache directory for models
-    cache_dir = os.path.expanduser('~/.cache/huggingface')
+    # Set cache directory for models (respect an explicitly configured one)
+    cache_dir = os.environ.get('HF_HOME') or os.path.expanduser('~/.cache/huggingface')
     os.makedirs(cache_dir, exist_ok=True)
     
     os.environ['HF_HOME'] = cache_dir
-    os.environ['TRANSFORMERS_CACHE'] = cache_dir
+    os.environ.setdefault('TRANSFORMERS_CACHE', cache_dir)
     
     logger.info(f"📁 HuggingFace cache directory set to: {cache_dir}")
     
     # Disable symlink warnings on Windows
     os.environ['HF_HUB_DISABLE_SYMLINKS_WARNING'] = '1'
     
-    logger.info("✅ SSL and cache configuration completed for sentence transformers")
-
-# Apply configuration when imported
-configure_ssl_for_sentence_transformers()
\ No newline at end of file
+    logger.info("✅ SSL and cache configuration completed for sentence transformers")
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Turn Timings Service - Per-stage latency of an answer submission
+
+submit_speech_answer gets a TurnTimings from the start_turn_timings dependency
+and records spans (upload, disk write, Whisper, evaluation, DB commits) into it;
+services deeper in the call stack add their own spans (e.g. every Groq chat call
+adds to "llm", part of evaluation) through record_span. Time outside every span
+is reported as "other", so the top-level stages add up to the total. The result
+is saved on Turn.timings_json after the response and aggregated into
+percentiles per job for the admin API.
+"""
+import logging
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import Invite, Job, Session as SessionModel, Turn
+
+logger = logging.getLogger(__name__)
+
+STAGES = ["upload", "disk_write", "whisper", "evaluation", "llm", "db_commit", "other", "total"]
+# Stages recorded inside another stage's span (LLM calls happen during evaluation)
+NESTED_STAGES = {"llm"}
+PERCENTILES = (50, 90, 99)
+
+_current_timings: ContextVar[Optional["TurnTimings"]] = ContextVar("turn_timings", default=None)
+
+
+class TurnTimings:
+    """Milliseconds spent per stage; repeated spans of the same stage add up"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, ms: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + ms
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - start) * 1000)
+
+    def as_dict(self) -> Dict[str, float]:
+        total = (time.perf_counter() - self.started_at) * 1000
+        timed = sum(ms for stage, ms in self.stages.items() if stage not in NESTED_STAGES)
+        timings = {stage: round(ms, 1) for stage, ms in self.stages.items()}
+        timings["other"] = round(max(total - timed, 0.0), 1)
+        timings["total"] = round(total, 1)
+        return timings
+
+
+async def start_turn_timings() -> TurnTimings:
+    """Dependency: start timing the request and bind the timings for record_span"""
+    # async, so the context variable is set in the request's own context rather than a threadpool copy
+    timings = TurnTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def record_span(stage: str, ms: float):
+    """Add time to a stage of the turn being timed, if any"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(stage, ms)
+
+
+def save_turn_timings(turn_id: int, timings: Dict[str, float]):
+    """Store a turn's timings (run after the response, so the last commit can be timed too)"""
+    db = SessionLocal()
+    try:
+        db.query(Turn).filter(Turn.id == turn_id).update({Turn.timings_json: timings}, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"⚠️ Could not save timings of turn {turn_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Linear interpolation between closest ranks of sorted values"""
+    if len(values) == 1:
+        return values[0]
+    rank = (len(values) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _stage_stats(rows: List[Dict[str, float]]) -> Dict[str, Dict[str, Any]]:
+    stats = {}
+    stages = [stage for stage in STAGES if any(stage in row for row in rows)]
+    stages += sorted({stage for row in rows for stage in row} - set(stages))
+    for stage in stages:
+        values = sorted(row[stage] for row in rows if stage in row)
+        entry = {"count": len(values), "mean": round(sum(values) / len(values), 1), "max": values[-1]}
+        for pct in PERCENTILES:
+            entry[f"p{pct}"] = round(_percentile(values, pct), 1)
+        stats[stage] = entry
+    return stats
+
+
+def timing_percentiles(db: Session, job_id: Optional[int] = None, since: Optional[datetime] = None,
+                       until: Optional[datetime] = None) -> Dict[str, Any]:
+    """Latency percentiles per stage for submitted turns, overall and per job"""
+    query = db.query(Turn.timings_json, Invite.job_id, Job.title).join(
+        SessionModel, SessionModel.id == Turn.session_id
+    ).join(Invite, Invite.id == SessionModel.invite_id).join(
+        Job, Job.id == Invite.job_id
+    ).filter(Turn.timings_json.isnot(None))
+    if job_id is not None:
+        query = query.filter(Invite.job_id == job_id)
+    if since is not None:
+        query = query.filter(Turn.submitted_at >= since)
+    if until is not None:
+        query = query.filter(Turn.submitted_at < until)
+
+    all_rows = []
+    by_job: Dict[int, Dict[str, Any]] = {}
+    for timings, turn_job_id, job_title in query.all():
+        if not timings:
+            continue
+        all_rows.append(timings)
+        by_job.setdefault(turn_job_id, {"job_id": turn_job_id, "job_title": job_title, "rows": []})["rows"].append(timings)
+
+    return {
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+        "turns": len(all_rows),
+        "stages": _stage_stats(all_rows) if all_rows else {},
+        "jobs": [
+            {"job_id": job["job_id"], "job_title": job["job_title"], "turns": len(job["rows"]),
+             "stages": _stage_stats(job["rows"])}
+            for job in sorted(by_job.values(), key=lambda job: len(job["rows"]), reverse=True)
+        ]
+    }
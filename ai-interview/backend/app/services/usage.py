@@ -0,0 +1,185 @@
+"""
+Usage Accounting Service - Records Groq tokens, audio seconds and latency per call
+
+Calls are tagged with the session and job bound to the current request through a
+context variable, so GroqClient does not need them passed in explicitly.
+
+Recording a call only appends a row to a buffer; a background thread inserts
+the buffered rows in one statement every LLM_USAGE_FLUSH_SECONDS, or as soon as
+LLM_USAGE_BATCH_SIZE rows are waiting. The summaries flush first, so they
+always include every call made so far.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Integer, cast, func, insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Job, LLMUsage
+
+logger = logging.getLogger(__name__)
+
+_usage_tags: ContextVar[Dict[str, Optional[int]]] = ContextVar("llm_usage_tags", default={})
+
+
+def bind_usage(session_id: Optional[int] = None, job_id: Optional[int] = None):
+    """Tag LLM calls made by the rest of this request with a session and job"""
+    return _usage_tags.set({"session_id": session_id, "job_id": job_id})
+
+
+@contextmanager
+def usage_context(session_id: Optional[int] = None, job_id: Optional[int] = None):
+    """Tag LLM calls made inside the block (for work outside a request, e.g. background jobs)"""
+    token = bind_usage(session_id, job_id)
+    try:
+        yield
+    finally:
+        _usage_tags.reset(token)
+
+
+class UsageRecorder:
+    """Buffers usage rows and inserts them in batches from a background thread"""
+
+    def __init__(self):
+        self._rows: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Held while inserting, so flush() returns once rows are stored
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, row: Dict[str, Any]):
+        with self._lock:
+            self._rows.append(row)
+            pending = len(self._rows)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="llm-usage-writer", daemon=True)
+                self._thread.start()
+        if pending >= settings.llm_usage_batch_size:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(settings.llm_usage_flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Insert every buffered row now; returns how many were stored"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            db = SessionLocal()
+            try:
+                db.execute(insert(LLMUsage), rows)
+                db.commit()
+                return len(rows)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"⚠️ Could not record usage of {len(rows)} LLM calls: {str(e)}")
+                return 0
+            finally:
+                db.close()
+
+
+def record_llm_usage(operation: str, model: str, duration_ms: float, prompt_tokens: int = 0,
+                     completion_tokens: int = 0, audio_seconds: float = 0.0, cached: bool = False):
+    """Queue one call's usage for the next batch insert; never blocks or breaks the call itself"""
+    if not settings.llm_usage_tracking:
+        return
+
+    tags = _usage_tags.get()
+    usage_recorder.add({
+        "session_id": tags.get("session_id"),
+        "job_id": tags.get("job_id"),
+        "operation": operation,
+        "model": model,
+        "prompt_tokens": prompt_tokens or 0,
+        "completion_tokens": completion_tokens or 0,
+        "audio_seconds": audio_seconds or 0.0,
+        "duration_ms": duration_ms,
+        "cached": cached,
+        "created_at": datetime.now(timezone.utc)
+    })
+
+
+def usage_summary(db: Session, session_id: Optional[int] = None, job_id: Optional[int] = None) -> Dict[str, Any]:
+    """Totals per operation (and overall) for a session, a job, or everything"""
+    usage_recorder.flush()
+    query = db.query(
+        LLMUsage.operation,
+        func.count(LLMUsage.id),
+        func.coalesce(func.sum(LLMUsage.prompt_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.completion_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.audio_seconds), 0.0),
+        func.coalesce(func.sum(LLMUsage.duration_ms), 0.0),
+        func.coalesce(func.sum(cast(LLMUsage.cached, Integer)), 0)
+    )
+    if session_id is not None:
+        query = query.filter(LLMUsage.session_id == session_id)
+    if job_id is not None:
+        query = query.filter(LLMUsage.job_id == job_id)
+
+    operations = {}
+    for operation, calls, prompt_tokens, completion_tokens, audio_seconds, duration_ms, cached in \
+            query.group_by(LLMUsage.operation).all():
+        operations[operation] = {
+            "calls": calls,
+            "cached_calls": int(cached),
+            "prompt_tokens": int(prompt_tokens),
+            "completion_tokens": int(completion_tokens),
+            "audio_seconds": round(float(audio_seconds), 1),
+            "total_seconds": round(float(duration_ms) / 1000, 2)
+        }
+
+    totals = {key: 0 for key in ("calls", "cached_calls", "prompt_tokens", "completion_tokens")}
+    totals.update({"audio_seconds": 0.0, "total_seconds": 0.0})
+    for stats in operations.values():
+        for key in totals:
+            totals[key] += stats[key]
+    totals["audio_seconds"] = round(totals["audio_seconds"], 1)
+    totals["total_seconds"] = round(totals["total_seconds"], 2)
+
+    return {"session_id": session_id, "job_id": job_id, "totals": totals, "operations": operations}
+
+
+def usage_by_job(db: Session, limit: int = 20):
+    """Jobs ranked by total tokens, with per-session averages, to find expensive interview setups"""
+    usage_recorder.flush()
+    tokens = func.coalesce(func.sum(LLMUsage.prompt_tokens), 0) + func.coalesce(func.sum(LLMUsage.completion_tokens), 0)
+    rows = db.query(
+        LLMUsage.job_id,
+        Job.title,
+        func.count(func.distinct(LLMUsage.session_id)),
+        func.count(LLMUsage.id),
+        tokens,
+        func.coalesce(func.sum(LLMUsage.audio_seconds), 0.0),
+        func.coalesce(func.sum(LLMUsage.duration_ms), 0.0)
+    ).outerjoin(Job, Job.id == LLMUsage.job_id).group_by(
+        LLMUsage.job_id, Job.title
+    ).order_by(tokens.desc()).limit(limit).all()
+
+    return [
+        {
+            "job_id": job_id,
+            "job_title": title,
+            "sessions": sessions,
+            "calls": calls,
+            "total_tokens": int(total_tokens),
+            "tokens_per_session": round(int(total_tokens) / sessions, 1) if sessions else None,
+            "audio_seconds": round(float(audio_seconds), 1),
+            "total_seconds": round(float(duration_ms) / 1000, 2)
+        }
+        for job_id, title, sessions, calls, total_tokens, audio_seconds, duration_ms in rows
+    ]
+
+
+# Global instance
+usage_recorder = UsageRecorder()
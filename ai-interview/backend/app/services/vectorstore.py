@@ -1,98 +1,471 @@
 import os
-import pickle
+import json
+import logging
+import shutil
+import threading
+import time
+import uuid
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import faiss
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from ..config import settings
+from .model_registry import model_registry
+from .metrics import observe_vector_search
+
+logger = logging.getLogger(__name__)
+
+# On-disk layout for a store saved at `path`:
+#   {path}.current            name of the version directory in use
+#   {path}.versions/{name}/   one saved version:
+#     vectors.npy   float32 (n, dimension) normalized embeddings, memory-mapped on load
+#     docs.jsonl    one {"document": ..., "metadata": ...} JSON record per line
+#     offsets.npy   int64 (n + 1) byte offsets of each record in docs.jsonl
+#     index.faiss   FAISS index, read on first search
+#     index.json    {"index_type", "trained_size"}: what the index was built from
+# save() writes a new version directory and then replaces the pointer file, so
+# readers see either the old store or the new one, never a mix of the two.
+# Stores saved before versioning ({path}.vectors.npy, {path}.docs.jsonl, ...)
+# are still loaded.
+CURRENT_SUFFIX = ".current"
+VERSIONS_SUFFIX = ".versions"
+STORE_FILES = {"vectors": "vectors.npy", "docs": "docs.jsonl", "offsets": "offsets.npy", "index": "index.faiss",
+               "index_meta": "index.json"}
+UNVERSIONED_SUFFIXES = {"vectors": ".vectors.npy", "docs": ".docs.jsonl", "offsets": ".offsets.npy", "index": ".faiss",
+                        "index_meta": ".index.json"}
+LEGACY_PICKLE_SUFFIX = ".pkl"
+
+# Parsed document records kept per loaded store
+DOCUMENT_CACHE_SIZE = 1024
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+IVF_POINTS_PER_CLUSTER = 39  # FAISS warns when k-means gets fewer training points per centroid
+
+
+def _version_files(directory: str) -> Dict[str, str]:
+    return {name: os.path.join(directory, filename) for name, filename in STORE_FILES.items()}
+
+
+def _current_files(path: str) -> Optional[Dict[str, str]]:
+    """Files of the version the pointer names, the unversioned layout, or None if nothing was saved"""
+    pointer = f"{path}{CURRENT_SUFFIX}"
+    if os.path.exists(pointer):
+        with open(pointer, 'r', encoding='utf-8') as f:
+            version = f.read().strip()
+        return _version_files(os.path.join(f"{path}{VERSIONS_SUFFIX}", version))
+    if os.path.exists(f"{path}{UNVERSIONED_SUFFIXES['vectors']}"):
+        return {name: f"{path}{suffix}" for name, suffix in UNVERSIONED_SUFFIXES.items()}
+    return None
+
+
+def _remove_old_versions(path: str, current: str):
+    """Delete versions other than current (processes that still map them keep their open files)"""
+    versions_dir = f"{path}{VERSIONS_SUFFIX}"
+    for name in os.listdir(versions_dir):
+        if name != current and not name.startswith("."):
+            shutil.rmtree(os.path.join(versions_dir, name), ignore_errors=True)
+    # A store saved before versioning was copied into the new version
+    if os.path.exists(f"{path}{UNVERSIONED_SUFFIXES['vectors']}"):
+        for suffix in UNVERSIONED_SUFFIXES.values():
+            if os.path.exists(f"{path}{suffix}"):
+                os.remove(f"{path}{suffix}")
+
+
+class DocumentFile:
+    """Read-only, offset-indexed JSON lines file; records are parsed only when accessed"""
+
+    def __init__(self, docs_path: str, offsets_path: str):
+        self.docs_path = docs_path
+        self.offsets = np.load(offsets_path, mmap_mode='r')
+        self._file = open(docs_path, 'rb')
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()  # Most recently used last
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def read_raw(self, idx: int) -> bytes:
+        start, end = int(self.offsets[idx]), int(self.offsets[idx + 1])
+        with self._lock:
+            self._file.seek(start)
+            return self._file.read(end - start)
+
+    def get(self, idx: int) -> Dict[str, Any]:
+        with self._lock:
+            record = self._cache.get(idx)
+            if record is not None:
+                self._cache.move_to_end(idx)
+                return record
+        record = json.loads(self.read_raw(idx))
+        with self._lock:
+            self._cache[idx] = record
+            while len(self._cache) > DOCUMENT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return record
+
+    def close(self):
+        self._file.close()
 
 
 class VectorStore:
     def __init__(self):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
         self.index = None
-        self.documents = []
+        self.vectors = None  # float32 (n, dimension), kept to rebuild or persist the index
+        self._vector_buffer = None  # Spare capacity behind self.vectors, so adds do not copy every vector
+        self.documents = []  # Documents added since the store was loaded
         self.metadata = []
+        self.stored_documents: Optional[DocumentFile] = None  # Documents loaded from disk
+        self.index_path: Optional[str] = None  # Saved index, read on first search
+        self.index_meta_path: Optional[str] = None  # Saved index type and trained size
+        self.index_type: Optional[str] = None  # Kind of the current index: flat, ivf or hnsw
+        self.trained_size = 0  # Corpus size the current index was built (for IVF, trained) on
         self.dimension = 384  # Dimension for all-MiniLM-L6-v2
-        
+        self._lock = threading.RLock()  # Adds and the swap-in of a rebuilt index
+        self._rebuild_thread: Optional[threading.Thread] = None
+
+    @property
+    def model(self):
+        """Shared sentence encoder, loaded on first use"""
+        return model_registry.get_sentence_encoder()
+
+    @property
+    def ntotal(self) -> int:
+        return 0 if self.vectors is None else len(self.vectors)
+
+    def choose_index_type(self, n: int) -> str:
+        """Index type for a corpus of n vectors, honoring VECTOR_INDEX_TYPE"""
+        configured = settings.vector_index_type
+        if configured == "auto":
+            if n < settings.vector_ann_min_vectors:
+                return "flat"
+            configured = "hnsw" if n < settings.vector_ivf_min_vectors else "ivf"
+        elif configured not in INDEX_TYPES:
+            raise ValueError(f"Unknown vector index type '{configured}', expected auto or one of {INDEX_TYPES}")
+        if configured == "ivf" and n < IVF_POINTS_PER_CLUSTER:
+            return "flat"  # Too few vectors to train even one cluster
+        return configured
+
+    def _build_index(self, index_type: str, vectors: np.ndarray):
+        """Create (and train, for IVF) an inner-product index over vectors"""
+        if index_type == "flat":
+            index = faiss.IndexFlatIP(self.dimension)  # Inner product for cosine similarity
+        elif index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.dimension, settings.vector_hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = settings.vector_hnsw_ef_construction
+        elif index_type == "ivf":
+            n = len(vectors)
+            nlist = settings.vector_ivf_nlist or int(4 * np.sqrt(n))
+            nlist = max(1, min(nlist, n // IVF_POINTS_PER_CLUSTER))
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+            sample_size = min(n, nlist * 256)
+            if sample_size < n:
+                sample = vectors[np.sort(np.random.default_rng(0).choice(n, sample_size, replace=False))]
+            else:
+                sample = vectors
+            index.train(np.ascontiguousarray(sample, dtype='float32'))
+        else:
+            raise ValueError(f"Unknown vector index type '{index_type}'")
+
+        if len(vectors):
+            index.add(np.ascontiguousarray(vectors, dtype='float32'))
+        return index
+
+    def _configure_search(self):
+        """Apply query-time recall/speed settings to the current index"""
+        if self.index_type == "ivf":
+            self.index.nprobe = settings.vector_ivf_nprobe
+        elif self.index_type == "hnsw":
+            self.index.hnsw.efSearch = settings.vector_hnsw_ef_search
+
+    def rebuild_index(self, index_type: Optional[str] = None):
+        """(Re)build the index from stored vectors, choosing its type by corpus size"""
+        vectors = self.vectors if self.vectors is not None else np.zeros((0, self.dimension), dtype='float32')
+        index_type = index_type or self.choose_index_type(len(vectors))
+
+        start = time.perf_counter()
+        index = self._build_index(index_type, vectors)
+        with self._lock:
+            self._swap_index(index, index_type, len(vectors))
+        if index_type != "flat":
+            logger.info(f"Built {index_type} index over {len(vectors)} vectors in {time.perf_counter() - start:.2f}s")
+
+    def _swap_index(self, index, index_type: str, built_size: int):
+        """Make index current, first adding the vectors stored after the first built_size (call with _lock held)"""
+        if self.ntotal > built_size:
+            index.add(np.ascontiguousarray(self.vectors[built_size:], dtype='float32'))
+        self.index = index
+        self.index_type = index_type
+        self.trained_size = built_size
+        self._configure_search()
+
+    def rebuild_in_background(self) -> threading.Thread:
+        """Rebuild on a background thread; the current index keeps serving searches and adds until the swap"""
+        with self._lock:
+            if self._rebuild_thread is not None and self._rebuild_thread.is_alive():
+                return self._rebuild_thread
+            # Stored vectors are only ever appended, so this prefix does not change while it is indexed
+            vectors = self.vectors[:self.ntotal]
+            index_type = self.choose_index_type(len(vectors))
+            self._rebuild_thread = threading.Thread(
+                target=self._rebuild_worker, args=(index_type, vectors), name="vector-index-rebuild", daemon=True
+            )
+            self._rebuild_thread.start()
+            return self._rebuild_thread
+
+    def _rebuild_worker(self, index_type: str, vectors: np.ndarray):
+        start = time.perf_counter()
+        try:
+            index = self._build_index(index_type, vectors)
+            with self._lock:
+                self._swap_index(index, index_type, len(vectors))
+        except Exception as e:
+            logger.error(f"Background rebuild of the {index_type} index failed: {e}")
+            return
+        logger.info(f"Rebuilt {index_type} index over {len(vectors)} vectors in the background "
+                    f"in {time.perf_counter() - start:.2f}s")
+
     def initialize_index(self):
         """Initialize FAISS index"""
-        self.index = faiss.IndexFlatIP(self.dimension)  # Inner product for cosine similarity
-        
+        self.rebuild_index()
+
+    def needs_rebuild(self) -> bool:
+        """Whether the corpus has outgrown the current index type or its IVF training"""
+        if self.index is None or (self._rebuild_thread is not None and self._rebuild_thread.is_alive()):
+            return False
+        if self.index_type != self.choose_index_type(self.ntotal):
+            return True
+        return (self.index_type == "ivf"
+                and self.ntotal > self.trained_size * settings.vector_ivf_retrain_growth)
+
+    def _ensure_index(self):
+        """Build or read the index on first use"""
+        if self.index is not None:
+            return
+        if self.index_path and os.path.exists(self.index_path):
+            self.index = faiss.read_index(self.index_path)
+            if self.index.ntotal == self.ntotal:
+                self.index_type = self._detect_index_type(self.index)
+                # Stores saved without index.json: assume the index was trained on everything it holds
+                self.trained_size = self.ntotal
+                if self.index_meta_path and os.path.exists(self.index_meta_path):
+                    with open(self.index_meta_path, 'r', encoding='utf-8') as f:
+                        self.trained_size = int(json.load(f).get("trained_size", self.ntotal))
+                self._configure_search()
+                return
+            logger.warning(f"Index {self.index_path} is out of sync with stored vectors, rebuilding")
+        self.initialize_index()
+
+    @staticmethod
+    def _detect_index_type(index) -> str:
+        if isinstance(index, faiss.IndexHNSW):
+            return "hnsw"
+        if isinstance(index, faiss.IndexIVF):
+            return "ivf"
+        return "flat"
+
+    def measure_recall(self, queries: np.ndarray, k: int = 10) -> Dict[str, Any]:
+        """Compare the current index against exact search for the given query vectors"""
+        self._ensure_index()
+        queries = np.array(queries, dtype='float32')
+        faiss.normalize_L2(queries)
+
+        exact = faiss.IndexFlatIP(self.dimension)
+        exact.add(np.ascontiguousarray(self.vectors, dtype='float32'))
+
+        start = time.perf_counter()
+        _, exact_ids = exact.search(queries, k)
+        exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        start = time.perf_counter()
+        _, ann_ids = self.index.search(queries, k)
+        ann_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        hits = sum(len(set(a[a >= 0]) & set(e[e >= 0])) for a, e in zip(ann_ids, exact_ids))
+        return {
+            "index_type": self.index_type,
+            "recall": hits / float(len(queries) * min(k, self.ntotal)),
+            "ann_ms_per_query": ann_ms,
+            "exact_ms_per_query": exact_ms
+        }
+
     def add_documents(self, documents: List[str], metadata: List[Dict[str, Any]]):
         """Add documents to the vector store"""
-        if self.index is None:
-            self.initialize_index()
-            
+        model = self.model
+        if model is None:
+            logger.warning("No encoder available, skipping document indexing")
+            return
+
+        self._ensure_index()
+
         # Generate embeddings
-        embeddings = self.model.encode(documents)
-        
+        embeddings = np.ascontiguousarray(model.encode(documents), dtype='float32')
+
         # Normalize embeddings for cosine similarity
         faiss.normalize_L2(embeddings)
-        
-        # Add to index
-        self.index.add(embeddings.astype('float32'))
-        
-        # Store documents and metadata
-        self.documents.extend(documents)
-        self.metadata.extend(metadata)
-        
+
+        with self._lock:
+            # Store documents first: searches run unlocked and may see the index grow at any point
+            self.documents.extend(documents)
+            self.metadata.extend(metadata)
+
+            # Add to index
+            self.index.add(embeddings)
+            self._append_vectors(embeddings)
+            if self.needs_rebuild():
+                self.rebuild_in_background()
+
+    def _append_vectors(self, embeddings: np.ndarray):
+        """Append to self.vectors, growing a buffer geometrically instead of copying on every add"""
+        n, m = self.ntotal, len(embeddings)
+        buffer = self._vector_buffer
+        # Loaded (memory-mapped) or externally assigned vectors are copied into a buffer once
+        if buffer is None or self.vectors is None or self.vectors.base is not buffer or n + m > len(buffer):
+            buffer = np.empty((max(2 * n, n + m, 64), self.dimension), dtype='float32')
+            if n:
+                buffer[:n] = self.vectors
+            self._vector_buffer = buffer
+        buffer[n:n + m] = embeddings
+        self.vectors = buffer[:n + m]
+
+    def get_record(self, idx: int) -> Tuple[str, Dict[str, Any]]:
+        """Return (document, metadata) for a vector position"""
+        stored_count = len(self.stored_documents) if self.stored_documents else 0
+        if idx < stored_count:
+            record = self.stored_documents.get(idx)
+            return record['document'], record['metadata']
+        return self.documents[idx - stored_count], self.metadata[idx - stored_count]
+
     def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         """Search for similar documents"""
-        if self.index is None or self.index.ntotal == 0:
+        if self.ntotal == 0:
             return []
-            
+
+        model = self.model
+        if model is None:
+            return []
+
+        self._ensure_index()
+
         # Generate query embedding
-        query_embedding = self.model.encode([query])
+        query_embedding = np.ascontiguousarray(model.encode([query]), dtype='float32')
         faiss.normalize_L2(query_embedding)
-        
+
         # Search
-        scores, indices = self.index.search(query_embedding.astype('float32'), k)
-        
+        start = time.perf_counter()
+        scores, indices = self.index.search(query_embedding, k)
+        observe_vector_search(self.index_type, time.perf_counter() - start)
+
         results = []
-        for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-            if idx < len(self.documents):
+        for score, idx in zip(scores[0], indices[0]):
+            # FAISS pads with -1 when fewer than k vectors match
+            if 0 <= idx < self.ntotal:
+                document, metadata = self.get_record(int(idx))
                 results.append({
-                    'document': self.documents[idx],
-                    'metadata': self.metadata[idx],
+                    'document': document,
+                    'metadata': metadata,
                     'score': float(score)
                 })
-                
+
         return results
-    
+
+    def _iter_raw_records(self):
+        """Yield every record as a JSON line, copying stored records without parsing them"""
+        if self.stored_documents:
+            for idx in range(len(self.stored_documents)):
+                yield self.stored_documents.read_raw(idx)
+        for document, metadata in zip(self.documents, self.metadata):
+            yield (json.dumps({'document': document, 'metadata': metadata}) + "\n").encode('utf-8')
+
     def save(self, path: str):
-        """Save vector store to disk"""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        
-        # Save FAISS index
-        if self.index is not None:
-            faiss.write_index(self.index, f"{path}.faiss")
-        
-        # Save documents and metadata
-        with open(f"{path}.pkl", 'wb') as f:
-            pickle.dump({
-                'documents': self.documents,
-                'metadata': self.metadata
-            }, f)
-    
+        """Save vector store to disk (vectors, offset-indexed documents and FAISS index).
+
+        Everything is written to a new version directory first and then made
+        current with a single atomic rename of the pointer file, so a crash or a
+        concurrent load never sees a half-written store.
+        """
+        versions_dir = f"{path}{VERSIONS_SUFFIX}"
+        version = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        staging = os.path.join(versions_dir, f".{version}.tmp")
+        os.makedirs(staging)
+        files = _version_files(staging)
+
+        offsets = [0]
+        with open(files["docs"], 'wb') as f:
+            for raw in self._iter_raw_records():
+                f.write(raw)
+                offsets.append(offsets[-1] + len(raw))
+
+        vectors = self.vectors if self.vectors is not None else np.zeros((0, self.dimension), dtype='float32')
+        with open(files["vectors"], 'wb') as f:
+            np.save(f, np.ascontiguousarray(vectors, dtype='float32'))
+        with open(files["offsets"], 'wb') as f:
+            np.save(f, np.asarray(offsets, dtype=np.int64))
+
+        self._ensure_index()
+        with self._lock:
+            index, index_type, trained_size = self.index, self.index_type, self.trained_size
+        faiss.write_index(index, files["index"])
+        with open(files["index_meta"], 'w', encoding='utf-8') as f:
+            json.dump({"index_type": index_type, "trained_size": trained_size}, f)
+
+        final = os.path.join(versions_dir, version)
+        os.rename(staging, final)
+        pointer_tmp = f"{path}{CURRENT_SUFFIX}.{version}.tmp"
+        with open(pointer_tmp, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(pointer_tmp, f"{path}{CURRENT_SUFFIX}")
+
+        # Continue from the saved files so memory holds only what gets touched
+        if self.stored_documents:
+            self.stored_documents.close()
+        files = _version_files(final)
+        self._open(files)
+        self.index_path = files["index"]
+        self.index_meta_path = files["index_meta"]
+        _remove_old_versions(path, version)
+
+    def _open(self, files: Dict[str, str]):
+        self.vectors = np.load(files["vectors"], mmap_mode='r')
+        self._vector_buffer = None
+        self.stored_documents = DocumentFile(files["docs"], files["offsets"])
+        self.documents = []
+        self.metadata = []
+        if len(self.stored_documents) != len(self.vectors):
+            raise ValueError(
+                f"Vector store at {files['vectors']} is corrupt: {len(self.vectors)} vectors "
+                f"but {len(self.stored_documents)} documents"
+            )
+
     def load(self, path: str):
-        """Load vector store from disk"""
+        """Load vector store from disk.
+
+        Vectors and document offsets are memory-mapped and the index is read on
+        first search, so opening a large store is cheap and only documents that
+        are actually returned get parsed.
+        """
         try:
-            # Load FAISS index
-            if os.path.exists(f"{path}.faiss"):
-                self.index = faiss.read_index(f"{path}.faiss")
-            
-            # Load documents and metadata
-            if os.path.exists(f"{path}.pkl"):
-                with open(f"{path}.pkl", 'rb') as f:
-                    data = pickle.load(f)
-                    self.documents = data['documents']
-                    self.metadata = data['metadata']
+            files = _current_files(path)
+            if files is None:
+                if os.path.exists(f"{path}{LEGACY_PICKLE_SUFFIX}"):
+                    # Never unpickle implicitly; convert trusted stores with migrate_vectorstore_pickle.py
+                    logger.warning(f"Ignoring legacy pickle vector store at {path}{LEGACY_PICKLE_SUFFIX}")
+                return
+
+            self._open(files)
+            self.index = None
+            self.index_path = files["index"]
+            self.index_meta_path = files["index_meta"]
         except Exception as e:
-            # TODO: Add proper logging
-            print(f"Error loading vector store: {e}")
+            logger.error(f"Error loading vector store: {e}")
+            self.vectors = None
+            self.stored_documents = None
+            self.documents = []
+            self.metadata = []
+            self.index_path = None
+            self.index_meta_path = None
             self.initialize_index()
 
 
 # Global vector store instance
-vector_store = VectorStore()
\ No newline at end of file
+vector_store = VectorStore()
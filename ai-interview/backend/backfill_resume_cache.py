@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Extract and parse a folder of resumes into the document cache
+
+Files are identified by the sha256 of their bytes, so re-running the script
+(or running it over a folder that overlaps an earlier one) only extracts files
+it has not seen before; the rest are counted as skipped. With
+--update-candidates, candidates without resume text get it from the file their
+resume_url points to, and those resumes are chunked and embedded for retrieval.
+A file matches when its path relative to RESUME_DIR is the end of the
+resume_url (the longest such path wins), so same-named files in different
+subfolders are never mixed up.
+
+Usage: python backfill_resume_cache.py RESUME_DIR [--update-candidates] [--workers 2]
+"""
+import argparse
+import asyncio
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+
+def match_resume(resume_url: str, texts: Dict[str, Dict[str, Tuple[str, str]]]) -> Optional[Tuple[str, str]]:
+    """Entry of the file whose relative path resume_url ends with; texts maps basename -> {relative path: (text, hash)}"""
+    url = resume_url.replace("\\", "/")
+    candidates = texts.get(url.rsplit("/", 1)[-1], {})
+    for path in sorted(candidates, key=len, reverse=True):
+        if url == path or url.endswith("/" + path):
+            return candidates[path]
+    return None
+
+
+async def backfill(directory: str, update_candidates: bool = False) -> dict:
+    from app.config import settings
+    from app.database import SessionLocal
+    from app.models import Candidate
+    from app.services.bulk_ingest import RESUME_EXTENSIONS
+    from app.services.document_cache import document_cache
+    from app.services.document_pool import DocumentError
+    from app.services.resume_index import resume_index
+
+    counts = {"parsed": 0, "skipped": 0, "failed": 0, "candidates_updated": 0}
+    texts: Dict[str, Dict[str, Tuple[str, str]]] = {}
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.startswith(".") or not name.lower().endswith(RESUME_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            with open(path, "rb") as f:
+                content = f.read()
+            try:
+                parsed = await document_cache.parse_resume(content, name)
+            except DocumentError as e:
+                print(f"❌ {path}: {e}")
+                counts["failed"] += 1
+                continue
+            counts["skipped" if parsed["cached"] else "parsed"] += 1
+            if parsed["text"].strip():
+                texts.setdefault(os.path.basename(relative), {})[relative] = (parsed["text"], parsed["content_hash"])
+
+    if update_candidates and texts:
+        updated = []
+        db = SessionLocal()
+        try:
+            candidates = db.query(Candidate).filter(
+                Candidate.resume_url.isnot(None),
+                (Candidate.resume_text.is_(None)) | (Candidate.resume_text == "")
+            ).all()
+            for candidate in candidates:
+                match = match_resume(candidate.resume_url, texts)
+                if match:
+                    candidate.resume_text, candidate.resume_content_hash = match
+                    updated.append((candidate.id, match[0]))
+            db.commit()
+        finally:
+            db.close()
+        counts["candidates_updated"] = len(updated)
+        if updated and settings.resume_index_on_upload:
+            resume_index.index_candidates(updated)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="Folder of resumes (searched recursively)")
+    parser.add_argument("--update-candidates", action="store_true",
+                        help="Fill empty candidates.resume_text from files matching their resume_url")
+    parser.add_argument("--workers", type=int, help="Document pool processes (defaults to DOCUMENT_POOL_WORKERS)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app.config import settings
+    from app.services.document_pool import document_pool
+
+    if args.workers is not None:
+        settings.document_pool_workers = args.workers
+    try:
+        counts = asyncio.run(backfill(args.directory, args.update_candidates))
+    finally:
+        document_pool.shutdown()
+    print(f"✅ Parsed {counts['parsed']} new files, skipped {counts['skipped']} already cached, "
+          f"{counts['failed']} failed; updated {counts['candidates_updated']} candidates")
+
+
+if __name__ == "__main__":
+    main()
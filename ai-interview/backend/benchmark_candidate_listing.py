@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the admin candidate listing: payload size, latency and SQL statements per page
+
+Seeds a scratch SQLite database (or --database-url) with candidates carrying
+resumes and interview sessions, then compares one page of:
+  - legacy:  full rows with resume text and one stats query per candidate (the old listing)
+  - full:    the lean listing asked for resume text (?fields=...,resume_text)
+  - lean:    the default listing (no resume text, one grouped stats subquery)
+
+Usage: python benchmark_candidate_listing.py [--candidates 500] [--page 100] [--resume-kb 8] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=500)
+    parser.add_argument("--page", type=int, default=100, help="Candidates per page (limit)")
+    parser.add_argument("--resume-kb", type=int, default=8, help="Resume text size per candidate")
+    parser.add_argument("--sessions", type=int, default=2, help="Interview sessions per candidate")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", help="Defaults to a scratch SQLite file")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="listing_bench_")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    os.environ["SQL_TRACE_HEADERS"] = "true"  # X-DB-Query-Count headers
+    os.environ["WARM_UP_MODELS"] = "false"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from datetime import datetime, timedelta, timezone
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func
+    from app.database import SessionLocal, create_tables
+    from app.main import app
+    from app.models import Candidate, Invite, Job, Session as SessionModel
+    from app.services.sql_tracer import trace_sql
+
+    create_tables()
+    db = SessionLocal()
+    resume = ("Built and operated Python services, tuned PostgreSQL queries and led migrations. "
+              * (args.resume_kb * 1024 // 84 + 1))[:args.resume_kb * 1024]
+    job = Job(title="Benchmark Engineer", description="Python")
+    db.add(job)
+    db.commit()
+    candidates = [Candidate(name=f"Bench Candidate {n}", email=f"bench-{n}-{time.time_ns()}@example.com",
+                            skills=["python", "sql"], resume_text=resume) for n in range(args.candidates)]
+    db.add_all(candidates)
+    db.commit()
+    invites = [Invite(candidate_id=c.id, job_id=job.id, invite_code=f"bench-{c.id}",
+                      expires_at=datetime.now(timezone.utc) + timedelta(days=1)) for c in candidates]
+    db.add_all(invites)
+    db.commit()
+    db.add_all([SessionModel(invite_id=invite.id, session_token=f"bench-{invite.id}-{i}", score=5.0 + i)
+                for invite in invites for i in range(args.sessions)])
+    db.commit()
+
+    def legacy_page():
+        """The listing as it was: full rows plus a stats query per candidate"""
+        rows = []
+        for candidate in db.query(Candidate).offset(0).limit(args.page).all():
+            stats = db.query(
+                func.count(SessionModel.id), func.avg(SessionModel.score), func.max(SessionModel.started_at)
+            ).join(Invite, SessionModel.invite_id == Invite.id).filter(Invite.candidate_id == candidate.id).first()
+            rows.append({
+                "id": candidate.id, "name": candidate.name, "email": candidate.email, "phone": candidate.phone,
+                "location": candidate.location, "experience_years": candidate.experience_years,
+                "skills": candidate.skills or [], "resume_url": candidate.resume_url,
+                "resume_text": candidate.resume_text, "resume_text_length": len(candidate.resume_text or ''),
+                "has_resume": bool(candidate.resume_text), "status": candidate.status,
+                "created_at": candidate.created_at.isoformat() if candidate.created_at else None,
+                "updated_at": candidate.updated_at.isoformat() if candidate.updated_at else None,
+                "interview_count": stats[0] or 0, "average_score": float(stats[1]) if stats[1] else None,
+                "last_interview_date": stats[2].isoformat() if stats[2] else None
+            })
+            db.expire(candidate)
+        return json.dumps({"candidates": rows, "total": db.query(Candidate).count()}).encode()
+
+    client = TestClient(app)
+    full_fields = "id,name,email,phone,location,experience_years,skills,resume_url,resume_text,status,interview_count"
+
+    def endpoint(params):
+        def call():
+            response = client.get("/api/admin/candidates/", params={"limit": args.page, **params})
+            response.raise_for_status()
+            return response
+        return call
+
+    print(f"\n{args.candidates} candidates, {args.resume_kb} KB resumes, page of {args.page}")
+    print(f"{'variant':8s} {'KB/page':>9s} {'p50 ms':>8s} {'p90 ms':>8s} {'queries':>8s}")
+    for name, call in (("legacy", legacy_page), ("full", endpoint({"fields": full_fields})), ("lean", endpoint({}))):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = call()
+            timings.append((time.perf_counter() - start) * 1000)
+        if name == "legacy":
+            with trace_sql() as trace:
+                payload = call()
+            size, queries = len(payload), trace.count
+        else:
+            size, queries = len(result.content), int(result.headers["X-DB-Query-Count"])
+        timings.sort()
+        print(f"{name:8s} {size / 1024:9.1f} {statistics.median(timings):8.1f} "
+              f"{timings[int(len(timings) * 0.9) - 1]:8.1f} {queries:8d}")
+
+    db.close()
+    shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
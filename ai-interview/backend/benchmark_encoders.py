@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compare sentence encoder backends: accuracy and CPU latency
+
+Encodes the same corpus with sentence-transformers (reference), ONNX Runtime
+and int8-quantized ONNX, then reports:
+  - per-query latency (batch of 1, what session start pays) and batch throughput
+  - cosine similarity of each backend's vectors to the reference vectors
+  - top-k retrieval agreement with the reference
+
+Export the ONNX models first:
+    python -m app.services.onnx_encoder --export models/all-MiniLM-L6-v2-onnx --quantize
+
+Usage: python benchmark_encoders.py [--model-dir DIR] [--docs 500] [--k 5]
+"""
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from app.config import settings
+
+TOPICS = ["Python", "Java", "React", "PostgreSQL", "Kubernetes", "AWS", "machine learning",
+          "REST APIs", "microservices", "data pipelines", "unit testing", "CI/CD", "Redis", "Django"]
+TEMPLATES = [
+    "Built and maintained {topic} services handling thousands of requests per day.",
+    "Led a team migrating legacy systems to {topic}, cutting costs by a third.",
+    "Designed {topic} components with a focus on reliability and observability.",
+    "Mentored junior engineers on {topic} best practices and code review.",
+    "Can you explain how you would use {topic} to scale a read-heavy workload?",
+    "Describe a production incident involving {topic} and how you resolved it.",
+]
+
+
+def build_corpus(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(TEMPLATES).format(topic=rng.choice(TOPICS)) for _ in range(size)]
+
+
+def load_backends(model_dir: str) -> dict:
+    from sentence_transformers import SentenceTransformer
+    from app.services.onnx_encoder import OnnxSentenceEncoder
+
+    backends = {"sentence-transformers": SentenceTransformer(settings.embedding_model_name, device="cpu")}
+    for name, quantized in (("onnx", False), ("onnx-int8", True)):
+        try:
+            backends[name] = OnnxSentenceEncoder(model_dir, quantized=quantized,
+                                                 intra_op_threads=settings.onnx_intra_op_threads)
+        except FileNotFoundError as e:
+            print(f"⚠️ Skipping {name}: {e}")
+    return backends
+
+
+def time_single_queries(encoder, queries: list) -> list:
+    encoder.encode(queries[:1])  # warm up
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        encoder.encode([query])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def top_k(doc_vectors: np.ndarray, query_vectors: np.ndarray, k: int) -> np.ndarray:
+    scores = query_vectors @ doc_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=settings.onnx_model_dir)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = build_corpus(args.docs)
+    queries = build_corpus(args.queries, seed=11)
+    backends = load_backends(args.model_dir)
+
+    results = {}
+    for name, encoder in backends.items():
+        latencies = time_single_queries(encoder, queries)
+        start = time.perf_counter()
+        doc_vectors = np.asarray(encoder.encode(docs, batch_size=32), dtype='float32')
+        batch_seconds = time.perf_counter() - start
+        query_vectors = np.asarray(encoder.encode(queries), dtype='float32')
+        results[name] = {
+            "latencies": latencies,
+            "throughput": len(docs) / batch_seconds,
+            "docs": doc_vectors,
+            "queries": query_vectors,
+        }
+
+    reference = results["sentence-transformers"]
+    reference_top = top_k(reference["docs"], reference["queries"], args.k)
+
+    print(f"\n{'backend':22s} {'dim':>4s} {'p50 ms':>8s} {'p95 ms':>8s} {'docs/s':>8s} "
+          f"{'cos mean':>9s} {'cos min':>8s} {'top-{0} agree'.format(args.k):>12s}")
+    for name, result in results.items():
+        latencies = sorted(result["latencies"])
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        cosines = (result["docs"] * reference["docs"]).sum(axis=1)
+        backend_top = top_k(result["docs"], result["queries"], args.k)
+        agreement = np.mean([
+            len(set(a) & set(b)) / args.k for a, b in zip(backend_top, reference_top)
+        ])
+        print(f"{name:22s} {result['docs'].shape[1]:4d} {statistics.median(latencies):8.2f} {p95:8.2f} "
+              f"{result['throughput']:8.1f} {cosines.mean():9.4f} {cosines.min():8.4f} {agreement:12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark skill extraction over a corpus of large resumes
+
+Builds a synthetic corpus (filler prose with skills and aliases sprinkled in)
+and compares:
+  - per-keyword:  one word-boundary re.search per taxonomy alias (the old resume parser loop)
+  - substring:    `alias in text` per alias (the old JD parser; fast but matches inside words)
+  - alternation:  one regex with a flat alternation of all aliases
+  - matcher:      SkillMatcher, one regex with the alternation factored into a prefix trie
+  - rules:        SkillMatcher with the taxonomy's case and context rules applied
+
+"agrees" is the share of resumes with exactly the skills the flat alternation
+finds. The single-regex methods report the longest alias only ("React Native",
+not also "React"); the per-keyword loop reports nested skills too. The corpus is
+lowercase prose, so "rules" drops the English-word skills (go, spring, react)
+and agrees least.
+
+Usage: python benchmark_skill_matcher.py [--resumes 200] [--resume-kb 40] [--repeat 3] [--taxonomy path.json]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+FILLER = (
+    "designed implemented maintained delivered improved collaborated stakeholders production services "
+    "platform performance reliability customers features releases team mentoring reviews testing "
+    "pipelines dashboards migration latency throughput scalable architecture requirements ownership"
+).split()
+
+
+def build_corpus(aliases, resumes: int, resume_kb: int, seed: int):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(resumes):
+        words, size = [], 0
+        while size < resume_kb * 1024:
+            word = rng.choice(aliases) if rng.random() < 0.02 else rng.choice(FILLER)
+            words.append(word.title() if rng.random() < 0.1 else word)
+            size += len(word) + 1
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def time_method(extract, corpus, repeat: int):
+    runs, results = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [extract(text) for text in corpus]
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--resume-kb", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--taxonomy", help="Skill taxonomy JSON (defaults to app/data/skill_taxonomy.json)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app.services.skill_matcher import (
+        BOUNDARY_AFTER, BOUNDARY_BEFORE, DEFAULT_TAXONOMY_PATH, SkillMatcher
+    )
+
+    with open(args.taxonomy or DEFAULT_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    with_rules = SkillMatcher(taxonomy)
+    # Aliases only, so the first comparison measures the regex alone
+    matcher = SkillMatcher({
+        category: {skill: entry["aliases"] if isinstance(entry, dict) else entry for skill, entry in skills.items()}
+        for category, skills in taxonomy.items()
+    })
+    aliases = sorted(matcher.canonical, key=len, reverse=True)
+    corpus = build_corpus(aliases, args.resumes, args.resume_kb, args.seed)
+    megabytes = sum(len(text) for text in corpus) / 1024 / 1024
+
+    keyword_patterns = [
+        (re.compile(BOUNDARY_BEFORE + re.escape(alias).replace(r"\ ", r"\s+") + BOUNDARY_AFTER, re.IGNORECASE), alias)
+        for alias in aliases
+    ]
+    flat = re.compile(
+        BOUNDARY_BEFORE + "(?:" + "|".join(re.escape(a).replace(r"\ ", r"\s+") for a in aliases) + ")" + BOUNDARY_AFTER,
+        re.IGNORECASE
+    )
+
+    def per_keyword(text):
+        return {matcher.canonical[alias] for pattern, alias in keyword_patterns if pattern.search(text)}
+
+    def substring(text):
+        lower = text.lower()
+        return {matcher.canonical[alias] for alias in aliases if alias in lower}
+
+    def alternation(text):
+        return {matcher.canonical[" ".join(m.group(0).lower().split())] for m in flat.finditer(text)}
+
+    def compiled(text):
+        return set(matcher.find(text))
+
+    def ruled(text):
+        return set(with_rules.find(text))
+
+    print(f"Corpus: {args.resumes} resumes x {args.resume_kb} KB ({megabytes:.1f} MB), "
+          f"{len(aliases)} aliases for {len(matcher.categories)} skills\n")
+    print(f"{'method':<12} {'total s':>8} {'ms/resume':>10} {'MB/s':>8} {'skills/resume':>14} {'agrees':>7}")
+
+    timings = {name: time_method(extract, corpus, args.repeat) for name, extract in [
+        ("per-keyword", per_keyword), ("substring", substring), ("alternation", alternation), ("matcher", compiled),
+        ("rules", ruled)
+    ]}
+    reference = timings["alternation"][1]
+    for name, (elapsed, results) in timings.items():
+        agrees = sum(result == expected for result, expected in zip(results, reference)) / len(corpus)
+        print(f"{name:<12} {elapsed:>8.2f} {elapsed / len(corpus) * 1000:>10.2f} {megabytes / elapsed:>8.1f} "
+              f"{statistics.mean(len(r) for r in results):>14.1f} {agrees:>6.0%}")
+
+    print(f"\nmatcher is {timings['per-keyword'][0] / timings['matcher'][0]:.1f}x faster than the per-keyword loop "
+          f"and {timings['alternation'][0] / timings['matcher'][0]:.1f}x faster than the flat alternation")
+
+
+if __name__ == "__main__":
+    main()
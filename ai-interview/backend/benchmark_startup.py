@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark application startup time and first-embedding latency
+
+Each scenario runs in a fresh interpreter so import caches don't skew results:
+  - import:   time to import app.main (what every uvicorn worker pays)
+  - lazy:     import, then time the first encode (model loaded on demand)
+  - preload:  PRELOAD_MODELS=true import, then time the first encode
+
+Usage: python benchmark_startup.py [--runs 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SCENARIO_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+from app.services.model_registry import model_registry
+imported = time.perf_counter()
+encoder = None
+if sys.argv[1] == "encode":
+    encoder = model_registry.get_sentence_encoder()
+    if encoder is not None:
+        encoder.encode(["Tell me about a challenging project you worked on."])
+encoded = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "first_encode_seconds": encoded - imported if sys.argv[1] == "encode" else None,
+    "encoder_available": encoder is not None,
+}))
+"""
+
+
+def run_scenario(preload: bool, encode: bool = True) -> dict:
+    env = dict(os.environ)
+    env["PRELOAD_MODELS"] = "true" if preload else "false"
+    env["WARM_UP_MODELS"] = "false"
+    result = subprocess.run(
+        [sys.executable, "-c", SCENARIO_CODE, "encode" if encode else "import"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "scenario failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(label: str, samples: list):
+    imports = [s["import_seconds"] for s in samples]
+    if samples[0]["first_encode_seconds"] is None:
+        print(f"{label:10s} import: median {statistics.median(imports):6.2f}s")
+        return
+    encodes = [s["first_encode_seconds"] for s in samples]
+    print(f"{label:10s} import: median {statistics.median(imports):6.2f}s  "
+          f"first encode: median {statistics.median(encodes):6.2f}s  "
+          f"total: {statistics.median(imports) + statistics.median(encodes):6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"🚀 Startup benchmark ({args.runs} runs per scenario)\n")
+    imports = [run_scenario(preload=False, encode=False) for _ in range(args.runs)]
+    lazy = [run_scenario(preload=False) for _ in range(args.runs)]
+    preload = [run_scenario(preload=True) for _ in range(args.runs)]
+
+    if not lazy[0]["encoder_available"]:
+        print("⚠️ Sentence encoder not available - encode timings only cover the failed load\n")
+
+    summarize("import", imports)
+    summarize("lazy", lazy)
+    summarize("preload", preload)
+
+
+if __name__ == "__main__":
+    main()
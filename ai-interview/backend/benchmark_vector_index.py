@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Compare flat, HNSW and IVF vector indexes: build time, query latency and recall
+
+Uses synthetic clustered unit vectors (no encoder needed) so large corpora can
+be measured quickly. Recall is top-k overlap with exact (flat) search.
+
+Usage: python benchmark_vector_index.py [--sizes 10000,100000] [--queries 200] [--k 10]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.services.vectorstore import VectorStore
+
+
+def clustered_vectors(n: int, dimension: int, clusters: int = 200, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype('float32')
+    vectors = centers[rng.integers(0, clusters, n)] + 0.5 * rng.standard_normal((n, dimension)).astype('float32')
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated corpus sizes")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"\nHNSW M={settings.vector_hnsw_m} efSearch={settings.vector_hnsw_ef_search}, "
+          f"IVF nprobe={settings.vector_ivf_nprobe}")
+    print(f"{'vectors':>9s} {'index':6s} {'build s':>8s} {'ms/query':>9s} {'exact ms':>9s} "
+          f"{'recall@{0}'.format(args.k):>10s}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        store = VectorStore()
+        store.vectors = clustered_vectors(size, store.dimension)
+        queries = clustered_vectors(args.queries, store.dimension, seed=1)
+        for kind in ("flat", "hnsw", "ivf"):
+            start = time.perf_counter()
+            store.rebuild_index(kind)
+            build_seconds = time.perf_counter() - start
+            result = store.measure_recall(queries, k=args.k)
+            print(f"{size:9d} {kind:6s} {build_seconds:8.2f} {result['ann_ms_per_query']:9.3f} "
+                  f"{result['exact_ms_per_query']:9.3f} {result['recall']:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Shared pytest fixtures for the backend tests
+"""
+import os
+from contextlib import contextmanager
+
+import pytest
+
+# Point the app at a throwaway SQLite database before any test module imports it
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from app.config import settings
+from app.database import create_tables
+import app.models  # noqa: F401 - registers every table with Base.metadata
+from app.services.model_registry import SENTENCE_ENCODER, model_registry
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Create the tables once per test run"""
+    create_tables()
+
+
+@pytest.fixture
+def overridden(monkeypatch):
+    """Context manager setting config values for the duration of a with block"""
+    @contextmanager
+    def override(**values):
+        with monkeypatch.context() as patch:
+            for name, value in values.items():
+                patch.setattr(settings, name, value)
+            yield
+    return override
+
+
+@pytest.fixture
+def no_encoder(monkeypatch):
+    """Context manager unloading the sentence encoder, so uploaded resumes are chunked but not embedded"""
+    @contextmanager
+    def unload():
+        with monkeypatch.context() as patch:
+            patch.setitem(model_registry._models, SENTENCE_ENCODER, None)
+            yield
+    return unload
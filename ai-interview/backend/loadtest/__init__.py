@@ -0,0 +1 @@
+"""Load-testing harness: fake Groq and SMTP servers plus a simulated-interview driver"""
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Groq API (OpenAI-compatible chat completions and Whisper)
+
+Answers with canned transcripts and interview questions after a configurable
+latency, so the platform can be load tested without Groq quotas or costs.
+Point the backend at it with GROQ_BASE_URL=http://127.0.0.1:<port>/openai/v1.
+
+Usage: python -m loadtest.fake_groq [--port 9100] [--chat-ms 800] [--whisper-ms 400] [--jitter 0.3]
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+TRANSCRIPTS = [
+    "I have five years of experience building REST APIs in Python with FastAPI and Django.",
+    "I would start by profiling the slow endpoint, then look at the database queries and add indexes where needed.",
+    "A hash map gives constant time lookups on average because keys are hashed into buckets.",
+    "In my last project I migrated a monolith to services behind a message queue, which cut deploy times in half.",
+    "I usually write unit tests first for the core logic and add integration tests around the database layer.",
+    "Caching works well for read-heavy data, but you need a clear invalidation strategy to avoid stale results.",
+    "I prefer PostgreSQL for relational data because of its transactional guarantees and rich indexing options.",
+    "When a teammate disagrees, I walk through the trade-offs with data and we agree on an experiment."
+]
+
+QUESTIONS = [
+    "Can you walk me through how you would design a rate limiter for a public API?",
+    "How do you decide which columns to index in a relational database?",
+    "What is the difference between a process and a thread?",
+    "How would you debug a memory leak in a long-running Python service?",
+    "Can you explain how you would make a background job idempotent?",
+    "What trade-offs do you consider when choosing between SQL and NoSQL storage?",
+    "How do you approach code reviews for a teammate's pull request?",
+    "Describe how HTTP caching headers work and when you would use them."
+]
+
+
+class FakeGroq:
+    """Latency model and request counters shared by the handler threads"""
+
+    def __init__(self, chat_ms: float = 800, whisper_ms: float = 400, jitter: float = 0.3,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.chat_ms = chat_ms
+        self.whisper_ms = whisper_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"chat": 0, "transcribe": 0, "errors": 0}
+
+    def delay(self, mean_ms: float):
+        with self.lock:
+            factor = 1 + self.random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, mean_ms * factor) / 1000)
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            failed = self.error_rate > 0 and self.random.random() < self.error_rate
+            if failed:
+                self.counts["errors"] += 1
+            return failed
+
+    def count(self, kind: str):
+        with self.lock:
+            self.counts[kind] += 1
+
+    def choice(self, options):
+        with self.lock:
+            return self.random.choice(options)
+
+    def chat_content(self, messages) -> str:
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        question = self.choice(QUESTIONS)
+        if "JSON" in system:
+            with self.lock:
+                score = self.random.randint(4, 9)
+            return json.dumps({
+                "score": score,
+                "missing": ["Concrete metrics"] if score < 7 else [],
+                "followup": question,
+                "complete": False
+            })
+        if "summary" in system.lower():
+            return "- Candidate described backend experience with Python and databases."
+        return question
+
+
+def make_handler(fake: FakeGroq):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: dict):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                with fake.lock:
+                    self._send(200, dict(fake.counts))
+            else:
+                self._send(404, {"error": {"message": "Not found"}})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path.endswith("/chat/completions"):
+                fake.count("chat")
+                fake.delay(fake.chat_ms)
+                if fake.should_fail():
+                    return self._send(503, {"error": {"message": "Simulated overload"}})
+                request = json.loads(body or b"{}")
+                content = fake.chat_content(request.get("messages", []))
+                prompt_tokens = sum(len(m.get("content", "")) for m in request.get("messages", [])) // 4
+                return self._send(200, {
+                    "model": request.get("model", "fake"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4}
+                })
+
+            if self.path.endswith("/audio/transcriptions"):
+                fake.count("transcribe")
+                fake.delay(fake.whisper_ms)
+                if fake.should_fail():
+                    return self._send(503, {"error": {"message": "Simulated overload"}})
+                # Rough audio duration from the upload size (~16 kB/s of webm/opus)
+                match = re.search(rb'filename="[^"]*"', body)
+                duration = round(max(len(body) - (match.end() if match else 0), 0) / 16000, 1)
+                return self._send(200, {"text": fake.choice(TRANSCRIPTS), "duration": duration})
+
+            self._send(404, {"error": {"message": "Not found"}})
+
+    return Handler
+
+
+def start_fake_groq(port: int = 0, **kwargs):
+    """Start the server in a background thread; returns (server, fake, base_url)"""
+    fake = FakeGroq(**kwargs)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-groq", daemon=True).start()
+    return server, fake, f"http://127.0.0.1:{server.server_address[1]}/openai/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--chat-ms", type=float, default=800, help="Mean chat completion latency")
+    parser.add_argument("--whisper-ms", type=float, default=400, help="Mean transcription latency")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Latency varies by +/- this fraction")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 503")
+    args = parser.parse_args()
+
+    server, _, base_url = start_fake_groq(args.port, chat_ms=args.chat_ms, whisper_ms=args.whisper_ms,
+                                          jitter=args.jitter, error_rate=args.error_rate)
+    print(f"Fake Groq listening, set GROQ_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
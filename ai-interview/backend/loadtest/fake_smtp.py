@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Local SMTP sink for load tests
+
+Accepts any credentials and keeps every message in memory so a load test can
+read OTP codes back out of the verification emails. No TLS: run the backend
+with SMTP_STARTTLS=false, SMTP_SERVER=127.0.0.1 and SMTP_PORT=<port>.
+
+Usage: python -m loadtest.fake_smtp [--port 2525]
+"""
+import argparse
+import email
+import re
+import socketserver
+import threading
+import time
+from email.utils import getaddresses
+from typing import Dict, List, Optional
+
+OTP_PATTERN = re.compile(r"verification code is:\s*(?:<[^>]+>)?\s*(\d{6})")
+
+
+class MailSink:
+    """Messages received by the SMTP server, newest last"""
+
+    def __init__(self):
+        self.messages: List[Dict] = []
+        self.condition = threading.Condition()
+
+    def add(self, sender: str, recipients: List[str], data: bytes):
+        message = email.message_from_bytes(data)
+        body = ""
+        for part in message.walk():
+            if part.get_content_maintype() == "text":
+                body += part.get_payload(decode=True).decode(part.get_content_charset() or "utf-8", "replace")
+        with self.condition:
+            self.messages.append({
+                "from": sender,
+                "to": [address.lower() for address in recipients],
+                "subject": message.get("Subject", ""),
+                "body": body,
+                "received_at": time.time()
+            })
+            self.condition.notify_all()
+
+    def wait_for(self, recipient: str, subject_contains: str = "", since: float = 0.0,
+                 timeout: float = 30.0) -> Optional[Dict]:
+        """Newest message to recipient received after since, waiting up to timeout seconds"""
+        recipient = recipient.lower()
+        deadline = time.time() + timeout
+        with self.condition:
+            while True:
+                for message in reversed(self.messages):
+                    if message["received_at"] < since:
+                        break
+                    if recipient in message["to"] and subject_contains in message["subject"]:
+                        return message
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+
+    def wait_for_otp(self, recipient: str, since: float = 0.0, timeout: float = 30.0) -> Optional[str]:
+        message = self.wait_for(recipient, "Verification Code", since, timeout)
+        match = OTP_PATTERN.search(message["body"]) if message else None
+        return match.group(1) if match else None
+
+
+def make_handler(sink: MailSink):
+    class SMTPHandler(socketserver.StreamRequestHandler):
+        def reply(self, line: str):
+            self.wfile.write(f"{line}\r\n".encode())
+
+        def handle(self):
+            sender, recipients = "", []
+            self.reply("220 fake-smtp ready")
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                command = line.decode("utf-8", "replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    self.wfile.write(b"250-fake-smtp\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+                elif verb == "HELO":
+                    self.reply("250 fake-smtp")
+                elif verb == "AUTH":
+                    # AUTH PLAIN with an initial response, or AUTH LOGIN with two challenges
+                    if command.upper().startswith("AUTH LOGIN"):
+                        self.reply("334 VXNlcm5hbWU6")
+                        self.rfile.readline()
+                        self.reply("334 UGFzc3dvcmQ6")
+                        self.rfile.readline()
+                    elif len(command.split()) == 2:
+                        self.reply("334 ")
+                        self.rfile.readline()
+                    self.reply("235 Authentication successful")
+                elif verb == "MAIL":
+                    sender, recipients = getaddresses([command.split(":", 1)[1]])[0][1], []
+                    self.reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(getaddresses([command.split(":", 1)[1]])[0][1])
+                    self.reply("250 OK")
+                elif verb == "DATA":
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        data_line = self.rfile.readline()
+                        if not data_line or data_line in (b".\r\n", b".\n"):
+                            break
+                        lines.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                    sink.add(sender, recipients, b"".join(lines))
+                    self.reply("250 OK: queued")
+                elif verb == "RSET":
+                    sender, recipients = "", []
+                    self.reply("250 OK")
+                elif verb == "NOOP":
+                    self.reply("250 OK")
+                elif verb == "QUIT":
+                    self.reply("221 Bye")
+                    return
+                else:
+                    self.reply("502 Command not implemented")
+
+    return SMTPHandler
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_fake_smtp(port: int = 0):
+    """Start the sink in a background thread; returns (server, sink, port)"""
+    sink = MailSink()
+    server = _ThreadingSMTPServer(("127.0.0.1", port), make_handler(sink))
+    threading.Thread(target=server.serve_forever, name="fake-smtp", daemon=True).start()
+    return server, sink, server.server_address[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=2525)
+    args = parser.parse_args()
+
+    server, sink, port = start_fake_smtp(args.port)
+    print(f"Fake SMTP listening on 127.0.0.1:{port}")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"{len(sink.messages)} messages received")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
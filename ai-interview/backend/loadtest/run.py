@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Load test: drive full simulated interviews against the API and report latency percentiles
+
+Boots the backend (uvicorn, SQLite by default or --database-url for Postgres)
+wired to a local fake Groq server and SMTP sink, then runs --interviews
+candidates through invite -> OTP -> start -> speech turns -> PDF report with
+--concurrency interviews in flight. Use --base-url to target a server that is
+already running; it must be configured with the GROQ_BASE_URL and SMTP
+settings printed at start-up.
+
+Usage: python -m loadtest.run [--interviews 20] [--concurrency 5] [--turns 15]
+                              [--chat-ms 800] [--whisper-ms 400] [--workers 1]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import requests
+
+from .fake_groq import start_fake_groq
+from .fake_smtp import start_fake_smtp
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STEPS = ["create_candidate", "create_invite", "open_invite", "otp_send", "otp_verify",
+         "session_start", "speech_turn", "report"]
+
+JOB_DESCRIPTION = (
+    "Backend Engineer: build and operate Python services with FastAPI, PostgreSQL and Redis. "
+    "Design REST APIs, write tests, profile performance problems and review code."
+)
+RESUME = (
+    "Software engineer with five years of Python experience. Built FastAPI and Django services, "
+    "tuned PostgreSQL queries, introduced Redis caching and CI pipelines. Mentored two junior developers."
+)
+
+
+class Recorder:
+    """Latency samples and errors per step, shared by the interview threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, List[str]] = defaultdict(list)
+
+    def call(self, step: str, method, url: str, expected=(200,), **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = method(url, timeout=300, **kwargs)
+        except requests.RequestException as e:
+            self.fail(step, str(e))
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.samples[step].append(elapsed_ms)
+        if response.status_code not in expected:
+            self.fail(step, f"HTTP {response.status_code}: {response.text[:200]}")
+            raise RuntimeError(f"{step} failed with HTTP {response.status_code}")
+        return response
+
+    def fail(self, step: str, message: str):
+        with self.lock:
+            self.errors[step].append(message)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def fake_audio(size_kb: int) -> bytes:
+    # EBML header so the upload looks like webm; the fake Whisper ignores the content
+    return b"\x1a\x45\xdf\xa3" + os.urandom(size_kb * 1024)
+
+
+def run_interview(n: int, base_url: str, job_id: int, run_id: str, sink, recorder: Recorder,
+                  audio: bytes, max_turns: int) -> Dict:
+    """One candidate from invite to report; returns the outcome"""
+    http = requests.Session()
+    email = f"loadtest-{run_id}-{n}@example.com"
+
+    candidate = recorder.call("create_candidate", http.post, f"{base_url}/api/admin/candidates/json", json={
+        "name": f"Load Test Candidate {n}", "email": email, "skills": ["python", "sql"], "resume_text": RESUME
+    }).json()["candidate"]
+
+    invite = recorder.call("create_invite", http.post, f"{base_url}/api/admin/invites/", json={
+        "candidate_id": candidate["id"], "job_id": job_id, "send_email": True
+    }).json()
+    recorder.call("open_invite", http.get, f"{base_url}/invite/{invite['invite_code']}")
+
+    since = time.time()
+    recorder.call("otp_send", http.post, f"{base_url}/identity/otp/send",
+                  json={"email": email, "invite_id": invite["id"]})
+    code = sink.wait_for_otp(email, since=since - 1)
+    if not code:
+        recorder.fail("otp_send", "No OTP email reached the SMTP sink")
+        raise RuntimeError("OTP email not received")
+    recorder.call("otp_verify", http.post, f"{base_url}/identity/otp/verify",
+                  json={"email": email, "invite_id": invite["id"], "code": code})
+
+    session = recorder.call("session_start", http.post, f"{base_url}/session/start",
+                            json={"invite_id": invite["id"]}).json()
+    session_id, question, turn_idx = session["session_id"], session["question"], session["turn_idx"]
+
+    turns = 0
+    complete = False
+    while not complete and turns < max_turns:
+        result = recorder.call(
+            "speech_turn", http.post, f"{base_url}/session/{session_id}/speech",
+            files={"audio": ("answer.webm", audio, "audio/webm")},
+            data={"question": question, "turn_idx": str(turn_idx)}
+        ).json()
+        turns += 1
+        complete = result["complete"]
+        question, turn_idx = result.get("next_question"), result.get("next_turn_idx")
+
+    recorder.call("report", http.get, f"{base_url}/reports/{session_id}.pdf")
+    return {"session_id": session_id, "turns": turns, "complete": complete}
+
+
+def boot_backend(args, groq_url: str, smtp_port: int, database_url: str, scratch_dir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": database_url,
+        "AUDIO_STORAGE_PATH": os.path.join(scratch_dir, "audio"),
+        "GROQ_API_KEY": "loadtest",
+        "GROQ_BASE_URL": groq_url,
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(smtp_port),
+        "SMTP_USERNAME": "loadtest",
+        "SMTP_PASSWORD": "loadtest",
+        "SMTP_STARTTLS": "false",
+        "MAX_QUESTIONS": str(args.turns),
+        "LLM_CACHE_ENABLED": "true" if args.llm_cache else "false",
+    })
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+               "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"]
+    log = open(os.path.join(scratch_dir, "backend.log"), "w")
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    print(f"Backend log: {log.name}")
+    return process
+
+
+def wait_until_live(base_url: str, process: Optional[subprocess.Popen], timeout: float = 180):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError("Backend exited during start-up, see the backend log")
+        try:
+            if requests.get(f"{base_url}/health/live", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Backend at {base_url} did not become live within {timeout:.0f}s")
+
+
+def print_report(recorder: Recorder, outcomes: List[Dict], failures: int, wall_seconds: float, groq_counts: Dict):
+    print(f"\n{'step':18s} {'count':>6s} {'errors':>6s} {'mean':>8s} {'p50':>8s} {'p90':>8s} {'p99':>8s} {'max':>8s}  (ms)")
+    for step in STEPS:
+        values = recorder.samples.get(step, [])
+        errors = len(recorder.errors.get(step, []))
+        if not values:
+            print(f"{step:18s} {0:6d} {errors:6d}")
+            continue
+        print(f"{step:18s} {len(values):6d} {errors:6d} {sum(values) / len(values):8.0f} "
+              f"{percentile(values, 50):8.0f} {percentile(values, 90):8.0f} {percentile(values, 99):8.0f} "
+              f"{max(values):8.0f}")
+
+    requests_made = sum(len(values) for values in recorder.samples.values())
+    completed = sum(1 for outcome in outcomes if outcome["complete"])
+    print(f"\nInterviews: {completed} completed, {len(outcomes) - completed} incomplete, {failures} failed "
+          f"in {wall_seconds:.1f}s")
+    print(f"Throughput: {len(outcomes) / wall_seconds * 60:.1f} interviews/min, "
+          f"{requests_made / wall_seconds:.1f} requests/s")
+    print(f"Fake Groq calls: {groq_counts}")
+    for step, messages in recorder.errors.items():
+        print(f"  {step} error sample: {messages[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=20, help="Simulated candidates")
+    parser.add_argument("--concurrency", type=int, default=5, help="Interviews in flight at once")
+    parser.add_argument("--turns", type=int, default=15, help="Questions per interview (MAX_QUESTIONS)")
+    parser.add_argument("--audio-kb", type=int, default=48, help="Size of each uploaded answer")
+    parser.add_argument("--chat-ms", type=float, default=800, help="Fake Groq chat latency")
+    parser.add_argument("--whisper-ms", type=float, default=400, help="Fake Whisper latency")
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake Groq calls that fail")
+    parser.add_argument("--llm-cache", action="store_true", help="Keep the LLM response cache on")
+    parser.add_argument("--database-url", help="Defaults to a fresh SQLite file; pass a Postgres URL to test Postgres")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--base-url", help="Use an already running backend instead of booting one")
+    parser.add_argument("--smtp-port", type=int, default=0, help="Fixed SMTP sink port (for --base-url)")
+    parser.add_argument("--groq-port", type=int, default=0, help="Fixed fake Groq port (for --base-url)")
+    parser.add_argument("--json", help="Also write raw samples and summary to this file")
+    parser.add_argument("--keep-files", action="store_true", help="Keep the SQLite database, audio and backend log")
+    args = parser.parse_args()
+
+    groq_server, fake, groq_url = start_fake_groq(args.groq_port, chat_ms=args.chat_ms, whisper_ms=args.whisper_ms,
+                                                  jitter=args.jitter, error_rate=args.error_rate)
+    smtp_server, sink, smtp_port = start_fake_smtp(args.smtp_port)
+    print(f"Fake Groq: GROQ_BASE_URL={groq_url}")
+    print(f"Fake SMTP: SMTP_SERVER=127.0.0.1 SMTP_PORT={smtp_port} SMTP_STARTTLS=false")
+
+    process = None
+    scratch_dir = tempfile.mkdtemp(prefix="loadtest_")
+    base_url = args.base_url
+    if not base_url:
+        database_url = args.database_url or f"sqlite:///{os.path.join(scratch_dir, 'loadtest.db')}"
+        print(f"Database: {database_url}")
+        process = boot_backend(args, groq_url, smtp_port, database_url, scratch_dir)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    recorder = Recorder()
+    outcomes: List[Dict] = []
+    failures = 0
+    try:
+        wait_until_live(base_url, process)
+        job = requests.post(f"{base_url}/api/admin/jobs/", json={
+            "title": "Load Test Backend Engineer", "level": "mid", "department": "Engineering",
+            "description": JOB_DESCRIPTION
+        }, timeout=60)
+        job.raise_for_status()
+        job_id = job.json()["id"]
+
+        run_id = uuid.uuid4().hex[:8]
+        audio = fake_audio(args.audio_kb)
+        max_turns = args.turns * 2  # Failed transcriptions add retry turns
+        print(f"Running {args.interviews} interviews x {args.turns} turns, concurrency {args.concurrency}...")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [
+                pool.submit(run_interview, n, base_url, job_id, run_id, sink, recorder, audio, max_turns)
+                for n in range(args.interviews)
+            ]
+            for future in as_completed(futures):
+                try:
+                    outcomes.append(future.result())
+                except Exception:
+                    failures += 1
+        wall_seconds = time.perf_counter() - start
+
+        print_report(recorder, outcomes, failures, wall_seconds, dict(fake.counts))
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({
+                    "args": vars(args),
+                    "wall_seconds": wall_seconds,
+                    "outcomes": outcomes,
+                    "failures": failures,
+                    "samples_ms": recorder.samples,
+                    "errors": recorder.errors,
+                    "groq_calls": fake.counts
+                }, f, indent=2)
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        groq_server.shutdown()
+        smtp_server.shutdown()
+        if args.keep_files:
+            print(f"Database, audio and backend log kept in {scratch_dir}")
+        else:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
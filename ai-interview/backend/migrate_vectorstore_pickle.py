@@ -0,0 +1,52 @@
+"""
+Convert a legacy pickle-based vector store ({path}.faiss + {path}.pkl) to the
+memory-mapped format used by VectorStore.save/load.
+
+Only run this on stores you created yourself: unpickling executes arbitrary code.
+
+Usage: python migrate_vectorstore_pickle.py <path-without-extension>
+"""
+
+import os
+import sys
+import pickle
+
+import faiss
+import numpy as np
+
+from app.services.vectorstore import VectorStore
+
+
+def migrate(path: str):
+    index_file = f"{path}.faiss"
+    pickle_file = f"{path}.pkl"
+    if not os.path.exists(pickle_file):
+        print(f"No legacy store found at {pickle_file}")
+        sys.exit(1)
+
+    with open(pickle_file, 'rb') as f:
+        data = pickle.load(f)
+
+    store = VectorStore()
+    if os.path.exists(index_file):
+        index = faiss.read_index(index_file)
+        store.vectors = index.reconstruct_n(0, index.ntotal).astype('float32')
+    else:
+        store.vectors = np.zeros((0, store.dimension), dtype='float32')
+
+    store.documents = list(data['documents'])
+    store.metadata = list(data['metadata'])
+    if len(store.documents) != store.ntotal:
+        print(f"Legacy store is inconsistent: {store.ntotal} vectors, {len(store.documents)} documents")
+        sys.exit(1)
+
+    # save() writes a new version under {path}.versions with an index rebuilt from the same vectors
+    store.save(path)
+    print(f"Migrated {store.ntotal} documents. You can now delete {pickle_file} and {index_file}.")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+    migrate(sys.argv[1])
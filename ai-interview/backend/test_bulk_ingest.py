@@ -0,0 +1,179 @@
+"""
+Test bulk resume ingestion: zip expansion, parallel parsing, email deduplication, one bulk insert, per-file progress
+"""
+import asyncio
+import io
+import secrets
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from app.database import SessionLocal
+from app.main import app
+from app.models import Candidate
+from app.services.bulk_ingest import BulkIngestError, bulk_ingestor, expand_uploads
+from app.services.resume_parser import ResumeParser
+from app.services.sql_tracer import trace_sql
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+
+
+def resume_text(name: str, email: str) -> str:
+    return f"{name}\n{email}\n+1 555-123-4567\n6 years of experience with Python, Docker and PostgreSQL\n"
+
+
+def make_pdf(text: str) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for number, line in enumerate(text.splitlines()):
+        pdf.drawString(72, 720 - number * 16, line)
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def make_zip(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_contact_info_extraction():
+    info = ResumeParser().extract_contact_info(resume_text("Jane Doe", "Jane.Doe@Example.com"))
+    assert info["name"] == "Jane Doe"
+    assert info["email"] == "jane.doe@example.com"
+    assert info["phone"] == "+1 555-123-4567"
+    assert info["experience_years"] == 6
+    assert {"Python", "Docker", "PostgreSQL"} <= set(info["skills"])
+
+
+def test_bulk_upload_reports_every_file(overridden, no_encoder):
+    tag = secrets.token_hex(4)
+    existing_email = f"existing-{tag}@example.com"
+    db = SessionLocal()
+    try:
+        db.add(Candidate(name="Already Here", email=existing_email))
+        db.commit()
+    finally:
+        db.close()
+
+    archive = make_zip({
+        "resumes/alice.pdf": make_pdf(resume_text("Alice Smith", f"alice-{tag}@example.com")),
+        "resumes/bob.txt": resume_text("Bob Jones", f"bob-{tag}@example.com"),
+        "resumes/bob_again.txt": resume_text("Bob Jones", f"BOB-{tag}@example.com"),
+        "resumes/existing.txt": resume_text("Already Here", existing_email.upper()),
+        "resumes/no_email.txt": "Carol White\nNo contact details here\n",
+        "resumes/photo.png": b"\x89PNG",
+        "__MACOSX/resumes/._alice.pdf": b"",
+    })
+    with overridden(document_pool_workers=0), no_encoder():
+        response = client.post("/api/admin/candidates/bulk", files=[
+            ("files", ("batch.zip", archive, "application/zip")),
+            ("files", ("dave.pdf", make_pdf(resume_text("Dave Brown", f"dave-{tag}@example.com")), "application/pdf")),
+        ])
+    assert response.status_code == 202, response.text
+    created = response.json()
+    assert created["total"] == 7
+
+    job = client.get(created["status_url"]).json()
+    assert job["status"] == "completed"
+    assert job["processed"] == job["total"] == 7
+    by_name = {entry["filename"]: entry for entry in job["files"]}
+    assert by_name["resumes/alice.pdf"]["status"] == "created"
+    assert by_name["resumes/bob.txt"]["status"] == "created"
+    assert by_name["resumes/bob_again.txt"]["status"] == "duplicate"
+    assert "resumes/bob.txt" in by_name["resumes/bob_again.txt"]["error"]
+    assert by_name["resumes/existing.txt"]["status"] == "duplicate"
+    assert by_name["resumes/no_email.txt"]["error"] == "No email address found"
+    assert by_name["resumes/photo.png"]["error"] == "Unsupported file type"
+    assert by_name["dave.pdf"]["status"] == "created"
+    assert job["counts"] == {"queued": 0, "parsing": 0, "parsed": 0, "created": 3, "duplicate": 2, "failed": 2}
+
+    db = SessionLocal()
+    try:
+        alice = db.get(Candidate, by_name["resumes/alice.pdf"]["candidate_id"])
+        assert alice.name == "Alice Smith"
+        assert alice.email == f"alice-{tag}@example.com"
+        assert "Python" in alice.resume_text
+        assert alice.experience_years == 6
+    finally:
+        db.close()
+
+
+def test_dedupe_is_one_query_and_insert_is_batched(overridden, no_encoder):
+    tag = secrets.token_hex(4)
+    entries = expand_uploads([
+        (f"candidate{n}.txt", resume_text(f"Batch Person", f"batch{n}-{tag}@example.com").encode())
+        for n in range(20)
+    ])
+    job = bulk_ingestor.create_job(entries)
+    with overridden(document_pool_workers=0), no_encoder(), trace_sql() as trace:
+        asyncio.run(bulk_ingestor.run(job, entries))
+    assert job["counts"]["created"] == 20
+
+    email_checks = [sig for sig in trace.signatures if "lower(candidates.email) IN" in sig]
+    inserts = sum(count for sig, count in trace.signatures.items() if sig.startswith("INSERT INTO candidates"))
+    assert len(email_checks) == 1 and trace.signatures[email_checks[0]] == 1
+    assert inserts == 1
+
+
+def test_batch_limits_and_unknown_job(overridden):
+    with overridden(bulk_ingest_max_files=2):
+        response = client.post("/api/admin/candidates/bulk", files=[
+            ("files", (f"r{n}.txt", b"resume", "text/plain")) for n in range(3)
+        ])
+    assert response.status_code == 413
+
+    with overridden(document_max_mb=1):
+        entries = expand_uploads([("big.zip", make_zip({"big.txt": b"x" * (2 * 1024 * 1024)}))])
+    assert entries[0][1] is None and "larger than" in entries[0][2]
+
+    with overridden(bulk_ingest_max_mb=1):
+        response = client.post("/api/admin/candidates/bulk", files=[
+            ("files", ("huge.txt", b"x" * (2 * 1024 * 1024), "text/plain"))
+        ])
+    assert response.status_code == 413
+
+
+def test_zip_limits_are_checked_before_decompressing(overridden):
+    reads = []
+    original_read = zipfile.ZipFile.read
+
+    def counting_read(self, name, pwd=None):
+        reads.append(name)
+        return original_read(self, name, pwd)
+
+    # 3 MB of members; only their headers may be read before the limits pass
+    archive = make_zip({f"r{n}.txt": b"a" * (1024 * 1024) for n in range(3)})
+    zipfile.ZipFile.read = counting_read
+    try:
+        with overridden(bulk_ingest_max_mb=2):
+            try:
+                expand_uploads([("bomb.zip", archive)])
+                assert False, "3 MB uncompressed should exceed a 2 MB batch"
+            except BulkIngestError as e:
+                assert "uncompressed" in str(e)
+        with overridden(bulk_ingest_max_files=2):
+            try:
+                expand_uploads([("many.zip", archive)])
+                assert False, "3 members should exceed a 2 file batch"
+            except BulkIngestError:
+                pass
+        assert reads == []
+
+        # Accepted members are read one by one when parsed
+        entries = expand_uploads([("ok.zip", archive)])
+        assert reads == [] and all(callable(content) for _, content, _ in entries)
+        assert entries[0][1]() == b"a" * (1024 * 1024)
+        assert len(reads) == 1
+    finally:
+        zipfile.ZipFile.read = original_read
+
+    assert client.get("/api/admin/candidates/bulk/missing").status_code == 404
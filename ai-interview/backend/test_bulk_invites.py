@@ -0,0 +1,160 @@
+"""
+Test bulk invites: set-based validation, one bulk insert, per-candidate progress, calendar template and queued emails
+"""
+import secrets
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.models import Candidate, Invite, Job
+from app.services.bulk_invites import bulk_inviter
+from app.services.calendar import generate_ics_file, ics_template, render_ics
+from app.services.emailer import email_service
+from app.services.mail_queue import mail_queue
+from app.services.sql_tracer import trace_sql
+from loadtest.fake_smtp import start_fake_smtp
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+
+
+@contextmanager
+def smtp_sink():
+    """Point the shared email service at a local SMTP sink"""
+    server, sink, port = start_fake_smtp()
+    names = ("smtp_host", "smtp_port", "smtp_user", "smtp_pass", "smtp_configured")
+    previous = {name: getattr(email_service, name) for name in names}
+    previous_starttls = settings.smtp_starttls
+    email_service.smtp_host, email_service.smtp_port = "127.0.0.1", port
+    email_service.smtp_user, email_service.smtp_pass, email_service.smtp_configured = "loadtest", "loadtest", True
+    settings.smtp_starttls = False
+    try:
+        yield sink
+    finally:
+        for name, value in previous.items():
+            setattr(email_service, name, value)
+        settings.smtp_starttls = previous_starttls
+        server.shutdown()
+
+
+def make_job_and_candidates(count: int):
+    tag = secrets.token_hex(4)
+    db = SessionLocal()
+    try:
+        job = Job(title=f"Platform Engineer {tag}", description="Kubernetes and Go")
+        candidates = [Candidate(name=f"Person {n}", email=f"person{n}-{tag}@example.com") for n in range(count)]
+        db.add(job)
+        db.add_all(candidates)
+        db.commit()
+        return job.id, [candidate.id for candidate in candidates]
+    finally:
+        db.close()
+
+
+def test_bulk_invite_reports_every_candidate():
+    job_id, candidate_ids = make_job_and_candidates(4)
+    db = SessionLocal()
+    try:
+        db.add(Invite(candidate_id=candidate_ids[3], job_id=job_id, invite_code="EXISTING",
+                      status="pending", expires_at=datetime.now() + timedelta(days=3)))
+        db.commit()
+    finally:
+        db.close()
+
+    with smtp_sink() as sink:
+        response = client.post("/api/admin/invites/bulk", json={
+            "job_id": job_id,
+            "candidate_ids": candidate_ids[:3] + [candidate_ids[0], candidate_ids[3], 999999]
+        })
+        assert response.status_code == 202, response.text
+        assert mail_queue.flush(timeout=10)
+
+        job = client.get(response.json()["status_url"]).json()
+        assert job["status"] == "completed"
+        assert job["processed"] == job["total"] == 6
+        # Progress reports delivery, not only queueing
+        assert job["counts"] == {"queued": 0, "invited": 3, "duplicate": 2, "failed": 1,
+                                 "emails_queued": 3, "emails_sent": 3, "emails_failed": 0}
+        entries = job["candidates"]
+        assert [entry["email_status"] for entry in entries[:3]] == ["sent"] * 3
+        assert entries[3]["error"] == "Listed more than once"
+        assert "pending invite" in entries[4]["error"]
+        assert entries[5]["error"] == "Candidate not found"
+
+        for entry in entries[:3]:
+            message = sink.wait_for(entry["email"], "Invitation", timeout=5)
+            assert message is not None and entry["invite_code"] in message["body"]
+
+    db = SessionLocal()
+    try:
+        invites = db.query(Invite).filter(Invite.job_id == job_id).all()
+        assert len(invites) == 4
+        assert {invite.id for invite in invites} >= {entry["invite_id"] for entry in entries[:3]}
+    finally:
+        db.close()
+
+
+def test_invites_are_validated_and_inserted_in_bulk():
+    job_id, candidate_ids = make_job_and_candidates(30)
+    job = bulk_inviter.create_job(job_id, candidate_ids, send_email=False)
+    with trace_sql() as trace:
+        bulk_inviter.run(job)
+    assert job["counts"]["invited"] == 30 and job["counts"]["emails_queued"] == 0
+
+    candidate_reads = sum(count for sig, count in trace.signatures.items() if "FROM candidates" in sig)
+    invite_checks = sum(count for sig, count in trace.signatures.items() if sig.startswith("SELECT invites.candidate_id"))
+    inserts = sum(count for sig, count in trace.signatures.items() if sig.startswith("INSERT INTO invites"))
+    assert candidate_reads == 1 and invite_checks == 1 and inserts == 1
+
+
+def test_calendar_template_matches_single_invite():
+    start, end = datetime(2026, 3, 2, 9), datetime(2026, 3, 9, 17)
+    template = ics_template("Data Engineer", start, end)
+    rendered = render_ics(template, "Ana Ruiz", "http://localhost:5173/i/ABC", uid="invite-7").decode()
+    assert rendered == generate_ics_file("Ana Ruiz", "Data Engineer", "http://localhost:5173/i/ABC",
+                                         start, end, uid="invite-7").decode()
+    assert "UID:invite-7@exatech.com" in rendered and "Candidate: Ana Ruiz" in rendered
+    assert "{{" not in rendered
+
+
+def test_resend_reports_delivery_failures():
+    job_id, candidate_ids = make_job_and_candidates(1)
+    db = SessionLocal()
+    try:
+        invite = Invite(candidate_id=candidate_ids[0], job_id=job_id, invite_code=secrets.token_hex(4).upper(),
+                        status="pending", expires_at=datetime.now() + timedelta(days=3))
+        db.add(invite)
+        db.commit()
+        invite_id = invite.id
+        email = db.query(Candidate.email).filter(Candidate.id == candidate_ids[0]).scalar()
+    finally:
+        db.close()
+
+    with smtp_sink() as sink:
+        response = client.post(f"/api/admin/invites/{invite_id}/resend-email")
+        assert response.status_code == 200, response.text
+        # Sent before the response, not queued
+        assert sink.wait_for(email, "Invitation", timeout=0) is not None
+
+        # Nothing listening: the admin sees the failure instead of a success message
+        email_service.smtp_port = 1
+        response = client.post(f"/api/admin/invites/{invite_id}/resend-email")
+        assert response.status_code == 400
+        assert "Failed to send email" in response.json()["detail"]
+
+
+def test_bulk_invite_limits_and_unknown_job(overridden):
+    job_id, candidate_ids = make_job_and_candidates(3)
+    with overridden(bulk_invite_max_candidates=2):
+        response = client.post("/api/admin/invites/bulk", json={"job_id": job_id, "candidate_ids": candidate_ids})
+    assert response.status_code == 413
+
+    assert client.post("/api/admin/invites/bulk", json={"job_id": job_id, "candidate_ids": []}).status_code == 400
+    assert client.post("/api/admin/invites/bulk", json={"job_id": 999999, "candidate_ids": [1]}).status_code == 404
+    assert client.get("/api/admin/invites/bulk/missing").status_code == 404
@@ -0,0 +1,86 @@
+"""
+Test the lean candidate listing: resume text left out, one grouped stats query, field selection
+"""
+import secrets
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models import Candidate, Invite, Job, Session as SessionModel
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+RESUME = "Senior Python engineer. " * 400
+
+
+def create_candidates(count: int, sessions_each: int = 2):
+    """Candidates sharing a unique name prefix, each with scored interview sessions"""
+    db = SessionLocal()
+    try:
+        prefix = f"Listing {secrets.token_hex(4)}"
+        job = Job(title="Listing Engineer", description="Python")
+        db.add(job)
+        db.commit()
+        for n in range(count):
+            candidate = Candidate(name=f"{prefix} {n}", email=f"{prefix.replace(' ', '-')}-{n}@example.com",
+                                  resume_text=RESUME)
+            db.add(candidate)
+            db.commit()
+            invite = Invite(candidate_id=candidate.id, job_id=job.id, invite_code=f"{prefix}-{n}",
+                            expires_at=datetime.now(timezone.utc) + timedelta(days=1))
+            db.add(invite)
+            db.commit()
+            db.add_all([
+                SessionModel(invite_id=invite.id, session_token=f"{prefix}-{n}-{i}", score=6.0 + i)
+                for i in range(sessions_each)
+            ])
+            db.commit()
+        return prefix
+    finally:
+        db.close()
+
+
+def test_listing_omits_resume_text_and_aggregates_stats():
+    prefix = create_candidates(3)
+    body = client.get("/api/admin/candidates/", params={"search": prefix}).json()
+    assert body["total"] == 3
+    for candidate in body["candidates"]:
+        assert "resume_text" not in candidate
+        assert candidate["has_resume"] is True
+        assert candidate["resume_text_length"] == len(RESUME)
+        assert candidate["interview_count"] == 2
+        assert candidate["average_score"] == 6.5
+
+
+def test_field_selection():
+    prefix = create_candidates(2, sessions_each=0)
+    body = client.get("/api/admin/candidates/", params={"search": prefix, "fields": "name,interview_count"}).json()
+    assert [sorted(c) for c in body["candidates"]] == [["id", "interview_count", "name"]] * 2
+    assert body["candidates"][0]["interview_count"] == 0
+
+    with_resume = client.get("/api/admin/candidates/", params={"search": prefix, "fields": "name,resume_text"}).json()
+    assert with_resume["candidates"][0]["resume_text"] == RESUME
+
+    assert client.get("/api/admin/candidates/", params={"fields": "name,password"}).status_code == 400
+
+
+def test_resume_endpoint():
+    prefix = create_candidates(1, sessions_each=0)
+    candidate_id = client.get("/api/admin/candidates/", params={"search": prefix}).json()["candidates"][0]["id"]
+    resume = client.get(f"/api/admin/candidates/{candidate_id}/resume").json()
+    assert resume["resume_text"] == RESUME
+    assert resume["resume_text_length"] == len(RESUME)
+    assert client.get("/api/admin/candidates/99999999/resume").status_code == 404
+
+
+def test_query_count_does_not_grow_with_page_size(overridden):
+    prefix = create_candidates(6, sessions_each=1)
+    with overridden(sql_trace_headers=True):
+        small = client.get("/api/admin/candidates/", params={"search": prefix, "limit": 2})
+        large = client.get("/api/admin/candidates/", params={"search": prefix, "limit": 6})
+    assert len(large.json()["candidates"]) == 6
+    assert small.headers["X-DB-Query-Count"] == large.headers["X-DB-Query-Count"]
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test rolling conversation summaries and the compacted follow-up prompt (no Groq calls)
+"""
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from app.config import settings
+from app.services.conversation_summary import conversation_summarizer, estimate_tokens
+from app.services.groq_client import groq_client
+from app.services.llm_cache import llm_cache
+from app.services.rag import rag_service
+
+ANSWER = ("I designed the service around a message queue so that spikes in traffic did not overload the database. "
+          "We partitioned the workers by customer, added retries with backoff and tracked lag in Grafana. ") * 3
+
+
+def make_history(n):
+    return [{"question": f"Question {i}: tell me about system {i} and how you scaled it?", "answer": f"{ANSWER} #{i}"}
+            for i in range(1, n + 1)]
+
+
+def test_short_history_is_not_summarized():
+    session = SimpleNamespace(id=1, session_metadata=None)
+    assert conversation_summarizer.compact(session, make_history(settings.history_recent_turns)) is None
+    assert session.session_metadata is None
+
+
+def test_summary_is_incremental():
+    session = SimpleNamespace(id=2, session_metadata={"other": True})
+    recent = settings.history_recent_turns
+    summarized = []
+    original = conversation_summarizer.summarize_turns
+
+    def counting(previous, turns):
+        summarized.append(len(turns))
+        return original(previous, turns)
+
+    with patch.object(conversation_summarizer, "summarize_turns", side_effect=counting):
+        first = conversation_summarizer.compact(session, make_history(recent + 4))
+        second = conversation_summarizer.compact(session, make_history(recent + 5))
+        third = conversation_summarizer.compact(session, make_history(recent + 5))
+
+    assert summarized == [4, 1]
+    assert second.startswith(first) and third == second
+    assert session.session_metadata["other"] is True
+    assert session.session_metadata["conversation_summary"]["turns"] == 5
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": '{"score": 7, "missing": [], "followup": "Next?", "complete": false}'}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 20}}
+
+
+def prompt_tokens(conversation_summary):
+    history = make_history(14)
+    with patch("app.services.groq_client.requests.post", return_value=FakeResponse()) as post:
+        rag_service.generate_followup_question(
+            "How would you scale it?", ANSWER, "Backend engineer", 14, history,
+            conversation_summary=conversation_summary
+        )
+    payload = post.call_args.kwargs["json"]
+    return sum(estimate_tokens(m["content"]) for m in payload["messages"])
+
+
+def test_compacted_prompt_is_smaller():
+    original = (llm_cache.redis_client, settings.llm_cache_enabled, settings.question_source)
+    llm_cache.redis_client, settings.llm_cache_enabled, settings.question_source = None, False, "llm"
+    try:
+        session = SimpleNamespace(id=3, session_metadata=None)
+        summary = conversation_summarizer.compact(session, make_history(14))
+        assert prompt_tokens(summary) < prompt_tokens(None)
+    finally:
+        llm_cache.redis_client, settings.llm_cache_enabled, settings.question_source = original
+
+
+if __name__ == "__main__":
+    test_short_history_is_not_summarized()
+    test_summary_is_incremental()
+    test_compacted_prompt_is_smaller()
+    print("✅ Conversation summary tests passed")
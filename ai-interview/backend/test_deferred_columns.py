@@ -0,0 +1,187 @@
+"""
+Test deferred loading of large text/JSON columns: listings fetch only small columns, detail views undefer what they show
+"""
+import os
+import secrets
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models import Candidate, Invite, Job, ProctorEvent, Session as SessionModel, Turn
+from app.services.sql_tracer import trace_sql
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+
+# Each large value is well above anything a listing row should carry
+BLOB_SIZE = 20_000
+TURNS = 6
+
+
+def blob(label: str) -> str:
+    return (label + " ") * (BLOB_SIZE // (len(label) + 1))
+
+
+def value_size(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    return 8
+
+
+@contextmanager
+def count_fetched_bytes():
+    """Total size of every value fetched from the database inside the block (SQLite row factory)"""
+    fetched = {"bytes": 0, "rows": 0}
+
+    def row_factory(cursor, row):
+        fetched["rows"] += 1
+        fetched["bytes"] += sum(value_size(value) for value in row)
+        return row
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        cursor.row_factory = row_factory
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield fetched
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def create_interview() -> dict:
+    """A completed interview where every deferred column holds a large value"""
+    db = SessionLocal()
+    try:
+        suffix = secrets.token_hex(4)
+        candidate = Candidate(name=f"Deferred {suffix}", email=f"deferred-{suffix}@example.com",
+                              resume_text=blob("resume"))
+        job = Job(title=f"Deferred Engineer {suffix}", department="Platform", description=blob("description"))
+        db.add_all([candidate, job])
+        db.commit()
+        invite = Invite(candidate_id=candidate.id, job_id=job.id, invite_code=f"deferred-{suffix}",
+                        expires_at=datetime.now(timezone.utc) + timedelta(days=1))
+        db.add(invite)
+        db.commit()
+        session = SessionModel(invite_id=invite.id, session_token=f"deferred-{suffix}", status="completed",
+                               score=7.0, ended_at=datetime.now(timezone.utc))
+        db.add(session)
+        db.commit()
+        now = datetime.now(timezone.utc)
+        db.add_all([
+            Turn(session_id=session.id, question_number=n, idx=n, question_text=f"Question {n}",
+                 prompt=f"Question {n}", answer_text=blob("answer"), ai_evaluation={"response": blob("eval")},
+                 scores_json={"score": 7, "notes": blob("scores")}, turn_score=7.0, status="ontime",
+                 start_time=now, started_at=now)
+            for n in range(1, TURNS + 1)
+        ])
+        db.add_all([
+            ProctorEvent(session_id=session.id, event_type="tab_hidden", severity="low",
+                         event_data={"trace": blob("event")})
+            for _ in range(TURNS)
+        ])
+        db.commit()
+        return {"suffix": suffix, "candidate_id": candidate.id, "job_id": job.id, "session_id": session.id}
+    finally:
+        db.close()
+
+
+def test_large_columns_are_not_loaded_by_default():
+    ids = create_interview()
+    db = SessionLocal()
+    try:
+        turn = db.query(Turn).filter(Turn.session_id == ids["session_id"]).first()
+        event_row = db.query(ProctorEvent).filter(ProctorEvent.session_id == ids["session_id"]).first()
+        candidate = db.get(Candidate, ids["candidate_id"])
+        job = db.get(Job, ids["job_id"])
+        for instance, columns in [(turn, ["answer_text", "ai_evaluation", "scores_json"]),
+                                  (event_row, ["event_data"]), (candidate, ["resume_text"]),
+                                  (job, ["description"])]:
+            for column in columns:
+                assert column not in instance.__dict__, column
+
+        # The whole group loads together on first access
+        assert turn.answer_text.startswith("answer")
+        assert "scores_json" in turn.__dict__ and "ai_evaluation" in turn.__dict__
+    finally:
+        db.close()
+
+
+def test_listing_endpoints_fetch_few_bytes():
+    ids = create_interview()
+    listings = [
+        ("/api/admin/candidates/", {"search": f"Deferred {ids['suffix']}"}),
+        ("/api/admin/sessions/", {"search": f"deferred-{ids['suffix']}"}),
+        ("/api/admin/reports/", {"search": f"Deferred {ids['suffix']}"}),
+        ("/api/admin/invites/", {"search": f"deferred-{ids['suffix']}"}),
+    ]
+    for path, params in listings:
+        with count_fetched_bytes() as fetched:
+            response = client.get(path, params=params)
+        assert response.status_code == 200, (path, response.text)
+        assert fetched["rows"] > 0, path
+        # Not even one large value may be fetched
+        assert fetched["bytes"] < BLOB_SIZE, (path, fetched)
+
+
+def test_detail_endpoints_undefer_what_they_show():
+    ids = create_interview()
+    with trace_sql() as trace:
+        response = client.get(f"/api/admin/sessions/{ids['session_id']}")
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert all(turn["ai_response"].startswith("eval") for turn in body["turns"])
+    assert all(event["metadata"]["trace"].startswith("event") for event in body["proctor_events"])
+    # Deferred columns come with the turn and event queries, not one lazy load per row
+    assert trace.max_repeats() < TURNS
+
+    jobs = client.get("/api/admin/jobs/", params={"search": f"Deferred Engineer {ids['suffix']}"}).json()
+    job = next(job for job in jobs["jobs"] if job["id"] == ids["job_id"])
+    assert job["description"].startswith("description")
+
+
+def test_unscored_answer_does_not_load_resume():
+    ids = create_interview()
+    db = SessionLocal()
+    try:
+        session = db.get(SessionModel, ids["session_id"])
+        session.status = "active"
+        db.query(Turn).filter(Turn.session_id == session.id, Turn.question_number == 1).update(
+            {"status": "pending", "answer_text": None}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    followup = {"score": None, "missing": [], "followup": "What drew you to platform work?", "complete": False}
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        # Question 1 is not scored; resume passages come from the resume index, not the resume column
+        with patch("app.routers.sessions.groq_client.transcribe_audio", return_value="I enjoy building tooling"), \
+                patch("app.routers.sessions.rag_service.generate_followup_question", return_value=followup):
+            response = client.post(
+                f"/session/{ids['session_id']}/speech",
+                files={"audio": ("answer.webm", b"\x1a\x45\xdf\xa3" + b"\0" * 4096, "audio/webm")},
+                data={"question": "Question 1", "turn_idx": "1"}
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        for name in os.listdir(settings.audio_storage_path):
+            if name.startswith(f"session_{ids['session_id']}_turn_"):
+                os.remove(os.path.join(settings.audio_storage_path, name))
+    assert response.status_code == 200, response.text
+    assert not [statement for statement in statements if "resume_text" in statement]
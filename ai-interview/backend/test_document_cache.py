@@ -0,0 +1,255 @@
+"""
+Test the content-addressed document cache: repeat uploads skip extraction, limit changes invalidate, backfills skip seen files,
+unused and deleted candidates' entries are removed
+"""
+import asyncio
+import io
+import os
+import secrets
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.models import CachedDocument, Candidate
+from app.services import document_cache as document_cache_module
+from app.services.document_cache import content_hash, document_cache
+from app.services.document_pool import document_pool
+from backfill_resume_cache import backfill
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+
+
+def make_pdf(text: str) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for y, line in zip(range(720, 0, -20), text.splitlines()):
+        pdf.drawString(72, y, line)
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def resume(tag: str) -> str:
+    return f"Erin Walker\nerin-{tag}@example.com\nSkills\n5 years of experience with Python and k8s\n"
+
+
+@contextmanager
+def counted_extractions():
+    """Count the documents that actually reach the document pool"""
+    calls = []
+    original = document_pool.extract_text
+
+    async def extract_text(content, filename):
+        calls.append(filename)
+        return await original(content, filename)
+
+    document_pool.extract_text = extract_text
+    try:
+        yield calls
+    finally:
+        del document_pool.extract_text
+
+
+def test_repeat_parse_is_a_cache_hit(overridden):
+    content = make_pdf(resume(secrets.token_hex(4)))
+    with overridden(document_pool_workers=0), counted_extractions() as calls:
+        first = asyncio.run(document_cache.parse_resume(content, "erin.pdf"))
+        second = asyncio.run(document_cache.parse_resume(content, "copy-of-erin.pdf"))
+    assert calls == ["erin.pdf"]
+    assert first["cached"] is False and second["cached"] is True
+    assert second["text"] == first["text"]
+    assert second["contact"] == first["contact"]
+    assert second["contact"]["skills"] == ["Python", "Kubernetes"]
+
+    db = SessionLocal()
+    try:
+        row = db.query(CachedDocument).filter(CachedDocument.content_hash == content_hash(content)).one()
+        assert row.hit_count == 1
+        assert row.parsed_json["contact"]["experience_years"] == 5
+    finally:
+        db.close()
+
+
+def test_parsing_runs_off_the_event_loop(overridden, monkeypatch):
+    on_loop = []
+    parse_resume_text = document_cache_module.parse_resume_text
+
+    def recorded_parse(text):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return parse_resume_text(text)
+
+    monkeypatch.setattr(document_cache_module, "parse_resume_text", recorded_parse)
+    with overridden(document_pool_workers=0):
+        asyncio.run(document_cache.parse_resume(make_pdf(resume(secrets.token_hex(4))), "resume.pdf"))
+    assert on_loop == [False]
+
+
+def test_changed_limits_and_disabled_cache_extract_again(overridden):
+    content = make_pdf(resume(secrets.token_hex(4)))
+    with overridden(document_pool_workers=0), counted_extractions() as calls:
+        asyncio.run(document_cache.extract_text(content, "resume.pdf"))
+        with overridden(document_max_chars=20):
+            short = asyncio.run(document_cache.extract_text(content, "resume.pdf"))
+        with overridden(document_cache_enabled=False):
+            asyncio.run(document_cache.extract_text(content, "resume.pdf"))
+    assert len(calls) == 3
+    assert short["cached"] is False and len(short["text"]) <= 20
+
+
+def test_upload_endpoint_reuses_parsed_resume(overridden, no_encoder):
+    tag = secrets.token_hex(4)
+    content = make_pdf(resume(tag))
+    db = SessionLocal()
+    try:
+        candidate = Candidate(name="Erin Walker", email=f"erin-upload-{tag}@example.com")
+        db.add(candidate)
+        db.commit()
+        url = f"/api/admin/candidates/{candidate.id}/parse-resume"
+    finally:
+        db.close()
+
+    with overridden(document_pool_workers=0), no_encoder(), counted_extractions() as calls:
+        responses = [
+            client.post(url, files={"resume": ("erin.pdf", content, "application/pdf")}) for _ in range(2)
+        ]
+    assert [r.status_code for r in responses] == [200, 200], responses[0].text
+    assert responses[0].json()["parsed_data"] == responses[1].json()["parsed_data"]
+    assert "Python" in responses[1].json()["parsed_data"]["raw_text"]
+    assert len(calls) == 1
+
+
+def cached_row(content: bytes):
+    db = SessionLocal()
+    try:
+        return db.query(CachedDocument).filter(CachedDocument.content_hash == content_hash(content)).first()
+    finally:
+        db.close()
+
+
+def test_unused_entries_are_swept(overridden):
+    stale, fresh = make_pdf(resume(secrets.token_hex(4))), make_pdf(resume(secrets.token_hex(4)))
+    with overridden(document_pool_workers=0):
+        asyncio.run(document_cache.extract_text(stale, "stale.pdf"))
+        db = SessionLocal()
+        try:
+            db.query(CachedDocument).filter(CachedDocument.content_hash == content_hash(stale)).update(
+                {"last_used_at": datetime.now(timezone.utc) - timedelta(days=settings.document_cache_retention_days + 1)}
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        # Storing a new entry runs the sweep once the interval has passed
+        document_cache._next_sweep = 0.0
+        asyncio.run(document_cache.extract_text(fresh, "fresh.pdf"))
+    assert cached_row(stale) is None
+    assert cached_row(fresh) is not None
+
+
+def test_deleting_candidate_drops_cached_resume(overridden, no_encoder):
+    tag = secrets.token_hex(4)
+    content = make_pdf(resume(tag))
+    db = SessionLocal()
+    try:
+        candidate = Candidate(name="Erin Walker", email=f"erin-delete-{tag}@example.com")
+        db.add(candidate)
+        db.commit()
+        candidate_id = candidate.id
+    finally:
+        db.close()
+
+    with overridden(document_pool_workers=0), no_encoder():
+        response = client.post(f"/api/admin/candidates/{candidate_id}/parse-resume",
+                               files={"resume": ("erin.pdf", content, "application/pdf")})
+    assert response.status_code == 200, response.text
+    assert cached_row(content) is not None
+    db = SessionLocal()
+    try:
+        assert db.get(Candidate, candidate_id).resume_content_hash == content_hash(content)
+    finally:
+        db.close()
+
+    assert client.delete(f"/api/admin/candidates/{candidate_id}").status_code == 200
+    assert cached_row(content) is None
+
+
+def test_backfill_skips_processed_files(overridden, no_encoder):
+    tag = secrets.token_hex(4)
+    db = SessionLocal()
+    try:
+        candidate = Candidate(name="Erin Walker", email=f"erin-{tag}@example.com", resume_url=f"/uploads/erin-{tag}.pdf")
+        db.add(candidate)
+        db.commit()
+        candidate_id = candidate.id
+    finally:
+        db.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, f"erin-{tag}.pdf"), "wb") as f:
+            f.write(make_pdf(resume(tag)))
+        with open(os.path.join(directory, f"frank-{tag}.txt"), "w") as f:
+            f.write(f"Frank Hall\nfrank-{tag}@example.com\n")
+        with overridden(document_pool_workers=0), no_encoder(), counted_extractions() as calls:
+            first = asyncio.run(backfill(directory, update_candidates=True))
+            second = asyncio.run(backfill(directory))
+
+    assert first["parsed"] == 2 and first["skipped"] == 0
+    assert first["candidates_updated"] == 1
+    assert second["parsed"] == 0 and second["skipped"] == 2
+    assert len(calls) == 2
+
+    db = SessionLocal()
+    try:
+        assert "Python" in db.get(Candidate, candidate_id).resume_text
+    finally:
+        db.close()
+
+
+def test_backfill_matches_relative_paths(overridden, no_encoder):
+    tag = secrets.token_hex(4)
+    db = SessionLocal()
+    try:
+        candidates = [
+            Candidate(name="Erin Walker", email=f"erin-{team}-{tag}@example.com",
+                      resume_url=f"/uploads/{team}/resume-{tag}.pdf")
+            for team in ("data", "platform")
+        ]
+        db.add_all(candidates)
+        db.commit()
+        candidate_ids = [candidate.id for candidate in candidates]
+    finally:
+        db.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Same file name in two folders; each candidate gets the file from its own folder
+        files = {team: make_pdf(resume(f"{team}-{tag}")) for team in ("data", "platform")}
+        for team, content in files.items():
+            os.makedirs(os.path.join(directory, team))
+            with open(os.path.join(directory, team, f"resume-{tag}.pdf"), "wb") as f:
+                f.write(content)
+        with overridden(document_pool_workers=0), no_encoder():
+            counts = asyncio.run(backfill(directory, update_candidates=True))
+    assert counts["candidates_updated"] == 2
+
+    db = SessionLocal()
+    try:
+        for team, candidate_id in zip(("data", "platform"), candidate_ids):
+            candidate = db.get(Candidate, candidate_id)
+            assert f"erin-{team}-{tag}@example.com" in candidate.resume_text
+            assert candidate.resume_content_hash == content_hash(files[team])
+    finally:
+        db.close()
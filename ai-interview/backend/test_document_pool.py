@@ -0,0 +1,212 @@
+"""
+Test resume/JD extraction in the document pool: page/character limits, deadlines, size limits and stuck workers
+killed without disturbing the other jobs
+"""
+import asyncio
+import io
+import os
+import time
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from app.services import document_pool as document_pool_module
+from app.services.document_pool import (
+    DocumentPool, DocumentTimeout, DocumentTooLarge, extract_document
+)
+
+
+def make_pdf(pages: int) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for number in range(1, pages + 1):
+        pdf.drawString(72, 720, f"Page {number} Senior Python engineer with FastAPI experience")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def slow_extract(content, filename, *args):
+    """stuck.pdf never finishes a page, slow.pdf takes a second; both report the worker that ran them"""
+    if filename == "stuck.pdf":
+        time.sleep(30)
+    if filename == "slow.pdf":
+        time.sleep(1)
+    return {**extract_document(content, filename, *args), "pid": os.getpid()}
+
+
+def test_pdf_extraction_stops_at_page_limit():
+    result = extract_document(make_pdf(5), "resume.pdf", max_pages=2)
+    assert "Page 1" in result["text"] and "Page 2" in result["text"]
+    assert "Page 3" not in result["text"]
+    assert result["pages"] == 2
+    assert result["truncated"] is True
+    assert result["method"] == "pypdf2"
+
+
+def test_character_limit_and_plain_text():
+    result = extract_document(make_pdf(3), "resume.pdf", max_chars=40)
+    assert len(result["text"]) <= 40
+    assert result["truncated"] is True
+
+    text = extract_document("Plain resume".encode(), "resume.txt")
+    assert text["text"] == "Plain resume" and text["method"] == "text"
+
+
+def test_deadline_stops_extraction():
+    try:
+        extract_document(make_pdf(2), "resume.pdf", deadline=time.time() - 1)
+        assert False, "expected DocumentTimeout"
+    except DocumentTimeout:
+        pass
+
+
+def test_pool_extracts_without_blocking_the_loop(overridden):
+    pool = DocumentPool()
+    content = make_pdf(3)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        try:
+            result = await pool.extract_text(content, "resume.pdf")
+        finally:
+            task.cancel()
+        return result, ticks
+
+    with overridden(document_pool_workers=1):
+        try:
+            result, ticks = asyncio.run(run())
+        finally:
+            pool.shutdown()
+    assert "Page 3" in result["text"]
+    # The loop kept running while the worker process started up and extracted
+    assert ticks > 5
+
+
+def test_pool_rejects_oversized_documents(overridden):
+    pool = DocumentPool()
+    with overridden(document_max_mb=1):
+        try:
+            asyncio.run(pool.extract_text(b"x" * (2 * 1024 * 1024), "resume.pdf"))
+            assert False, "expected DocumentTooLarge"
+        except DocumentTooLarge as e:
+            assert e.status_code == 413
+    # Nothing was queued, so no worker was started
+    assert pool._size == 0
+
+
+def test_stuck_worker_is_killed_alone(overridden):
+    pool = DocumentPool()
+    content = make_pdf(1)
+
+    async def run():
+        # Start both workers, then get one stuck while the other runs a slower job
+        warm = await asyncio.gather(*(pool.extract_text(content, "resume.pdf") for _ in range(2)))
+        stuck = asyncio.create_task(pool.extract_text(content, "stuck.pdf"))
+        await asyncio.sleep(1.5)
+        slow = await pool.extract_text(content, "slow.pdf")
+        try:
+            await stuck
+            assert False, "expected DocumentTimeout"
+        except DocumentTimeout:
+            pass
+        return {result["pid"] for result in warm}, slow
+
+    original_grace = document_pool_module.KILL_GRACE_SECONDS
+    document_pool_module.KILL_GRACE_SECONDS = 0.5
+    document_pool_module.extract_document = slow_extract
+    try:
+        with overridden(document_pool_workers=2, document_timeout_seconds=1.5):
+            started = time.perf_counter()
+            warm_pids, slow = asyncio.run(run())
+            assert time.perf_counter() - started < 20
+            # The slow job finished in its worker although the stuck worker was killed meanwhile
+            assert "Page 1" in slow["text"] and slow["pid"] in warm_pids
+            assert pool._size == 1 and [worker.process.pid for worker in pool._idle] == [slow["pid"]]
+
+            # The killed worker is replaced on demand
+            replacement = asyncio.run(pool.extract_text(content, "resume.pdf"))
+            assert "Page 1" in replacement["text"]
+    finally:
+        document_pool_module.extract_document = extract_document
+        document_pool_module.KILL_GRACE_SECONDS = original_grace
+        pool.shutdown()
+
+
+def test_uploads_are_read_in_chunks(overridden):
+    from fastapi import UploadFile
+
+    class Upload(UploadFile):
+        reads = 0
+
+        async def read(self, size=-1):
+            self.reads += 1
+            return await super().read(size)
+
+    pool = DocumentPool()
+    with overridden(document_max_mb=1):
+        upload = Upload(io.BytesIO(b"x" * 100), size=None)
+        assert asyncio.run(pool.read_upload(upload)) == b"x" * 100
+
+        # Unknown size: reading stops at the first chunk past the limit
+        upload = Upload(io.BytesIO(b"x" * (5 * 1024 * 1024)), size=None)
+        try:
+            asyncio.run(pool.read_upload(upload))
+            assert False, "expected DocumentTooLarge"
+        except DocumentTooLarge:
+            pass
+        assert upload.reads == 2
+
+        # Known size: nothing is read
+        upload = Upload(io.BytesIO(b"x" * (2 * 1024 * 1024)), size=2 * 1024 * 1024)
+        try:
+            asyncio.run(pool.read_upload(upload))
+            assert False, "expected DocumentTooLarge"
+        except DocumentTooLarge:
+            pass
+        assert upload.reads == 0
+
+
+def test_upload_endpoints_report_limits(database, overridden, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.routers import admin
+
+    # The async handler's blocking DB work runs in a thread, away from the event loop
+    on_loop = []
+    save_job = admin._save_job
+
+    def recorded_save_job(db, job):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return save_job(db, job)
+
+    monkeypatch.setattr(admin, "_save_job", recorded_save_job)
+    client = TestClient(app)
+    with overridden(document_max_mb=1):
+        response = client.post(
+            "/api/admin/create-job",
+            data={"title": "Pool Engineer", "level": "Senior", "department": "Platform"},
+            files={"jd_pdf": ("jd.pdf", b"%PDF" + b"x" * (2 * 1024 * 1024), "application/pdf")}
+        )
+    assert response.status_code == 413, response.text
+
+    with overridden(document_pool_workers=0):
+        response = client.post(
+            "/api/admin/create-job",
+            data={"title": "Pool Engineer", "level": "Senior", "department": "Platform"},
+            files={"jd_pdf": ("jd.pdf", make_pdf(2), "application/pdf")}
+        )
+    assert response.status_code == 200, response.text
+    assert on_loop == [False]
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test dynamic batching in the embedding server (no model download needed)
+"""
+import asyncio
+import os
+
+import numpy as np
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from app.services.embedding_server import EmbeddingBatcher
+
+
+class FakeEncoder:
+    """Encodes each text as [len(text), 0, ...] and records batch sizes"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def encode(self, texts, batch_size=32):
+        self.batch_sizes.append(len(texts))
+        vectors = np.zeros((len(texts), 4), dtype='float32')
+        vectors[:, 0] = [len(text) for text in texts]
+        return vectors
+
+
+async def _encode_concurrently(batcher, requests):
+    batcher.start()
+    try:
+        return await asyncio.gather(*(batcher.encode(texts) for texts in requests))
+    finally:
+        await batcher.stop()
+
+
+def test_concurrent_requests_share_one_batch():
+    encoder = FakeEncoder()
+    batcher = EmbeddingBatcher(encoder, max_batch_size=64, max_wait_ms=50)
+    requests = [["a"], ["bb", "ccc"], ["dddd"]]
+
+    results = asyncio.run(_encode_concurrently(batcher, requests))
+
+    assert encoder.batch_sizes == [4]
+    assert [r[:, 0].tolist() for r in results] == [[1.0], [2.0, 3.0], [4.0]]
+
+
+def test_batch_size_limit_splits_batches():
+    encoder = FakeEncoder()
+    batcher = EmbeddingBatcher(encoder, max_batch_size=2, max_wait_ms=50)
+    requests = [["a"], ["b"], ["c"], ["d"]]
+
+    results = asyncio.run(_encode_concurrently(batcher, requests))
+
+    assert encoder.batch_sizes == [2, 2]
+    assert len(results) == 4
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_batch()
+    test_batch_size_limit_splits_batches()
+    print("✅ Embedding batcher tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test the liveness and readiness probes: dependency failures, required checks and result caching
+"""
+import os
+from contextlib import contextmanager
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services.health import check_database, check_disk, health_checker
+
+client = TestClient(app)
+
+
+@contextmanager
+def stub_checks(**checks):
+    """Replace dependency checks and clear cached results, restoring both afterwards"""
+    original = dict(health_checker.checks)
+    health_checker.checks.update(checks)
+    health_checker._cache.clear()
+    try:
+        yield
+    finally:
+        health_checker.checks.clear()
+        health_checker.checks.update(original)
+        health_checker._cache.clear()
+
+
+def passing():
+    return {"ok": True}
+
+
+def test_liveness_touches_no_dependencies():
+    def broken():
+        raise RuntimeError("database down")
+
+    with stub_checks(database=broken, redis=broken, models=broken, disk=broken):
+        response = client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json()["status"] == "alive"
+
+
+def test_readiness_fails_on_required_check():
+    def redis_down():
+        raise ConnectionError("Connection refused")
+
+    previous = settings.health_ready_checks
+    settings.health_ready_checks = "database,redis,models"
+    try:
+        with stub_checks(database=passing, redis=redis_down, models=passing, disk=passing):
+            response = client.get("/health/ready")
+            assert response.status_code == 503
+            body = response.json()
+            assert body["status"] == "not_ready"
+            assert body["checks"]["redis"]["ok"] is False
+            assert "Connection refused" in body["checks"]["redis"]["error"]
+            # The summary endpoint still answers 200 for dashboards
+            assert client.get("/health").json()["ready"] is False
+    finally:
+        settings.health_ready_checks = previous
+
+
+def test_missing_redis_and_models_only_degrade_by_default():
+    def redis_down():
+        raise ConnectionError("Connection refused")
+
+    def no_encoder():
+        return {"ok": False, "models": {"sentence_encoder": {"error": "No module named 'sentence_transformers'"}}}
+
+    with stub_checks(database=passing, redis=redis_down, models=no_encoder, disk=passing):
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "degraded"
+        assert response.json()["checks"]["redis"]["required"] is False
+
+
+def test_optional_check_only_degrades():
+    with stub_checks(database=passing, redis=passing, models=passing, disk=lambda: {"ok": False, "free_mb": 1}):
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "degraded"
+        assert response.json()["checks"]["disk"]["required"] is False
+
+
+def test_results_are_cached():
+    calls = []
+
+    def counting():
+        calls.append(1)
+        return {"ok": True}
+
+    with stub_checks(database=counting, redis=passing, models=passing, disk=passing):
+        for _ in range(5):
+            assert client.get("/health/ready").status_code == 200
+        assert len(calls) == 1
+
+        health_checker._cache["database"]["checked_at"] -= settings.health_cache_seconds + 1
+        client.get("/health/ready")
+        assert len(calls) == 2
+
+
+def test_real_database_and_disk_checks():
+    assert check_database()["ok"] is True
+    disk = check_disk()
+    assert disk["free_mb"] > 0
+    assert disk["min_free_mb"] == settings.health_min_free_disk_mb
+
+
+if __name__ == "__main__":
+    test_liveness_touches_no_dependencies()
+    test_readiness_fails_on_required_check()
+    test_missing_redis_and_models_only_degrade_by_default()
+    test_optional_check_only_degrades()
+    test_results_are_cached()
+    test_real_database_and_disk_checks()
+    print("✅ Health probe tests passed")
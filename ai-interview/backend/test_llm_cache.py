@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test the LLM response cache (in-memory backend) and GroqClient cache integration
+"""
+import os
+import re
+import zlib
+from unittest.mock import patch
+
+import numpy as np
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from app.config import settings
+from app.services.groq_client import groq_client
+from app.services.llm_cache import LLMCache, llm_cache
+from app.services.model_registry import model_registry, SENTENCE_ENCODER
+
+
+def payload(prompt, model="llama-3.3-70b-versatile"):
+    return {
+        "model": model,
+        "messages": [{"role": "system", "content": "Return JSON"}, {"role": "user", "content": prompt}],
+        "temperature": 0.3,
+        "max_tokens": 300
+    }
+
+
+def memory_cache():
+    cache = LLMCache()
+    cache.redis_client = None
+    return cache
+
+
+class BagOfWordsEncoder:
+    def encode(self, texts, **kwargs):
+        vectors = np.zeros((len(texts), 384), dtype='float32')
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+", text.lower()):
+                vectors[row, zlib.crc32(word.encode()) % 384] += 1.0
+        return vectors
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": self.content}}]}
+
+
+def test_exact_hits_ignore_whitespace():
+    cache = memory_cache()
+    assert cache.get(payload("Job: Python developer")) is None
+    cache.set(payload("Job: Python developer"), "answer")
+    assert cache.get(payload("  Job:\n Python   developer ")) == "answer"
+    assert cache.get(payload("Job: Python developer", model="other")) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_memory_store_is_bounded_and_expires():
+    cache = memory_cache()
+    previous = (settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds)
+    settings.llm_cache_max_entries = 2
+    try:
+        for i in range(3):
+            cache.set(payload(f"prompt {i}"), f"answer {i}")
+        assert len(cache.memory_store) == 2
+        assert cache.get(payload("prompt 0")) is None
+
+        settings.llm_cache_ttl_seconds = -1
+        cache.set(payload("stale"), "old")
+        assert cache.get(payload("stale")) is None
+    finally:
+        settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds = previous
+
+
+def test_semantic_match_is_opt_in():
+    cache = memory_cache()
+    previous_encoder = model_registry._models.get(SENTENCE_ENCODER)
+    model_registry._models[SENTENCE_ENCODER] = BagOfWordsEncoder()
+    settings.llm_cache_semantic = True
+    try:
+        cache.set(payload("Senior Python developer with Django and PostgreSQL"), "cached", "rephrase")
+        # Same words, different order and case: not an exact hit, but a semantic one
+        assert cache.get(payload("senior python developer with postgresql and django"), "rephrase") == "cached"
+        assert cache.stats()["semantic_hits"] == 1
+        assert cache.get(payload("Frontend engineer with React"), "rephrase") is None
+    finally:
+        settings.llm_cache_semantic = False
+        if previous_encoder is None:
+            model_registry._models.pop(SENTENCE_ENCODER, None)
+        else:
+            model_registry._models[SENTENCE_ENCODER] = previous_encoder
+
+
+def test_scoring_prompts_never_match_semantically():
+    cache = memory_cache()
+    previous_encoder = model_registry._models.get(SENTENCE_ENCODER)
+    model_registry._models[SENTENCE_ENCODER] = BagOfWordsEncoder()
+    settings.llm_cache_semantic = True
+    job = "Job Description: Senior Python developer with Django, PostgreSQL and Kubernetes experience. " * 20
+    try:
+        cache.set(payload(job + "Answer: I scaled our Django app with read replicas"), '{"score": 9}', "evaluate")
+        # Another candidate's answer to the same question embeds almost identically but must be evaluated
+        assert cache.get(payload(job + "Answer: I do not know Django"), "evaluate") is None
+        assert cache.stats()["semantic_entries"] == 0
+    finally:
+        settings.llm_cache_semantic = False
+        if previous_encoder is None:
+            model_registry._models.pop(SENTENCE_ENCODER, None)
+        else:
+            model_registry._models[SENTENCE_ENCODER] = previous_encoder
+
+
+def test_groq_client_reuses_cached_responses():
+    original_redis = llm_cache.redis_client
+    llm_cache.redis_client = None
+    llm_cache.clear()
+    try:
+        with patch("app.services.groq_client.requests.post", return_value=FakeResponse("What is a hash map?")) as post:
+            first = groq_client.rephrase_question("Explain hash maps", "I used dictionaries a lot")
+            second = groq_client.rephrase_question("Explain hash maps", "I used dictionaries a lot")
+        assert first == second == "What is a hash map?"
+        assert post.call_count == 1
+
+        # Unparseable evaluations are not cached
+        with patch("app.services.groq_client.requests.post", return_value=FakeResponse("not json")) as post:
+            groq_client.evaluate_answer_json("Clarity", "Q", "A")
+            groq_client.evaluate_answer_json("Clarity", "Q", "A")
+        assert post.call_count == 2
+    finally:
+        llm_cache.clear()
+        llm_cache.redis_client = original_redis
+
+
+if __name__ == "__main__":
+    test_exact_hits_ignore_whitespace()
+    test_memory_store_is_bounded_and_expires()
+    test_semantic_match_is_opt_in()
+    test_scoring_prompts_never_match_semantically()
+    test_groq_client_reuses_cached_responses()
+    print("✅ LLM cache tests passed")
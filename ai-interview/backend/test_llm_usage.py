@@ -0,0 +1,133 @@
+"""
+Test Groq usage accounting: per-call records tagged by session/job, batched inserts and the summaries
+"""
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.database import SessionLocal
+import app.main  # noqa: F401 - registers the SQL tracing used by trace_sql
+from app.models import LLMUsage, Job
+from app.services.groq_client import groq_client
+from app.services.llm_cache import llm_cache
+from app.services.sql_tracer import trace_sql
+from app.services.usage import record_llm_usage, usage_by_job, usage_context, usage_recorder, usage_summary
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+CHAT = {"choices": [{"message": {"content": "Can you describe a hash map?"}}],
+        "usage": {"prompt_tokens": 120, "completion_tokens": 15}}
+WHISPER = {"text": "I have five years of Python experience", "duration": 42.5}
+
+pytestmark = pytest.mark.usefixtures("database")
+
+
+def test_calls_are_recorded_per_session_and_job():
+    db = SessionLocal()
+    job = Job(title="Usage Test Engineer", description="Python")
+    db.add(job)
+    db.commit()
+    job_id = job.id
+    db.query(LLMUsage).filter(LLMUsage.job_id == job_id).delete()
+    db.commit()
+
+    audio_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "usage_test_audio.webm")
+    with open(audio_path, "wb") as f:
+        f.write(b"\0" * 2048)
+
+    original_redis = llm_cache.redis_client
+    llm_cache.redis_client = None
+    llm_cache.clear()
+    try:
+        with usage_context(session_id=None, job_id=job_id):
+            with patch("app.services.groq_client.requests.post", return_value=FakeResponse(CHAT)):
+                groq_client.rephrase_question("Explain hash maps", "I use dicts")
+                groq_client.rephrase_question("Explain hash maps", "I use dicts")  # cache hit
+            with patch("app.services.groq_client.requests.post", return_value=FakeResponse(WHISPER)):
+                assert groq_client.transcribe_audio(audio_path) == WHISPER["text"]
+
+        summary = usage_summary(db, job_id=job_id)
+        assert summary["operations"]["rephrase"]["calls"] == 2
+        assert summary["operations"]["rephrase"]["cached_calls"] == 1
+        assert summary["operations"]["rephrase"]["prompt_tokens"] == 120
+        assert summary["operations"]["transcribe"]["audio_seconds"] == 42.5
+        assert summary["totals"]["calls"] == 3
+        assert summary["totals"]["completion_tokens"] == 15
+
+        ranked = {row["job_id"]: row for row in usage_by_job(db, limit=100)}
+        assert ranked[job_id]["total_tokens"] == 135
+        assert ranked[job_id]["job_title"] == "Usage Test Engineer"
+    finally:
+        llm_cache.clear()
+        llm_cache.redis_client = original_redis
+        os.remove(audio_path)
+        db.query(LLMUsage).filter(LLMUsage.job_id == job_id).delete()
+        db.delete(job)
+        db.commit()
+        db.close()
+
+
+def test_untagged_calls_have_no_session():
+    db = SessionLocal()
+    try:
+        with patch("app.services.groq_client.requests.post", return_value=FakeResponse(CHAT)), \
+                patch.object(llm_cache, "get", return_value=None):
+            groq_client.summarize_conversation("", [{"question": "Q", "answer": "A"}])
+        usage_recorder.flush()
+        row = db.query(LLMUsage).order_by(LLMUsage.id.desc()).first()
+        assert row.operation == "summarize"
+        assert row.session_id is None and row.job_id is None
+        db.delete(row)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_calls_are_inserted_in_batches(overridden):
+    db = SessionLocal()
+    job = Job(title="Batch Usage Engineer", description="Python")
+    db.add(job)
+    db.commit()
+    job_id = job.id
+    try:
+        # Recording never touches the database; buffered rows are inserted in one statement
+        with overridden(llm_usage_flush_seconds=60, llm_usage_batch_size=5), usage_context(job_id=job_id):
+            with trace_sql() as recording:
+                for _ in range(4):
+                    record_llm_usage("followup", "test-model", 12.5, prompt_tokens=10)
+            assert recording.count == 0
+            assert db.query(LLMUsage).filter(LLMUsage.job_id == job_id).count() == 0
+
+            # The fifth row fills a batch and wakes the writer thread
+            record_llm_usage("followup", "test-model", 12.5, prompt_tokens=10)
+            deadline = time.time() + 5
+            while db.query(LLMUsage).filter(LLMUsage.job_id == job_id).count() < 5 and time.time() < deadline:
+                time.sleep(0.05)
+            assert db.query(LLMUsage).filter(LLMUsage.job_id == job_id).count() == 5
+
+            for _ in range(3):
+                record_llm_usage("followup", "test-model", 12.5, prompt_tokens=10)
+            with trace_sql() as writing:
+                assert usage_recorder.flush() == 3
+        inserts = sum(count for sig, count in writing.signatures.items() if sig.startswith("INSERT INTO llm_usage"))
+        assert inserts == 1
+        assert usage_summary(db, job_id=job_id)["totals"]["prompt_tokens"] == 80
+    finally:
+        db.query(LLMUsage).filter(LLMUsage.job_id == job_id).delete()
+        db.delete(job)
+        db.commit()
+        db.close()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the load-test stand-ins: GroqClient against the fake Groq server, OTP mail into the SMTP sink
+"""
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from app.config import settings
+from app.services.emailer import EmailService
+from app.services.groq_client import groq_client
+from app.services.llm_cache import llm_cache
+from loadtest.fake_groq import QUESTIONS, start_fake_groq
+from loadtest.fake_smtp import start_fake_smtp
+
+
+def test_groq_client_talks_to_fake_groq():
+    server, fake, base_url = start_fake_groq(chat_ms=20, whisper_ms=10, jitter=0, seed=1)
+    original_url = groq_client.base_url
+    groq_client.base_url = base_url
+    audio_path = "fake_groq_test_audio.webm"
+    with open(audio_path, "wb") as f:
+        f.write(b"\x1a\x45\xdf\xa3" + b"\0" * 16000)
+    try:
+        llm_cache.clear()
+        evaluation = groq_client.evaluate_answer_json("Depth", "What is an index?", "A lookup structure", "DBA")
+        assert 4 <= evaluation["score"] <= 9
+        assert evaluation["followup"] in QUESTIONS
+        assert groq_client.rephrase_question("Explain caching", "I use Redis") in QUESTIONS
+
+        start = time.perf_counter()
+        transcript = groq_client.transcribe_audio(audio_path)
+        assert transcript and "transcribe" not in transcript.lower()
+        assert time.perf_counter() - start >= 0.01
+        assert fake.counts["chat"] == 2 and fake.counts["transcribe"] == 1
+    finally:
+        groq_client.base_url = original_url
+        llm_cache.clear()
+        os.remove(audio_path)
+        server.shutdown()
+
+
+def test_otp_email_reaches_smtp_sink():
+    server, sink, port = start_fake_smtp()
+    original = (settings.smtp_server, settings.smtp_port, settings.smtp_username, settings.smtp_password,
+                settings.smtp_starttls)
+    settings.smtp_server, settings.smtp_port = "127.0.0.1", port
+    settings.smtp_username, settings.smtp_password, settings.smtp_starttls = "loadtest", "loadtest", False
+    try:
+        service = EmailService()
+        service.redis_client = None
+        code = service.send_otp("sink-test@example.com", 42)
+        assert sink.wait_for_otp("sink-test@example.com", timeout=5) == code
+        assert service.verify_otp("sink-test@example.com", 42, code)
+    finally:
+        (settings.smtp_server, settings.smtp_port, settings.smtp_username, settings.smtp_password,
+         settings.smtp_starttls) = original
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_groq_client_talks_to_fake_groq()
+    test_otp_email_reaches_smtp_sink()
+    print("✅ Load-test stand-in tests passed")
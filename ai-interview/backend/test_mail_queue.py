@@ -0,0 +1,137 @@
+"""
+Test the background mail queue: pooled connections, batching, retries and permanent failures
+"""
+import smtplib
+import time
+
+from app.services.emailer import EmailService
+from app.services.mail_queue import MailQueue, SMTPConfig
+from loadtest.fake_smtp import start_fake_smtp
+
+
+def message(recipient: str, subject: str = "Hello") -> str:
+    return f"From: noreply@example.com\r\nTo: {recipient}\r\nSubject: {subject}\r\n\r\nBody\r\n"
+
+
+def sink_config(port: int) -> SMTPConfig:
+    return SMTPConfig("127.0.0.1", port, "loadtest", "loadtest", False)
+
+
+def test_messages_share_one_connection(overridden):
+    server, sink, port = start_fake_smtp()
+    mail_queue = MailQueue()
+    try:
+        with overridden(mail_queue_workers=1, mail_batch_size=10):
+            started = time.time()
+            for i in range(25):
+                mail_queue.enqueue(sink_config(port), "noreply@example.com", [f"user{i}@example.com"],
+                                   message(f"user{i}@example.com"))
+            # Enqueueing does not wait for SMTP
+            assert time.time() - started < 1.0
+            assert mail_queue.flush(timeout=10)
+
+            stats = mail_queue.stats()
+            assert len(sink.messages) == 25
+            assert stats["sent"] == 25 and stats["failed"] == 0
+            assert stats["connections"] == 1
+            assert stats["batches"] >= 3  # At most 10 messages per batch
+    finally:
+        mail_queue.shutdown()
+        server.shutdown()
+
+
+def test_temporary_failure_is_retried(overridden):
+    # Reserve a port, then leave it closed so the first attempt is refused
+    server, _, port = start_fake_smtp()
+    server.shutdown()
+    server.server_close()
+
+    mail_queue = MailQueue()
+    try:
+        with overridden(mail_retry_backoff_seconds=0.2, mail_max_retries=3):
+            mail_queue.enqueue(sink_config(port), "noreply@example.com", ["retry@example.com"],
+                               message("retry@example.com"))
+            deadline = time.time() + 5
+            while mail_queue.stats()["retried"] == 0 and time.time() < deadline:
+                time.sleep(0.02)
+            assert mail_queue.stats()["retried"] >= 1
+
+            server, sink, _ = start_fake_smtp(port)
+            assert mail_queue.flush(timeout=10)
+            assert sink.wait_for("retry@example.com", timeout=1) is not None
+            assert mail_queue.stats()["sent"] == 1 and mail_queue.stats()["failed"] == 0
+    finally:
+        mail_queue.shutdown()
+        server.shutdown()
+
+
+def test_permanent_failure_is_not_retried(overridden):
+    server, sink, port = start_fake_smtp()
+    mail_queue = MailQueue()
+    original_sendmail = smtplib.SMTP.sendmail
+
+    def sendmail(self, from_addr, to_addrs, msg, *args, **kwargs):
+        if "blocked@example.com" in to_addrs:
+            raise smtplib.SMTPDataError(554, b"Message rejected")
+        return original_sendmail(self, from_addr, to_addrs, msg, *args, **kwargs)
+
+    smtplib.SMTP.sendmail = sendmail
+    try:
+        with overridden(mail_queue_workers=1, mail_retry_backoff_seconds=0.1):
+            results, ids = [], []
+            for recipient in ["blocked@example.com", "fine@example.com"]:
+                ids.append(mail_queue.enqueue(sink_config(port), "noreply@example.com", [recipient], message(recipient),
+                                              on_result=lambda status, error: results.append((status, error))))
+            assert mail_queue.flush(timeout=10)
+
+            stats = mail_queue.stats()
+            assert stats["failed"] == 1 and stats["retried"] == 0 and stats["sent"] == 1
+            assert [outcome for outcome, _ in results] == ["failed", "sent"]
+            assert "Message rejected" in results[0][1]
+            assert mail_queue.status(ids[0])["status"] == "failed" and mail_queue.status(ids[1])["status"] == "sent"
+            # A rejected message does not cost the connection
+            assert stats["connections"] == 1
+            assert [m["to"] for m in sink.messages] == [["fine@example.com"]]
+    finally:
+        smtplib.SMTP.sendmail = original_sendmail
+        mail_queue.shutdown()
+        server.shutdown()
+
+
+def test_shutdown_cancels_pending_retries(overridden):
+    server, _, port = start_fake_smtp()
+    server.shutdown()
+    server.server_close()
+
+    mail_queue = MailQueue()
+    results = []
+    with overridden(mail_retry_backoff_seconds=60, mail_max_retries=3):
+        message_id = mail_queue.enqueue(sink_config(port), "noreply@example.com", ["later@example.com"],
+                                        message("later@example.com"),
+                                        on_result=lambda status, error: results.append(status))
+        deadline = time.time() + 5
+        while mail_queue.stats()["retry_scheduled"] == 0 and time.time() < deadline:
+            time.sleep(0.02)
+        assert mail_queue.status(message_id)["status"] == "retrying"
+
+        started = time.time()
+        mail_queue.shutdown(timeout=0.1)
+        assert time.time() - started < 5
+    assert mail_queue.stats()["retry_scheduled"] == 0
+    assert results == ["failed"]
+    assert mail_queue.status(message_id)["status"] == "failed"
+    assert mail_queue.flush(timeout=0)
+
+
+def test_email_service_sends_inline_without_queue(overridden):
+    server, sink, port = start_fake_smtp()
+    try:
+        with overridden(smtp_server="127.0.0.1", smtp_port=port, smtp_username="loadtest",
+                        smtp_password="loadtest", smtp_starttls=False, mail_queue_enabled=False):
+            service = EmailService()
+            service.redis_client = None
+            code = service.send_otp("inline@example.com", 7)
+            # Delivered before send_otp returned
+            assert sink.wait_for_otp("inline@example.com", timeout=0) == code
+    finally:
+        server.shutdown()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test the /metrics endpoint: route-templated request metrics, per-request SQL counts and gauges
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from fastapi.testclient import TestClient
+
+from app.database import create_tables
+from app.main import app
+from app.services.metrics import observe_groq_error, observe_vector_search
+
+client = TestClient(app)
+
+
+def metric_value(body: str, prefix: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_requests_and_queries_are_measured():
+    create_tables()
+    before = client.get("/metrics").text
+    assert client.get("/api/admin/stats").status_code == 200
+    assert client.get("/api/admin/reports/999999/download").status_code in (404, 500)
+
+    body = client.get("/metrics").text
+    stats_requests = 'http_requests_total{method="GET",route="/api/admin/stats",status="200"}'
+    assert metric_value(body, stats_requests) == metric_value(before, stats_requests) + 1
+    # Path parameters stay templated so label cardinality is bounded
+    assert 'route="/api/admin/reports/{session_id}/download"' in body
+    # The stats endpoint runs four COUNT queries
+    queries = 'db_queries_per_request_sum{route="/api/admin/stats"}'
+    assert metric_value(body, queries) - metric_value(before, queries) >= 4
+    assert "active_interview_sessions" in body
+
+
+def test_service_metrics_are_exported():
+    observe_groq_error("followup")
+    observe_vector_search("hnsw", 0.002)
+    body = client.get("/metrics").text
+    assert metric_value(body, 'groq_errors_total{operation="followup"}') >= 1
+    assert metric_value(body, 'vector_search_duration_seconds_count{index_type="hnsw"}') >= 1
+
+
+if __name__ == "__main__":
+    test_requests_and_queries_are_measured()
+    test_service_metrics_are_exported()
+    print("✅ Metrics tests passed")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test the ONNX encoder backend with a tiny generated model: pooling, normalization and the load-time dimension check
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
+from app.config import settings
+from app.services.model_registry import EMBEDDING_DIMENSION, load_local_sentence_encoder
+from app.services.onnx_encoder import MODEL_FILE, TOKENIZER_FILE, OnnxSentenceEncoder
+
+VOCAB = {"[PAD]": 0, "[UNK]": 1, "python": 2, "kafka": 3, "kubernetes": 4, "go": 5}
+
+
+def write_model(model_dir: str, dimension: int = EMBEDDING_DIMENSION):
+    """An embedding-lookup "transformer" with the exported model's inputs and outputs"""
+    table = np.random.default_rng(0).normal(size=(len(VOCAB), dimension)).astype(np.float32)
+    graph = helper.make_graph(
+        [helper.make_node("Gather", ["table", "input_ids"], ["token_embeddings"])],
+        "tiny-encoder",
+        [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"]),
+         helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "sequence"])],
+        [helper.make_tensor_value_info("token_embeddings", TensorProto.FLOAT, ["batch", "sequence", dimension])],
+        [numpy_helper.from_array(table, "table")]
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 14)])
+    model.ir_version = 8
+    onnx.save(model, os.path.join(model_dir, MODEL_FILE))
+
+    tokenizer = Tokenizer(WordLevel(VOCAB, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.save(os.path.join(model_dir, TOKENIZER_FILE))
+    return table
+
+
+@contextmanager
+def onnx_backend(model_dir: str):
+    previous = (settings.embedding_backend, settings.onnx_model_dir)
+    settings.embedding_backend, settings.onnx_model_dir = "onnx", model_dir
+    try:
+        yield
+    finally:
+        settings.embedding_backend, settings.onnx_model_dir = previous
+
+
+def test_encode_mean_pools_and_normalizes():
+    with tempfile.TemporaryDirectory() as model_dir:
+        table = write_model(model_dir)
+        encoder = OnnxSentenceEncoder(model_dir)
+        vectors = encoder.encode(["python kafka", "go"])
+        assert vectors.shape == (2, EMBEDDING_DIMENSION)
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+        expected = table[[2, 3]].mean(axis=0)
+        assert np.allclose(vectors[0], expected / np.linalg.norm(expected), atol=1e-5)
+        # Padding of the shorter text does not change its vector
+        assert np.allclose(vectors[1], encoder.encode("go"), atol=1e-5)
+
+
+def test_load_checks_dimension_without_inference():
+    calls = []
+    original = OnnxSentenceEncoder._encode_batch
+
+    def counting(self, texts):
+        calls.append(len(texts))
+        return original(self, texts)
+
+    OnnxSentenceEncoder._encode_batch = counting
+    try:
+        with tempfile.TemporaryDirectory() as model_dir, onnx_backend(model_dir):
+            write_model(model_dir)
+            encoder = load_local_sentence_encoder()
+            assert encoder.get_sentence_embedding_dimension() == EMBEDDING_DIMENSION
+            assert calls == []  # Safe in a pre-fork master: nothing was encoded
+
+        with tempfile.TemporaryDirectory() as model_dir, onnx_backend(model_dir):
+            write_model(model_dir, dimension=128)
+            try:
+                load_local_sentence_encoder()
+                assert False, "a 128-d model should be rejected"
+            except ValueError as e:
+                assert "128-d" in str(e)
+            assert calls == []
+    finally:
+        OnnxSentenceEncoder._encode_batch = original
+
+
+def test_missing_model_names_export_command():
+    with tempfile.TemporaryDirectory() as model_dir:
+        try:
+            OnnxSentenceEncoder(model_dir, quantized=True)
+            assert False, "missing model should raise"
+        except FileNotFoundError as e:
+            assert "--export" in str(e)
+
+
+if __name__ == "__main__":
+    test_encode_mean_pools_and_normalizes()
+    test_load_checks_dimension_without_inference()
+    test_missing_model_names_export_command()
+    print("✅ All ONNX encoder tests passed")
@@ -0,0 +1,121 @@
+"""
+Test the OTP store: single use, attempt limits, send rate limits, bounded expiring memory fallback and 429 responses
+"""
+import secrets
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models import Candidate, Invite, Job
+from app.services.otp_store import INVALID, LOCKED, MISSING, VALID, MemoryOTPStore, OTPRateLimited, otp_store
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+
+
+def new_email() -> str:
+    return f"otp-{secrets.token_hex(4)}@example.com"
+
+
+def make_invite():
+    email = new_email()
+    db = SessionLocal()
+    try:
+        candidate = Candidate(name="Otp Person", email=email)
+        job = Job(title="Support Engineer", description="Customer support")
+        db.add_all([candidate, job])
+        db.flush()
+        invite = Invite(candidate_id=candidate.id, job_id=job.id, invite_code=secrets.token_hex(4).upper(),
+                        status="pending", expires_at=datetime.now() + timedelta(days=1))
+        db.add(invite)
+        db.commit()
+        return email, invite.id
+    finally:
+        db.close()
+
+
+def test_code_is_used_once():
+    email = new_email()
+    otp_store.issue(email, 1, "123456")
+    assert not otp_store.verify(email, 1, "654321")
+    assert not otp_store.verify(email, 2, "123456")  # Codes belong to one invite
+    assert otp_store.verify(email, 1, "123456")
+    assert not otp_store.verify(email, 1, "123456")
+
+
+def test_wrong_codes_discard_the_code(overridden):
+    email = new_email()
+    with overridden(otp_max_attempts=3):
+        otp_store.issue(email, 1, "111111")
+        assert not otp_store.verify(email, 1, "000000")
+        assert not otp_store.verify(email, 1, "000001")
+        try:
+            otp_store.verify(email, 1, "000002")
+            assert False, "third wrong code should lock the code"
+        except OTPRateLimited:
+            pass
+        # The right code no longer works; a new one must be requested
+        assert not otp_store.verify(email, 1, "111111")
+
+        # Requesting a new code resets the attempts
+        otp_store.issue(email, 1, "222222")
+        assert not otp_store.verify(email, 1, "000000")
+        assert otp_store.verify(email, 1, "222222")
+
+
+def test_send_limit(overridden):
+    email = new_email()
+    with overridden(otp_send_limit=2, otp_send_window_seconds=300):
+        otp_store.issue(email, 1, "100000")
+        otp_store.issue(email, 1, "200000")
+        try:
+            otp_store.issue(email, 1, "300000")
+            assert False, "third code within the window should be refused"
+        except OTPRateLimited as e:
+            assert 0 < e.retry_after <= 300
+        # The refused code was not stored; the last one sent still works
+        assert otp_store.verify(email, 1, "200000")
+        otp_store.issue(new_email(), 1, "400000")  # Other candidates are not limited
+
+
+def test_memory_store_is_bounded_and_expires(overridden):
+    store = MemoryOTPStore()
+    with overridden(otp_memory_max_entries=5, otp_send_limit=100):
+        for n in range(20):
+            assert store.issue(f"key{n}", "123456") == 0
+        assert len(store.codes) == 5 and len(store.sends) == 5
+        assert store.verify("key0", "123456") == MISSING  # Oldest were dropped
+        assert store.verify("key19", "000000") == INVALID
+        assert store.verify("key19", "123456") == VALID
+
+    store = MemoryOTPStore()
+    with overridden(otp_ttl_seconds=-1, otp_send_window_seconds=-1, otp_sweep_interval_seconds=0):
+        store.issue("expired", "123456")
+        store.issue("also-expired", "123456")
+        assert store.verify("expired", "123456") == MISSING
+        # The sweep removes every expired code and send window, not only the ones looked up
+        assert not store.codes and not store.sends
+
+    with overridden(otp_max_attempts=1):
+        store.issue("locked", "123456")
+        assert store.verify("locked", "000000") == LOCKED
+        assert store.verify("locked", "123456") == MISSING
+
+
+def test_api_returns_429(overridden):
+    email, invite_id = make_invite()
+    with overridden(otp_send_limit=1, otp_max_attempts=2):
+        response = client.post("/identity/otp/send", json={"email": email, "invite_id": invite_id})
+        assert response.status_code == 200, response.text
+        response = client.post("/identity/otp/send", json={"email": email, "invite_id": invite_id})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+        body = {"email": email, "invite_id": invite_id, "code": "not-a-code"}
+        assert client.post("/identity/otp/verify", json=body).status_code == 400
+        assert client.post("/identity/otp/verify", json=body).status_code == 429
+        assert client.post("/identity/otp/verify", json=body).status_code == 400
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test opt-in request profiling: header trigger, stack samples, SQL timings and admin download
+"""
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import create_tables, engine
+from app.routers import admin
+from app.services.conversation_summary import history_tokens
+from app.services.profiler import request_profiler
+
+app = FastAPI()
+app.middleware("http")(request_profiler.middleware)
+app.include_router(admin.router, prefix="/api/admin")
+
+
+@app.get("/slow")
+def slow_endpoint():
+    # Only stacks running app code are sampled, so spend the time inside an app function
+    history = [{"question": "Tell me about yourself. " * 50, "answer": "I build APIs. " * 200}] * 50
+    deadline = time.perf_counter() + 0.15
+    while time.perf_counter() < deadline:
+        history_tokens(history)
+    return {"ok": True}
+
+
+if not settings.profiling_enabled:
+    request_profiler.instrument_engine(engine)
+
+client = TestClient(app)
+
+
+@contextmanager
+def profiling(sample_rate: float = 0.0):
+    """Enable profiling into a scratch directory, restoring settings afterwards"""
+    original = (settings.profiling_enabled, settings.profile_sample_rate, settings.profile_storage_path)
+    settings.profiling_enabled = True
+    settings.profile_sample_rate = sample_rate
+    settings.profile_storage_path = "./test_profiles"
+    shutil.rmtree(settings.profile_storage_path, ignore_errors=True)
+    try:
+        yield
+    finally:
+        shutil.rmtree(settings.profile_storage_path, ignore_errors=True)
+        settings.profiling_enabled, settings.profile_sample_rate, settings.profile_storage_path = original
+
+
+def test_requests_are_not_profiled_by_default():
+    with profiling():
+        response = client.get("/slow")
+        assert "X-Profile-Id" not in response.headers
+        assert client.get("/api/admin/profiles").json() == []
+
+
+def test_header_triggers_profile_with_stacks():
+    with profiling():
+        response = client.get("/slow", headers={settings.profile_header: "1"})
+        profile_id = response.headers["X-Profile-Id"]
+
+        listed = client.get("/api/admin/profiles").json()
+        assert [p["id"] for p in listed] == [profile_id]
+        assert listed[0]["path"] == "/slow"
+
+        profile = client.get(f"/api/admin/profiles/{profile_id}").json()
+        assert profile["duration_ms"] >= 150
+        assert profile["samples"] > 0
+        assert any("history_tokens" in row["function"] for row in profile["top_cumulative"])
+
+        collapsed = client.get(f"/api/admin/profiles/{profile_id}?format=collapsed").text
+        assert "history_tokens (app/services/conversation_summary.py" in collapsed
+
+
+def test_sql_statements_are_timed():
+    create_tables()
+    with profiling():
+        response = client.get("/api/admin/stats", headers={settings.profile_header: "1"})
+        profile = client.get(f"/api/admin/profiles/{response.headers['X-Profile-Id']}").json()
+        assert profile["sql"]["count"] >= 4
+        assert all(statement["sql"].startswith("SELECT") for statement in profile["sql"]["statements"])
+
+
+def test_sampling_and_retention():
+    with profiling(sample_rate=1.0):
+        original_max = settings.profile_max_files
+        settings.profile_max_files = 2
+        try:
+            for _ in range(4):
+                assert "X-Profile-Id" in client.get("/api/admin/llm-cache/stats").headers
+            assert len(client.get("/api/admin/profiles").json()) == 2
+        finally:
+            settings.profile_max_files = original_max
+
+
+def test_unknown_profile_is_404():
+    with profiling():
+        assert client.get("/api/admin/profiles/20250101T000000_deadbeef").status_code == 404
+        assert client.get("/api/admin/profiles/..%2Fconfig").status_code == 404
+
+
+if __name__ == "__main__":
+    test_requests_are_not_profiled_by_default()
+    test_header_triggers_profile_with_stacks()
+    test_sql_statements_are_timed()
+    test_sampling_and_retention()
+    test_unknown_profile_is_404()
+    print("✅ Request profiler tests passed")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test question bank retrieval and the bank-backed follow-up flow (no Groq calls)
+"""
+import os
+import re
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from app.config import settings
+from app.services.model_registry import model_registry, SENTENCE_ENCODER
+from app.services.question_bank import QuestionBank
+from app.services.rag import rag_service
+
+
+class BagOfWordsEncoder:
+    """Deterministic stand-in for the sentence encoder; shared words give similar vectors"""
+
+    def encode(self, texts, **kwargs):
+        vectors = np.zeros((len(texts), 384), dtype='float32')
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+", text.lower()):
+                vectors[row, zlib.crc32(word.encode()) % 384] += 1.0
+        return vectors
+
+
+class FakeGroqClient:
+    def __init__(self):
+        self.calls = []
+
+    def evaluate_answer_json(self, criteria, question, answer, job_description="", next_question=None):
+        self.calls.append("evaluate")
+        return {"score": 7, "missing": [], "followup": f"Building on that: {next_question}", "complete": False}
+
+    def rephrase_question(self, question, answer):
+        self.calls.append("rephrase")
+        return question
+
+    def chat_followup_json(self, *args, **kwargs):
+        self.calls.append("generate")
+        return {"score": 6, "missing": [], "followup": "Generated question?", "complete": False}
+
+
+@contextmanager
+def stub_encoder():
+    previous = model_registry._models.get(SENTENCE_ENCODER)
+    model_registry._models[SENTENCE_ENCODER] = BagOfWordsEncoder()
+    try:
+        yield
+    finally:
+        if previous is None:
+            model_registry._models.pop(SENTENCE_ENCODER, None)
+        else:
+            model_registry._models[SENTENCE_ENCODER] = previous
+
+
+def test_selects_relevant_unasked_question():
+    with stub_encoder():
+        bank = QuestionBank()
+        jd = "Backend engineer: SQL queries, joins, indexes and database transactions"
+
+        first = bank.select_question("technology", jd, "")
+        assert "SQL" in first["topics"]
+
+        second = bank.select_question("technology", jd, "", asked_questions=[first["question"]])
+        assert second["question"] != first["question"]
+        assert bank.select_question("unknown-section", jd, "") is None
+
+
+def test_bank_exhaustion_returns_none():
+    with stub_encoder():
+        bank = QuestionBank()
+        asked = []
+        while True:
+            selected = bank.select_question("introduction_followup", "", "projects", asked_questions=asked)
+            if selected is None:
+                break
+            asked.append(selected["question"])
+        assert 0 < len(asked) <= 12
+
+
+def test_followup_uses_bank_instead_of_generation():
+    with stub_encoder():
+        fake = FakeGroqClient()
+        original = (rag_service.groq_client, rag_service.question_bank, settings.question_source)
+        rag_service.groq_client, rag_service.question_bank = fake, QuestionBank()
+        settings.question_source = "bank"
+        try:
+            # Question 1 is not scored: only a rephrase, no evaluation
+            evaluation = rag_service.generate_followup_question(
+                "Please introduce yourself", "I built a Django project with my team", "Python developer", 1,
+                [], score_answer=False
+            )
+            assert evaluation["question_source"] == "bank"
+            assert evaluation["score"] is None
+            assert fake.calls == ["rephrase"]
+
+            # Scored technology question: one small evaluation call
+            summaries = []
+            evaluation = rag_service.generate_followup_question(
+                "How do indexes work?", "They speed up lookups", "SQL developer", 5, [],
+                summarize_history=lambda: summaries.append("summary") or "summary"
+            )
+            assert evaluation["score"] == 7
+            assert evaluation["followup"].startswith("Building on that:")
+            assert fake.calls == ["rephrase", "evaluate"]
+            # The bank answered, so the history was never summarized
+            assert summaries == []
+
+            # An exhausted bank falls back to generation, which does use the summary
+            rag_service.question_bank = None
+            rag_service.generate_followup_question(
+                "How do indexes work?", "They speed up lookups", "SQL developer", 5, [],
+                summarize_history=lambda: summaries.append("summary") or "summary"
+            )
+            assert fake.calls[-1] == "generate" and summaries == ["summary"]
+        finally:
+            rag_service.groq_client, rag_service.question_bank, settings.question_source = original
+
+
+if __name__ == "__main__":
+    test_selects_relevant_unasked_question()
+    test_bank_exhaustion_returns_none()
+    test_followup_uses_bank_instead_of_generation()
+    print("✅ Question bank tests passed")
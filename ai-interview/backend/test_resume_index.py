@@ -0,0 +1,211 @@
+"""
+Test resume chunking and the per-candidate resume index: sections, token budgets, overlap, retrieval and prompt context
+"""
+import re
+import secrets
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models import Candidate, ResumeChunk
+from app.services.chunking import chunk_resume, chunk_text, section_of
+from app.services.conversation_summary import estimate_tokens
+from app.services.model_registry import SENTENCE_ENCODER, model_registry
+from app.services.rag import rag_service
+from app.services.resume_index import ResumeIndex, resume_index
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+
+RESUME = """Dana Lee
+dana@example.com
+Backend engineer who enjoys distributed systems.
+
+Professional Experience
+- Migrated the billing platform from EC2 to Kubernetes, cutting infrastructure cost by 30%.
+- Built Kafka pipelines that process two million payment events per day.
+- Led the on-call rotation and wrote incident runbooks for the payments team.
+
+Education
+BSc Computer Science, University of Toronto
+
+Technical Skills
+Python, Go, PostgreSQL, Redis, Terraform
+"""
+
+
+class BagOfWordsEncoder:
+    """Deterministic stand-in for the sentence encoder; shared words give similar vectors"""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, **kwargs):
+        self.batches.append(len(texts))
+        vectors = np.zeros((len(texts), 384), dtype='float32')
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+", text.lower()):
+                vectors[row, zlib.crc32(word.encode()) % 384] += 1.0
+        return vectors
+
+
+class FakeGroqClient:
+    def __init__(self):
+        self.resume_context = None
+
+    def chat_followup_json(self, criteria, question, answer, job_description="", question_context=None,
+                           conversation_history=None, conversation_summary=None, resume_context=None):
+        self.resume_context = resume_context
+        return {"score": 6, "missing": [], "followup": "Generated question?", "complete": False}
+
+
+@contextmanager
+def stub_encoder():
+    previous = model_registry._models.get(SENTENCE_ENCODER)
+    encoder = BagOfWordsEncoder()
+    model_registry._models[SENTENCE_ENCODER] = encoder
+    try:
+        yield encoder
+    finally:
+        if previous is None:
+            model_registry._models.pop(SENTENCE_ENCODER, None)
+        else:
+            model_registry._models[SENTENCE_ENCODER] = previous
+
+
+def make_candidate(resume_text: str = RESUME) -> int:
+    db = SessionLocal()
+    try:
+        candidate = Candidate(name="Dana Lee", email=f"dana-{secrets.token_hex(4)}@example.com", resume_text=resume_text)
+        db.add(candidate)
+        db.commit()
+        return candidate.id
+    finally:
+        db.close()
+
+
+def test_sections_follow_headings():
+    chunks = chunk_resume(RESUME)
+    assert [chunk["section"] for chunk in chunks] == ["summary", "experience", "education", "skills"]
+    assert "Kafka" in chunks[1]["text"] and "Kafka" not in chunks[0]["text"]
+    assert section_of("Work Experience:") == "experience"
+    assert section_of("Key Skills") == "skills"
+    # Sentences that merely mention a section keyword are content, not headings
+    assert section_of("5 years experience with Python") is None
+    assert section_of("Experience designing REST APIs for the payments platform team") is None
+
+
+def test_chunks_respect_budget_and_overlap():
+    text = " ".join(f"Sentence {i} describes a different reliability project." for i in range(40))
+    chunks = chunk_text(text, max_tokens=40, overlap_tokens=15)
+    assert len(chunks) > 5
+    assert all(estimate_tokens(chunk) <= 40 for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        # The next chunk starts with the last sentence of the previous one
+        assert previous.split("\n")[-1] == current.split("\n")[0]
+
+    # A sentence longer than the budget is split on word boundaries
+    long_sentence = " ".join(["kubernetes"] * 200) + "."
+    pieces = chunk_text(long_sentence, max_tokens=30, overlap_tokens=0)
+    assert len(pieces) > 1 and all(estimate_tokens(piece) <= 30 for piece in pieces)
+    assert " ".join(pieces).split() == long_sentence.split()
+
+
+def test_index_and_search_one_candidate():
+    with stub_encoder() as encoder:
+        candidate_id = make_candidate()
+        other_id = make_candidate("Ravi Kumar\nExperience\nDesigned Kafka consumers for fraud detection at a bank.")
+        written = resume_index.index_candidates([(candidate_id, RESUME), (other_id, "Ravi Kumar\nExperience\n"
+                                                 "Designed Kafka consumers for fraud detection at a bank.")])
+        assert written == len(chunk_resume(RESUME)) + 2
+        assert encoder.batches == [written]  # Both resumes embedded in one batch
+
+        results = resume_index.search(candidate_id, "How did you build the Kafka event pipelines?", k=2)
+        assert results[0]["metadata"]["section"] == "experience"
+        assert "Kafka" in results[0]["document"]
+        assert all(result["metadata"]["candidate_id"] == candidate_id for result in results)
+
+        # Same text again: nothing is re-chunked or re-embedded
+        assert resume_index.index_candidate(candidate_id, RESUME) == 0
+        assert encoder.batches[:-1] == [written]
+
+    db = SessionLocal()
+    try:
+        rows = db.query(ResumeChunk).filter(ResumeChunk.candidate_id == candidate_id).all()
+        assert len(rows) == len(chunk_resume(RESUME))
+        assert all(len(row.embedding) == 384 * 4 for row in rows)
+    finally:
+        db.close()
+
+
+def test_clearing_resume_drops_chunks():
+    with stub_encoder():
+        candidate_id = make_candidate()
+        assert resume_index.index_candidate(candidate_id, RESUME) > 0
+        assert resume_index.search(candidate_id, "Kafka pipelines")
+
+        # Updates without resume_text leave the chunks alone
+        response = client.put(f"/api/admin/candidates/{candidate_id}", json={"location": "Toronto"})
+        assert response.status_code == 200, response.text
+        assert resume_index.search(candidate_id, "Kafka pipelines")
+
+        response = client.put(f"/api/admin/candidates/{candidate_id}", json={"resume_text": ""})
+        assert response.status_code == 200, response.text
+        assert resume_index.search(candidate_id, "Kafka pipelines") == []
+
+    db = SessionLocal()
+    try:
+        assert db.query(ResumeChunk).filter(ResumeChunk.candidate_id == candidate_id).count() == 0
+    finally:
+        db.close()
+
+
+def test_other_workers_changes_are_not_served_from_cache():
+    candidate_id = make_candidate()
+    other_worker = ResumeIndex()  # Stands in for another process sharing the database
+    with stub_encoder():
+        resume_index.index_candidate(candidate_id, RESUME)
+        assert "Kafka" in resume_index.search(candidate_id, "Kafka pipelines", k=1)[0]["document"]
+
+        replaced = "Dana Lee\nExperience\nWrote Rust firmware for industrial sensors."
+        other_worker.index_candidate(candidate_id, replaced)
+        results = resume_index.search(candidate_id, "Rust firmware", k=3)
+        assert results and all("Kafka" not in result["document"] for result in results)
+
+    db = SessionLocal()
+    try:
+        db.query(ResumeChunk).filter(ResumeChunk.candidate_id == candidate_id).delete()
+        db.commit()
+    finally:
+        db.close()
+    with stub_encoder():
+        assert resume_index.search(candidate_id, "Rust firmware") == []
+
+
+def test_followup_prompt_gets_relevant_passages():
+    candidate_id = make_candidate()
+    previous_client = rag_service.groq_client
+    fake = FakeGroqClient()
+    rag_service.groq_client = fake
+    try:
+        with stub_encoder():
+            # Not indexed at upload: the first interview indexes it, and only into the resume index
+            shared_size = rag_service.vector_store.ntotal
+            rag_service.prepare_context("Backend engineer, Kafka and Kubernetes", RESUME, candidate_id)
+            assert rag_service.vector_store.ntotal == shared_size
+            rag_service.generate_followup_question(
+                "Tell me about your infrastructure work", "I moved our billing services onto Kubernetes",
+                "Backend engineer", question_number=2, candidate_id=candidate_id
+            )
+    finally:
+        rag_service.groq_client = previous_client
+
+    assert "Kubernetes" in fake.resume_context
+    assert "University of Toronto" not in fake.resume_context
+    assert len(fake.resume_context) < len(RESUME)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the compiled skill matcher: word boundaries, aliases, custom taxonomies and the JD/resume parsers using it
+"""
+import json
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from app.services.jd_parser import extract_level, extract_requirements, extract_skills
+from app.services.skill_matcher import SkillMatcher, skill_matcher
+
+
+def test_aliases_map_to_canonical_names():
+    text = "Shipped services on k8s and Kubernetes with Postgres, ReactJS and python3 (sklearn models)."
+    assert skill_matcher.find(text) == ["Kubernetes", "PostgreSQL", "React", "Python", "scikit-learn"]
+    assert skill_matcher.count(text)["Kubernetes"] == 2
+
+
+def test_word_boundaries():
+    # No skills hidden inside other words
+    assert skill_matcher.find("We maintain a googleplex of gears and rustic furniture") == []
+    # Symbols that belong to skill names
+    assert skill_matcher.find("C++ and C# but not c+") == ["C++", "C#"]
+    assert skill_matcher.find("node.js, asp.net, HTML/CSS") == ["Node.js", "ASP.NET", "HTML", "CSS"]
+    # The longest alias wins and whitespace inside phrases is flexible
+    assert skill_matcher.find("React Native apps; machine\n  learning") == ["React Native", "Machine Learning"]
+
+
+def test_english_words_are_not_skills():
+    prose = ("Go to market in Spring 2021. Express interest early; less is more. "
+             "Shell company, Swift response, R&D budget. We react to incidents before rust sets in.")
+    assert skill_matcher.find(prose) == []
+    assert extract_skills("Junior role. Spring hiring: go through the express onboarding and react quickly.") == []
+
+
+def test_ambiguous_skills_in_technical_context():
+    assert skill_matcher.find("Languages: Go, R") == ["Go", "R"]
+    assert skill_matcher.find("Built services in Go and Python") == ["Go", "Python"]
+    assert skill_matcher.find("Tech stack: Express, Less") == ["Express", "Less"]
+    assert skill_matcher.find("SKILLS: GO, SWIFT") == ["Go", "Swift"]
+    # Lowercase spellings only count next to other skills, and only for skills that are not context-only
+    assert skill_matcher.find("react, node.js") == ["React", "Node.js"]
+    assert skill_matcher.find("go, python") == ["Python"]
+    # Aliases are unambiguous
+    assert skill_matcher.find("golang and spring boot services") == ["Go", "Spring"]
+    assert extract_skills("Requirements: Go and Kubernetes, Spring Boot") == ["Go", "Kubernetes", "Spring"]
+
+
+def test_custom_taxonomy_file():
+    taxonomy = {"Data": {"Apache Spark": ["spark", "pyspark"], "Airflow": ["apache airflow"],
+                         "Beam": {"aliases": ["apache beam"], "case_sensitive": True, "context": True}}}
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(taxonomy, f)
+    try:
+        matcher = SkillMatcher.from_file(f.name)
+    finally:
+        os.remove(f.name)
+    assert matcher.find("PySpark jobs scheduled by Apache Airflow") == ["Apache Spark", "Airflow"]
+    assert matcher.categories["Airflow"] == "Data"
+    assert matcher.find("Beam pipelines next to PySpark") == ["Beam", "Apache Spark"]
+    assert matcher.find("A beam of light. Beam me up.") == []
+
+
+def test_jd_parser_uses_single_pass_patterns():
+    jd = (
+        "Senior Backend Engineer\n"
+        "Requirements: Python, Docker and CI/CD\n"
+        "You must have 5+ years with AWS\n"
+        "Nice to have: GraphQL\n"
+    )
+    assert extract_skills(jd) == ["Python", "Docker", "CI/CD", "AWS", "GraphQL"]
+    assert extract_requirements(jd) == ["requirements: python, docker and ci/cd", "you must have 5+ years with aws"]
+    assert extract_level(jd) == "Senior"
+    assert extract_level("Graduate role, 0-2 years") == "Junior"
+    assert extract_level("Backend engineer") == "Mid-level"
+
+
+if __name__ == "__main__":
+    test_aliases_map_to_canonical_names()
+    test_word_boundaries()
+    test_english_words_are_not_skills()
+    test_ambiguous_skills_in_technical_context()
+    test_custom_taxonomy_file()
+    test_jd_parser_uses_single_pass_patterns()
+    print("✅ All skill matcher tests passed")
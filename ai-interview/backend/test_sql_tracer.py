@@ -0,0 +1,100 @@
+"""
+Test per-request SQL tracing: statement signatures, N+1 detection, threshold warnings and X-DB-* headers
+"""
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models import Candidate, Invite, Job, Session as SessionModel
+from app.services.sql_tracer import statement_signature, trace_sql
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+
+
+class CapturedWarnings(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def create_candidate_with_sessions(count: int) -> int:
+    db = SessionLocal()
+    try:
+        suffix = secrets.token_hex(4)
+        candidate = Candidate(name="Tracer Candidate", email=f"tracer-{suffix}@example.com")
+        job = Job(title="Tracer Engineer", description="SQL")
+        db.add_all([candidate, job])
+        db.commit()
+        invite = Invite(candidate_id=candidate.id, job_id=job.id, invite_code=f"trace-{suffix}",
+                        expires_at=datetime.now(timezone.utc) + timedelta(days=1))
+        db.add(invite)
+        db.commit()
+        db.add_all([
+            SessionModel(invite_id=invite.id, session_token=f"trace-{suffix}-{i}") for i in range(count)
+        ])
+        db.commit()
+        return candidate.id
+    finally:
+        db.close()
+
+
+def test_signatures_ignore_parameters():
+    assert statement_signature("SELECT * FROM turns WHERE session_id = 12") == \
+        statement_signature("SELECT *  FROM turns\n WHERE session_id = 7")
+    assert statement_signature("SELECT * FROM jobs WHERE title = 'a'") == \
+        statement_signature("SELECT * FROM jobs WHERE title = 'b'")
+    assert statement_signature("SELECT * FROM jobs WHERE id IN (?, ?, ?)") == \
+        statement_signature("SELECT * FROM jobs WHERE id IN (?)")
+
+
+def test_trace_block_counts_repeats():
+    db = SessionLocal()
+    try:
+        with trace_sql() as trace:
+            for job_id in range(1, 7):
+                db.query(Job).filter(Job.id == job_id).first()
+            db.query(Candidate).count()
+        assert trace.count == 7
+        assert trace.max_repeats() == 6
+        assert len(trace.repeated_statements(threshold=5)) == 1
+
+        # A nested block is counted in its own trace and in the enclosing one
+        with trace_sql() as outer:
+            db.query(Candidate).count()
+            with trace_sql() as inner:
+                db.query(Job).count()
+        assert inner.count == 1 and outer.count == 2
+    finally:
+        db.close()
+
+
+def test_n_plus_one_is_logged_and_exposed_in_headers(overridden):
+    candidate_id = create_candidate_with_sessions(6)
+    handler = CapturedWarnings()
+    logger = logging.getLogger("app.services.sql_tracer")
+    logger.addHandler(handler)
+    try:
+        with overridden(sql_trace_headers=True):
+            response = client.get(f"/api/admin/sessions/?candidate_id={candidate_id}")
+        assert response.status_code == 200
+        assert len(response.json()["sessions"]) == 6
+        # The listing loads turn stats and risk events once per session
+        assert int(response.headers["X-DB-Max-Repeats"]) >= 6
+        assert int(response.headers["X-DB-Query-Count"]) >= 12
+        assert float(response.headers["X-DB-Time-Ms"]) > 0
+        assert any("possible N+1" in message for message in handler.messages)
+    finally:
+        logger.removeHandler(handler)
+
+    # Headers are only sent when SQL_TRACE_HEADERS is on
+    assert "X-DB-Query-Count" not in client.get("/api/admin/stats").headers
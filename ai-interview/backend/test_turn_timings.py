@@ -0,0 +1,126 @@
+"""
+Test per-turn latency spans on speech submissions and the admin percentile endpoint
+"""
+import os
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.models import Candidate, Invite, Job, Session as SessionModel, Turn
+from app.services.timings import _percentile, record_span, start_turn_timings
+
+pytestmark = pytest.mark.usefixtures("database")
+
+client = TestClient(app)
+
+
+def create_session_with_turn(question_number: int = 3):
+    db = SessionLocal()
+    try:
+        suffix = secrets.token_hex(4)
+        candidate = Candidate(name="Timing Candidate", email=f"timing-{suffix}@example.com")
+        job = Job(title="Timing Engineer", description="Python and SQL")
+        db.add_all([candidate, job])
+        db.commit()
+        invite = Invite(candidate_id=candidate.id, job_id=job.id, invite_code=f"timing-{suffix}",
+                        expires_at=datetime.now(timezone.utc) + timedelta(days=1))
+        db.add(invite)
+        db.commit()
+        session = SessionModel(invite_id=invite.id, session_token=f"timing-{suffix}")
+        db.add(session)
+        db.commit()
+        db.add(Turn(session_id=session.id, question_number=question_number, question_text="Explain indexes",
+                    idx=question_number, prompt="Explain indexes", status="pending"))
+        db.commit()
+        return session.id, job.id
+    finally:
+        db.close()
+
+
+def slow_transcription(audio_path):
+    time.sleep(0.02)
+    return "An index lets the database find rows without scanning the table"
+
+
+def slow_evaluation(*args, **kwargs):
+    time.sleep(0.01)
+    record_span("llm", 30.0)  # As GroqClient does for each chat call
+    return {"score": 7, "missing": [], "followup": "How would you pick columns to index?", "complete": False}
+
+
+def submit_answer(session_id: int, turn_idx: int = 3):
+    with patch("app.routers.sessions.groq_client.transcribe_audio", side_effect=slow_transcription), \
+            patch("app.routers.sessions.rag_service.generate_followup_question", side_effect=slow_evaluation):
+        return client.post(
+            f"/session/{session_id}/speech",
+            files={"audio": ("answer.webm", b"\x1a\x45\xdf\xa3" + b"\0" * 4096, "audio/webm")},
+            data={"question": "Explain indexes", "turn_idx": str(turn_idx)}
+        )
+
+
+def remove_audio(session_id: int):
+    """Delete the audio files written by a test submission"""
+    for name in os.listdir(settings.audio_storage_path):
+        if name.startswith(f"session_{session_id}_turn_"):
+            os.remove(os.path.join(settings.audio_storage_path, name))
+
+
+def test_percentile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert _percentile(values, 50) == 25.0
+    assert _percentile(values, 100) == 40.0
+    assert _percentile([7.0], 99) == 7.0
+
+
+def test_submission_stores_stage_timings():
+    session_id, _ = create_session_with_turn()
+    response = submit_answer(session_id)
+    remove_audio(session_id)
+    assert response.status_code == 200, response.text
+
+    db = SessionLocal()
+    try:
+        turn = db.query(Turn).filter(Turn.session_id == session_id, Turn.question_number == 3).first()
+        timings = turn.timings_json
+    finally:
+        db.close()
+
+    for stage in ("upload", "disk_write", "whisper", "evaluation", "llm", "db_commit", "other", "total"):
+        assert stage in timings, stage
+    assert timings["whisper"] >= 20
+    assert timings["llm"] == 30.0
+    # LLM time is part of evaluation; the other stages, "other" included, add up to the total
+    top_level = sum(ms for stage, ms in timings.items() if stage not in ("llm", "total"))
+    assert abs(top_level - timings["total"]) <= 0.5
+
+
+def test_timings_are_only_started_for_speech_answers():
+    from app.routers.sessions import router
+
+    # A dependency of the speech route, not a middleware in front of every request
+    route = next(route for route in router.routes if route.path == "/{session_id}/speech" and "POST" in route.methods)
+    assert start_turn_timings in [dependency.call for dependency in route.dependant.dependencies]
+
+
+def test_admin_percentiles_per_job_and_window():
+    session_id, job_id = create_session_with_turn()
+    response = submit_answer(session_id)
+    remove_audio(session_id)
+    assert response.status_code == 200
+
+    report = client.get(f"/api/admin/turn-timings?job_id={job_id}").json()
+    assert report["turns"] == 1
+    assert report["jobs"][0]["job_id"] == job_id
+    whisper = report["stages"]["whisper"]
+    assert whisper["count"] == 1 and whisper["p50"] == whisper["p99"] >= 20
+
+    future = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    windowed = client.get("/api/admin/turn-timings", params={"job_id": job_id, "since": future}).json()
+    assert windowed["turns"] == 0
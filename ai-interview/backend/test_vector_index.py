@@ -0,0 +1,171 @@
+"""
+Test ANN index selection, rebuilds and recall for VectorStore
+"""
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from app.services.model_registry import SENTENCE_ENCODER, model_registry
+from app.services.vectorstore import VectorStore
+
+
+def clustered_vectors(n, dimension=384, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype('float32')
+    vectors = centers[rng.integers(0, clusters, n)] + 0.3 * rng.standard_normal((n, dimension)).astype('float32')
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def store_with(vectors):
+    store = VectorStore()
+    store.vectors = vectors
+    store.documents = [f"doc {i}" for i in range(len(vectors))]
+    store.metadata = [{"i": i} for i in range(len(vectors))]
+    return store
+
+
+def test_auto_picks_index_by_corpus_size(overridden):
+    with overridden(vector_index_type="auto", vector_ann_min_vectors=100, vector_ivf_min_vectors=1000):
+        store = VectorStore()
+        assert store.choose_index_type(50) == "flat"
+        assert store.choose_index_type(500) == "hnsw"
+        assert store.choose_index_type(5000) == "ivf"
+
+
+def test_ann_indexes_keep_recall_and_persist(overridden):
+    queries = clustered_vectors(50, seed=1)
+    for kind in ("hnsw", "ivf"):
+        with overridden(vector_index_type=kind):
+            store = store_with(clustered_vectors(3000))
+            store.rebuild_index()
+            assert store.index_type == kind
+            assert store.measure_recall(queries, k=10)["recall"] >= 0.9
+
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "store")
+                store.save(path)
+                loaded = VectorStore()
+                loaded.load(path)
+                loaded._ensure_index()
+                assert loaded.index_type == kind
+                assert loaded.index.ntotal == 3000
+                loaded.stored_documents.close()
+                store.stored_documents.close()
+
+
+def test_ivf_retrains_after_growth(overridden):
+    with overridden(vector_index_type="ivf", vector_ivf_retrain_growth=2.0):
+        store = store_with(clustered_vectors(1000))
+        store.rebuild_index()
+        assert store.trained_size == 1000
+        assert not store.needs_rebuild()
+
+        store.vectors = clustered_vectors(2500, seed=2)
+        store.index.add(store.vectors[1000:])
+        assert store.needs_rebuild()
+        store.rebuild_index()
+        assert store.trained_size == 2500
+
+
+def test_trained_size_survives_save_and_load(overridden):
+    with overridden(vector_index_type="ivf", vector_ivf_retrain_growth=2.0):
+        grown = clustered_vectors(1500, seed=2)
+        store = store_with(grown)
+        store.vectors = grown[:1000]
+        store.rebuild_index()
+        store.index.add(grown[1000:])
+        store.vectors = grown
+        assert not store.needs_rebuild()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "store")
+            store.save(path)
+            loaded = VectorStore()
+            loaded.load(path)
+            loaded._ensure_index()
+            # Still trained on the first 1000, not on the 1500 the saved index holds
+            assert loaded.trained_size == 1000
+            loaded.vectors = clustered_vectors(2100, seed=3)
+            assert loaded.needs_rebuild()
+            loaded.stored_documents.close()
+            store.stored_documents.close()
+
+
+class ClusterEncoder:
+    """Stand-in for the sentence encoder returning clustered vectors"""
+
+    def __init__(self):
+        self.seed = 10
+
+    def encode(self, texts, **kwargs):
+        self.seed += 1
+        return clustered_vectors(len(texts), seed=self.seed)
+
+
+def test_growth_rebuilds_in_background(monkeypatch, overridden):
+    monkeypatch.setitem(model_registry._models, SENTENCE_ENCODER, ClusterEncoder())
+    with overridden(vector_index_type="ivf", vector_ivf_retrain_growth=2.0):
+        store = store_with(clustered_vectors(1000))
+        store.rebuild_index()
+
+        # Hold the rebuild until documents have been added alongside it
+        release, building = threading.Event(), threading.Event()
+        build_index = store._build_index
+
+        def held_build(index_type, vectors):
+            building.set()
+            release.wait(10)
+            return build_index(index_type, vectors)
+
+        store._build_index = held_build
+        store.add_documents([f"doc {i}" for i in range(1100)], [{}] * 1100)
+        assert building.wait(10)
+        assert store.trained_size == 1000 and store.index.ntotal == 2100  # Old index still serving
+
+        store.add_documents(["late 1", "late 2"], [{}, {}])
+        assert store.search("late 1", k=1)
+        release.set()
+        store._rebuild_thread.join(10)
+
+        assert store.trained_size == 2100
+        assert store.index.ntotal == store.ntotal == 2102
+        assert not store.needs_rebuild()
+
+
+def test_search_during_add_finds_every_record(monkeypatch, overridden):
+    monkeypatch.setitem(model_registry._models, SENTENCE_ENCODER, ClusterEncoder())
+    with overridden(vector_index_type="flat"):
+        store = store_with(clustered_vectors(50))
+        store.rebuild_index()
+
+        # Search from another thread each time the index has just grown
+        errors, found = [], []
+        needs_rebuild = store.needs_rebuild
+
+        def searched_needs_rebuild():
+            def search():
+                try:
+                    found.append(len(store.search("query", k=store.index.ntotal)))
+                except Exception as e:
+                    errors.append(e)
+            searcher = threading.Thread(target=search)
+            searcher.start()
+            searcher.join(10)
+            return needs_rebuild()
+
+        store.needs_rebuild = searched_needs_rebuild
+        for batch in range(5):
+            store.add_documents([f"added {batch} {i}" for i in range(10)], [{}] * 10)
+
+        assert not errors
+        assert found == [60, 70, 80, 90, 100]
+
+
+def test_tiny_corpus_falls_back_to_flat(overridden):
+    with overridden(vector_index_type="ivf"):
+        store = store_with(clustered_vectors(10))
+        store.rebuild_index()
+        assert store.index_type == "flat"
+        assert not store.needs_rebuild()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test VectorStore save/load with the memory-mapped, pickle-free format
+"""
+import os
+import pickle
+import tempfile
+import zlib
+
+import numpy as np
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ai_interview.db")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from app.services.model_registry import model_registry, SENTENCE_ENCODER
+from app.services import vectorstore
+from app.services.vectorstore import VectorStore
+
+
+class HashEncoder:
+    """Deterministic stand-in for the sentence encoder"""
+
+    def encode(self, texts, **kwargs):
+        return np.stack([
+            np.random.default_rng(zlib.crc32(text.encode())).standard_normal(384).astype('float32')
+            for text in texts
+        ])
+
+
+_previous_encoder = None
+
+
+def setup_module():
+    global _previous_encoder
+    _previous_encoder = model_registry._models.get(SENTENCE_ENCODER)
+    model_registry._models[SENTENCE_ENCODER] = HashEncoder()
+
+
+def teardown_module():
+    if _previous_encoder is None:
+        model_registry._models.pop(SENTENCE_ENCODER, None)
+    else:
+        model_registry._models[SENTENCE_ENCODER] = _previous_encoder
+
+DOCS = [f"Candidate worked on project number {i} using Python and SQL" for i in range(50)]
+META = [{"type": "resume", "chunk": i} for i in range(50)]
+
+
+def test_round_trip_is_lazy():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store", "jobs")
+        store = VectorStore()
+        store.add_documents(DOCS, META)
+        store.save(path)
+
+        loaded = VectorStore()
+        loaded.load(path)
+        assert loaded.ntotal == 50
+        assert isinstance(loaded.vectors, np.memmap)
+        assert loaded.index is None
+        assert loaded.stored_documents._cache == {}
+
+        results = loaded.search(DOCS[7], k=3)
+        assert results[0]['document'] == DOCS[7]
+        assert results[0]['metadata'] == {"type": "resume", "chunk": 7}
+        assert len(loaded.stored_documents._cache) == 3
+        loaded.stored_documents.close()
+
+
+def test_add_after_load_and_resave():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store")
+        store = VectorStore()
+        store.add_documents(DOCS[:10], META[:10])
+        store.save(path)
+
+        reopened = VectorStore()
+        reopened.load(path)
+        reopened.add_documents(DOCS[10:20], META[10:20])
+        reopened.save(path)
+
+        final = VectorStore()
+        final.load(path)
+        assert final.ntotal == 20
+        assert final.get_record(15) == (DOCS[15], META[15])
+        assert final.search(DOCS[3], k=1)[0]['document'] == DOCS[3]
+        for s in (reopened, final):
+            s.stored_documents.close()
+
+
+def test_save_swaps_one_pointer():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store")
+        store = VectorStore()
+        store.add_documents(DOCS[:10], META[:10])
+        store.save(path)
+        first = open(f"{path}.current").read()
+
+        # A reader that opened the first version keeps working while a new one is saved
+        reader = VectorStore()
+        reader.load(path)
+        store.add_documents(DOCS[10:20], META[10:20])
+        store.save(path)
+        second = open(f"{path}.current").read()
+        assert second != first
+        assert os.listdir(f"{path}.versions") == [second]
+        assert reader.get_record(5) == (DOCS[5], META[5])
+
+        final = VectorStore()
+        final.load(path)
+        assert final.ntotal == 20
+        for s in (store, reader, final):
+            s.stored_documents.close()
+
+
+def test_unversioned_store_is_loaded_and_replaced():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store")
+        store = VectorStore()
+        store.add_documents(DOCS[:5], META[:5])
+        store.save(path)
+        # Lay the files out the way stores were saved before versioning
+        version_dir = os.path.join(f"{path}.versions", open(f"{path}.current").read())
+        for name, suffix in vectorstore.UNVERSIONED_SUFFIXES.items():
+            os.replace(os.path.join(version_dir, vectorstore.STORE_FILES[name]), f"{path}{suffix}")
+        os.remove(f"{path}.current")
+        store.stored_documents.close()
+
+        old = VectorStore()
+        old.load(path)
+        assert old.get_record(2) == (DOCS[2], META[2])
+        old.save(path)
+        assert not os.path.exists(f"{path}.vectors.npy") and not os.path.exists(f"{path}.faiss")
+        assert old.get_record(2) == (DOCS[2], META[2])
+        old.stored_documents.close()
+
+
+def test_adds_grow_a_buffer():
+    store = VectorStore()
+    copies = 0
+    for i in range(0, 50, 5):
+        buffer = store._vector_buffer
+        store.add_documents(DOCS[i:i + 5], META[i:i + 5])
+        copies += store._vector_buffer is not buffer
+    assert store.ntotal == 50 and store.vectors.shape == (50, 384)
+    assert copies == 1  # One allocation for all ten adds
+    assert store.search(DOCS[42], k=1)[0]["document"] == DOCS[42]
+
+
+def test_document_cache_is_bounded():
+    previous = vectorstore.DOCUMENT_CACHE_SIZE
+    vectorstore.DOCUMENT_CACHE_SIZE = 4
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "store")
+            store = VectorStore()
+            store.add_documents(DOCS, META)
+            store.save(path)
+            for idx in range(20):
+                assert store.get_record(idx) == (DOCS[idx], META[idx])
+            assert list(store.stored_documents._cache) == [16, 17, 18, 19]
+            store.stored_documents.close()
+    finally:
+        vectorstore.DOCUMENT_CACHE_SIZE = previous
+
+
+def test_search_never_returns_padding():
+    store = VectorStore()
+    store.add_documents(DOCS[:2], META[:2])
+    assert len(store.search("anything", k=5)) == 2
+
+
+def test_legacy_pickle_is_not_loaded():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy")
+        with open(f"{path}.pkl", "wb") as f:
+            pickle.dump({"documents": ["x"], "metadata": [{}]}, f)
+
+        store = VectorStore()
+        store.load(path)
+        assert store.ntotal == 0
+        assert store.search("x") == []
+
+
+if __name__ == "__main__":
+    setup_module()
+    test_round_trip_is_lazy()
+    test_add_after_load_and_resave()
+    test_save_swaps_one_pointer()
+    test_unversioned_store_is_loaded_and_replaced()
+    test_adds_grow_a_buffer()
+    test_document_cache_is_bounded()
+    test_search_never_returns_padding()
+    test_legacy_pickle_is_not_loaded()
+    teardown_module()
+    print("✅ Vector store persistence tests passed")
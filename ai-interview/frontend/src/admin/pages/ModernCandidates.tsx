@@ -56,6 +56,9 @@ const ModernCandidates: React.FC = () => {
   const [showViewModal, setShowViewModal] = useState(false);
   const [showDeleteModal, setShowDeleteModal] = useState(false);
   const [selectedCandidate, setSelectedCandidate] = useState<any>(null);
+  // Resume text is only sent on update once loaded and edited, so a failed or slow load never clears it
+  const [resumeLoading, setResumeLoading] = useState(false);
+  const [resumeEdited, setResumeEdited] = useState(false);
   
   // Form states
   const [formData, setFormData] = useState({
@@ -132,8 +135,10 @@ const ModernCandidates: React.FC = () => {
     try {
       if (!selectedCandidate) return;
       // Format the data properly for the API
+      const { resume_text, ...fields } = formData;
       const apiData = {
-        ...formData,
+        ...fields,
+        ...(resumeEdited ? { resume_text } : {}),
         skills: formData.skills ? formData.skills.split(',').map(s => s.trim()).filter(s => s.length > 0) : []
       };
       console.log('Updating candidate with data:', apiData);
@@ -170,7 +175,7 @@ const ModernCandidates: React.FC = () => {
     }
   };
 
-  const openEditModal = (candidate: any) => {
+  const openEditModal = async (candidate: any) => {
     setSelectedCandidate(candidate);
     setFormData({
       name: candidate.name || '',
@@ -181,7 +186,21 @@ const ModernCandidates: React.FC = () => {
       skills: Array.isArray(candidate.skills) ? candidate.skills.join(', ') : (candidate.skills || ''),
       resume_text: candidate.resume_text || ''
     });
+    setResumeEdited(false);
     setShowEditModal(true);
+
+    // The listing omits resume text; load it for editing (it is left out of the update unless edited)
+    if (candidate.resume_text === undefined && candidate.has_resume) {
+      setResumeLoading(true);
+      try {
+        const resume = await apiClient.getCandidateResume(candidate.id);
+        setFormData(prev => ({ ...prev, resume_text: resume.resume_text || '' }));
+      } catch (err) {
+        console.error('Failed to load resume:', err);
+      } finally {
+        setResumeLoading(false);
+      }
+    }
   };
 
   const openViewModal = (candidate: any) => {
@@ -834,9 +853,13 @@ const ModernCandidates: React.FC = () => {
                 <label className="block text-sm font-medium text-gray-700 mb-1">Resume Content</label>
                 <textarea
                   value={formData.resume_text}
-                  onChange={(e) => setFormData({...formData, resume_text: e.target.value})}
+                  onChange={(e) => {
+                    setFormData({...formData, resume_text: e.target.value});
+                    setResumeEdited(true);
+                  }}
+                  disabled={resumeLoading}
                   className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
-                  placeholder="Resume content for AI interview questions"
+                  placeholder={resumeLoading ? "Loading resume..." : "Resume content for AI interview questions"}
                   rows={4}
                 />
               </div>
@@ -850,10 +873,11 @@ const ModernCandidates: React.FC = () => {
               </button>
               <button 
                 onClick={handleEditCandidate}
-                className="flex-1 px-4 py-2 text-white rounded-lg"
+                disabled={resumeLoading}
+                className="flex-1 px-4 py-2 text-white rounded-lg disabled:opacity-50"
                 style={{backgroundColor: '#BB6C43'}}
               >
-                Update Candidate
+                {resumeLoading ? 'Loading resume...' : 'Update Candidate'}
               </button>
             </div>
           </div>
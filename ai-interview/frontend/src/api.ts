@@ -141,6 +141,11 @@ export const apiClient = {
     return response.data;
   },
 
+  async getCandidateResume(id: number): Promise<any> {
+    const response = await api.get(`/api/admin/candidates/${id}/resume`);
+    return response.data;
+  },
+
   async createCandidate(candidateData: any): Promise<any> {
     const response = await api.post('/api/admin/candidates/json', candidateData, {
       headers: { 'Content-Type': 'application/json' },
@@ -148,6 +153,21 @@ export const apiClient = {
     return response.data;
   },
 
+  async bulkUploadCandidates(files: File[]): Promise<any> {
+    const formData = new FormData();
+    files.forEach((file) => formData.append('files', file, file.name));
+
+    const response = await api.post('/api/admin/candidates/bulk', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
+
+  async getBulkUploadStatus(jobId: string): Promise<any> {
+    const response = await api.get(`/api/admin/candidates/bulk/${jobId}`);
+    return response.data;
+  },
+
   async updateCandidate(id: number, candidateData: any): Promise<any> {
     const response = await api.put(`/api/admin/candidates/${id}`, candidateData, {
       headers: { 'Content-Type': 'application/json' },